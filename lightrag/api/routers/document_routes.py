@@ -1800,6 +1800,7 @@ async def background_delete_documents(
     )
 
     total_docs = len(doc_ids)
+    batch_size = max(1, rag.max_delete_batch_size)
     successful_deletions = []
     failed_deletions = []
 
@@ -1813,11 +1814,11 @@ async def background_delete_documents(
         pipeline_status.update(
             {
                 "busy": True,
-                # Job name can not be changed, it's verified in adelete_by_doc_id()
+                # Job name can not be changed, it's verified in adelete_by_doc_ids()
                 "job_name": f"Deleting {total_docs} Documents",
                 "job_start": datetime.now().isoformat(),
                 "docs": total_docs,
-                "batchs": total_docs,
+                "batchs": (total_docs + batch_size - 1) // batch_size,
                 "cur_batch": 0,
                 "latest_message": "Starting document deletion process",
             }
@@ -1830,173 +1831,192 @@ async def background_delete_documents(
             )
 
     try:
-        # Loop through each document ID and delete them one by one
-        for i, doc_id in enumerate(doc_ids, 1):
-            # Check for cancellation at the start of each document deletion
+        # Delete bounded batches of documents: entities and relations shared by the
+        # documents of a batch are rebuilt once, and cancellation is checked and
+        # progress reported between batches
+        for batch_index, start in enumerate(range(0, total_docs, batch_size), 1):
+            batch_doc_ids = doc_ids[start : start + batch_size]
             async with pipeline_status_lock:
                 if pipeline_status.get("cancellation_requested", False):
-                    cancel_msg = f"Deletion cancelled by user at document {i}/{total_docs}. {len(successful_deletions)} deleted, {total_docs - i + 1} remaining."
+                    cancel_msg = f"Deletion cancelled by user at document {start + 1}/{total_docs}. {len(successful_deletions)} deleted, {total_docs - start} remaining."
                     logger.info(cancel_msg)
                     pipeline_status["latest_message"] = cancel_msg
                     pipeline_status["history_messages"].append(cancel_msg)
                     # Add remaining documents to failed list with cancellation reason
-                    failed_deletions.extend(
-                        doc_ids[i - 1 :]
-                    )  # i-1 because enumerate starts at 1
+                    failed_deletions.extend(doc_ids[start:])
                     break  # Exit the loop, remaining documents unchanged
 
-                start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
+                start_msg = f"Deleting documents {start + 1}-{start + len(batch_doc_ids)}/{total_docs}"
                 logger.info(start_msg)
-                pipeline_status["cur_batch"] = i
+                pipeline_status["cur_batch"] = batch_index
                 pipeline_status["latest_message"] = start_msg
                 pipeline_status["history_messages"].append(start_msg)
 
-            file_path = "#"
             try:
-                result = await rag.adelete_by_doc_id(
-                    doc_id, delete_llm_cache=delete_llm_cache
+                results = await rag.adelete_by_doc_ids(
+                    batch_doc_ids, delete_llm_cache=delete_llm_cache
                 )
-                file_path = (
-                    getattr(result, "file_path", "-") if "result" in locals() else "-"
-                )
-                if result.status == "success":
-                    successful_deletions.append(doc_id)
-                    success_msg = (
-                        f"Document deleted {i}/{total_docs}: {doc_id}[{file_path}]"
-                    )
-                    logger.info(success_msg)
-                    async with pipeline_status_lock:
-                        pipeline_status["history_messages"].append(success_msg)
+            except Exception as e:
+                failed_deletions.extend(batch_doc_ids)
+                error_msg = f"Error deleting documents {start + 1}-{start + len(batch_doc_ids)}/{total_docs}: {str(e)}"
+                logger.error(error_msg)
+                logger.error(traceback.format_exc())
+                async with pipeline_status_lock:
+                    pipeline_status["latest_message"] = error_msg
+                    pipeline_status["history_messages"].append(error_msg)
+                continue
 
-                    # Handle file deletion if requested and file_path is available
-                    if (
-                        delete_file
-                        and result.file_path
-                        and result.file_path != "unknown_source"
-                    ):
-                        try:
-                            deleted_files = []
-                            # SECURITY FIX: Use secure path validation to prevent arbitrary file deletion
-                            safe_file_path = validate_file_path_security(
-                                result.file_path, doc_manager.input_dir
-                            )
+            # Clean up input files and report the outcome of each document
+            for i, (doc_id, result) in enumerate(
+                zip(batch_doc_ids, results), start + 1
+            ):
+                file_path = "#"
+                try:
+                    file_path = getattr(result, "file_path", "-")
+                    if result.status == "success":
+                        successful_deletions.append(doc_id)
+                        success_msg = (
+                            f"Document deleted {i}/{total_docs}: {doc_id}[{file_path}]"
+                        )
+                        logger.info(success_msg)
+                        async with pipeline_status_lock:
+                            pipeline_status["history_messages"].append(success_msg)
 
-                            if safe_file_path is None:
-                                # Security violation detected - log and skip file deletion
-                                security_msg = f"Security violation: Unsafe file path detected for deletion - {result.file_path}"
-                                logger.warning(security_msg)
-                                async with pipeline_status_lock:
-                                    pipeline_status["latest_message"] = security_msg
-                                    pipeline_status["history_messages"].append(
-                                        security_msg
-                                    )
-                            else:
-                                # check and delete files from input_dir directory
-                                if safe_file_path.exists():
-                                    try:
-                                        safe_file_path.unlink()
-                                        deleted_files.append(safe_file_path.name)
-                                        file_delete_msg = f"Successfully deleted input_dir file: {result.file_path}"
-                                        logger.info(file_delete_msg)
-                                        async with pipeline_status_lock:
-                                            pipeline_status["latest_message"] = (
-                                                file_delete_msg
-                                            )
-                                            pipeline_status["history_messages"].append(
-                                                file_delete_msg
-                                            )
-                                    except Exception as file_error:
-                                        file_error_msg = f"Failed to delete input_dir file {result.file_path}: {str(file_error)}"
-                                        logger.debug(file_error_msg)
-                                        async with pipeline_status_lock:
-                                            pipeline_status["latest_message"] = (
-                                                file_error_msg
-                                            )
-                                            pipeline_status["history_messages"].append(
-                                                file_error_msg
-                                            )
+                        # Handle file deletion if requested and file_path is available
+                        if (
+                            delete_file
+                            and result.file_path
+                            and result.file_path != "unknown_source"
+                        ):
+                            try:
+                                deleted_files = []
+                                # SECURITY FIX: Use secure path validation to prevent arbitrary file deletion
+                                safe_file_path = validate_file_path_security(
+                                    result.file_path, doc_manager.input_dir
+                                )
 
-                                # Also check and delete files from __enqueued__ directory
-                                enqueued_dir = doc_manager.input_dir / "__enqueued__"
-                                if enqueued_dir.exists():
-                                    # SECURITY FIX: Validate that the file path is safe before processing
-                                    # Only proceed if the original path validation passed
-                                    base_name = Path(result.file_path).stem
-                                    extension = Path(result.file_path).suffix
-
-                                    # Search for exact match and files with numeric suffixes
-                                    for enqueued_file in enqueued_dir.glob(
-                                        f"{base_name}*{extension}"
-                                    ):
-                                        # Additional security check: ensure enqueued file is within enqueued directory
-                                        safe_enqueued_path = (
-                                            validate_file_path_security(
-                                                enqueued_file.name, enqueued_dir
-                                            )
+                                if safe_file_path is None:
+                                    # Security violation detected - log and skip file deletion
+                                    security_msg = f"Security violation: Unsafe file path detected for deletion - {result.file_path}"
+                                    logger.warning(security_msg)
+                                    async with pipeline_status_lock:
+                                        pipeline_status["latest_message"] = security_msg
+                                        pipeline_status["history_messages"].append(
+                                            security_msg
                                         )
-                                        if safe_enqueued_path is not None:
-                                            try:
-                                                enqueued_file.unlink()
-                                                deleted_files.append(enqueued_file.name)
-                                                logger.info(
-                                                    f"Successfully deleted enqueued file: {enqueued_file.name}"
+                                else:
+                                    # check and delete files from input_dir directory
+                                    if safe_file_path.exists():
+                                        try:
+                                            safe_file_path.unlink()
+                                            deleted_files.append(safe_file_path.name)
+                                            file_delete_msg = f"Successfully deleted input_dir file: {result.file_path}"
+                                            logger.info(file_delete_msg)
+                                            async with pipeline_status_lock:
+                                                pipeline_status["latest_message"] = (
+                                                    file_delete_msg
+                                                )
+                                                pipeline_status[
+                                                    "history_messages"
+                                                ].append(file_delete_msg)
+                                        except Exception as file_error:
+                                            file_error_msg = f"Failed to delete input_dir file {result.file_path}: {str(file_error)}"
+                                            logger.debug(file_error_msg)
+                                            async with pipeline_status_lock:
+                                                pipeline_status["latest_message"] = (
+                                                    file_error_msg
+                                                )
+                                                pipeline_status[
+                                                    "history_messages"
+                                                ].append(file_error_msg)
+
+                                    # Also check and delete files from __enqueued__ directory
+                                    enqueued_dir = (
+                                        doc_manager.input_dir / "__enqueued__"
+                                    )
+                                    if enqueued_dir.exists():
+                                        # SECURITY FIX: Validate that the file path is safe before processing
+                                        # Only proceed if the original path validation passed
+                                        base_name = Path(result.file_path).stem
+                                        extension = Path(result.file_path).suffix
+
+                                        # Search for exact match and files with numeric suffixes
+                                        for enqueued_file in enqueued_dir.glob(
+                                            f"{base_name}*{extension}"
+                                        ):
+                                            # Additional security check: ensure enqueued file is within enqueued directory
+                                            safe_enqueued_path = (
+                                                validate_file_path_security(
+                                                    enqueued_file.name, enqueued_dir
                                                 )
-                                            except Exception as enqueued_error:
-                                                file_error_msg = f"Failed to delete enqueued file {enqueued_file.name}: {str(enqueued_error)}"
-                                                logger.debug(file_error_msg)
-                                                async with pipeline_status_lock:
-                                                    pipeline_status[
-                                                        "latest_message"
-                                                    ] = file_error_msg
-                                                    pipeline_status[
-                                                        "history_messages"
-                                                    ].append(file_error_msg)
-                                        else:
-                                            security_msg = f"Security violation: Unsafe enqueued file path detected - {enqueued_file.name}"
-                                            logger.warning(security_msg)
-
-                            if deleted_files == []:
-                                file_error_msg = f"File deletion skipped, missing or unsafe file: {result.file_path}"
-                                logger.warning(file_error_msg)
+                                            )
+                                            if safe_enqueued_path is not None:
+                                                try:
+                                                    enqueued_file.unlink()
+                                                    deleted_files.append(
+                                                        enqueued_file.name
+                                                    )
+                                                    logger.info(
+                                                        f"Successfully deleted enqueued file: {enqueued_file.name}"
+                                                    )
+                                                except Exception as enqueued_error:
+                                                    file_error_msg = f"Failed to delete enqueued file {enqueued_file.name}: {str(enqueued_error)}"
+                                                    logger.debug(file_error_msg)
+                                                    async with pipeline_status_lock:
+                                                        pipeline_status[
+                                                            "latest_message"
+                                                        ] = file_error_msg
+                                                        pipeline_status[
+                                                            "history_messages"
+                                                        ].append(file_error_msg)
+                                            else:
+                                                security_msg = f"Security violation: Unsafe enqueued file path detected - {enqueued_file.name}"
+                                                logger.warning(security_msg)
+
+                                if deleted_files == []:
+                                    file_error_msg = f"File deletion skipped, missing or unsafe file: {result.file_path}"
+                                    logger.warning(file_error_msg)
+                                    async with pipeline_status_lock:
+                                        pipeline_status["latest_message"] = (
+                                            file_error_msg
+                                        )
+                                        pipeline_status["history_messages"].append(
+                                            file_error_msg
+                                        )
+
+                            except Exception as file_error:
+                                file_error_msg = f"Failed to delete file {result.file_path}: {str(file_error)}"
+                                logger.error(file_error_msg)
                                 async with pipeline_status_lock:
                                     pipeline_status["latest_message"] = file_error_msg
                                     pipeline_status["history_messages"].append(
                                         file_error_msg
                                     )
-
-                        except Exception as file_error:
-                            file_error_msg = f"Failed to delete file {result.file_path}: {str(file_error)}"
-                            logger.error(file_error_msg)
+                        elif delete_file:
+                            no_file_msg = (
+                                f"File deletion skipped, missing file path: {doc_id}"
+                            )
+                            logger.warning(no_file_msg)
                             async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = file_error_msg
-                                pipeline_status["history_messages"].append(
-                                    file_error_msg
-                                )
-                    elif delete_file:
-                        no_file_msg = (
-                            f"File deletion skipped, missing file path: {doc_id}"
-                        )
-                        logger.warning(no_file_msg)
+                                pipeline_status["latest_message"] = no_file_msg
+                                pipeline_status["history_messages"].append(no_file_msg)
+                    else:
+                        failed_deletions.append(doc_id)
+                        error_msg = f"Failed to delete {i}/{total_docs}: {doc_id}[{file_path}] - {result.message}"
+                        logger.error(error_msg)
                         async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = no_file_msg
-                            pipeline_status["history_messages"].append(no_file_msg)
-                else:
+                            pipeline_status["latest_message"] = error_msg
+                            pipeline_status["history_messages"].append(error_msg)
+
+                except Exception as e:
                     failed_deletions.append(doc_id)
-                    error_msg = f"Failed to delete {i}/{total_docs}: {doc_id}[{file_path}] - {result.message}"
+                    error_msg = f"Error cleaning up document {i}/{total_docs}: {doc_id}[{file_path}] - {str(e)}"
                     logger.error(error_msg)
+                    logger.error(traceback.format_exc())
                     async with pipeline_status_lock:
                         pipeline_status["latest_message"] = error_msg
                         pipeline_status["history_messages"].append(error_msg)
 
-            except Exception as e:
-                failed_deletions.append(doc_id)
-                error_msg = f"Error deleting document {i}/{total_docs}: {doc_id}[{file_path}] - {str(e)}"
-                logger.error(error_msg)
-                logger.error(traceback.format_exc())
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = error_msg
-                    pipeline_status["history_messages"].append(error_msg)
-
     except Exception as e:
         error_msg = f"Critical error during batch deletion: {str(e)}"
         logger.error(error_msg)
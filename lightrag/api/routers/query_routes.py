@@ -95,6 +95,12 @@ class QueryRequest(BaseModel):
         description="Enable reranking for retrieved text chunks. If True but no rerank model is configured, a warning will be issued. Default is True.",
     )
 
+    vector_search_effort: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Search breadth for approximate vector indexes (nprobe for IVF, efSearch for HNSW). Higher values improve recall at the cost of latency. Ignored by exact vector storages.",
+    )
+
     include_references: Optional[bool] = Field(
         default=True,
         description="If True, includes reference list in responses. Affects /query and /query/stream endpoints. /query/data always includes references.",
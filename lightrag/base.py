@@ -168,6 +168,12 @@ class QueryParam:
     containing citation information for the retrieved content.
     """
 
+    vector_search_effort: int | None = None
+    """Search breadth for approximate vector indexes: nprobe for IVF, efSearch for HNSW.
+    Higher values improve recall at the cost of latency. None uses the storage default;
+    vector storages without a tunable index ignore it.
+    """
+
 
 @dataclass
 class StorageNameSpace(ABC):
@@ -222,7 +228,11 @@ class BaseVectorStorage(StorageNameSpace, ABC):
 
     @abstractmethod
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        search_effort: int | None = None,
     ) -> list[dict[str, Any]]:
         """Query the vector storage and retrieve top_k results.
 
@@ -231,6 +241,8 @@ class BaseVectorStorage(StorageNameSpace, ABC):
             top_k: Number of top results to return
             query_embedding: Optional pre-computed embedding for the query.
                            If provided, skips embedding computation for better performance.
+            search_effort: Optional ANN search breadth (see QueryParam.vector_search_effort).
+                           Storages without a tunable index ignore it.
         """
 
     @abstractmethod
@@ -558,6 +570,35 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """Insert or update multiple nodes
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+        """
+        for node_id, node_data in nodes:
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple edges
+
+        Default implementation upserts edges one by one.
+        Override this method for better performance in storage backends
+        that support batch operations. Both endpoints of every edge must
+        already exist, as with upsert_edge.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
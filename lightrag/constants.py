@@ -23,6 +23,8 @@ DEFAULT_SUMMARY_MAX_TOKENS = 1200
 DEFAULT_SUMMARY_LENGTH_RECOMMENDED = 600
 # Maximum token size sent to LLM for summary
 DEFAULT_SUMMARY_CONTEXT_SIZE = 12000
+# Max concurrent map-phase summaries of one entity/relation (0: half of MAX_ASYNC)
+DEFAULT_SUMMARY_MAP_MAX_ASYNC = 0
 # Default entities to extract if ENTITY_TYPES is not specified in .env
 DEFAULT_ENTITY_TYPES = [
     "Person",
@@ -50,6 +52,9 @@ DEFAULT_MAX_TOTAL_TOKENS = 30000
 DEFAULT_COSINE_THRESHOLD = 0.2
 DEFAULT_RELATED_CHUNK_NUMBER = 5
 DEFAULT_KG_CHUNK_PICK_METHOD = "VECTOR"
+# Retrieval (query context) cache: max entries per process and TTL in seconds
+DEFAULT_RETRIEVAL_CACHE_MAX_SIZE = 128
+DEFAULT_RETRIEVAL_CACHE_TTL = 300
 
 # TODO: Deprated. All conversation_history messages is send to LLM.
 DEFAULT_HISTORY_TURNS = 0
@@ -57,6 +62,14 @@ DEFAULT_HISTORY_TURNS = 0
 # Rerank configuration defaults
 DEFAULT_MIN_RERANK_SCORE = 0.0
 DEFAULT_RERANK_BINDING = "null"
+# Connection limit and keep-alive seconds of the shared rerank HTTP session per endpoint
+DEFAULT_RERANK_MAX_CONNECTIONS = 32
+DEFAULT_RERANK_KEEPALIVE_TIMEOUT = 60
+
+# Connection pool of the shared OpenAI clients (one per endpoint configuration)
+DEFAULT_OPENAI_MAX_CONNECTIONS = 1000
+DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS = 100
+DEFAULT_OPENAI_KEEPALIVE_EXPIRY = 30.0
 
 # Default source ids limit in meta data for entity and relation
 DEFAULT_MAX_SOURCE_IDS_PER_ENTITY = 300
@@ -80,12 +93,66 @@ DEFAULT_MAX_FILE_PATH_LENGTH = 32768
 # Placeholder for more file paths in meta data for entity and relation (Should not be changed)
 DEFAULT_FILE_PATH_MORE_PLACEHOLDER = "truncated"
 
+# Max number of token counts memoized per Tokenizer (keyed by content hash)
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 50000
+
+# Tokenizer backend created when no tokenizer is given: "tiktoken" or "huggingface"
+DEFAULT_TOKENIZER_BACKEND = "tiktoken"
+# Token counts for budget checks: "exact" or "estimate" (calibrated character-class estimate)
+DEFAULT_TOKEN_COUNT_MODE = "exact"
+# Characters of text counted exactly to calibrate the estimator before estimates are used
+DEFAULT_TOKEN_ESTIMATOR_CALIBRATION_CHARS = 100000
+# Relative margin added to token estimates so budget checks err on the safe side
+DEFAULT_TOKEN_ESTIMATE_MARGIN = 0.05
+
+# JsonKVStorage rewrites its JSON snapshot once the append-only log exceeds this fraction of the snapshot size
+DEFAULT_KV_LOG_COMPACTION_RATIO = 0.5
+
+# Coalesce the entity/relation vector upserts of concurrent merge tasks into
+# embedding_batch_num sized batches (pays off when merge concurrency exceeds
+# the embedding concurrency)
+DEFAULT_VECTOR_UPSERT_BATCHING = False
+# Seconds a partially filled batch of entity/relation vector upserts waits for
+# more records during the merge phase before it is embedded and written
+DEFAULT_VECTOR_UPSERT_FLUSH_INTERVAL = 0.02
+
+# New LLM cache entries buffered during entity extraction are written with one
+# upsert at document end, or earlier once this many entries are pending
+DEFAULT_LLM_CACHE_FLUSH_SIZE = 256
+
+# NetworkXStorage on-disk format: "graphml" or "binary" (snapshot plus delta file)
+DEFAULT_NETWORKX_GRAPH_FORMAT = "graphml"
+# Binary NetworkX graphs are re-snapshotted once the delta file exceeds this fraction of the snapshot size
+DEFAULT_GRAPH_DELTA_COMPACTION_RATIO = 0.5
+# Change feeds that let worker processes apply each other's NetworkX (graphml), NanoVectorDB
+# and Faiss changes are restarted once they exceed this fraction of the data file size
+DEFAULT_CHANGE_FEED_COMPACTION_RATIO = 0.5
+
+# Records per shared-dict update when streaming JSON stores into memory
+DEFAULT_JSON_LOAD_BATCH_SIZE = 10000
+# Log loading progress for JSON store files larger than this (bytes)
+JSON_LOAD_PROGRESS_MIN_BYTES = 64 * 1024 * 1024
+# Keep JSON KV / doc status data of multi-worker servers in memory-mapped files
+# that workers read without IPC, instead of multiprocessing.Manager dicts
+DEFAULT_SHARED_MEMORY_STORE = True
+
 # Default temperature for LLM
 DEFAULT_TEMPERATURE = 1.0
 
 # Async configuration defaults
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
+# Prefetch and write back graph data of a document in batches during merge
+DEFAULT_GRAPH_BULK_MERGE = False
+# Share chunk extraction slots fairly across all documents being processed
+DEFAULT_EXTRACTION_SCHEDULER = False
+# Documents deleted per adelete_by_doc_ids call by a background deletion job
+DEFAULT_MAX_DELETE_BATCH_SIZE = 20
+# Adapt LLM concurrency (AIMD) between 1 and MAX_ASYNC, starting from the initial value
+DEFAULT_ADAPTIVE_MAX_ASYNC = False
+DEFAULT_ADAPTIVE_INITIAL_ASYNC = 4
+# LLM token budget per minute shared by all LLM calls (0: unlimited)
+DEFAULT_LLM_TOKENS_PER_MINUTE = 0
 
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
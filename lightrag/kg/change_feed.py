@@ -0,0 +1,194 @@
+"""
+Versioned change feed for storages that keep their data in memory and save it
+as whole files (NetworkXStorage in graphml format, NanoVectorDBStorage,
+FaissVectorDBStorage).
+
+The writing process appends the operations made since its previous save as a
+frame with the next sequence number, saves its data file, then records in the
+feed header which sequence the data file contains. Other worker processes
+apply the frames they have not seen yet to their in-memory replica, and only
+reload the data file when those frames are gone because the feed was compacted
+or restarted past their position.
+
+File layout: magic + 32-byte hex feed id + uint64 base sequence (the feed
+holds every frame after it) + uint64 snapshot sequence, followed by frames of (uint32 length, uint64 sequence, pickled list of operations).
+Operations may only contain builtins; a torn final frame is ignored.
+"""
+
+import io
+import os
+import pickle
+import struct
+import uuid
+from typing import Any
+
+from lightrag.constants import DEFAULT_CHANGE_FEED_COMPACTION_RATIO
+
+_MAGIC = b"LRCF0001"
+_ID_SIZE = 32
+_SEQUENCE = struct.Struct("<Q")
+_BASE_OFFSET = len(_MAGIC) + _ID_SIZE
+_SNAPSHOT_OFFSET = _BASE_OFFSET + _SEQUENCE.size
+_HEADER_SIZE = _SNAPSHOT_OFFSET + _SEQUENCE.size
+_FRAME_HEADER = struct.Struct("<IQ")
+
+
+class _BuiltinsUnpickler(pickle.Unpickler):
+    """Unpickler that refuses to import anything, so a feed can only ever
+    produce plain containers, strings, bytes and numbers."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(
+            f"Unexpected global {module}.{name} in change feed"
+        )
+
+
+def _loads(payload: bytes) -> Any:
+    return _BuiltinsUnpickler(io.BytesIO(payload)).load()
+
+
+class ChangeFeed:
+    """Operation log of one storage file, shared by all worker processes.
+
+    Each process owns one ChangeFeed object per storage; ``sequence`` is the
+    last sequence its in-memory replica contains. All methods must be called
+    while holding the storage's namespace lock.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        compaction_ratio: float = DEFAULT_CHANGE_FEED_COMPACTION_RATIO,
+    ):
+        self.file_name = file_name
+        self.compaction_ratio = compaction_ratio
+        self.sequence = 0
+        self._feed_id: str | None = None
+        self._offset = _HEADER_SIZE
+
+    def _read_header(self) -> tuple[str, int, int] | None:
+        try:
+            with open(self.file_name, "rb") as f:
+                header = f.read(_HEADER_SIZE)
+        except FileNotFoundError:
+            return None
+        if len(header) != _HEADER_SIZE or not header.startswith(_MAGIC):
+            return None
+        feed_id = header[len(_MAGIC) : _BASE_OFFSET].decode("ascii")
+        (base,) = _SEQUENCE.unpack_from(header, _BASE_OFFSET)
+        (snapshot,) = _SEQUENCE.unpack_from(header, _SNAPSHOT_OFFSET)
+        return feed_id, base, snapshot
+
+    def loaded(self) -> list:
+        """Record that the data file was just loaded.
+
+        Returns the operations appended after the data file was saved (left
+        behind by a writer that stopped between appending and saving), which
+        the caller applies on top of the loaded data.
+        """
+        header = self._read_header()
+        if header is None:
+            self._feed_id, self.sequence = None, 0
+            return []
+        self._feed_id, _, self.sequence = header
+        self._offset = _HEADER_SIZE
+        return self.read() or []
+
+    def read(self) -> list | None:
+        """Return the operations committed after ``sequence``.
+
+        Returns None when they are no longer available and the caller has to
+        reload the data file (followed by ``loaded``).
+        """
+        header = self._read_header()
+        if header is None:
+            return None
+        feed_id, base, _ = header
+        if feed_id != self._feed_id:
+            # Compacted or restarted feed: frames up to its base are gone
+            if base > self.sequence:
+                return None
+            self._feed_id, self._offset = feed_id, _HEADER_SIZE
+
+        ops: list = []
+        with open(self.file_name, "rb") as f:
+            f.seek(self._offset)
+            while True:
+                header = f.read(_FRAME_HEADER.size)
+                if len(header) < _FRAME_HEADER.size:
+                    break
+                size, sequence = _FRAME_HEADER.unpack(header)
+                payload = f.read(size)
+                if len(payload) < size:
+                    break
+                if sequence > self.sequence:
+                    ops.extend(_loads(payload))
+                    self.sequence = sequence
+                self._offset = f.tell()
+        return ops
+
+    def append(self, ops: list, data_size: int) -> None:
+        """Append the operations of one save as the next sequence.
+
+        The feed is restarted (dropping all frames) once it outgrows
+        ``compaction_ratio`` times the data file size, or if it was replaced
+        by another process. Replicas that are caught up carry on with the new
+        feed; replicas further behind reload the data file.
+        """
+        header = self._read_header()
+        if (
+            header is None
+            or header[0] != self._feed_id
+            or os.path.getsize(self.file_name) - _HEADER_SIZE
+            > data_size * self.compaction_ratio
+        ):
+            self.restart(self.sequence)
+
+        payload = pickle.dumps(ops, protocol=pickle.HIGHEST_PROTOCOL)
+        self.sequence += 1
+        with open(self.file_name, "ab") as f:
+            f.write(_FRAME_HEADER.pack(len(payload), self.sequence))
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+            self._offset = f.tell()
+
+    def mark_snapshot(self) -> None:
+        """Record that the data file now contains everything up to ``sequence``"""
+        if self._read_header() is None:
+            self.restart(self.sequence)
+            return
+        with open(self.file_name, "r+b") as f:
+            f.seek(_SNAPSHOT_OFFSET)
+            f.write(_SEQUENCE.pack(self.sequence))
+
+    def reset(self) -> None:
+        """Restart the feed past every sequence a replica can hold, so all
+        other processes reload (used after a storage dropped its data)"""
+        latest = self.sequence
+        header = self._read_header()
+        if header is not None:
+            latest = max(latest, header[2])
+            with open(self.file_name, "rb") as f:
+                f.seek(_HEADER_SIZE)
+                while True:
+                    frame = f.read(_FRAME_HEADER.size)
+                    if len(frame) < _FRAME_HEADER.size:
+                        break
+                    size, sequence = _FRAME_HEADER.unpack(frame)
+                    latest = max(latest, sequence)
+                    f.seek(size, os.SEEK_CUR)
+        self.restart(latest + 1)
+
+    def restart(self, sequence: int) -> None:
+        """Replace the feed with an empty one starting after ``sequence``"""
+        self._feed_id = uuid.uuid4().hex
+        self.sequence = sequence
+        tmp_file = f"{self.file_name}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(_MAGIC + self._feed_id.encode("ascii"))
+            f.write(_SEQUENCE.pack(sequence) * 2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.file_name)
+        self._offset = _HEADER_SIZE
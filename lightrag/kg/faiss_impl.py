@@ -6,9 +6,11 @@ import json
 import numpy as np
 from dataclasses import dataclass
 
-from lightrag.utils import logger, compute_mdhash_id
+from lightrag.constants import DEFAULT_CHANGE_FEED_COMPACTION_RATIO
+from lightrag.utils import logger, compute_mdhash_id, rank_by_cosine_similarity
 from lightrag.base import BaseVectorStorage
 
+from .change_feed import ChangeFeed
 from .shared_storage import (
     get_namespace_lock,
     get_update_flag,
@@ -18,6 +20,53 @@ from .shared_storage import (
 # You must manually install faiss-cpu or faiss-gpu before using FAISS vector db
 import faiss  # type: ignore
 
+# Supported values for faiss_index_type (FAISS_INDEX_TYPE)
+FAISS_INDEX_TYPES = ("Flat", "IVF", "HNSW", "IVFPQ")
+
+# Fraction of removed-but-still-indexed HNSW vectors that triggers a rebuild on save
+_HNSW_REBUILD_RATIO = 0.3
+
+
+def faiss_index_description(
+    index_type: str, nlist: int = 1024, hnsw_m: int = 32, pq_m: int = 64
+) -> str:
+    """Return the faiss.index_factory description for a supported index type.
+
+    Flat and HNSW indexes are wrapped in IndexIDMap2 so vectors keep stable
+    ids. IVF indexes store ids natively and support remove_ids directly;
+    wrapping them in an IDMap would break removal because IVF lists are not
+    renumbered.
+    """
+    if index_type == "Flat":
+        return "IDMap2,Flat"
+    if index_type == "IVF":
+        return f"IVF{nlist},Flat"
+    if index_type == "HNSW":
+        return f"IDMap2,HNSW{hnsw_m}"
+    if index_type == "IVFPQ":
+        return f"IVF{nlist},PQ{pq_m}"
+    raise ValueError(
+        f"faiss_index_type must be one of {FAISS_INDEX_TYPES}, got {index_type}"
+    )
+
+
+def default_faiss_train_size(index_type: str, nlist: int) -> int:
+    """Faiss recommends at least 39 training points per centroid (IVF lists, 256 PQ codes)."""
+    centroids = max(nlist, 256) if index_type == "IVFPQ" else nlist
+    return 39 * centroids
+
+
+def set_faiss_search_effort(index, search_effort: int | None) -> None:
+    """Set nprobe (IVF, IVFPQ) or efSearch (HNSW) on an index; Flat ignores it."""
+    if search_effort is None:
+        return
+    if isinstance(index, faiss.IndexIDMap2):
+        index = faiss.downcast_index(index.index)
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = max(1, int(search_effort))
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = max(1, min(int(search_effort), index.nlist))
+
 
 @final
 @dataclass
@@ -25,6 +74,18 @@ class FaissVectorDBStorage(BaseVectorStorage):
     """
     A Faiss-based Vector DB Storage for LightRAG.
     Uses cosine similarity by storing normalized vectors in a Faiss index with inner product search.
+
+    Supported vector_db_storage_cls_kwargs (environment variable fallback in brackets):
+        faiss_index_type: "Flat" (default, exact), "IVF", "HNSW" or "IVFPQ" (FAISS_INDEX_TYPE)
+        faiss_nlist: Number of IVF lists (FAISS_NLIST, default 1024)
+        faiss_hnsw_m: HNSW graph degree (FAISS_HNSW_M, default 32)
+        faiss_pq_m: PQ sub-quantizers, must divide the embedding dim (FAISS_PQ_M, default 64)
+        faiss_train_size: Vectors collected before training IVF/IVFPQ (FAISS_TRAIN_SIZE, default 39 per centroid)
+        faiss_search_effort: Default nprobe (IVF) or efSearch (HNSW) (FAISS_SEARCH_EFFORT)
+
+    Until an IVF index has been trained, new vectors are kept aside and searched
+    exactly, so small workspaces behave like the Flat index. The search effort can
+    be overridden per query through QueryParam.vector_search_effort.
     """
 
     def __post_init__(self):
@@ -58,13 +119,58 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
-        # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
-        # Keep a local store for metadata, IDs, etc.
-        # Maps <int faiss_id> → metadata (including your original ID).
-        self._id_to_meta = {}
+        # Index configuration
+        index_type = kwargs.get(
+            "faiss_index_type", os.getenv("FAISS_INDEX_TYPE", "Flat")
+        )
+        self._index_type = {t.lower(): t for t in FAISS_INDEX_TYPES}.get(
+            str(index_type).lower()
+        )
+        if self._index_type is None:
+            raise ValueError(
+                f"faiss_index_type must be one of {FAISS_INDEX_TYPES}, got {index_type}"
+            )
+        self._nlist = int(kwargs.get("faiss_nlist", os.getenv("FAISS_NLIST", 1024)))
+        self._hnsw_m = int(kwargs.get("faiss_hnsw_m", os.getenv("FAISS_HNSW_M", 32)))
+        self._pq_m = int(kwargs.get("faiss_pq_m", os.getenv("FAISS_PQ_M", 64)))
+        if self._index_type == "IVFPQ" and self._dim % self._pq_m:
+            raise ValueError(
+                f"faiss_pq_m ({self._pq_m}) must divide the embedding dimension ({self._dim})"
+            )
+        self._train_size = int(
+            kwargs.get(
+                "faiss_train_size",
+                os.getenv(
+                    "FAISS_TRAIN_SIZE",
+                    default_faiss_train_size(self._index_type, self._nlist),
+                ),
+            )
+        )
+        search_effort = kwargs.get(
+            "faiss_search_effort", os.getenv("FAISS_SEARCH_EFFORT")
+        )
+        self._search_effort = int(search_effort) if search_effort else None
+
+        # In-memory state:
+        # _index:            Faiss index, vectors are added with their int faiss_id
+        # _id_to_meta:       <int faiss_id> → metadata (including your original ID and __vector__)
+        # _custom_id_to_fid: <original ID> → <int faiss_id>
+        # _pending:          <int faiss_id> → vector, waiting for IVF training
+        # _stale_fids:       faiss_ids removed from metadata but still inside an HNSW graph
+        # _pending_ops:      changes since the last save, as change feed operations
+        self._reset_index()
+
+        # Other worker processes apply the changes of each save from this feed
+        # instead of reloading the whole index
+        self._change_feed = ChangeFeed(
+            f"{self._faiss_index_file}.changes",
+            float(
+                os.getenv(
+                    "CHANGE_FEED_COMPACTION_RATIO",
+                    DEFAULT_CHANGE_FEED_COMPACTION_RATIO,
+                )
+            ),
+        )
 
         self._load_faiss_index()
 
@@ -85,13 +191,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         async with self._storage_lock:
             # Check if storage was updated by another process
             if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
-                )
-                # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
-                self._load_faiss_index()
+                self._sync_index()
                 self.storage_updated.value = False
             return self._index
 
@@ -156,7 +256,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # 2. Remove them
         # 3. Add the new vectors
         existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
+        for meta in list_data:
             faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
             if faiss_internal_id is not None:
                 existing_ids_to_remove.append(faiss_internal_id)
@@ -164,17 +264,19 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if existing_ids_to_remove:
             await self._remove_faiss_ids(existing_ids_to_remove)
 
-        # Step 2: Add new vectors
-        index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
+        # Step 2: Add new vectors under fresh ids
+        await self._get_index()
+        fids = list(range(self._next_fid, self._next_fid + len(list_data)))
+        self._next_fid += len(list_data)
 
         # Step 3: Store metadata + vector for each new ID
-        for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+        for fid, meta, emb in zip(fids, list_data, embeddings):
+            # Store the raw vector so we can rebuild the index when needed
+            meta["__vector__"] = emb.tolist()
+            self._id_to_meta[fid] = meta
+            self._custom_id_to_fid[meta["__id__"]] = fid
+        self._add_vectors(fids, embeddings)
+        self._pending_ops.append(("upsert", [dict(meta) for meta in list_data]))
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -182,10 +284,16 @@ class FaissVectorDBStorage(BaseVectorStorage):
         return [m["__id__"] for m in list_data]
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        search_effort: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search by a textual query; returns top_k results with their metadata + similarity distance.
+
+        search_effort overrides the configured nprobe (IVF) or efSearch (HNSW) for this query.
         """
         if query_embedding is not None:
             embedding = np.array([query_embedding], dtype=np.float32)
@@ -200,22 +308,41 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         # Perform the similarity search
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
-
-        distances = distances[0]
-        indices = indices[0]
+        candidates: list[tuple[float, int]] = []
+        if index.ntotal > 0:
+            set_faiss_search_effort(
+                index,
+                search_effort if search_effort is not None else self._search_effort,
+            )
+            # Over-fetch so removed HNSW vectors do not reduce the result count
+            k = min(top_k + len(self._stale_fids), index.ntotal)
+            distances, indices = index.search(embedding, k)
+            candidates.extend(zip(distances[0].tolist(), indices[0].tolist()))
+        if self._pending:
+            # Vectors waiting for IVF training are searched exactly
+            pending_fids = list(self._pending)
+            order, scores = rank_by_cosine_similarity(
+                embedding[0],
+                [self._pending[fid] for fid in pending_fids],
+                top_k=top_k,
+                normalized=True,
+            )
+            candidates.extend(zip(scores.tolist(), [pending_fids[i] for i in order]))
+        candidates.sort(key=lambda item: item[0], reverse=True)
 
         results = []
-        for dist, idx in zip(distances, indices):
-            if idx == -1:
+        for dist, idx in candidates:
+            if idx == -1 or idx in self._stale_fids:
                 # Faiss returns -1 if no neighbor
                 continue
 
             # Cosine similarity threshold
             if dist < self.cosine_better_than_threshold:
-                continue
+                break
 
-            meta = self._id_to_meta.get(idx, {})
+            meta = self._id_to_meta.get(idx)
+            if not meta:
+                continue
             # Filter out __vector__ from query results to avoid returning large vector data
             filtered_meta = {k: v for k, v in meta.items() if k != "__vector__"}
             results.append(
@@ -226,6 +353,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     "created_at": meta.get("__created_at__"),
                 }
             )
+            if len(results) >= top_k:
+                break
 
         return results
 
@@ -297,44 +426,179 @@ class FaissVectorDBStorage(BaseVectorStorage):
     # Internal helper methods
     # --------------------------------------------------------------------------------
 
+    def _new_index(self):
+        """Create an empty index for the configured index type."""
+        return faiss.index_factory(
+            self._dim,
+            faiss_index_description(
+                self._index_type, self._nlist, self._hnsw_m, self._pq_m
+            ),
+            faiss.METRIC_INNER_PRODUCT,
+        )
+
+    def _index_matches_config(self, index) -> bool:
+        """Check whether a loaded index was built with the configured index type."""
+        if self._index_type in ("Flat", "HNSW"):
+            if not isinstance(index, faiss.IndexIDMap2):
+                return False
+            inner = faiss.downcast_index(index.index)
+            expected = (
+                faiss.IndexFlat if self._index_type == "Flat" else faiss.IndexHNSW
+            )
+            return isinstance(inner, expected)
+        expected = faiss.IndexIVFFlat if self._index_type == "IVF" else faiss.IndexIVFPQ
+        return isinstance(index, expected) and index.nlist == self._nlist
+
+    def _reset_index(self):
+        """Reset the index and all in-memory state to empty."""
+        self._index = self._new_index()
+        self._id_to_meta = {}
+        self._custom_id_to_fid = {}
+        self._pending = {}
+        self._stale_fids = set()
+        self._next_fid = 0
+        self._pending_ops = []
+
+    def _set_metadata(self, id_to_meta: dict[int, dict[str, Any]]):
+        self._id_to_meta = id_to_meta
+        self._custom_id_to_fid = {
+            meta.get("__id__"): fid for fid, meta in id_to_meta.items()
+        }
+        self._next_fid = max(id_to_meta, default=-1) + 1
+
+    def _add_vectors(self, fids: list[int], vectors: np.ndarray):
+        """Add normalized vectors, keeping them aside until an IVF index is trained."""
+        if self._index.is_trained:
+            self._index.add_with_ids(vectors, np.asarray(fids, dtype=np.int64))
+            return
+
+        for fid, vector in zip(fids, vectors):
+            self._pending[fid] = vector
+        if len(self._pending) >= self._train_size:
+            self._train_index()
+
+    def _train_index(self):
+        """Train the IVF index on the first collected vectors, then add all of them."""
+        fids = list(self._pending)
+        vectors = np.stack([self._pending[fid] for fid in fids]).astype(np.float32)
+        self._index.train(vectors[: self._train_size])
+        self._index.add_with_ids(vectors, np.asarray(fids, dtype=np.int64))
+        self._pending = {}
+        logger.info(
+            f"[{self.workspace}] Trained Faiss {self._index_type} index for {self.namespace} on {min(len(fids), self._train_size)} vectors"
+        )
+
+    def _rebuild_index(self, id_to_meta: dict[int, dict[str, Any]]):
+        """Rebuild the index from the vectors stored in metadata."""
+        self._reset_index()
+        self._set_metadata(id_to_meta)
+        if id_to_meta:
+            fids = list(id_to_meta)
+            vectors = np.array(
+                [id_to_meta[fid]["__vector__"] for fid in fids], dtype=np.float32
+            )
+            self._add_vectors(fids, vectors)
+
     def _find_faiss_id_by_custom_id(self, custom_id: str):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
         """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        return self._custom_id_to_fid.get(custom_id)
 
     async def _remove_faiss_ids(self, fid_list):
         """
         Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        Flat and IVF indexes remove the ids in place. HNSW graphs do not support
+        removal, so those ids are hidden from results until the next rebuild.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
-
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
-
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
+            removed_ids = self._remove_fids(fid_list)
+            if removed_ids:
+                self._pending_ops.append(("delete", removed_ids))
+
+    def _remove_fids(self, fid_list) -> list[str]:
+        """Remove internal Faiss IDs and return the custom IDs they belonged to."""
+        indexed_fids = []
+        removed_ids = []
+        for fid in fid_list:
+            meta = self._id_to_meta.pop(fid, None)
+            if meta is None:
+                continue
+            removed_ids.append(meta.get("__id__"))
+            self._custom_id_to_fid.pop(meta.get("__id__"), None)
+            if self._pending.pop(fid, None) is None:
+                indexed_fids.append(fid)
+
+        if indexed_fids:
+            if self._index_type == "HNSW":
+                self._stale_fids.update(indexed_fids)
+            else:
+                self._index.remove_ids(np.asarray(indexed_fids, dtype=np.int64))
+        return removed_ids
+
+    def _apply_ops(self, ops: list[tuple]):
+        """Apply change feed operations saved by another process."""
+        for kind, payload in ops:
+            if kind == "delete":
+                self._remove_fids(
+                    [
+                        self._custom_id_to_fid[cid]
+                        for cid in payload
+                        if cid in self._custom_id_to_fid
+                    ]
+                )
+            elif kind == "upsert":
+                self._remove_fids(
+                    [
+                        self._custom_id_to_fid[meta["__id__"]]
+                        for meta in payload
+                        if meta["__id__"] in self._custom_id_to_fid
+                    ]
+                )
+                fids = list(range(self._next_fid, self._next_fid + len(payload)))
+                self._next_fid += len(payload)
+                for fid, meta in zip(fids, payload):
+                    self._id_to_meta[fid] = meta
+                    self._custom_id_to_fid[meta["__id__"]] = fid
+                self._add_vectors(
+                    fids,
+                    np.array(
+                        [meta["__vector__"] for meta in payload], dtype=np.float32
+                    ),
+                )
 
-            self._id_to_meta = new_id_to_meta
+    def _sync_index(self):
+        """
+        Catch up with changes saved by another process.
+        Only the change feed frames saved since this process last synced are
+        applied, unless there are unsaved local changes or the feed no longer
+        reaches back far enough; then the index is reloaded in full.
+        """
+        ops = None if self._pending_ops else self._change_feed.read()
+        if ops is None:
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
+            )
+            self._load_faiss_index()
+        else:
+            logger.debug(
+                f"[{self.workspace}] Process {os.getpid()} FAISS applied {len(ops)} changes to {self.namespace} from another process"
+            )
+            self._apply_ops(ops)
 
     def _save_faiss_index(self):
         """
         Save the current Faiss index + metadata to disk so it can persist across runs.
         """
+        if (
+            self._stale_fids
+            and len(self._stale_fids) > self._index.ntotal * _HNSW_REBUILD_RATIO
+        ):
+            logger.info(
+                f"[{self.workspace}] Rebuilding Faiss HNSW index for {self.namespace} to drop {len(self._stale_fids)} removed vectors"
+            )
+            self._rebuild_index(self._id_to_meta)
+
         faiss.write_index(self._index, self._faiss_index_file)
 
         # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
@@ -352,6 +616,12 @@ class FaissVectorDBStorage(BaseVectorStorage):
         Load the Faiss index + metadata from disk if it exists,
         and rebuild in-memory structures so we can query.
         """
+        self._reset_index()
+        self._load_faiss_files()
+        # Changes saved to the feed after the index files were written
+        self._apply_ops(self._change_feed.loaded())
+
+    def _load_faiss_files(self):
         if not os.path.exists(self._faiss_index_file):
             logger.warning(
                 f"[{self.workspace}] No existing Faiss index file found for {self.namespace}"
@@ -360,27 +630,49 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         try:
             # Load the Faiss index
-            self._index = faiss.read_index(self._faiss_index_file)
+            index = faiss.read_index(self._faiss_index_file)
             # Load metadata
             with open(self._meta_file, "r", encoding="utf-8") as f:
                 stored_dict = json.load(f)
 
             # Convert string keys back to int
-            self._id_to_meta = {}
+            id_to_meta = {}
             for fid_str, meta in stored_dict.items():
                 fid = int(fid_str)
-                self._id_to_meta[fid] = meta
+                id_to_meta[fid] = meta
+
+            if self._index_matches_config(index):
+                self._index = index
+                self._set_metadata(id_to_meta)
+                if not index.is_trained:
+                    # Index saved before enough vectors arrived for training
+                    for fid, meta in id_to_meta.items():
+                        self._pending[fid] = np.asarray(
+                            meta["__vector__"], dtype=np.float32
+                        )
+                elif isinstance(index, faiss.IndexIDMap2):
+                    indexed_fids = set(faiss.vector_to_array(index.id_map).tolist())
+                    self._stale_fids = indexed_fids - set(id_to_meta)
+                    # Never reuse ids that are still present in the HNSW graph
+                    self._next_fid = max(
+                        self._next_fid, max(indexed_fids, default=-1) + 1
+                    )
+            else:
+                # Legacy IndexFlatIP file or a changed faiss_index_type
+                logger.info(
+                    f"[{self.workspace}] Rebuilding Faiss index for {self.namespace} as {self._index_type}"
+                )
+                self._rebuild_index(id_to_meta)
 
             logger.info(
-                f"[{self.workspace}] Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
+                f"[{self.workspace}] Faiss index loaded with {len(self._id_to_meta)} vectors from {self._faiss_index_file}"
             )
         except Exception as e:
             logger.error(
                 f"[{self.workspace}] Failed to load Faiss index or metadata: {e}"
             )
             logger.warning(f"[{self.workspace}] Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_to_meta = {}
+            self._reset_index()
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -390,17 +682,26 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
-                self._load_faiss_index()
+                self._sync_index()
                 self.storage_updated.value = False
                 return False  # Return error
 
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
-                # Save data to disk
+                # Publish the changes to other processes, then save data to disk
+                if self._pending_ops:
+                    self._change_feed.append(
+                        self._pending_ops,
+                        sum(
+                            os.path.getsize(f)
+                            for f in (self._faiss_index_file, self._meta_file)
+                            if os.path.exists(f)
+                        ),
+                    )
+                    self._pending_ops = []
                 self._save_faiss_index()
+                self._change_feed.mark_snapshot()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
@@ -516,17 +817,14 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
 
                 # Remove storage files if they exist
                 if os.path.exists(self._faiss_index_file):
                     os.remove(self._faiss_index_file)
                 if os.path.exists(self._meta_file):
                     os.remove(self._meta_file)
-
-                self._id_to_meta = {}
-                self._load_faiss_index()
+                self._change_feed.reset()
 
                 # Notify other processes
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
@@ -1,3 +1,4 @@
+from bisect import bisect_left, insort
 from dataclasses import dataclass
 import os
 from typing import Any, Union, final
@@ -8,7 +9,7 @@ from lightrag.base import (
     DocStatusStorage,
 )
 from lightrag.utils import (
-    load_json,
+    load_json_streaming,
     logger,
     write_json,
     get_pinyin_sort_key,
@@ -16,6 +17,7 @@ from lightrag.utils import (
 from lightrag.exceptions import StorageNotInitializedError
 from .shared_storage import (
     get_namespace_data,
+    get_namespace_store,
     get_namespace_lock,
     get_data_init_lock,
     get_update_flag,
@@ -24,6 +26,116 @@ from .shared_storage import (
     try_initialize_namespace,
 )
 
+# Recent index changes kept in shared memory so other processes can catch up
+# incrementally; anything older (or larger) forces a full index rebuild
+_MAX_INDEX_CHANGES = 64
+_MAX_INDEX_CHANGE_IDS = 1000
+
+
+class _DocStatusIndex:
+    """Process-local secondary indexes over the doc status records.
+
+    Keeps doc ids grouped by status, track_id and file_path, plus sorted
+    (sort_key, doc_id) views per (sort_field, status) that are created on first
+    use and maintained with bisect, so pages can be sliced without scanning or
+    sorting the whole corpus.
+    """
+
+    def __init__(self):
+        # doc_id -> (status, track_id, file_path, created_at, updated_at)
+        self.fields: dict[str, tuple] = {}
+        self.by_status: dict[str, set[str]] = {}
+        self.by_track_id: dict[str, set[str]] = {}
+        self.by_file_path: dict[str, dict[str, None]] = {}
+        self.views: dict[tuple[str, str | None], list[tuple[str, str]]] = {}
+        self._pinyin_keys: dict[str, str] = {}
+
+    def _sort_key(self, doc_id: str, sort_field: str) -> str:
+        _, _, file_path, created_at, updated_at = self.fields[doc_id]
+        if sort_field == "id":
+            return doc_id
+        if sort_field == "file_path":
+            # Use pinyin sorting for file_path field to support Chinese characters
+            path = file_path or "no-file-path"
+            key = self._pinyin_keys.get(path)
+            if key is None:
+                key = self._pinyin_keys[path] = get_pinyin_sort_key(path)
+            return key
+        value = created_at if sort_field == "created_at" else updated_at
+        return "" if value is None else str(value)
+
+    def add(self, doc_id: str, doc_data: dict[str, Any]) -> None:
+        if doc_id in self.fields:
+            self.remove(doc_id)
+        status = doc_data.get("status")
+        track_id = doc_data.get("track_id")
+        file_path = doc_data.get("file_path")
+        self.fields[doc_id] = (
+            status,
+            track_id,
+            file_path,
+            doc_data.get("created_at"),
+            doc_data.get("updated_at"),
+        )
+        self.by_status.setdefault(status, set()).add(doc_id)
+        if track_id is not None:
+            self.by_track_id.setdefault(track_id, set()).add(doc_id)
+        if file_path is not None:
+            self.by_file_path.setdefault(file_path, {})[doc_id] = None
+        for (sort_field, view_status), view in self.views.items():
+            if view_status is None or view_status == status:
+                insort(view, (self._sort_key(doc_id, sort_field), doc_id))
+
+    def remove(self, doc_id: str) -> None:
+        if doc_id not in self.fields:
+            return
+        status, track_id, file_path, _, _ = self.fields[doc_id]
+        for (sort_field, view_status), view in self.views.items():
+            if view_status is None or view_status == status:
+                entry = (self._sort_key(doc_id, sort_field), doc_id)
+                pos = bisect_left(view, entry)
+                if pos < len(view) and view[pos] == entry:
+                    del view[pos]
+        del self.fields[doc_id]
+        for index, key in (
+            (self.by_status, status),
+            (self.by_track_id, track_id),
+            (self.by_file_path, file_path),
+        ):
+            ids = index.get(key)
+            if ids is not None:
+                if isinstance(ids, set):
+                    ids.discard(doc_id)
+                else:
+                    ids.pop(doc_id, None)
+                if not ids:
+                    del index[key]
+
+    def view(self, sort_field: str, status: str | None) -> list[tuple[str, str]]:
+        view = self.views.get((sort_field, status))
+        if view is None:
+            doc_ids = self.fields if status is None else self.by_status.get(status, ())
+            view = sorted((self._sort_key(d, sort_field), d) for d in doc_ids)
+            self.views[(sort_field, status)] = view
+        return view
+
+    def page(
+        self,
+        sort_field: str,
+        status: str | None,
+        descending: bool,
+        offset: int,
+        limit: int,
+    ) -> tuple[list[str], int]:
+        view = self.view(sort_field, status)
+        total = len(view)
+        if descending:
+            stop = max(total - offset, 0)
+            entries = reversed(view[max(stop - limit, 0) : stop])
+        else:
+            entries = view[offset : offset + limit]
+        return [doc_id for _, doc_id in entries], total
+
 
 @final
 @dataclass
@@ -45,6 +157,9 @@ class JsonDocStatusStorage(DocStatusStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        self._index_state = None
+        self._index: _DocStatusIndex | None = None
+        self._index_version = -1
 
     async def initialize(self):
         """Initialize storage data"""
@@ -59,23 +174,117 @@ class JsonDocStatusStorage(DocStatusStorage):
             need_init = await try_initialize_namespace(
                 self.namespace, workspace=self.workspace
             )
-            self._data = await get_namespace_data(
+            self._data = await get_namespace_store(
                 self.namespace, workspace=self.workspace
             )
+            self._index_state = await get_namespace_data(
+                f"{self.namespace}_index_state", workspace=self.workspace
+            )
             if need_init:
-                loaded_data = load_json(self._file_name) or {}
                 async with self._storage_lock:
-                    self._data.update(loaded_data)
+                    # Stream records straight into shared memory
+                    data_count = (
+                        load_json_streaming(
+                            self._file_name,
+                            target=self._data,
+                            label=f"{self.workspace}/{self.namespace}",
+                        )
+                        or 0
+                    )
+                    self._record_index_change(None)
                     logger.info(
-                        f"[{self.workspace}] Process {os.getpid()} doc status load {self.namespace} with {len(loaded_data)} records"
+                        f"[{self.workspace}] Process {os.getpid()} doc status load {self.namespace} with {data_count} records"
                     )
 
+    def _record_index_change(self, doc_ids: list[str] | None) -> None:
+        """Publish changed doc ids to every process's index (caller holds the lock)
+
+        None means the data changed wholesale and indexes must be rebuilt.
+        """
+        version = self._index_state.get("version", 0) + 1
+        if doc_ids is None or len(doc_ids) > _MAX_INDEX_CHANGE_IDS:
+            changes = []
+        else:
+            changes = list(self._index_state.get("changes", []))
+            changes.append((version, list(doc_ids)))
+            changes = changes[-_MAX_INDEX_CHANGES:]
+        # Reassign instead of mutating so Manager dicts see the update
+        self._index_state["changes"] = changes
+        self._index_state["version"] = version
+
+    def _sync_index(self) -> _DocStatusIndex:
+        """Bring the process-local index up to date (caller holds the lock)"""
+        version = self._index_state.get("version", 0)
+        if self._index is not None and self._index_version == version:
+            return self._index
+
+        changes = [
+            ids
+            for change_version, ids in self._index_state.get("changes", [])
+            if change_version > self._index_version
+        ]
+        if self._index is not None and len(changes) == version - self._index_version:
+            for ids in changes:
+                for doc_id in ids:
+                    doc_data = self._data.get(doc_id)
+                    if doc_data is None:
+                        self._index.remove(doc_id)
+                    else:
+                        self._index.add(doc_id, doc_data)
+        else:
+            index = _DocStatusIndex()
+            for doc_id, doc_data in self._data.items():
+                index.add(doc_id, doc_data)
+            self._index = index
+            logger.debug(
+                f"[{self.workspace}] Process {os.getpid()} rebuilt doc status index for {self.namespace} with {len(index.fields)} records"
+            )
+        self._index_version = version
+        return self._index
+
+    def _to_doc_status(
+        self, doc_id: str, doc_data: dict[str, Any]
+    ) -> DocProcessingStatus | None:
+        try:
+            # Make a copy of the data to avoid modifying the original
+            data = doc_data.copy()
+            # Remove deprecated content field if it exists
+            data.pop("content", None)
+            # If file_path is not in data, use document id as file path
+            if "file_path" not in data:
+                data["file_path"] = "no-file-path"
+            # Ensure new fields exist with default values
+            if "metadata" not in data:
+                data["metadata"] = {}
+            if "error_msg" not in data:
+                data["error_msg"] = None
+            return DocProcessingStatus(**data)
+        except KeyError as e:
+            logger.error(
+                f"[{self.workspace}] Missing required field for document {doc_id}: {e}"
+            )
+            return None
+
+    def _to_doc_statuses(self, doc_ids) -> dict[str, DocProcessingStatus]:
+        result = {}
+        for doc_id in doc_ids:
+            doc_data = self._data.get(doc_id)
+            if doc_data is None:
+                continue
+            doc_status = self._to_doc_status(doc_id, doc_data)
+            if doc_status is not None:
+                result[doc_id] = doc_status
+        return result
+
     async def filter_keys(self, keys: set[str]) -> set[str]:
         """Return keys that should be processed (not in storage or not successfully processed)"""
         if self._storage_lock is None:
             raise StorageNotInitializedError("JsonDocStatusStorage")
         async with self._storage_lock:
-            return set(keys) - set(self._data.keys())
+            if hasattr(self._data, "_getvalue"):
+                # One round trip for all keys of a Manager dict
+                return set(keys) - set(self._data.keys())
+            return {key for key in keys if key not in self._data}
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         ordered_results: list[dict[str, Any] | None] = []
@@ -96,73 +305,31 @@ class JsonDocStatusStorage(DocStatusStorage):
         if self._storage_lock is None:
             raise StorageNotInitializedError("JsonDocStatusStorage")
         async with self._storage_lock:
-            for doc in self._data.values():
-                counts[doc["status"]] += 1
+            for status, doc_ids in self._sync_index().by_status.items():
+                counts[status] = counts.get(status, 0) + len(doc_ids)
         return counts
 
     async def get_docs_by_status(
         self, status: DocStatus
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
-        result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v["status"] == status.value:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(
-                            f"[{self.workspace}] Missing required field for document {k}: {e}"
-                        )
-                        continue
-        return result
+            doc_ids = self._sync_index().by_status.get(status.value, ())
+            return self._to_doc_statuses(list(doc_ids))
 
     async def get_docs_by_track_id(
         self, track_id: str
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific track_id"""
-        result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v.get("track_id") == track_id:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(
-                            f"[{self.workspace}] Missing required field for document {k}: {e}"
-                        )
-                        continue
-        return result
+            doc_ids = self._sync_index().by_track_id.get(track_id, ())
+            return self._to_doc_statuses(list(doc_ids))
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
             if self.storage_updated.value:
                 data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
+                    self._data if isinstance(self._data, dict) else self._data.copy()
                 )
                 logger.debug(
                     f"[{self.workspace}] Process {os.getpid()} doc status writting {len(data_dict)} records to {self.namespace}"
@@ -176,10 +343,11 @@ class JsonDocStatusStorage(DocStatusStorage):
                     logger.info(
                         f"[{self.workspace}] Reloading sanitized data into shared memory for {self.namespace}"
                     )
-                    cleaned_data = load_json(self._file_name)
+                    cleaned_data = load_json_streaming(self._file_name)
                     if cleaned_data is not None:
                         self._data.clear()
                         self._data.update(cleaned_data)
+                        self._record_index_change(None)
 
                 await clear_all_update_flags(self.namespace, workspace=self.workspace)
 
@@ -202,6 +370,7 @@ class JsonDocStatusStorage(DocStatusStorage):
                 if "chunks_list" not in doc_data:
                     doc_data["chunks_list"] = []
             self._data.update(data)
+            self._record_index_change(list(data))
             await set_all_update_flags(self.namespace, workspace=self.workspace)
 
         await self.index_done_callback()
@@ -258,66 +427,19 @@ class JsonDocStatusStorage(DocStatusStorage):
         if sort_direction.lower() not in ["asc", "desc"]:
             sort_direction = "desc"
 
-        # For JSON storage, we load all data and sort/filter in memory
-        all_docs = []
+        status_value = status_filter.value if status_filter is not None else None
+        descending = sort_direction.lower() == "desc"
 
         async with self._storage_lock:
-            for doc_id, doc_data in self._data.items():
-                # Apply status filter
-                if (
-                    status_filter is not None
-                    and doc_data.get("status") != status_filter.value
-                ):
-                    continue
-
-                try:
-                    # Prepare document data
-                    data = doc_data.copy()
-                    data.pop("content", None)
-                    if "file_path" not in data:
-                        data["file_path"] = "no-file-path"
-                    if "metadata" not in data:
-                        data["metadata"] = {}
-                    if "error_msg" not in data:
-                        data["error_msg"] = None
-
-                    doc_status = DocProcessingStatus(**data)
-
-                    # Add sort key for sorting
-                    if sort_field == "id":
-                        doc_status._sort_key = doc_id
-                    elif sort_field == "file_path":
-                        # Use pinyin sorting for file_path field to support Chinese characters
-                        file_path_value = getattr(doc_status, sort_field, "")
-                        doc_status._sort_key = get_pinyin_sort_key(file_path_value)
-                    else:
-                        doc_status._sort_key = getattr(doc_status, sort_field, "")
-
-                    all_docs.append((doc_id, doc_status))
-
-                except KeyError as e:
-                    logger.error(
-                        f"[{self.workspace}] Error processing document {doc_id}: {e}"
-                    )
-                    continue
-
-        # Sort documents
-        reverse_sort = sort_direction.lower() == "desc"
-        all_docs.sort(
-            key=lambda x: getattr(x[1], "_sort_key", ""), reverse=reverse_sort
-        )
-
-        # Remove sort key from documents
-        for doc_id, doc in all_docs:
-            if hasattr(doc, "_sort_key"):
-                delattr(doc, "_sort_key")
-
-        total_count = len(all_docs)
-
-        # Apply pagination
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_docs = all_docs[start_idx:end_idx]
+            # Slice the requested page from the maintained sorted view
+            doc_ids, total_count = self._sync_index().page(
+                sort_field,
+                status_value,
+                descending,
+                (page - 1) * page_size,
+                page_size,
+            )
+            paginated_docs = list(self._to_doc_statuses(doc_ids).items())
 
         return paginated_docs, total_count
 
@@ -349,13 +471,14 @@ class JsonDocStatusStorage(DocStatusStorage):
             None
         """
         async with self._storage_lock:
-            any_deleted = False
+            deleted_ids = []
             for doc_id in doc_ids:
                 result = self._data.pop(doc_id, None)
                 if result is not None:
-                    any_deleted = True
+                    deleted_ids.append(doc_id)
 
-            if any_deleted:
+            if deleted_ids:
+                self._record_index_change(deleted_ids)
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
     async def get_doc_by_file_path(self, file_path: str) -> Union[dict[str, Any], None]:
@@ -372,10 +495,10 @@ class JsonDocStatusStorage(DocStatusStorage):
             raise StorageNotInitializedError("JsonDocStatusStorage")
 
         async with self._storage_lock:
-            for doc_id, doc_data in self._data.items():
-                if doc_data.get("file_path") == file_path:
-                    # Return complete document data, consistent with get_by_ids method
-                    return doc_data
+            doc_ids = self._sync_index().by_file_path.get(file_path)
+            if doc_ids:
+                # Return complete document data, consistent with get_by_ids method
+                return self._data.get(next(iter(doc_ids)))
 
         return None
 
@@ -395,6 +518,7 @@ class JsonDocStatusStorage(DocStatusStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                self._record_index_change(None)
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
             await self.index_done_callback()
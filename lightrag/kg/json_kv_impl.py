@@ -1,4 +1,8 @@
+import asyncio
+import itertools
+import json
 import os
+from contextlib import nullcontext
 from dataclasses import dataclass
 from typing import Any, final
 
@@ -6,13 +10,21 @@ from lightrag.base import (
     BaseKVStorage,
 )
 from lightrag.utils import (
-    load_json,
+    SanitizingJSONEncoder,
+    iter_json_object_items,
+    load_json_streaming,
     logger,
     write_json,
 )
+from lightrag.constants import (
+    DEFAULT_JSON_LOAD_BATCH_SIZE,
+    DEFAULT_KV_LOG_COMPACTION_RATIO,
+)
 from lightrag.exceptions import StorageNotInitializedError
 from .shared_storage import (
+    SharedMemoryStore,
     get_namespace_data,
+    get_namespace_store,
     get_namespace_lock,
     get_data_init_lock,
     get_update_flag,
@@ -25,6 +37,27 @@ from .shared_storage import (
 @final
 @dataclass
 class JsonKVStorage(BaseKVStorage):
+    """
+    File-based KV storage persisted as a JSON snapshot plus an append-only log.
+
+    Files in the workspace directory:
+        kv_store_<namespace>.json          full snapshot (plain JSON import/export format)
+        kv_store_<namespace>.log.jsonl     upsert/delete entries written after the snapshot
+
+    index_done_callback only appends the keys changed since the last persist, so
+    its cost follows the size of the change instead of the size of the store. The
+    log is replayed on initialize, and folded into a new snapshot (written off the
+    event loop and atomically replaced) once it grows beyond KV_LOG_COMPACTION_RATIO
+    of the snapshot size, on drop and on finalize.
+
+    Files are parsed record by record. With JSON_KV_BACKGROUND_LOAD=true, cache
+    namespaces are filled in the background so the server starts serving at once;
+    keys not loaded yet read as cache misses, and persistence waits for the load.
+
+    With several workers the records live in a SharedMemoryStore, which reads
+    without taking the namespace lock.
+    """
+
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -37,9 +70,26 @@ class JsonKVStorage(BaseKVStorage):
 
         os.makedirs(workspace_dir, exist_ok=True)
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        self._log_file = os.path.join(
+            workspace_dir, f"kv_store_{self.namespace}.log.jsonl"
+        )
+        self._compaction_ratio = float(
+            os.getenv("KV_LOG_COMPACTION_RATIO", DEFAULT_KV_LOG_COMPACTION_RATIO)
+        )
+        self._background_load = (
+            self.namespace.endswith("_cache")
+            and os.getenv("JSON_KV_BACKGROUND_LOAD", "false").lower() == "true"
+        )
 
         self._data = None
+        # Keys changed since the last persist, shared by all processes
+        self._pending_keys = None
+        # {"loading": True} while a background load is filling shared memory
+        self._load_state = None
+        self._load_task = None
         self._storage_lock = None
+        # Lock held by reads, a no-op when the data store is safe to read concurrently
+        self._read_lock = None
         self.storage_updated = None
 
     async def initialize(self):
@@ -55,11 +105,40 @@ class JsonKVStorage(BaseKVStorage):
             need_init = await try_initialize_namespace(
                 self.namespace, workspace=self.workspace
             )
-            self._data = await get_namespace_data(
+            self._data = await get_namespace_store(
                 self.namespace, workspace=self.workspace
             )
+            self._pending_keys = await get_namespace_store(
+                f"{self.namespace}_pending_keys", workspace=self.workspace
+            )
+            self._read_lock = (
+                nullcontext()
+                if isinstance(self._data, SharedMemoryStore)
+                else self._storage_lock
+            )
+            self._load_state = await get_namespace_data(
+                f"{self.namespace}_load_state", workspace=self.workspace
+            )
             if need_init:
-                loaded_data = load_json(self._file_name) or {}
+                if self._background_load and self._snapshot_is_flattened():
+                    self._load_state["loading"] = True
+                    self._load_task = asyncio.create_task(self._load_in_background())
+                    logger.info(
+                        f"[{self.workspace}] Process {os.getpid()} KV loading {self.namespace} in background"
+                    )
+                    return
+
+                loaded_data = (
+                    load_json_streaming(
+                        self._file_name, label=f"{self.workspace}/{self.namespace}"
+                    )
+                    or {}
+                )
+                replayed = self._replay_log(loaded_data)
+                if replayed:
+                    logger.info(
+                        f"[{self.workspace}] Process {os.getpid()} KV replayed {replayed} log entries for {self.namespace}"
+                    )
                 async with self._storage_lock:
                     # Migrate legacy cache structure if needed
                     if self.namespace.endswith("_cache"):
@@ -67,44 +146,200 @@ class JsonKVStorage(BaseKVStorage):
                             loaded_data
                         )
 
-                    self._data.update(loaded_data)
+                    # Push to shared memory in batches to bound per-call copies
+                    items = iter(loaded_data.items())
+                    while batch := dict(
+                        itertools.islice(items, DEFAULT_JSON_LOAD_BATCH_SIZE)
+                    ):
+                        self._data.update(batch)
                     data_count = len(loaded_data)
 
                     logger.info(
                         f"[{self.workspace}] Process {os.getpid()} KV load {self.namespace} with {data_count} records"
                     )
 
+    def _snapshot_is_flattened(self) -> bool:
+        """Check that the snapshot needs no legacy cache migration (required for background load)"""
+        if not os.path.exists(self._file_name):
+            return True
+        first_key, _ = next(iter_json_object_items(self._file_name), (None, None))
+        return first_key is None or len(first_key.split(":")) == 3
+
+    async def _load_in_background(self) -> None:
+        """Stream snapshot records and log entries into shared memory.
+
+        Keys written by the application meanwhile (still pending persistence) are
+        newer than anything on disk and are left untouched.
+        """
+        deleted = object()
+        records = (
+            iter_json_object_items(self._file_name)
+            if os.path.exists(self._file_name)
+            else iter(())
+        )
+        log_records = (
+            (entry["key"], entry["value"] if entry["op"] == "upsert" else deleted)
+            for entry in self._iter_log_entries()
+        )
+        ops = itertools.chain(records, log_records)
+        loaded = 0
+        try:
+            while True:
+                batch = await asyncio.to_thread(
+                    lambda: dict(itertools.islice(ops, DEFAULT_JSON_LOAD_BATCH_SIZE))
+                )
+                if not batch:
+                    break
+                async with self._storage_lock:
+                    changed = set(self._pending_keys.keys())
+                    updates = {}
+                    for key, value in batch.items():
+                        if key in changed:
+                            continue
+                        if value is deleted:
+                            self._data.pop(key, None)
+                        else:
+                            updates[key] = value
+                    self._data.update(updates)
+                loaded += len(batch)
+        except Exception as e:
+            # Keep persistence disabled: compacting now would drop unloaded records
+            logger.error(
+                f"[{self.workspace}] Background load of {self.namespace} failed after {loaded} records, persistence disabled until restart: {e}"
+            )
+            return
+
+        self._load_state["loading"] = False
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} KV load {self.namespace} with {len(self._data)} records (background)"
+        )
+
     async def index_done_callback(self) -> None:
+        await self._persist()
+
+    async def _persist(self, force_compaction: bool = False) -> None:
+        """Append changed keys to the log, compacting into a new snapshot when due"""
         async with self._storage_lock:
-            if self.storage_updated.value:
-                data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
+            if not self.storage_updated.value and not (
+                force_compaction and os.path.exists(self._log_file)
+            ):
+                return
+            if self._load_state.get("loading"):
+                # Changes stay pending until the background load has finished
+                logger.debug(
+                    f"[{self.workspace}] Deferring persistence of {self.namespace} until loading completes"
                 )
+                return
 
-                # Calculate data count - all data is now flattened
-                data_count = len(data_dict)
+            pending_keys = list(self._pending_keys.keys())
+            if pending_keys:
+                logger.debug(
+                    f"[{self.workspace}] Process {os.getpid()} KV appending {len(pending_keys)} records to {self.namespace} log"
+                )
+                # Always log changes before compaction: if the process dies between
+                # replacing the snapshot and removing the log, replaying the log
+                # reproduces exactly the state stored in the snapshot.
+                self._append_log(pending_keys)
+                self._pending_keys.clear()
 
+            if force_compaction or self._needs_compaction():
+                data_dict = (
+                    self._data if isinstance(self._data, dict) else self._data.copy()
+                )
                 logger.debug(
-                    f"[{self.workspace}] Process {os.getpid()} KV writting {data_count} records to {self.namespace}"
+                    f"[{self.workspace}] Process {os.getpid()} KV writting {len(data_dict)} records to {self.namespace}"
                 )
 
-                # Write JSON and check if sanitization was applied
-                needs_reload = write_json(data_dict, self._file_name)
+                # Write JSON snapshot in a worker thread and check if sanitization was applied
+                needs_reload = await asyncio.to_thread(self._write_snapshot, data_dict)
 
                 # If data was sanitized, reload cleaned data to update shared memory
                 if needs_reload:
                     logger.info(
                         f"[{self.workspace}] Reloading sanitized data into shared memory for {self.namespace}"
                     )
-                    cleaned_data = load_json(self._file_name)
+                    cleaned_data = load_json_streaming(self._file_name)
                     if cleaned_data is not None:
                         self._data.clear()
                         self._data.update(cleaned_data)
 
-                await clear_all_update_flags(self.namespace, workspace=self.workspace)
+            await clear_all_update_flags(self.namespace, workspace=self.workspace)
+
+    def _needs_compaction(self) -> bool:
+        if not os.path.exists(self._file_name):
+            return True
+        if not os.path.exists(self._log_file):
+            return False
+        log_size = os.path.getsize(self._log_file)
+        return log_size > os.path.getsize(self._file_name) * self._compaction_ratio
+
+    def _append_log(self, keys: list[str]) -> None:
+        """Append the current state of keys to the log (upsert, or delete if absent)"""
+        lines = []
+        for key in keys:
+            value = self._data.get(key)
+            if value is None:
+                entry = {"op": "delete", "key": key}
+            else:
+                entry = {"op": "upsert", "key": key, "value": value}
+            line = json.dumps(entry, ensure_ascii=False)
+            try:
+                line.encode("utf-8")
+            except UnicodeEncodeError:
+                # Sanitize like write_json and keep shared memory in sync with the log
+                line = json.dumps(entry, ensure_ascii=False, cls=SanitizingJSONEncoder)
+                if value is not None:
+                    cleaned = json.loads(line)
+                    self._data.pop(key, None)
+                    self._data[cleaned["key"]] = cleaned["value"]
+            lines.append(line + "\n")
+
+        with open(self._log_file, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _iter_log_entries(self):
+        """Yield log entries in order, stopping at a torn final write"""
+        if not os.path.exists(self._log_file):
+            return
+        with open(self._log_file, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn write can only affect the tail of the log
+                    logger.warning(
+                        f"[{self.workspace}] Ignoring incomplete log entry at line {line_no} of {self._log_file}"
+                    )
+                    return
+                if entry.get("op") in ("upsert", "delete"):
+                    yield entry
+
+    def _replay_log(self, data: dict[str, Any]) -> int:
+        """Apply log entries on top of snapshot data, returns the number applied"""
+        applied = 0
+        for entry in self._iter_log_entries():
+            if entry["op"] == "upsert":
+                data[entry["key"]] = entry["value"]
+            else:
+                data.pop(entry["key"], None)
+            applied += 1
+        return applied
+
+    def _write_snapshot(self, data_dict: dict[str, Any]) -> bool:
+        """Atomically replace the JSON snapshot and drop the folded-in log"""
+        tmp_file = f"{self._file_name}.tmp"
+        needs_reload = write_json(data_dict, tmp_file)
+        os.replace(tmp_file, self._file_name)
+        if os.path.exists(self._log_file):
+            os.remove(self._log_file)
+        return needs_reload
 
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
-        async with self._storage_lock:
+        async with self._read_lock:
             result = self._data.get(id)
             if result:
                 # Create a copy to avoid modifying the original data
@@ -117,7 +352,7 @@ class JsonKVStorage(BaseKVStorage):
             return result
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
-        async with self._storage_lock:
+        async with self._read_lock:
             results = []
             for id in ids:
                 data = self._data.get(id, None)
@@ -135,8 +370,11 @@ class JsonKVStorage(BaseKVStorage):
             return results
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
-        async with self._storage_lock:
-            return set(keys) - set(self._data.keys())
+        async with self._read_lock:
+            if hasattr(self._data, "_getvalue"):
+                # One round trip for all keys of a Manager dict
+                return set(keys) - set(self._data.keys())
+            return {key for key in keys if key not in self._data}
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
@@ -174,6 +412,7 @@ class JsonKVStorage(BaseKVStorage):
                 v["_id"] = k
 
             self._data.update(data)
+            self._pending_keys.update(dict.fromkeys(data, True))
             await set_all_update_flags(self.namespace, workspace=self.workspace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -190,10 +429,14 @@ class JsonKVStorage(BaseKVStorage):
             None
         """
         async with self._storage_lock:
+            # While a background load runs, keys not loaded yet must be recorded
+            # too, so the load does not bring them back
+            loading = bool(self._load_state and self._load_state.get("loading"))
             any_deleted = False
             for doc_id in ids:
                 result = self._data.pop(doc_id, None)
-                if result is not None:
+                if result is not None or loading:
+                    self._pending_keys[doc_id] = True
                     any_deleted = True
 
             if any_deleted:
@@ -215,7 +458,7 @@ class JsonKVStorage(BaseKVStorage):
         This method will:
         1. Clear all data from memory
         2. Update flags to notify other processes
-        3. Trigger index_done_callback to save the empty state
+        3. Write the empty snapshot and remove the log
 
         Returns:
             dict[str, str]: Operation status and message
@@ -223,11 +466,18 @@ class JsonKVStorage(BaseKVStorage):
             - On failure: {"status": "error", "message": "<error details>"}
         """
         try:
+            if self._load_task is not None and not self._load_task.done():
+                # Nothing left to load once the data is dropped
+                self._load_task.cancel()
+                await asyncio.gather(self._load_task, return_exceptions=True)
+                self._load_state["loading"] = False
+
             async with self._storage_lock:
                 self._data.clear()
+                self._pending_keys.clear()
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
-            await self.index_done_callback()
+            await self._persist(force_compaction=True)
             logger.info(
                 f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
             )
@@ -282,13 +532,16 @@ class JsonKVStorage(BaseKVStorage):
             )
             # Persist migrated data immediately and check if sanitization was applied
             needs_reload = write_json(migrated_data, self._file_name)
+            # The snapshot now includes any replayed log entries
+            if os.path.exists(self._log_file):
+                os.remove(self._log_file)
 
             # If data was sanitized during write, reload cleaned data
             if needs_reload:
                 logger.info(
                     f"[{self.workspace}] Reloading sanitized migration data for {self.namespace}"
                 )
-                cleaned_data = load_json(self._file_name)
+                cleaned_data = load_json_streaming(self._file_name)
                 if cleaned_data is not None:
                     return cleaned_data  # Return cleaned data to update shared memory
 
@@ -296,7 +549,9 @@ class JsonKVStorage(BaseKVStorage):
 
     async def finalize(self):
         """Finalize storage resources
-        Persistence cache data to disk before exiting
+        Persistence cache data to disk before exiting, folding any log into the JSON snapshot
         """
-        if self.namespace.endswith("_cache"):
-            await self.index_done_callback()
+        if self._load_task is not None:
+            await self._load_task
+        if self.namespace.endswith("_cache") or os.path.exists(self._log_file):
+            await self._persist(force_compaction=True)
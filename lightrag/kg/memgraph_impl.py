@@ -664,6 +664,125 @@ class MemgraphStorage(BaseGraphStorage):
                 )
                 raise
 
+    async def _execute_write_with_retry(self, execute, operation: str) -> None:
+        """Run a write transaction, retrying transient conflicts with backoff
+        like upsert_node and upsert_edge do"""
+        max_retries = 100
+        initial_wait_time = 0.2
+        backoff_factor = 1.1
+        jitter_factor = 0.1
+
+        for attempt in range(max_retries):
+            try:
+                async with self._driver.session(database=self._DATABASE) as session:
+                    await session.execute_write(execute)
+                    return
+            except (TransientError, ResultFailedError) as e:
+                root_cause = e
+                while hasattr(root_cause, "__cause__") and root_cause.__cause__:
+                    root_cause = root_cause.__cause__
+                is_transient = (
+                    isinstance(root_cause, TransientError)
+                    or isinstance(e, TransientError)
+                    or "TransientError" in str(e)
+                    or "Cannot resolve conflicting transactions" in str(e)
+                )
+                if not is_transient or attempt == max_retries - 1:
+                    logger.error(
+                        f"[{self.workspace}] Error during {operation} after {attempt + 1} attempts: {str(e)}"
+                    )
+                    raise
+                jitter = random.uniform(0, jitter_factor) * initial_wait_time
+                wait_time = initial_wait_time * (backoff_factor**attempt) + jitter
+                logger.warning(
+                    f"[{self.workspace}] {operation} failed. Attempt #{attempt + 1} retrying in {wait_time:.3f} seconds... Error: {str(e)}"
+                )
+                await asyncio.sleep(wait_time)
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Unexpected error during {operation}: {str(e)}"
+                )
+                raise
+
+    async def upsert_nodes_batch(
+        self, nodes: list[tuple[str, dict[str, str]]], batch_size: int = 1000
+    ) -> None:
+        """
+        Upsert multiple nodes using UNWIND, one query per entity type since
+        the type label cannot be parameterized.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+            batch_size: Maximum number of nodes per query
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        if not nodes:
+            return
+        nodes_by_type: dict[str, list[dict]] = {}
+        for node_id, properties in nodes:
+            if "entity_id" not in properties:
+                raise ValueError(
+                    "Memgraph: node properties must contain an 'entity_id' field"
+                )
+            nodes_by_type.setdefault(properties["entity_type"], []).append(
+                {"entity_id": node_id, "properties": properties}
+            )
+
+        async def execute_upsert(tx: AsyncManagedTransaction):
+            workspace_label = self._get_workspace_label()
+            for entity_type, rows in nodes_by_type.items():
+                query = f"""
+                UNWIND $rows AS row
+                MERGE (n:`{workspace_label}` {{entity_id: row.entity_id}})
+                SET n += row.properties
+                SET n:`{entity_type}`
+                """
+                for i in range(0, len(rows), batch_size):
+                    result = await tx.run(query, rows=rows[i : i + batch_size])
+                    await result.consume()  # Ensure result is fully consumed
+
+        await self._execute_write_with_retry(execute_upsert, "batch node upsert")
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]], batch_size: int = 1000
+    ) -> None:
+        """
+        Upsert multiple edges using UNWIND. Edges whose endpoints do not
+        exist are skipped, as with upsert_edge.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+            batch_size: Maximum number of edges per query
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        if not edges:
+            return
+        rows = [
+            {"source": source, "target": target, "properties": properties}
+            for source, target, properties in edges
+        ]
+
+        async def execute_upsert(tx: AsyncManagedTransaction):
+            workspace_label = self._get_workspace_label()
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (source:`{workspace_label}` {{entity_id: row.source}})
+            MATCH (target:`{workspace_label}` {{entity_id: row.target}})
+            MERGE (source)-[r:DIRECTED]-(target)
+            SET r += row.properties
+            """
+            for i in range(0, len(rows), batch_size):
+                result = await tx.run(query, rows=rows[i : i + batch_size])
+                await result.consume()  # Ensure result is consumed
+
+        await self._execute_write_with_retry(execute_upsert, "batch edge upsert")
+
     async def delete_node(self, node_id: str) -> None:
         """Delete a node with the specified label
 
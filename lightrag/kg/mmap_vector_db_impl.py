@@ -0,0 +1,673 @@
+import asyncio
+import glob
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, final
+
+import numpy as np
+
+from lightrag.utils import logger, compute_mdhash_id
+from lightrag.base import BaseVectorStorage
+
+from .shared_storage import (
+    get_namespace_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+
+# Rows scored per matmul block, bounds the temporary memory used by a query
+_QUERY_BLOCK_ROWS = 65536
+
+
+@final
+@dataclass
+class MmapVectorDBStorage(BaseVectorStorage):
+    """
+    File-based vector storage keeping vectors in a contiguous binary file opened with np.memmap.
+
+    Files in the workspace directory (<epoch> increases on every compaction):
+        mvdb_<namespace>.meta.json            snapshot: dim, dtype, epoch and one metadata record per row
+        mvdb_<namespace>.<epoch>.vec          normalized vector rows (raw float32 or float16)
+        mvdb_<namespace>.<epoch>.log.jsonl    append-only upsert/delete log written after the snapshot
+
+    Vectors are appended to the .vec file on index_done_callback and mapped read-only,
+    so (re)loading only parses metadata and all worker processes share the same page
+    cache. Workers notified of an update apply just the new log tail instead of
+    reloading everything. Compaction rewrites the vector file without deleted rows
+    once they exceed `mmap_compaction_ratio` of all rows.
+
+    Supported vector_db_storage_cls_kwargs:
+        mmap_vector_dtype: "float32" (default) or "float16"
+        mmap_compaction_ratio: Fraction of dead rows that triggers compaction (default 0.3)
+    """
+
+    def __post_init__(self):
+        # Initialize basic attributes
+        self._storage_lock = None
+        self.storage_updated = None
+
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+
+        dtype = kwargs.get("mmap_vector_dtype", "float32")
+        if dtype not in ("float32", "float16"):
+            raise ValueError(
+                f"mmap_vector_dtype must be 'float32' or 'float16', got {dtype}"
+            )
+        self._dtype = np.dtype(dtype)
+        self._compaction_ratio = float(kwargs.get("mmap_compaction_ratio", 0.3))
+
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+        else:
+            # Default behavior when workspace is empty
+            workspace_dir = working_dir
+            self.workspace = ""
+
+        os.makedirs(workspace_dir, exist_ok=True)
+        self._file_prefix = os.path.join(workspace_dir, f"mvdb_{self.namespace}")
+        self._meta_file = f"{self._file_prefix}.meta.json"
+
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        self._load()
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(
+            self.namespace, workspace=self.workspace
+        )
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_namespace_lock(
+            self.namespace, workspace=self.workspace
+        )
+
+    # --------------------------------------------------------------------------------
+    # File layout helpers
+    # --------------------------------------------------------------------------------
+
+    def _vector_file(self, epoch: int) -> str:
+        return f"{self._file_prefix}.{epoch}.vec"
+
+    def _log_file(self, epoch: int) -> str:
+        return f"{self._file_prefix}.{epoch}.log.jsonl"
+
+    def _snapshot_signature(self) -> tuple[int, int, int] | None:
+        try:
+            stat = os.stat(self._meta_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    # --------------------------------------------------------------------------------
+    # In-memory state
+    # --------------------------------------------------------------------------------
+
+    def _reset_state(self):
+        self._epoch = 0
+        self._snapshot_sig = None
+        self._log_offset = 0
+        self._log_entries = 0
+        # Row metadata (None for deleted rows) and id -> row index
+        self._records: list[dict[str, Any] | None] = []
+        self._id_to_row: dict[str, int] = {}
+        self._alive = np.zeros(1024, dtype=bool)
+        self._dead_rows = 0
+        # Rows [0, _persisted_rows) live in the memory-mapped file
+        self._vectors: np.memmap | None = None
+        self._persisted_rows = 0
+        # Rows appended since the last persist, kept normalized in float32
+        self._tail = np.zeros((0, self._dim), dtype=np.float32)
+        self._tail_len = 0
+        self._pending_ops: list[dict[str, Any]] = []
+
+    def _vector_bytes(self, rows: int) -> int:
+        return rows * self._dim * self._dtype.itemsize
+
+    def _open_vectors(self):
+        """Map the persisted vector rows of the current epoch (read-only, zero-copy)"""
+        self._vectors = None
+        if self._persisted_rows > 0:
+            self._vectors = np.memmap(
+                self._vector_file(self._epoch),
+                dtype=self._dtype,
+                mode="r",
+                shape=(self._persisted_rows, self._dim),
+            )
+
+    def _append_row(self, record: dict[str, Any]) -> int:
+        row = len(self._records)
+        old_row = self._id_to_row.get(record["__id__"])
+        if old_row is not None:
+            self._mark_dead(old_row)
+        if row >= len(self._alive):
+            self._alive = np.concatenate([self._alive, np.zeros_like(self._alive)])
+        self._records.append(record)
+        self._alive[row] = True
+        self._id_to_row[record["__id__"]] = row
+        return row
+
+    def _mark_dead(self, row: int):
+        record = self._records[row]
+        if record is None:
+            return
+        self._id_to_row.pop(record["__id__"], None)
+        self._records[row] = None
+        self._alive[row] = False
+        self._dead_rows += 1
+
+    def _apply_op(self, op: dict[str, Any]):
+        if op["op"] == "add":
+            self._append_row(op["record"])
+        elif op["op"] == "del":
+            for id in op["ids"]:
+                row = self._id_to_row.get(id)
+                if row is not None:
+                    self._mark_dead(row)
+
+    def _read_log_tail(self) -> int:
+        """Apply complete log lines written after the current offset, return count"""
+        log_file = self._log_file(self._epoch)
+        if not os.path.exists(log_file):
+            return 0
+        applied = 0
+        with open(log_file, "rb") as f:
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Incomplete trailing line, writer not finished
+                self._log_offset += len(line)
+                if line.strip():
+                    self._apply_op(json.loads(line))
+                    applied += 1
+        self._log_entries += applied
+        return applied
+
+    def _load(self):
+        """Load snapshot metadata, replay the log and map the vector file"""
+        self._reset_state()
+        if not os.path.exists(self._meta_file):
+            return
+
+        try:
+            with open(self._meta_file, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot["dim"] != self._dim:
+                raise ValueError(
+                    f"dimension mismatch: file {snapshot['dim']}, embedding {self._dim}"
+                )
+            self._dtype = np.dtype(snapshot["dtype"])
+            self._epoch = snapshot["epoch"]
+            self._snapshot_sig = self._snapshot_signature()
+            for record in snapshot["records"]:
+                self._append_row(record)
+            self._read_log_tail()
+            # Rows past the log-referenced count (a writer still between its vector
+            # write and log append, or one that stopped there) are never mapped
+            self._persisted_rows = len(self._records)
+            self._open_vectors()
+            logger.info(
+                f"[{self.workspace}] Loaded {len(self._id_to_row)} vectors for {self.namespace} (epoch {self._epoch})"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Failed to load vector storage {self.namespace}: {e}"
+            )
+            logger.warning(
+                f"[{self.workspace}] Starting with an empty vector storage for {self.namespace}"
+            )
+            self._reset_state()
+
+    def _refresh(self):
+        """Bring in-memory state up to date with changes persisted by another process"""
+        if (
+            self._pending_ops
+            or self._snapshot_sig is None
+            or self._snapshot_signature() != self._snapshot_sig
+        ):
+            # Compacted, dropped or locally modified: full reload
+            self._load()
+            return
+        if self._read_log_tail():
+            self._persisted_rows = len(self._records)
+            self._open_vectors()
+
+    async def _get_store(self):
+        """Check if the storage should be reloaded"""
+        # Acquire lock to prevent concurrent read and write
+        async with self._storage_lock:
+            if self.storage_updated.value:
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} refreshing {self.namespace} due to update by another process"
+                )
+                self._refresh()
+                self.storage_updated.value = False
+        return self
+
+    def _row_vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Return float32 vectors for the given row indices"""
+        result = np.empty((len(rows), self._dim), dtype=np.float32)
+        persisted = rows < self._persisted_rows
+        if persisted.any():
+            result[persisted] = self._vectors[rows[persisted]]
+        if (~persisted).any():
+            result[~persisted] = self._tail[rows[~persisted] - self._persisted_rows]
+        return result
+
+    # --------------------------------------------------------------------------------
+    # Persistence
+    # --------------------------------------------------------------------------------
+
+    def _should_compact(self) -> bool:
+        if self._snapshot_sig is None:
+            return True
+        total_rows = len(self._records)
+        return total_rows > 0 and self._dead_rows > self._compaction_ratio * total_rows
+
+    def _persist(self):
+        """Append pending rows and log entries to disk, compacting when needed"""
+        if not self._pending_ops:
+            return
+        if self._should_compact():
+            self._compact()
+            return
+
+        # Write at the end of the referenced rows rather than the end of the file
+        # (under the storage lock): rows left behind by a writer that stopped
+        # before its log append are overwritten and cut off, so row indices stay
+        # aligned with the log
+        vector_file = self._vector_file(self._epoch)
+        mode = "r+b" if os.path.exists(vector_file) else "wb"
+        with open(vector_file, mode) as f:
+            f.seek(self._vector_bytes(self._persisted_rows))
+            f.write(self._tail[: self._tail_len].astype(self._dtype).tobytes())
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        with open(self._log_file(self._epoch), "ab") as f:
+            for op in self._pending_ops:
+                f.write(json.dumps(op, ensure_ascii=False).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            self._log_offset = f.tell()
+        self._log_entries += len(self._pending_ops)
+
+        self._pending_ops = []
+        self._persisted_rows = len(self._records)
+        self._tail_len = 0
+        self._open_vectors()
+
+    def _compact(self):
+        """Rewrite live rows into a new epoch and atomically switch the snapshot to it"""
+        old_epoch = self._epoch
+        new_epoch = old_epoch + 1
+        alive_rows = np.flatnonzero(self._alive[: len(self._records)])
+
+        with open(self._vector_file(new_epoch), "wb") as f:
+            for start in range(0, len(alive_rows), _QUERY_BLOCK_ROWS):
+                block = self._row_vectors(alive_rows[start : start + _QUERY_BLOCK_ROWS])
+                f.write(block.astype(self._dtype).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        open(self._log_file(new_epoch), "wb").close()
+
+        records = [self._records[row] for row in alive_rows]
+        snapshot = {
+            "dim": self._dim,
+            "dtype": self._dtype.name,
+            "epoch": new_epoch,
+            "records": records,
+        }
+        tmp_file = f"{self._meta_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        # Commit point: readers switch to the new epoch from here on
+        os.replace(tmp_file, self._meta_file)
+
+        # Old files stay readable for processes that still have them mapped (POSIX)
+        for old_file in (self._vector_file(old_epoch), self._log_file(old_epoch)):
+            try:
+                if os.path.exists(old_file):
+                    os.remove(old_file)
+            except OSError as e:
+                logger.debug(f"[{self.workspace}] Could not remove {old_file}: {e}")
+
+        dtype = self._dtype
+        self._reset_state()
+        self._dtype = dtype
+        self._epoch = new_epoch
+        self._snapshot_sig = self._snapshot_signature()
+        for record in records:
+            self._append_row(record)
+        self._persisted_rows = len(records)
+        self._open_vectors()
+        logger.info(
+            f"[{self.workspace}] Compacted {self.namespace} to {len(records)} vectors (epoch {new_epoch})"
+        )
+
+    # --------------------------------------------------------------------------------
+    # BaseVectorStorage interface
+    # --------------------------------------------------------------------------------
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        if not data:
+            return
+
+        current_time = int(time.time())
+        list_data = [
+            {
+                "__id__": k,
+                "__created_at__": current_time,
+                **{k1: v1 for k1, v1 in v.items() if k1 in self.meta_fields},
+            }
+            for k, v in data.items()
+        ]
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+        embeddings = np.concatenate(embeddings_list).astype(np.float32)
+        if len(embeddings) != len(list_data):
+            # sometimes the embedding is not returned correctly. just log it.
+            logger.error(
+                f"[{self.workspace}] embedding is not 1-1 with data, {len(embeddings)} != {len(list_data)}"
+            )
+            return
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        embeddings /= norms
+
+        await self._get_store()
+        needed = self._tail_len + len(list_data)
+        if needed > len(self._tail):
+            grown = np.zeros((max(needed, 2 * len(self._tail)), self._dim), np.float32)
+            grown[: self._tail_len] = self._tail[: self._tail_len]
+            self._tail = grown
+        self._tail[self._tail_len : needed] = embeddings
+        self._tail_len = needed
+
+        for record in list_data:
+            self._append_row(record)
+            self._pending_ops.append({"op": "add", "record": record})
+
+    async def query(
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        search_effort: int | None = None,
+    ) -> list[dict[str, Any]]:
+        # Use provided embedding or compute it
+        if query_embedding is not None:
+            embedding = np.asarray(query_embedding, dtype=np.float32)
+        else:
+            # Execute embedding outside of lock to avoid improve cocurrent
+            embedding = await self.embedding_func(
+                [query], _priority=5
+            )  # higher priority for query
+            embedding = np.asarray(embedding[0], dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding = embedding / norm
+
+        await self._get_store()
+        total_rows = len(self._records)
+        if total_rows == 0 or top_k <= 0:
+            return []
+
+        scores = np.empty(total_rows, dtype=np.float32)
+        for start in range(0, self._persisted_rows, _QUERY_BLOCK_ROWS):
+            end = min(start + _QUERY_BLOCK_ROWS, self._persisted_rows)
+            block = self._vectors[start:end]
+            if block.dtype != np.float32:
+                block = block.astype(np.float32)
+            scores[start:end] = block @ embedding
+        if self._tail_len:
+            scores[self._persisted_rows :] = self._tail[: self._tail_len] @ embedding
+        scores[~self._alive[:total_rows]] = -np.inf
+
+        k = min(top_k, total_rows)
+        top_rows = np.argpartition(-scores, k - 1)[:k]
+        top_rows = top_rows[np.argsort(-scores[top_rows])]
+
+        results = []
+        for row in top_rows:
+            score = float(scores[row])
+            if score < self.cosine_better_than_threshold:
+                break
+            record = self._records[row]
+            results.append(
+                {
+                    **record,
+                    "id": record["__id__"],
+                    "distance": score,
+                    "created_at": record.get("__created_at__"),
+                }
+            )
+        return results
+
+    @property
+    async def client_storage(self):
+        await self._get_store()
+        return {"data": [record for record in self._records if record is not None]}
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        await self._get_store()
+        existing = [id for id in ids if id in self._id_to_row]
+        if existing:
+            op = {"op": "del", "ids": existing}
+            self._apply_op(op)
+            self._pending_ops.append(op)
+        logger.debug(
+            f"[{self.workspace}] Successfully deleted {len(existing)} vectors from {self.namespace}"
+        )
+
+    async def delete_entity(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+        logger.debug(
+            f"[{self.workspace}] Attempting to delete entity {entity_name} with ID {entity_id}"
+        )
+        await self.delete([entity_id])
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        await self._get_store()
+        ids_to_delete = [
+            record["__id__"]
+            for record in self._records
+            if record is not None
+            and (
+                record.get("src_id") == entity_name
+                or record.get("tgt_id") == entity_name
+            )
+        ]
+        logger.debug(
+            f"[{self.workspace}] Found {len(ids_to_delete)} relations for entity {entity_name}"
+        )
+        if ids_to_delete:
+            await self.delete(ids_to_delete)
+
+    async def index_done_callback(self) -> bool:
+        """Save data to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
+                )
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+                return False  # Return error
+
+        # Acquire lock and perform persistence
+        async with self._storage_lock:
+            try:
+                if not self._pending_ops:
+                    return True
+                self._persist()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace, workspace=self.workspace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error saving data for {self.namespace}: {e}"
+                )
+                return False  # Return error
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        await self._get_store()
+        row = self._id_to_row.get(id)
+        if row is None:
+            return None
+        record = self._records[row]
+        return {
+            **record,
+            "id": record["__id__"],
+            "created_at": record.get("__created_at__"),
+        }
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        if not ids:
+            return []
+
+        await self._get_store()
+        results: list[dict[str, Any] | None] = []
+        for id in ids:
+            row = self._id_to_row.get(id)
+            if row is None:
+                results.append(None)
+                continue
+            record = self._records[row]
+            results.append(
+                {
+                    **record,
+                    "id": record["__id__"],
+                    "created_at": record.get("__created_at__"),
+                }
+            )
+        return results
+
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        """Get vectors by their IDs, returning only ID and vector data for efficiency
+
+        Vectors are returned L2-normalized, as stored.
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Dictionary mapping IDs to their vector embeddings
+            Format: {id: [vector_values], ...}
+        """
+        if not ids:
+            return {}
+
+        await self._get_store()
+        found = [(id, self._id_to_row[id]) for id in ids if id in self._id_to_row]
+        if not found:
+            return {}
+        vectors = self._row_vectors(np.array([row for _, row in found]))
+        return {id: vectors[i].tolist() for i, (id, _) in enumerate(found)}
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        This method will:
+        1. Remove the snapshot, vector and log files if they exist
+        2. Reset the in-memory state
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                self._vectors = None
+                for file_name in [self._meta_file] + glob.glob(
+                    f"{glob.escape(self._file_prefix)}.*"
+                ):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
+                self._reset_state()
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace, workspace=self.workspace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}(files:{self._file_prefix}.*)"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
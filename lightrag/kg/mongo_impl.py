@@ -1085,6 +1085,71 @@ class MongoGraphStorage(BaseGraphStorage):
             upsert=True,
         )
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Insert or update multiple node documents with one bulk write.
+        """
+        if not nodes:
+            return
+        operations = []
+        for node_id, node_data in nodes:
+            update_doc = {"$set": {**node_data}}
+            if node_data.get("source_id", ""):
+                update_doc["$set"]["source_ids"] = node_data["source_id"].split(
+                    GRAPH_FIELD_SEP
+                )
+            operations.append(UpdateOne({"_id": node_id}, update_doc, upsert=True))
+        await self.collection.bulk_write(operations, ordered=False)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges with one bulk write per collection, matching
+        existing edges in either direction like upsert_edge.
+        """
+        if not edges:
+            return
+        # Ensure source nodes exist
+        source_node_ids = dict.fromkeys(source for source, _, _ in edges)
+        await self.collection.bulk_write(
+            [
+                UpdateOne({"_id": node_id}, {"$set": {}}, upsert=True)
+                for node_id in source_node_ids
+            ],
+            ordered=False,
+        )
+
+        operations = []
+        for source_node_id, target_node_id, edge_data in edges:
+            edge_doc = {
+                **edge_data,
+                "source_node_id": source_node_id,
+                "target_node_id": target_node_id,
+            }
+            if edge_data.get("source_id", ""):
+                edge_doc["source_ids"] = edge_data["source_id"].split(GRAPH_FIELD_SEP)
+            operations.append(
+                UpdateOne(
+                    {
+                        "$or": [
+                            {
+                                "source_node_id": source_node_id,
+                                "target_node_id": target_node_id,
+                            },
+                            {
+                                "source_node_id": target_node_id,
+                                "target_node_id": source_node_id,
+                            },
+                        ]
+                    },
+                    {"$set": edge_doc},
+                    upsert=True,
+                )
+            )
+        # Ordered, so repeated pairs in one batch apply in sequence
+        await self.edge_collection.bulk_write(operations)
+
     #
     # -------------------------------------------------------------------------
     # DELETION
@@ -2201,7 +2266,11 @@ class MongoVectorDBStorage(BaseVectorStorage):
         return list_data
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        search_effort: int | None = None,
     ) -> list[dict[str, Any]]:
         """Queries the vector database using Atlas Vector Search."""
         if query_embedding is not None:
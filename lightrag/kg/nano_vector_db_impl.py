@@ -7,6 +7,7 @@ from dataclasses import dataclass
 import numpy as np
 import time
 
+from lightrag.constants import DEFAULT_CHANGE_FEED_COMPACTION_RATIO
 from lightrag.utils import (
     logger,
     compute_mdhash_id,
@@ -14,6 +15,7 @@ from lightrag.utils import (
 
 from lightrag.base import BaseVectorStorage
 from nano_vectordb import NanoVectorDB
+from .change_feed import ChangeFeed
 from .shared_storage import (
     get_namespace_lock,
     get_update_flag,
@@ -57,10 +59,60 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         self._max_batch_size = self.global_config["embedding_batch_num"]
 
+        # Other worker processes apply the changes of each save from this feed
+        # instead of reloading the whole file
+        self._change_feed = ChangeFeed(
+            f"{self._client_file_name}.changes",
+            float(
+                os.getenv(
+                    "CHANGE_FEED_COMPACTION_RATIO",
+                    DEFAULT_CHANGE_FEED_COMPACTION_RATIO,
+                )
+            ),
+        )
+        # Changes made since the last save, as change feed operations
+        self._pending_ops: list[tuple] = []
+        self._load_client()
+
+    def _load_client(self) -> None:
+        """Load the vector file, plus changes saved to the feed after it"""
         self._client = NanoVectorDB(
             self.embedding_func.embedding_dim,
             storage_file=self._client_file_name,
         )
+        self._pending_ops = []
+        self._apply_ops(self._change_feed.loaded())
+
+    def _apply_ops(self, ops: list[tuple]) -> None:
+        for kind, payload in ops:
+            if kind == "upsert":
+                self._client.upsert(
+                    datas=[
+                        {**d, "__vector__": np.frombuffer(d["__vector__"], np.float32)}
+                        for d in payload
+                    ]
+                )
+            elif kind == "delete":
+                self._client.delete(payload)
+
+    def _sync_client(self) -> None:
+        """Catch up with changes saved by another process.
+
+        Only the change feed frames saved since this process last synced are
+        applied, unless there are unsaved local changes or the feed no longer
+        reaches back far enough; then the vector file is reloaded in full.
+        """
+        ops = None if self._pending_ops else self._change_feed.read()
+        if ops is None:
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
+            )
+            self._load_client()
+        else:
+            logger.debug(
+                f"[{self.workspace}] Process {os.getpid()} applied {len(ops)} changes to {self.namespace} from another process"
+            )
+            self._apply_ops(ops)
 
     async def initialize(self):
         """Initialize storage data"""
@@ -79,14 +131,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
         async with self._storage_lock:
             # Check if data needs to be reloaded
             if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
-                )
-                # Reload data
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._sync_client()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -132,6 +177,18 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 d["vector"] = encoded_vector
                 d["__vector__"] = embeddings[i]
             client = await self._get_client()
+            self._pending_ops.append(
+                (
+                    "upsert",
+                    [
+                        {
+                            **d,
+                            "__vector__": d["__vector__"].astype(np.float32).tobytes(),
+                        }
+                        for d in list_data
+                    ],
+                )
+            )
             results = client.upsert(datas=list_data)
             return results
         else:
@@ -141,7 +198,11 @@ class NanoVectorDBStorage(BaseVectorStorage):
             )
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        search_effort: int | None = None,
     ) -> list[dict[str, Any]]:
         # Use provided embedding or compute it
         if query_embedding is not None:
@@ -192,6 +253,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             before_count = len(client)
 
             client.delete(ids)
+            self._pending_ops.append(("delete", list(ids)))
 
             # Calculate actual deleted count
             after_count = len(client)
@@ -223,6 +285,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             client = await self._get_client()
             if client.get([entity_id]):
                 client.delete([entity_id])
+                self._pending_ops.append(("delete", [entity_id]))
                 logger.debug(
                     f"[{self.workspace}] Successfully deleted entity {entity_name}"
                 )
@@ -257,6 +320,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             if ids_to_delete:
                 client = await self._get_client()
                 client.delete(ids_to_delete)
+                self._pending_ops.append(("delete", ids_to_delete))
                 logger.debug(
                     f"[{self.workspace}] Deleted {len(ids_to_delete)} relations for {entity_name}"
                 )
@@ -278,10 +342,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
                 )
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._sync_client()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -289,8 +350,17 @@ class NanoVectorDBStorage(BaseVectorStorage):
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
-                # Save data to disk
+                # Publish the changes to other processes, then save data to disk
+                if self._pending_ops:
+                    self._change_feed.append(
+                        self._pending_ops,
+                        os.path.getsize(self._client_file_name)
+                        if os.path.exists(self._client_file_name)
+                        else 0,
+                    )
+                    self._pending_ops = []
                 self._client.save()
+                self._change_feed.mark_snapshot()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
@@ -412,6 +482,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     self.embedding_func.embedding_dim,
                     storage_file=self._client_file_name,
                 )
+                self._pending_ops = []
+                self._change_feed.reset()
 
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
@@ -1019,6 +1019,118 @@ class Neo4JStorage(BaseGraphStorage):
             logger.error(f"[{self.workspace}] Error during edge upsert: {str(e)}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_nodes_batch(
+        self, nodes: list[tuple[str, dict[str, str]]], batch_size: int = 1000
+    ) -> None:
+        """
+        Upsert multiple nodes using UNWIND, one query per entity type since
+        the type label cannot be parameterized.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+            batch_size: Maximum number of nodes per query
+        """
+        if not nodes:
+            return
+        workspace_label = self._get_workspace_label()
+        nodes_by_type: dict[str, list[dict]] = {}
+        for node_id, properties in nodes:
+            if "entity_id" not in properties:
+                raise ValueError(
+                    "Neo4j: node properties must contain an 'entity_id' field"
+                )
+            nodes_by_type.setdefault(properties["entity_type"], []).append(
+                {"entity_id": node_id, "properties": properties}
+            )
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    for entity_type, rows in nodes_by_type.items():
+                        query = f"""
+                        UNWIND $rows AS row
+                        MERGE (n:`{workspace_label}` {{entity_id: row.entity_id}})
+                        SET n += row.properties
+                        SET n:`{entity_type}`
+                        """
+                        for i in range(0, len(rows), batch_size):
+                            result = await tx.run(query, rows=rows[i : i + batch_size])
+                            await result.consume()  # Ensure result is fully consumed
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch node upsert: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]], batch_size: int = 1000
+    ) -> None:
+        """
+        Upsert multiple edges using UNWIND. Edges whose endpoints do not
+        exist are skipped, as with upsert_edge.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+            batch_size: Maximum number of edges per query
+        """
+        if not edges:
+            return
+        rows = [
+            {"source": source, "target": target, "properties": properties}
+            for source, target, properties in edges
+        ]
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    workspace_label = self._get_workspace_label()
+                    query = f"""
+                    UNWIND $rows AS row
+                    MATCH (source:`{workspace_label}` {{entity_id: row.source}})
+                    MATCH (target:`{workspace_label}` {{entity_id: row.target}})
+                    MERGE (source)-[r:DIRECTED]-(target)
+                    SET r += row.properties
+                    """
+                    for i in range(0, len(rows), batch_size):
+                        result = await tx.run(query, rows=rows[i : i + batch_size])
+                        await result.consume()  # Ensure result is consumed
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch edge upsert: {str(e)}")
+            raise
+
     async def get_knowledge_graph(
         self,
         node_label: str,
@@ -1,11 +1,23 @@
+import bisect
+import io
 import os
+import pickle
+import struct
+import uuid
+from array import array
 from dataclasses import dataclass
-from typing import final
+from typing import Any, final
 
+from lightrag.constants import (
+    DEFAULT_CHANGE_FEED_COMPACTION_RATIO,
+    DEFAULT_GRAPH_DELTA_COMPACTION_RATIO,
+    DEFAULT_NETWORKX_GRAPH_FORMAT,
+)
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from lightrag.utils import logger
 from lightrag.base import BaseGraphStorage
 import networkx as nx
+from .change_feed import ChangeFeed
 from .shared_storage import (
     get_namespace_lock,
     get_update_flag,
@@ -19,6 +31,235 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+NETWORKX_GRAPH_FORMATS = ("graphml", "binary")
+
+# Binary layout: magic + 32-byte hex generation, then pickled builtins only.
+# Delta files repeat the generation of the snapshot they apply to, followed by
+# length-prefixed frames of operations; a torn final frame is ignored.
+_SNAPSHOT_MAGIC = b"LRNXG001"
+_DELTA_MAGIC = b"LRNXD001"
+_HEADER_SIZE = len(_SNAPSHOT_MAGIC) + 32
+_FRAME_HEADER = struct.Struct("<I")
+
+
+class _BuiltinsUnpickler(pickle.Unpickler):
+    """Unpickler that refuses to import anything, so graph files can only
+    ever produce plain containers, strings and numbers."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Unexpected global {module}.{name} in graph file")
+
+
+def _loads(payload: bytes) -> Any:
+    return _BuiltinsUnpickler(io.BytesIO(payload)).load()
+
+
+def _read_generation(file_name: str, magic: bytes) -> str | None:
+    try:
+        with open(file_name, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+    except FileNotFoundError:
+        return None
+    if len(header) != _HEADER_SIZE or not header.startswith(magic):
+        return None
+    return header[len(magic) :].decode("ascii")
+
+
+def write_graph_snapshot(graph: nx.Graph, file_name: str) -> str:
+    """Write the graph as node and edge tables and return the new generation.
+
+    Edges reference nodes by their position in the node table, stored as
+    packed int64 arrays, so endpoints are not repeated as strings.
+    """
+    generation = uuid.uuid4().hex
+    position = {node: i for i, node in enumerate(graph.nodes)}
+    edge_source = array("q")
+    edge_target = array("q")
+    edge_attrs = []
+    for u, v, attrs in graph.edges(data=True):
+        edge_source.append(position[u])
+        edge_target.append(position[v])
+        edge_attrs.append(attrs)
+    payload = {
+        "nodes": list(position),
+        "node_attrs": [attrs for _, attrs in graph.nodes(data=True)],
+        "edge_source": edge_source.tobytes(),
+        "edge_target": edge_target.tobytes(),
+        "edge_attrs": edge_attrs,
+    }
+    tmp_file = f"{file_name}.{os.getpid()}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(_SNAPSHOT_MAGIC + generation.encode("ascii"))
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, file_name)
+    return generation
+
+
+def read_graph_snapshot(file_name: str) -> tuple[nx.Graph, str] | None:
+    """Load a snapshot written by write_graph_snapshot with its generation"""
+    generation = _read_generation(file_name, _SNAPSHOT_MAGIC)
+    if generation is None:
+        return None
+    with open(file_name, "rb") as f:
+        f.seek(_HEADER_SIZE)
+        payload = _loads(f.read())
+    nodes = payload["nodes"]
+    edge_source = array("q")
+    edge_source.frombytes(payload["edge_source"])
+    edge_target = array("q")
+    edge_target.frombytes(payload["edge_target"])
+
+    graph = nx.Graph()
+    graph.add_nodes_from(zip(nodes, payload["node_attrs"]))
+    graph.add_edges_from(
+        (nodes[s], nodes[t], attrs)
+        for s, t, attrs in zip(edge_source, edge_target, payload["edge_attrs"])
+    )
+    return graph, generation
+
+
+def append_graph_delta(file_name: str, generation: str, ops: list[tuple]) -> int:
+    """Append one frame of operations to the delta file and return its size"""
+    payload = pickle.dumps(ops, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(file_name, "ab") as f:
+        if f.tell() == 0:
+            f.write(_DELTA_MAGIC + generation.encode("ascii"))
+        f.write(_FRAME_HEADER.pack(len(payload)))
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def read_graph_delta(
+    file_name: str, generation: str, offset: int = 0
+) -> tuple[list[tuple], int]:
+    """Read the operations appended after offset.
+
+    Returns the operations and the offset just past the last complete frame.
+    Delta files belonging to another snapshot generation are ignored.
+    """
+    if _read_generation(file_name, _DELTA_MAGIC) != generation:
+        return [], _HEADER_SIZE
+    ops: list[tuple] = []
+    offset = max(offset, _HEADER_SIZE)
+    with open(file_name, "rb") as f:
+        f.seek(offset)
+        while True:
+            header = f.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                break
+            (size,) = _FRAME_HEADER.unpack(header)
+            payload = f.read(size)
+            if len(payload) < size:
+                break
+            ops.extend(_loads(payload))
+            offset = f.tell()
+    return ops, offset
+
+
+def apply_graph_delta(graph: nx.Graph, ops: list[tuple]) -> set:
+    """Apply operations to the graph and return the nodes whose presence or
+    degree may have changed"""
+    touched = set()
+    for op in ops:
+        kind = op[0]
+        if kind == "node":
+            graph.add_node(op[1], **op[2])
+            touched.add(op[1])
+        elif kind == "edge":
+            graph.add_edge(op[1], op[2], **op[3])
+            touched.update(op[1:3])
+        elif kind == "remove_node":
+            if graph.has_node(op[1]):
+                touched.update(graph.neighbors(op[1]))
+                graph.remove_node(op[1])
+            touched.add(op[1])
+        elif kind == "remove_edge":
+            if graph.has_edge(op[1], op[2]):
+                graph.remove_edge(op[1], op[2])
+            touched.update(op[1:3])
+    return touched
+
+
+class GraphDegreeIndex:
+    """Node degrees and labels of a graph, kept ordered as the graph changes.
+
+    Nodes are bucketed by degree, with the non-empty degrees in a sorted list,
+    and labels are kept in a sorted list, so the top-K nodes by degree and the
+    label listing are read without sorting the whole graph. Callers report the
+    nodes they changed through refresh().
+    """
+
+    def __init__(self, graph: nx.Graph):
+        self.graph = graph
+        self._degrees: dict[str, int] = {}
+        # degree -> nodes with that degree (dicts keep insertion order)
+        self._buckets: dict[int, dict[str, None]] = {}
+        self._levels: list[int] = []  # non-empty degrees, ascending
+        for node, degree in graph.degree():
+            self._add(node, degree)
+        self._labels = sorted(str(node) for node in self._degrees)
+
+    def _add(self, node: str, degree: int) -> None:
+        bucket = self._buckets.get(degree)
+        if bucket is None:
+            bucket = self._buckets[degree] = {}
+            bisect.insort(self._levels, degree)
+        bucket[node] = None
+        self._degrees[node] = degree
+
+    def _discard(self, node: str) -> None:
+        degree = self._degrees.pop(node)
+        bucket = self._buckets[degree]
+        del bucket[node]
+        if not bucket:
+            del self._buckets[degree]
+            del self._levels[bisect.bisect_left(self._levels, degree)]
+
+    def refresh(self, nodes) -> None:
+        """Re-read the presence and degree of nodes after the graph changed"""
+        for node in nodes:
+            present = self.graph.has_node(node)
+            degree = self.graph.degree(node) if present else None
+            known = self._degrees.get(node)
+            if known == degree:
+                continue
+            if known is not None:
+                self._discard(node)
+            if present:
+                self._add(node, degree)
+            if known is None or not present:
+                label = str(node)
+                i = bisect.bisect_left(self._labels, label)
+                if present:
+                    self._labels.insert(i, label)
+                elif i < len(self._labels) and self._labels[i] == label:
+                    del self._labels[i]
+
+    def top(self, limit: int) -> list[str]:
+        """Nodes with the highest degree, highest first"""
+        result: list[str] = []
+        for degree in reversed(self._levels):
+            for node in self._buckets[degree]:
+                if len(result) >= limit:
+                    return result
+                result.append(node)
+        return result
+
+    def labels(self) -> list[str]:
+        """All node labels, sorted"""
+        return list(self._labels)
+
+
+def convert_graphml_to_binary(graphml_file: str, binary_file: str) -> nx.Graph:
+    """Convert an existing GraphML file into a binary snapshot"""
+    graph = nx.read_graphml(graphml_file)
+    write_graph_snapshot(graph, binary_file)
+    return graph
+
 
 @final
 @dataclass
@@ -30,11 +271,14 @@ class NetworkXStorage(BaseGraphStorage):
         return None
 
     @staticmethod
-    def write_nx_graph(graph: nx.Graph, file_name, workspace="_"):
+    def write_nx_graph(graph: nx.Graph, file_name, workspace="_", binary=False):
         logger.info(
             f"[{workspace}] Writing graph with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
         )
-        nx.write_graphml(graph, file_name)
+        if binary:
+            write_graph_snapshot(graph, file_name)
+        else:
+            nx.write_graphml(graph, file_name)
 
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
@@ -50,22 +294,184 @@ class NetworkXStorage(BaseGraphStorage):
         self._graphml_xml_file = os.path.join(
             workspace_dir, f"graph_{self.namespace}.graphml"
         )
+        self._binary_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.nxgraph"
+        )
+        self._delta_file = f"{self._binary_file}.delta"
+        self._graph_format = os.getenv(
+            "NETWORKX_GRAPH_FORMAT", DEFAULT_NETWORKX_GRAPH_FORMAT
+        ).lower()
+        if self._graph_format not in NETWORKX_GRAPH_FORMATS:
+            raise ValueError(
+                f"Unsupported NETWORKX_GRAPH_FORMAT '{self._graph_format}', "
+                f"expected one of {NETWORKX_GRAPH_FORMATS}"
+            )
+        self._delta_compaction_ratio = float(
+            os.getenv(
+                "GRAPH_DELTA_COMPACTION_RATIO", DEFAULT_GRAPH_DELTA_COMPACTION_RATIO
+            )
+        )
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
+        # Built on first use for the current graph object, see _get_degree_index
+        self._degree_index: GraphDegreeIndex | None = None
+        # Binary format state: snapshot generation, how far into the delta file
+        # this process has applied, and operations not yet persisted
+        self._generation: str | None = None
+        self._delta_offset = 0
+        self._pending_ops: list[tuple] = []
+        # GraphML format: other processes apply the operations of each save
+        # from this feed instead of reparsing the whole file
+        self._change_feed = ChangeFeed(
+            f"{self._graphml_xml_file}.changes",
+            float(
+                os.getenv(
+                    "CHANGE_FEED_COMPACTION_RATIO",
+                    DEFAULT_CHANGE_FEED_COMPACTION_RATIO,
+                )
+            ),
+        )
 
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+        preloaded_graph = self._load_graph()
+        graph_file = (
+            self._binary_file
+            if self._graph_format == "binary"
+            else self._graphml_xml_file
+        )
         if preloaded_graph is not None:
             logger.info(
-                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+                f"[{self.workspace}] Loaded graph from {graph_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
             )
         else:
             logger.info(
-                f"[{self.workspace}] Created new empty graph file: {self._graphml_xml_file}"
+                f"[{self.workspace}] Created new empty graph file: {graph_file}"
             )
         self._graph = preloaded_graph or nx.Graph()
 
+    def _load_graph(self) -> nx.Graph | None:
+        """Load the graph from disk in the configured format"""
+        self._pending_ops = []
+        if self._graph_format == "graphml":
+            graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+            # Changes saved to the feed after the graphml file was written
+            ops = self._change_feed.loaded()
+            if ops:
+                graph = graph if graph is not None else nx.Graph()
+                apply_graph_delta(graph, ops)
+            return graph
+
+        loaded = read_graph_snapshot(self._binary_file)
+        if loaded is None:
+            self._generation = None
+            self._delta_offset = 0
+            if not os.path.exists(self._graphml_xml_file):
+                return None
+            logger.info(
+                f"[{self.workspace}] Converting {self._graphml_xml_file} to binary graph file {self._binary_file}"
+            )
+            graph = convert_graphml_to_binary(self._graphml_xml_file, self._binary_file)
+            self._generation = _read_generation(self._binary_file, _SNAPSHOT_MAGIC)
+            self._delta_offset = _HEADER_SIZE
+            return graph
+
+        graph, self._generation = loaded
+        ops, self._delta_offset = read_graph_delta(self._delta_file, self._generation)
+        apply_graph_delta(graph, ops)
+        return graph
+
+    def _reload_graph(self) -> nx.Graph:
+        """Pick up changes persisted by another process.
+
+        In binary format, only the delta frames appended since the last load
+        are applied when the snapshot is unchanged and there are no local
+        unsaved changes; otherwise the graph is loaded in full. GraphML graphs
+        apply the change feed frames saved since the last sync the same way.
+        """
+        if (
+            self._graph_format == "graphml"
+            and self._graph is not None
+            and not self._pending_ops
+        ):
+            ops = self._change_feed.read()
+            if ops is not None:
+                self._index_changed(apply_graph_delta(self._graph, ops))
+                return self._graph
+        elif (
+            self._graph_format == "binary"
+            and self._graph is not None
+            and not self._pending_ops
+            and self._generation is not None
+            and _read_generation(self._binary_file, _SNAPSHOT_MAGIC) == self._generation
+        ):
+            ops, self._delta_offset = read_graph_delta(
+                self._delta_file, self._generation, self._delta_offset
+            )
+            self._index_changed(apply_graph_delta(self._graph, ops))
+            return self._graph
+        return self._load_graph() or nx.Graph()
+
+    def _record_ops(self, *ops: tuple) -> None:
+        self._pending_ops.extend(ops)
+
+    def _get_degree_index(self, graph: nx.Graph) -> GraphDegreeIndex:
+        """Degree index of graph, rebuilt only when the graph object was replaced"""
+        if self._degree_index is None or self._degree_index.graph is not graph:
+            self._degree_index = GraphDegreeIndex(graph)
+        return self._degree_index
+
+    def _index_changed(self, nodes) -> None:
+        """Update the degree index for nodes changed in the current graph"""
+        if self._degree_index is not None and self._degree_index.graph is self._graph:
+            self._degree_index.refresh(nodes)
+
+    def _persist_graph(self) -> None:
+        """Write pending changes to disk in the configured format"""
+        if self._graph_format == "graphml":
+            if self._pending_ops:
+                self._change_feed.append(
+                    self._pending_ops,
+                    os.path.getsize(self._graphml_xml_file)
+                    if os.path.exists(self._graphml_xml_file)
+                    else 0,
+                )
+                self._pending_ops = []
+            NetworkXStorage.write_nx_graph(
+                self._graph, self._graphml_xml_file, self.workspace
+            )
+            self._change_feed.mark_snapshot()
+            return
+
+        snapshot_size = (
+            os.path.getsize(self._binary_file)
+            if self._generation is not None and os.path.exists(self._binary_file)
+            else 0
+        )
+        if snapshot_size and self._pending_ops:
+            delta_size = append_graph_delta(
+                self._delta_file, self._generation, self._pending_ops
+            )
+            logger.debug(
+                f"[{self.workspace}] Appended {len(self._pending_ops)} graph changes to {self._delta_file}"
+            )
+            self._pending_ops = []
+            if delta_size <= snapshot_size * self._delta_compaction_ratio:
+                self._delta_offset = delta_size
+                return
+        elif snapshot_size:
+            return
+
+        # First write, or the delta outgrew the snapshot: write a full snapshot
+        NetworkXStorage.write_nx_graph(
+            self._graph, self._binary_file, self.workspace, binary=True
+        )
+        self._generation = _read_generation(self._binary_file, _SNAPSHOT_MAGIC)
+        if os.path.exists(self._delta_file):
+            os.remove(self._delta_file)
+        self._delta_offset = _HEADER_SIZE
+        self._pending_ops = []
+
     async def initialize(self):
         """Initialize storage data"""
         # Get the update flag for cross-process update notification
@@ -84,12 +490,10 @@ class NetworkXStorage(BaseGraphStorage):
             # Check if data needs to be reloaded
             if self.storage_updated.value:
                 logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graphml_xml_file} due to modifications by another process"
+                    f"[{self.workspace}] Process {os.getpid()} reloading graph {self.namespace} due to modifications by another process"
                 )
                 # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._graph = self._reload_graph()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -129,6 +533,56 @@ class NetworkXStorage(BaseGraphStorage):
             return list(graph.edges(source_node_id))
         return None
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        graph = await self._get_graph()
+        nodes = graph.nodes
+        return {node_id: nodes[node_id] for node_id in node_ids if node_id in nodes}
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        graph = await self._get_graph()
+        degree = graph.degree
+        return {
+            node_id: degree[node_id] if node_id in graph else 0 for node_id in node_ids
+        }
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        graph = await self._get_graph()
+        degree = graph.degree
+        # Nodes shared by several edges are looked up once
+        degrees = {
+            node_id: degree[node_id] if node_id in graph else 0
+            for pair in edge_pairs
+            for node_id in pair
+        }
+        return {(src, tgt): degrees[src] + degrees[tgt] for src, tgt in edge_pairs}
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        graph = await self._get_graph()
+        adj = graph.adj
+        result = {}
+        for pair in pairs:
+            src, tgt = pair["src"], pair["tgt"]
+            edge = adj[src].get(tgt) if src in adj else None
+            if edge is not None:
+                result[(src, tgt)] = edge
+        return result
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        graph = await self._get_graph()
+        adj = graph.adj
+        return {
+            node_id: [(node_id, neighbor) for neighbor in adj[node_id]]
+            if node_id in adj
+            else []
+            for node_id in node_ids
+        }
+
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """
         Importance notes:
@@ -138,6 +592,8 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_node(node_id, **node_data)
+        self._record_ops(("node", node_id, dict(graph.nodes[node_id])))
+        self._index_changed((node_id,))
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -150,6 +606,47 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._record_ops(
+            (
+                "edge",
+                source_node_id,
+                target_node_id,
+                dict(graph.edges[source_node_id, target_node_id]),
+            )
+        )
+        self._index_changed((source_node_id, target_node_id))
+
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """Insert or update multiple nodes
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        graph = await self._get_graph()
+        graph.add_nodes_from(nodes)
+        self._record_ops(
+            *(("node", node_id, dict(graph.nodes[node_id])) for node_id, _ in nodes)
+        )
+        self._index_changed(node_id for node_id, _ in nodes)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple edges
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        graph = await self._get_graph()
+        graph.add_edges_from(edges)
+        self._record_ops(
+            *(("edge", u, v, dict(graph.edges[u, v])) for u, v, _ in edges)
+        )
+        self._index_changed(node for u, v, _ in edges for node in (u, v))
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -160,7 +657,10 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
+            neighbors = list(graph.neighbors(node_id))
             graph.remove_node(node_id)
+            self._record_ops(("remove_node", node_id))
+            self._index_changed([node_id, *neighbors])
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
             logger.warning(
@@ -179,9 +679,14 @@ class NetworkXStorage(BaseGraphStorage):
             nodes: List of node IDs to be deleted
         """
         graph = await self._get_graph()
+        changed = set()
         for node in nodes:
             if graph.has_node(node):
+                changed.update(graph.neighbors(node))
+                changed.add(node)
                 graph.remove_node(node)
+                self._record_ops(("remove_node", node))
+        self._index_changed(changed)
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -198,6 +703,8 @@ class NetworkXStorage(BaseGraphStorage):
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+                self._record_ops(("remove_edge", source, target))
+                self._index_changed((source, target))
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -206,12 +713,7 @@ class NetworkXStorage(BaseGraphStorage):
             [label1, label2, ...]  # Alphabetically sorted label list
         """
         graph = await self._get_graph()
-        labels = set()
-        for node in graph.nodes():
-            labels.add(str(node))  # Add node id as a label
-
-        # Return sorted list
-        return sorted(list(labels))
+        return self._get_degree_index(graph).labels()
 
     async def get_popular_labels(self, limit: int = 300) -> list[str]:
         """
@@ -225,12 +727,10 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
 
-        # Get degrees of all nodes and sort by degree descending
-        degrees = dict(graph.degree())
-        sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
-        # Return top labels limited by the specified limit
-        popular_labels = [str(node) for node, _ in sorted_nodes[:limit]]
+        # Highest degree nodes from the incrementally maintained degree index
+        popular_labels = [
+            str(node) for node in self._get_degree_index(graph).top(limit)
+        ]
 
         logger.debug(
             f"[{self.workspace}] Retrieved {len(popular_labels)} popular labels (limit: {limit})"
@@ -325,19 +825,16 @@ class NetworkXStorage(BaseGraphStorage):
 
         # Handle special case for "*" label
         if node_label == "*":
-            # Get degrees of all nodes
-            degrees = dict(graph.degree())
-            # Sort nodes by degree in descending order and take top max_nodes
-            sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
             # Check if graph is truncated
-            if len(sorted_nodes) > max_nodes:
+            node_count = graph.number_of_nodes()
+            if node_count > max_nodes:
                 result.is_truncated = True
                 logger.info(
-                    f"[{self.workspace}] Graph truncated: {len(sorted_nodes)} nodes found, limited to {max_nodes}"
+                    f"[{self.workspace}] Graph truncated: {node_count} nodes found, limited to {max_nodes}"
                 )
 
-            limited_nodes = [node for node, _ in sorted_nodes[:max_nodes]]
+            # Take the top max_nodes nodes by degree from the degree index
+            limited_nodes = self._get_degree_index(graph).top(max_nodes)
             # Create subgraph with the highest degree nodes
             subgraph = graph.subgraph(limited_nodes)
         else:
@@ -509,9 +1006,7 @@ class NetworkXStorage(BaseGraphStorage):
                 logger.info(
                     f"[{self.workspace}] Graph was updated by another process, reloading..."
                 )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._graph = self._reload_graph()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -520,9 +1015,7 @@ class NetworkXStorage(BaseGraphStorage):
         async with self._storage_lock:
             try:
                 # Save data to disk
-                NetworkXStorage.write_nx_graph(
-                    self._graph, self._graphml_xml_file, self.workspace
-                )
+                self._persist_graph()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
@@ -551,9 +1044,19 @@ class NetworkXStorage(BaseGraphStorage):
         try:
             async with self._storage_lock:
                 # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
+                for file_name in (
+                    self._graphml_xml_file,
+                    self._binary_file,
+                    self._delta_file,
+                ):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
                 self._graph = nx.Graph()
+                self._generation = None
+                self._delta_offset = 0
+                self._pending_ops = []
+                if self._graph_format == "graphml":
+                    self._change_feed.reset()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
@@ -2323,7 +2323,11 @@ class PGVectorStorage(BaseVectorStorage):
 
     #################### query method ###############
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        search_effort: int | None = None,
     ) -> list[dict[str, Any]]:
         if query_embedding is not None:
             embedding = query_embedding
@@ -3639,23 +3643,7 @@ class PGGraphStorage(BaseGraphStorage):
             node_id: The unique identifier for the node (used as label)
             node_data: Dictionary of node properties
         """
-        if "entity_id" not in node_data:
-            raise ValueError(
-                "PostgreSQL: node properties must contain an 'entity_id' field"
-            )
-
-        label = self._normalize_node_id(node_id)
-        properties = self._format_properties(node_data)
-
-        query = """SELECT * FROM cypher('%s', $$
-                     MERGE (n:base {entity_id: "%s"})
-                     SET n += %s
-                     RETURN n
-                   $$) AS (n agtype)""" % (
-            self.graph_name,
-            label,
-            properties,
-        )
+        query = self._upsert_node_query(node_id, node_data)
 
         try:
             await self._query(query, readonly=False, upsert=True)
@@ -3682,11 +3670,44 @@ class PGGraphStorage(BaseGraphStorage):
             target_node_id (str): Label of the target node (used as identifier)
             edge_data (dict): dictionary of properties to set on the edge
         """
+        query = self._upsert_edge_query(source_node_id, target_node_id, edge_data)
+
+        try:
+            await self._query(query, readonly=False, upsert=True)
+
+        except Exception:
+            logger.error(
+                f"[{self.workspace}] POSTGRES, upsert_edge error on edge: `{source_node_id}`-`{target_node_id}`"
+            )
+            raise
+
+    def _upsert_node_query(self, node_id: str, node_data: dict[str, str]) -> str:
+        if "entity_id" not in node_data:
+            raise ValueError(
+                "PostgreSQL: node properties must contain an 'entity_id' field"
+            )
+
+        label = self._normalize_node_id(node_id)
+        properties = self._format_properties(node_data)
+
+        return """SELECT * FROM cypher('%s', $$
+                     MERGE (n:base {entity_id: "%s"})
+                     SET n += %s
+                     RETURN n
+                   $$) AS (n agtype)""" % (
+            self.graph_name,
+            label,
+            properties,
+        )
+
+    def _upsert_edge_query(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> str:
         src_label = self._normalize_node_id(source_node_id)
         tgt_label = self._normalize_node_id(target_node_id)
         edge_properties = self._format_properties(edge_data)
 
-        query = """SELECT * FROM cypher('%s', $$
+        return """SELECT * FROM cypher('%s', $$
                      MATCH (source:base {entity_id: "%s"})
                      WITH source
                      MATCH (target:base {entity_id: "%s"})
@@ -3702,14 +3723,68 @@ class PGGraphStorage(BaseGraphStorage):
             edge_properties,  # https://github.com/HKUDS/LightRAG/issues/1438#issuecomment-2826000195
         )
 
-        try:
-            await self._query(query, readonly=False, upsert=True)
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((PGGraphQueryException,)),
+    )
+    async def upsert_nodes_batch(
+        self, nodes: list[tuple[str, dict[str, str]]], batch_size: int = 200
+    ) -> None:
+        """
+        Upsert multiple nodes, sending batch_size MERGE statements per round trip.
 
-        except Exception:
-            logger.error(
-                f"[{self.workspace}] POSTGRES, upsert_edge error on edge: `{source_node_id}`-`{target_node_id}`"
-            )
-            raise
+        Args:
+            nodes: List of (node_id, node_data) tuples
+            batch_size: Number of statements per round trip
+        """
+        queries = [
+            self._upsert_node_query(node_id, node_data) for node_id, node_data in nodes
+        ]
+        for i in range(0, len(queries), batch_size):
+            try:
+                await self._query(
+                    ";\n".join(queries[i : i + batch_size]),
+                    readonly=False,
+                    upsert=True,
+                )
+            except Exception:
+                logger.error(
+                    f"[{self.workspace}] POSTGRES, upsert_nodes_batch error on {len(queries[i : i + batch_size])} nodes"
+                )
+                raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((PGGraphQueryException,)),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]], batch_size: int = 200
+    ) -> None:
+        """
+        Upsert multiple edges, sending batch_size MERGE statements per round trip.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+            batch_size: Number of statements per round trip
+        """
+        queries = [
+            self._upsert_edge_query(source_node_id, target_node_id, edge_data)
+            for source_node_id, target_node_id, edge_data in edges
+        ]
+        for i in range(0, len(queries), batch_size):
+            try:
+                await self._query(
+                    ";\n".join(queries[i : i + batch_size]),
+                    readonly=False,
+                    upsert=True,
+                )
+            except Exception:
+                logger.error(
+                    f"[{self.workspace}] POSTGRES, upsert_edges_batch error on {len(queries[i : i + batch_size])} edges"
+                )
+                raise
 
     async def delete_node(self, node_id: str) -> None:
         """
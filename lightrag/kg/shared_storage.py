@@ -1,14 +1,22 @@
 import os
 import sys
 import asyncio
+import hashlib
+import mmap
+import pickle
+import shutil
+import struct
+import tempfile
 import multiprocessing as mp
 from multiprocessing.synchronize import Lock as ProcessLock
 from multiprocessing import Manager
 import time
 import logging
+from collections.abc import MutableMapping
 from contextvars import ContextVar
 from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
 
+from lightrag.constants import DEFAULT_SHARED_MEMORY_STORE
 from lightrag.exceptions import PipelineNotInitializedError
 
 DEBUG_LOCKS = False
@@ -83,6 +91,8 @@ _default_workspace: Optional[str] = None
 _shared_dicts: Optional[Dict[str, Any]] = None
 _init_flags: Optional[Dict[str, bool]] = None  # namespace -> initialized
 _update_flags: Optional[Dict[str, bool]] = None  # namespace -> updated
+# process-local proxies of the update flags: namespace -> (list proxy, flag proxies)
+_update_flag_proxies: Dict[str, tuple[Any, list]] = {}
 
 # locks for mutex access
 _internal_lock: Optional[LockType] = None
@@ -90,6 +100,11 @@ _data_init_lock: Optional[LockType] = None
 # Manager for all keyed locks
 _storage_keyed_lock: Optional["KeyedUnifiedLock"] = None
 
+# memory-mapped stores for storage data in multiprocess mode (see SharedMemoryStore)
+_shared_memory_dir: Optional[str] = None
+_shared_memory_owner: Optional[int] = None  # pid of the process that created the dir
+_shared_memory_stores: Dict[str, "SharedMemoryStore"] = {}
+
 # async locks for coroutine synchronization in multiprocess mode
 _async_locks: Optional[Dict[str, asyncio.Lock]] = None
 
@@ -1155,6 +1170,219 @@ def get_keyed_lock_status() -> Dict[str, Any]:
     return status
 
 
+class SharedMemoryStore(MutableMapping):
+    """
+    Dict-like key/value store that worker processes share through a memory-mapped file.
+
+    Records are appended to a log file (on /dev/shm when available) mapped into
+    every process. Each process keeps its own index of the log and catches up
+    by reading only the records appended since its last access, so reads need
+    no IPC and no lock. Writes must be serialized across processes by the
+    caller (the namespace lock); a write appends its records and then
+    publishes them by advancing the committed length in the file header.
+    Values are pickled, so like Manager dict proxies reads return copies.
+
+    clear() and compaction (once superseded records outweigh live ones) write
+    a new generation file and switch every process to it through a small
+    control file holding the current generation number.
+    """
+
+    _HEADER = struct.Struct("<Q")  # committed length of the log
+    _RECORD = struct.Struct("<II")  # key length, value length
+    _DELETED = 0xFFFFFFFF
+    _INITIAL_SIZE = 1 << 20
+    _MIN_COMPACTION_BYTES = 1 << 20
+
+    def __init__(self, path: str):
+        self._path = path
+        control_file = f"{path}.ctl"
+        if not os.path.exists(control_file):
+            try:
+                self._create_generation(0)
+            except FileExistsError:
+                pass
+            tmp_file = f"{control_file}.{os.getpid()}.tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(self._HEADER.pack(0))
+            try:
+                # Publish atomically; another process may have won the race
+                os.link(tmp_file, control_file)
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(tmp_file)
+        with open(control_file, "r+b") as f:
+            self._control = mmap.mmap(f.fileno(), self._HEADER.size)
+        self._generation = -1
+        self._fd = None
+        self._map = None
+        self._sync()
+
+    def _data_file(self, generation: int) -> str:
+        return f"{self._path}.{generation}"
+
+    def _create_generation(self, generation: int, records: bytes = b"") -> None:
+        end = self._HEADER.size + len(records)
+        with open(self._data_file(generation), "xb") as f:
+            f.write(self._HEADER.pack(end))
+            f.write(records)
+            f.truncate(max(end, self._INITIAL_SIZE))
+
+    def _open_generation(self) -> None:
+        while True:
+            generation = self._HEADER.unpack_from(self._control)[0]
+            try:
+                fd = os.open(self._data_file(generation), os.O_RDWR)
+                break
+            except FileNotFoundError:
+                # Replaced by a newer generation since the control file was read
+                continue
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = fd
+        self._map = mmap.mmap(fd, 0)
+        self._generation = generation
+        # key -> (value offset, value length, record offset)
+        self._index: dict[str, tuple[int, int, int]] = {}
+        self._applied = self._HEADER.size
+        self._live_bytes = 0
+
+    def _sync(self) -> None:
+        """Apply the records other processes committed since the last access"""
+        if self._HEADER.unpack_from(self._control)[0] != self._generation:
+            self._open_generation()
+        end = self._HEADER.unpack_from(self._map)[0]
+        if end <= self._applied:
+            return
+        if end > len(self._map):
+            self._map = mmap.mmap(self._fd, 0)
+        buffer, index, pos = self._map, self._index, self._applied
+        while pos < end:
+            record_start = pos
+            key_len, value_len = self._RECORD.unpack_from(buffer, pos)
+            pos += self._RECORD.size
+            key = buffer[pos : pos + key_len].decode("utf-8")
+            pos += key_len
+            previous = index.pop(key, None)
+            if previous is not None:
+                offset, length, start = previous
+                self._live_bytes -= offset + length - start
+            if value_len != self._DELETED:
+                index[key] = (pos, value_len, record_start)
+                pos += value_len
+                self._live_bytes += pos - record_start
+        self._applied = end
+
+    def _append(self, records: list[tuple[str, Any]]) -> None:
+        """Append upserts (value) and deletions (value _DELETED) and publish them"""
+        parts = []
+        for key, value in records:
+            key_bytes = key.encode("utf-8")
+            if value is self._DELETED:
+                parts.append(self._RECORD.pack(len(key_bytes), self._DELETED))
+                parts.append(key_bytes)
+            else:
+                value_bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+                parts.append(self._RECORD.pack(len(key_bytes), len(value_bytes)))
+                parts.append(key_bytes)
+                parts.append(value_bytes)
+        payload = b"".join(parts)
+        start = self._applied
+        end = start + len(payload)
+        if end > len(self._map):
+            os.ftruncate(self._fd, max(end, 2 * len(self._map)))
+            self._map = mmap.mmap(self._fd, 0)
+        self._map[start:end] = payload
+        self._HEADER.pack_into(self._map, 0, end)
+        self._sync()
+
+        dead_bytes = end - self._HEADER.size - self._live_bytes
+        if dead_bytes > max(self._live_bytes, self._MIN_COMPACTION_BYTES):
+            self._switch_generation(
+                b"".join(
+                    self._map[start : offset + length]
+                    for offset, length, start in self._index.values()
+                )
+            )
+
+    def _switch_generation(self, records: bytes = b"") -> None:
+        previous = self._generation
+        self._create_generation(previous + 1, records)
+        self._HEADER.pack_into(self._control, 0, previous + 1)
+        os.remove(self._data_file(previous))
+        self._sync()
+
+    def __getitem__(self, key: str) -> Any:
+        self._sync()
+        offset, length, _ = self._index[key]
+        return pickle.loads(self._map[offset : offset + length])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._sync()
+        entry = self._index.get(key)
+        if entry is None:
+            return default
+        return pickle.loads(self._map[entry[0] : entry[0] + entry[1]])
+
+    def __contains__(self, key: object) -> bool:
+        self._sync()
+        return key in self._index
+
+    def __len__(self) -> int:
+        self._sync()
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self) -> list[str]:
+        self._sync()
+        return list(self._index)
+
+    def items(self) -> list[tuple[str, Any]]:
+        self._sync()
+        return [
+            (key, pickle.loads(self._map[offset : offset + length]))
+            for key, (offset, length, _) in self._index.items()
+        ]
+
+    def values(self) -> list[Any]:
+        return [value for _, value in self.items()]
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self.items())
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._sync()
+        self._append([(key, value)])
+
+    def update(self, other=(), **kwargs) -> None:
+        records = list(dict(other, **kwargs).items())
+        if records:
+            self._sync()
+            self._append(records)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._append([(key, self._DELETED)])
+
+    def pop(self, key: str, *default: Any) -> Any:
+        self._sync()
+        if key not in self._index:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self[key]
+        self._append([(key, self._DELETED)])
+        return value
+
+    def clear(self) -> None:
+        self._sync()
+        if self._index or self._applied > self._HEADER.size:
+            self._switch_generation()
+
+
 def initialize_share_data(workers: int = 1):
     """
     Initialize shared storage data for single or multi-process mode.
@@ -1167,7 +1395,9 @@ def initialize_share_data(workers: int = 1):
 
     The function determines whether to use cross-process shared variables for data storage
     based on the number of workers. If workers=1, it uses thread locks and local dictionaries.
-    If workers>1, it uses process locks and shared dictionaries managed by multiprocessing.Manager.
+    If workers>1, it uses process locks and shared dictionaries managed by multiprocessing.Manager,
+    and keeps storage data (get_namespace_store) in memory-mapped files unless
+    SHARED_MEMORY_STORE=false.
 
     Args:
         workers (int): Number of worker processes. If 1, single-process mode is used.
@@ -1190,7 +1420,9 @@ def initialize_share_data(workers: int = 1):
         _async_locks, \
         _storage_keyed_lock, \
         _earliest_mp_cleanup_time, \
-        _last_mp_cleanup_time
+        _last_mp_cleanup_time, \
+        _shared_memory_dir, \
+        _shared_memory_owner
 
     # Check if already initialized
     if _initialized:
@@ -1216,6 +1448,16 @@ def initialize_share_data(workers: int = 1):
 
         _storage_keyed_lock = KeyedUnifiedLock()
 
+        if (
+            os.getenv("SHARED_MEMORY_STORE", str(DEFAULT_SHARED_MEMORY_STORE)).lower()
+            == "true"
+        ):
+            _shared_memory_dir = tempfile.mkdtemp(
+                prefix="lightrag-shm-",
+                dir="/dev/shm" if os.path.isdir("/dev/shm") else None,
+            )
+            _shared_memory_owner = os.getpid()
+
         # Initialize async locks for multiprocess mode
         _async_locks = {
             "internal_lock": asyncio.Lock(),
@@ -1323,6 +1565,25 @@ async def get_update_flag(namespace: str, workspace: str | None = None):
         return new_update_flag
 
 
+def _get_namespace_update_flags(final_namespace: str) -> list:
+    """Update flags of a namespace (caller holds the internal lock)
+
+    In multiprocess mode every item fetched from a Manager list is a new proxy
+    that opens its own connection, so flag proxies are cached per process and
+    only flags registered since the last call are fetched.
+    """
+    if not _is_multiprocess:
+        return _update_flags[final_namespace]
+    cached = _update_flag_proxies.get(final_namespace)
+    if cached is None:
+        cached = (_update_flags[final_namespace], [])
+        _update_flag_proxies[final_namespace] = cached
+    flags_list, flags = cached
+    for i in range(len(flags), len(flags_list)):
+        flags.append(flags_list[i])
+    return flags
+
+
 async def set_all_update_flags(namespace: str, workspace: str | None = None):
     """Set all update flag of namespace indicating all workers need to reload data from files"""
     global _update_flags
@@ -1335,8 +1596,8 @@ async def set_all_update_flags(namespace: str, workspace: str | None = None):
         if final_namespace not in _update_flags:
             raise ValueError(f"Namespace {final_namespace} not found in update flags")
         # Update flags for both modes
-        for i in range(len(_update_flags[final_namespace])):
-            _update_flags[final_namespace][i].value = True
+        for flag in _get_namespace_update_flags(final_namespace):
+            flag.value = True
 
 
 async def clear_all_update_flags(namespace: str, workspace: str | None = None):
@@ -1351,8 +1612,37 @@ async def clear_all_update_flags(namespace: str, workspace: str | None = None):
         if final_namespace not in _update_flags:
             raise ValueError(f"Namespace {final_namespace} not found in update flags")
         # Update flags for both modes
-        for i in range(len(_update_flags[final_namespace])):
-            _update_flags[final_namespace][i].value = False
+        for flag in _get_namespace_update_flags(final_namespace):
+            flag.value = False
+
+
+async def get_storage_generation(workspace: str | None = None) -> int:
+    """
+    Get the storage generation counter of a workspace.
+
+    The generation is bumped by bump_storage_generation() whenever indexed data is
+    persisted, so derived query-time caches can key on it and expire automatically.
+    Returns 0 before Shared-Data is initialized or before the first bump.
+    """
+    if _shared_dicts is None:
+        return 0
+    generation_data = await get_namespace_data(
+        "storage_generation", workspace=workspace
+    )
+    return generation_data.get("generation", 0)
+
+
+async def bump_storage_generation(workspace: str | None = None) -> int:
+    """Increment the storage generation of a workspace (visible to all workers)"""
+    if _shared_dicts is None:
+        return 0
+    generation_data = await get_namespace_data(
+        "storage_generation", workspace=workspace
+    )
+    async with get_internal_lock():
+        generation = generation_data.get("generation", 0) + 1
+        generation_data["generation"] = generation
+    return generation
 
 
 async def get_all_update_flags_status(workspace: str | None = None) -> Dict[str, list]:
@@ -1465,6 +1755,27 @@ async def get_namespace_data(
     return _shared_dicts[final_namespace]
 
 
+async def get_namespace_store(
+    namespace: str, workspace: str | None = None
+) -> MutableMapping[str, Any]:
+    """get the shared key/value store holding the data of a storage namespace
+
+    In multiprocess mode this is a SharedMemoryStore, read without IPC; writes
+    must hold the namespace lock. Otherwise (or with SHARED_MEMORY_STORE=false)
+    it is the namespace data of get_namespace_data.
+    """
+    if _shared_memory_dir is None:
+        return await get_namespace_data(namespace, workspace=workspace)
+
+    final_namespace = get_final_namespace(namespace, workspace)
+    store = _shared_memory_stores.get(final_namespace)
+    if store is None:
+        file_name = hashlib.md5(final_namespace.encode("utf-8")).hexdigest()
+        store = SharedMemoryStore(os.path.join(_shared_memory_dir, file_name))
+        _shared_memory_stores[final_namespace] = store
+    return store
+
+
 class NamespaceLock:
     """
     Reusable namespace lock wrapper that creates a fresh context on each use.
@@ -1585,7 +1896,9 @@ def finalize_share_data():
         _initialized, \
         _update_flags, \
         _async_locks, \
-        _default_workspace
+        _default_workspace, \
+        _shared_memory_dir, \
+        _shared_memory_owner
 
     # Check if already initialized
     if not _initialized:
@@ -1638,6 +1951,14 @@ def finalize_share_data():
                 f"Process {os.getpid()} Error shutting down Manager: {e}", level="ERROR"
             )
 
+    # Remove the memory-mapped stores (mappings stay valid until released)
+    _shared_memory_stores.clear()
+    _update_flag_proxies.clear()
+    if _shared_memory_dir is not None and _shared_memory_owner == os.getpid():
+        shutil.rmtree(_shared_memory_dir, ignore_errors=True)
+    _shared_memory_dir = None
+    _shared_memory_owner = None
+
     # Reset global variables
     _manager = None
     _initialized = None
@@ -7,6 +7,8 @@ import inspect
 import os
 import time
 import warnings
+from collections import OrderedDict
+from contextlib import nullcontext
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from functools import partial
@@ -37,12 +39,24 @@ from lightrag.constants import (
     DEFAULT_COSINE_THRESHOLD,
     DEFAULT_RELATED_CHUNK_NUMBER,
     DEFAULT_KG_CHUNK_PICK_METHOD,
+    DEFAULT_RETRIEVAL_CACHE_MAX_SIZE,
+    DEFAULT_RETRIEVAL_CACHE_TTL,
     DEFAULT_MIN_RERANK_SCORE,
     DEFAULT_SUMMARY_MAX_TOKENS,
     DEFAULT_SUMMARY_CONTEXT_SIZE,
+    DEFAULT_SUMMARY_MAP_MAX_ASYNC,
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_MAX_DELETE_BATCH_SIZE,
+    DEFAULT_GRAPH_BULK_MERGE,
+    DEFAULT_VECTOR_UPSERT_BATCHING,
+    DEFAULT_EXTRACTION_SCHEDULER,
+    DEFAULT_ADAPTIVE_MAX_ASYNC,
+    DEFAULT_ADAPTIVE_INITIAL_ASYNC,
+    DEFAULT_LLM_TOKENS_PER_MINUTE,
+    DEFAULT_TOKENIZER_BACKEND,
+    DEFAULT_TOKEN_COUNT_MODE,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_MAX_SOURCE_IDS_PER_ENTITY,
     DEFAULT_MAX_SOURCE_IDS_PER_RELATION,
@@ -63,6 +77,7 @@ from lightrag.kg import (
 
 
 from lightrag.kg.shared_storage import (
+    bump_storage_generation,
     get_namespace_data,
     get_data_init_lock,
     get_default_workspace,
@@ -86,6 +101,7 @@ from lightrag.base import (
 )
 from lightrag.namespace import NameSpace
 from lightrag.operate import (
+    ExtractionScheduler,
     chunking_by_token_size,
     extract_entities,
     merge_nodes_and_edges,
@@ -97,6 +113,9 @@ from lightrag.constants import GRAPH_FIELD_SEP
 from lightrag.utils import (
     Tokenizer,
     TiktokenTokenizer,
+    HuggingFaceTokenizer,
+    acquire_client_pools,
+    release_client_pools,
     EmbeddingFunc,
     always_get_an_event_loop,
     compute_mdhash_id,
@@ -238,6 +257,20 @@ class LightRAG:
     tiktoken_model_name: str = field(default="gpt-4o-mini")
     """Model name used for tokenization when chunking text with tiktoken. Defaults to `gpt-4o-mini`."""
 
+    tokenizer_backend: str = field(
+        default=get_env_value("TOKENIZER_BACKEND", DEFAULT_TOKENIZER_BACKEND, str)
+    )
+    """Backend of the default tokenizer: `tiktoken` or `huggingface` (HuggingFace `tokenizers`)."""
+
+    tokenizer_model: str = field(default=get_env_value("TOKENIZER_MODEL", "", str))
+    """Tokenizer.json path or HuggingFace Hub model id used by the `huggingface` tokenizer backend."""
+
+    token_count_mode: str = field(
+        default=get_env_value("TOKEN_COUNT_MODE", DEFAULT_TOKEN_COUNT_MODE, str)
+    )
+    """`exact` or `estimate`: token budget checks on retrieved context and descriptions use calibrated estimates.
+    Applies to the tokenizer LightRAG creates; a provided tokenizer keeps its own `count_mode`."""
+
     chunking_func: Callable[
         [
             Tokenizer,
@@ -264,12 +297,17 @@ class LightRAG:
         - `chunk_token_size`: The maximum number of tokens per chunk.
 
 
-    The function should return a list of dictionaries (or an awaitable that resolves to a list),
+    The function should return a list of dictionaries (or an awaitable that resolves to a list,
+    or a sync/async generator such as `iter_chunks_by_token_size`),
     where each dictionary contains the following keys:
         - `tokens` (int): The number of tokens in the chunk.
         - `content` (str): The text content of the chunk.
         - `chunk_order_index` (int): Zero-based index indicating the chunk's order in the document.
 
+    Generators are accepted but drained into a list before extraction, since the document's
+    chunk list is stored as a whole; they bound the chunker's own working memory, not the
+    number of chunks held per document.
+
     Defaults to `chunking_by_token_size` if not specified.
     """
 
@@ -333,11 +371,38 @@ class LightRAG:
     )
     """Recommended length of LLM summary output."""
 
+    summary_map_max_async: int = field(
+        default=int(os.getenv("SUMMARY_MAP_MAX_ASYNC", DEFAULT_SUMMARY_MAP_MAX_ASYNC))
+    )
+    """Maximum concurrent group summaries in the map phase of a single entity or relation
+    description summary. 0 uses half of llm_model_max_async."""
+
     llm_model_max_async: int = field(
         default=int(os.getenv("MAX_ASYNC", DEFAULT_MAX_ASYNC))
     )
     """Maximum number of concurrent LLM calls."""
 
+    adaptive_max_async: bool = field(
+        default=get_env_value("ADAPTIVE_MAX_ASYNC", DEFAULT_ADAPTIVE_MAX_ASYNC, bool)
+    )
+    """Adapt the number of concurrent LLM calls to provider latency, errors and rate
+    limits, starting from adaptive_initial_async. llm_model_max_async is then the
+    upper bound."""
+
+    adaptive_initial_async: int = field(
+        default=get_env_value(
+            "ADAPTIVE_INITIAL_ASYNC", DEFAULT_ADAPTIVE_INITIAL_ASYNC, int
+        )
+    )
+    """Starting number of concurrent LLM calls when adaptive_max_async is enabled."""
+
+    llm_tokens_per_minute: int = field(
+        default=get_env_value(
+            "LLM_TOKENS_PER_MINUTE", DEFAULT_LLM_TOKENS_PER_MINUTE, int
+        )
+    )
+    """Estimated prompt tokens all LLM calls may send per minute. 0 means unlimited."""
+
     llm_model_kwargs: dict[str, Any] = field(default_factory=dict)
     """Additional keyword arguments passed to the LLM model function."""
 
@@ -368,6 +433,18 @@ class LightRAG:
     enable_llm_cache_for_entity_extract: bool = field(default=True)
     """If True, enables caching for entity extraction steps to reduce LLM costs."""
 
+    retrieval_cache_max_size: int = field(
+        default=get_env_value(
+            "RETRIEVAL_CACHE_MAX_SIZE", DEFAULT_RETRIEVAL_CACHE_MAX_SIZE, int
+        )
+    )
+    """Max number of built query contexts cached by this instance (0 disables the retrieval cache)."""
+
+    retrieval_cache_ttl: int = field(
+        default=get_env_value("RETRIEVAL_CACHE_TTL", DEFAULT_RETRIEVAL_CACHE_TTL, int)
+    )
+    """Seconds a cached query context stays valid. Entries are also dropped whenever indexed data changes."""
+
     # Extensions
     # ---
 
@@ -376,6 +453,44 @@ class LightRAG:
     )
     """Maximum number of parallel insert operations."""
 
+    max_delete_batch_size: int = field(
+        default=get_env_value(
+            "MAX_DELETE_BATCH_SIZE", DEFAULT_MAX_DELETE_BATCH_SIZE, int
+        )
+    )
+    """Maximum number of documents a background deletion job removes in one
+    adelete_by_doc_ids call. Cancellation is checked and progress is reported
+    between batches."""
+
+    graph_bulk_merge: bool = field(
+        default=get_env_value("GRAPH_BULK_MERGE", DEFAULT_GRAPH_BULK_MERGE, bool)
+    )
+    """Prefetch every node, edge and chunk-tracking record a document touches in batched
+    calls and write merged results back in batches, holding the entity locks for each
+    merge phase. Cuts round trips for remote graph backends. The locks stay held across the
+    phase's LLM summaries, so concurrent documents that share an entity merge one after
+    the other instead of interleaving per entity."""
+
+    vector_upsert_batching: bool = field(
+        default=get_env_value(
+            "VECTOR_UPSERT_BATCHING", DEFAULT_VECTOR_UPSERT_BATCHING, bool
+        )
+    )
+    """Coalesce the single-record entity and relation vector upserts of concurrent
+    merge tasks into embedding_batch_num sized requests. Each task waits for its
+    batch under its entity lock, so this only pays off when merge concurrency
+    (2 x llm_model_max_async) exceeds the concurrency of the embedding service."""
+
+    extraction_scheduler: bool = field(
+        default=get_env_value(
+            "EXTRACTION_SCHEDULER", DEFAULT_EXTRACTION_SCHEDULER, bool
+        )
+    )
+    """Run the chunk extraction of all documents in a pipeline run from one queue of
+    llm_model_max_async slots, shared round-robin between documents. Documents are
+    admitted while the queue is short, and max_parallel_insert limits concurrent merges
+    instead of concurrent documents."""
+
     max_graph_nodes: int = field(
         default=get_env_value("MAX_GRAPH_NODES", DEFAULT_MAX_GRAPH_NODES, int)
     )
@@ -494,11 +609,30 @@ class LightRAG:
 
         # Init Tokenizer
         # Post-initialization hook to handle backward compatabile tokenizer initialization based on provided parameters
+        if self.token_count_mode not in ("exact", "estimate"):
+            raise ValueError(f"Invalid token_count_mode: {self.token_count_mode}")
         if self.tokenizer is None:
-            if self.tiktoken_model_name:
-                self.tokenizer = TiktokenTokenizer(self.tiktoken_model_name)
+            if self.tokenizer_backend == "huggingface":
+                if not self.tokenizer_model:
+                    raise ValueError(
+                        "TOKENIZER_MODEL is required for the huggingface tokenizer backend"
+                    )
+                self.tokenizer = HuggingFaceTokenizer(
+                    self.tokenizer_model, count_mode=self.token_count_mode
+                )
+            elif self.tokenizer_backend != "tiktoken":
+                raise ValueError(f"Invalid tokenizer_backend: {self.tokenizer_backend}")
+            elif self.tiktoken_model_name:
+                self.tokenizer = TiktokenTokenizer(
+                    self.tiktoken_model_name, count_mode=self.token_count_mode
+                )
             else:
-                self.tokenizer = TiktokenTokenizer()
+                self.tokenizer = TiktokenTokenizer(count_mode=self.token_count_mode)
+        elif self.tokenizer.count_mode != self.token_count_mode:
+            # A caller-supplied tokenizer may be shared, so it is left as is
+            logger.warning(
+                f"token_count_mode={self.token_count_mode} ignored: the provided tokenizer counts in {self.tokenizer.count_mode} mode"
+            )
 
         # Initialize ollama_server_infos if not provided
         if self.ollama_server_infos is None:
@@ -648,6 +782,9 @@ class LightRAG:
             self.llm_model_max_async,
             llm_timeout=self.default_llm_timeout,
             queue_name="LLM func",
+            adaptive=self.adaptive_max_async,
+            initial_size=min(self.adaptive_initial_async, self.llm_model_max_async),
+            tokens_per_minute=self.llm_tokens_per_minute,
         )(
             partial(
                 self.llm_model_func,  # type: ignore
@@ -656,6 +793,9 @@ class LightRAG:
             )
         )
 
+        # Retrieval cache owned by this instance (see kg_query): key -> (expires_at, context)
+        self._query_context_cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
         self._storages_status = StoragesStatus.CREATED
 
     async def initialize_storages(self):
@@ -695,6 +835,9 @@ class LightRAG:
                     # logger.debug(f"Initializing storage: {storage}")
                     await storage.initialize()
 
+            # Rerank and LLM client connections are kept alive while the instance is initialized
+            acquire_client_pools()
+
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("All storage types initialized")
 
@@ -744,6 +887,8 @@ class LightRAG:
             else:
                 logger.debug("All storages finalized successfully")
 
+            await release_client_pools()
+
             self._storages_status = StoragesStatus.FINALIZED
 
     async def check_and_migrate_data(self):
@@ -1730,6 +1875,17 @@ class LightRAG:
                 processed_count = 0
                 # Create a semaphore to limit the number of concurrent file processing
                 semaphore = asyncio.Semaphore(self.max_parallel_insert)
+                # With the extraction scheduler, documents are admitted by the
+                # scheduler and the semaphore only limits concurrent merges
+                extraction_scheduler = (
+                    ExtractionScheduler(
+                        self.llm_model_max_async,
+                        max_documents=self.max_parallel_insert
+                        + self.llm_model_max_async,
+                    )
+                    if self.extraction_scheduler
+                    else None
+                )
 
                 async def process_document(
                     doc_id: str,
@@ -1748,8 +1904,14 @@ class LightRAG:
                     processing_start_time = int(time.time())
                     first_stage_tasks = []
                     entity_relation_task = None
+                    if extraction_scheduler is not None:
+                        document_slot = extraction_scheduler.document(doc_id)
+                        merge_slot = semaphore
+                    else:
+                        document_slot = semaphore
+                        merge_slot = nullcontext()
 
-                    async with semaphore:
+                    async with document_slot:
                         nonlocal processed_count
                         # Initialize to prevent UnboundLocalError in error handling
                         first_stage_tasks = []
@@ -1812,10 +1974,17 @@ class LightRAG:
                             if inspect.isawaitable(chunking_result):
                                 chunking_result = await chunking_result
 
+                            # Drain streaming chunkers (sync or async generators): chunks
+                            # are stored and extracted per document as a whole list
+                            if inspect.isasyncgen(chunking_result):
+                                chunking_result = [dp async for dp in chunking_result]
+                            elif isinstance(chunking_result, Iterator):
+                                chunking_result = list(chunking_result)
+
                             # Validate return type
                             if not isinstance(chunking_result, (list, tuple)):
                                 raise TypeError(
-                                    f"chunking_func must return a list or tuple of dicts, "
+                                    f"chunking_func must return a list, tuple or iterator of dicts, "
                                     f"got {type(chunking_result)}"
                                 )
 
@@ -1888,7 +2057,11 @@ class LightRAG:
                             # Stage 2: Process entity relation graph (after text_chunks are saved)
                             entity_relation_task = asyncio.create_task(
                                 self._process_extract_entities(
-                                    chunks, pipeline_status, pipeline_status_lock
+                                    chunks,
+                                    pipeline_status,
+                                    pipeline_status_lock,
+                                    extraction_scheduler=extraction_scheduler,
+                                    doc_id=doc_id,
                                 )
                             )
                             chunk_results = await entity_relation_task
@@ -1973,25 +2146,26 @@ class LightRAG:
                                             "User cancelled"
                                         )
 
-                                # Use chunk_results from entity_relation_task
-                                await merge_nodes_and_edges(
-                                    chunk_results=chunk_results,  # result collected from entity_relation_task
-                                    knowledge_graph_inst=self.chunk_entity_relation_graph,
-                                    entity_vdb=self.entities_vdb,
-                                    relationships_vdb=self.relationships_vdb,
-                                    global_config=asdict(self),
-                                    full_entities_storage=self.full_entities,
-                                    full_relations_storage=self.full_relations,
-                                    doc_id=doc_id,
-                                    pipeline_status=pipeline_status,
-                                    pipeline_status_lock=pipeline_status_lock,
-                                    llm_response_cache=self.llm_response_cache,
-                                    entity_chunks_storage=self.entity_chunks,
-                                    relation_chunks_storage=self.relation_chunks,
-                                    current_file_number=current_file_number,
-                                    total_files=total_files,
-                                    file_path=file_path,
-                                )
+                                async with merge_slot:
+                                    # Use chunk_results from entity_relation_task
+                                    await merge_nodes_and_edges(
+                                        chunk_results=chunk_results,  # result collected from entity_relation_task
+                                        knowledge_graph_inst=self.chunk_entity_relation_graph,
+                                        entity_vdb=self.entities_vdb,
+                                        relationships_vdb=self.relationships_vdb,
+                                        global_config=asdict(self),
+                                        full_entities_storage=self.full_entities,
+                                        full_relations_storage=self.full_relations,
+                                        doc_id=doc_id,
+                                        pipeline_status=pipeline_status,
+                                        pipeline_status_lock=pipeline_status_lock,
+                                        llm_response_cache=self.llm_response_cache,
+                                        entity_chunks_storage=self.entity_chunks,
+                                        relation_chunks_storage=self.relation_chunks,
+                                        current_file_number=current_file_number,
+                                        total_files=total_files,
+                                        file_path=file_path,
+                                    )
 
                                 # Record processing end time
                                 processing_end_time = int(time.time())
@@ -2157,7 +2331,12 @@ class LightRAG:
                 pipeline_status["history_messages"].append(log_message)
 
     async def _process_extract_entities(
-        self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
+        self,
+        chunk: dict[str, Any],
+        pipeline_status=None,
+        pipeline_status_lock=None,
+        extraction_scheduler: ExtractionScheduler | None = None,
+        doc_id: str | None = None,
     ) -> list:
         try:
             chunk_results = await extract_entities(
@@ -2167,6 +2346,8 @@ class LightRAG:
                 pipeline_status_lock=pipeline_status_lock,
                 llm_response_cache=self.llm_response_cache,
                 text_chunks_storage=self.text_chunks,
+                extraction_scheduler=extraction_scheduler,
+                doc_id=doc_id,
             )
             return chunk_results
         except Exception as e:
@@ -2199,6 +2380,7 @@ class LightRAG:
             if storage_inst is not None
         ]
         await asyncio.gather(*tasks)
+        await bump_storage_generation(self.workspace)
 
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
@@ -2614,6 +2796,7 @@ class LightRAG:
                 hashing_kv=self.llm_response_cache,
                 system_prompt=None,
                 chunks_vdb=self.chunks_vdb,
+                query_context_cache=self._query_context_cache,
             )
         elif data_param.mode == "naive":
             logger.debug(f"[aquery_data] Using naive_query for mode: {data_param.mode}")
@@ -2711,6 +2894,7 @@ class LightRAG:
                     hashing_kv=self.llm_response_cache,
                     system_prompt=system_prompt,
                     chunks_vdb=self.chunks_vdb,
+                    query_context_cache=self._query_context_cache,
                 )
             elif param.mode == "naive":
                 query_result = await naive_query(
@@ -2945,44 +3129,82 @@ class LightRAG:
     ) -> DeletionResult:
         """Delete a document and all its related data, including chunks, graph elements.
 
-        This method orchestrates a comprehensive deletion process for a given document ID.
-        It ensures that not only the document itself but also all its derived and associated
-        data across different storage layers are removed or rebuiled. If entities or relationships
-        are partially affected, they will be rebuilded using LLM cached from remaining documents.
+        Single-document form of adelete_by_doc_ids(), which describes the deletion
+        steps and the pipeline concurrency control.
+
+        Args:
+            doc_id (str): The unique identifier of the document to be deleted.
+            delete_llm_cache (bool): Whether to delete cached LLM extraction results
+                associated with the document. Defaults to False.
+
+        Returns:
+            DeletionResult: An object containing the outcome of the deletion process.
+                - `status` (str): "success", "not_found", "not_allowed", or "failure".
+                - `doc_id` (str): The ID of the document attempted to be deleted.
+                - `message` (str): A summary of the operation's result.
+                - `status_code` (int): HTTP status code (e.g., 200, 404, 403, 500).
+                - `file_path` (str | None): The file path of the deleted document, if available.
+        """
+        results = await self.adelete_by_doc_ids(
+            [doc_id], delete_llm_cache=delete_llm_cache
+        )
+        return results[0]
+
+    async def adelete_by_doc_ids(
+        self, doc_ids: list[str], delete_llm_cache: bool = False
+    ) -> list[DeletionResult]:
+        """Delete documents and all their related data, including chunks, graph elements.
+
+        The documents are deleted in one pass: the chunks of all of them are removed
+        together, each affected entity and relationship is analyzed once against the
+        union of removed chunks, entities and relationships that keep chunks from other
+        documents are rebuilt once using the LLM cache of the remaining chunks, and
+        vector / KV deletions are batched. Storages are persisted once at the end.
+        Progress is reported through pipeline_status.
 
         **Concurrency Control Design:**
 
         This function implements a pipeline-based concurrency control to prevent data corruption:
 
-        1. **Single Document Deletion** (when WE acquire pipeline):
-           - Sets job_name to "Single document deletion" (NOT starting with "deleting")
-           - Prevents other adelete_by_doc_id calls from running concurrently
+        1. **Standalone Deletion** (when WE acquire pipeline):
+           - Sets job_name to "Single document deletion" or "Batch document deletion"
+             (NOT starting with "deleting")
+           - Prevents other adelete_by_doc_id(s) calls from running concurrently
            - Ensures exclusive access to graph operations for this deletion
 
-        2. **Batch Document Deletion** (when background_delete_documents acquires pipeline):
+        2. **Deletion Job** (when background_delete_documents acquires pipeline):
            - Sets job_name to "Deleting {N} Documents" (starts with "deleting")
-           - Allows multiple adelete_by_doc_id calls to join the deletion queue
+           - Allows adelete_by_doc_id(s) calls to run as part of the job
            - Each call validates the job name to ensure it's part of a deletion operation
 
         The validation logic `if not job_name.startswith("deleting") or "document" not in job_name`
         ensures that:
-        - adelete_by_doc_id can only run when pipeline is idle OR during batch deletion
-        - Prevents concurrent single deletions that could cause race conditions
+        - adelete_by_doc_ids can only run when pipeline is idle OR during a deletion job
+        - Prevents concurrent standalone deletions that could cause race conditions
         - Rejects operations when pipeline is busy with non-deletion tasks
 
+        A cancellation requested through pipeline_status before the deletion starts
+        modifying storages leaves all documents in place.
+
         Args:
-            doc_id (str): The unique identifier of the document to be deleted.
+            doc_ids (list[str]): The unique identifiers of the documents to be deleted.
             delete_llm_cache (bool): Whether to delete cached LLM extraction results
-                associated with the document. Defaults to False.
+                associated with the documents. Defaults to False.
 
         Returns:
-            DeletionResult: An object containing the outcome of the deletion process.
-                - `status` (str): "success", "not_found", "not_allowed", or "failure".
-                - `doc_id` (str): The ID of the document attempted to be deleted.
-                - `message` (str): A summary of the operation's result.
-                - `status_code` (int): HTTP status code (e.g., 200, 404, 403, 500).
-                - `file_path` (str | None): The file path of the deleted document, if available.
+            list[DeletionResult]: One result per entry of doc_ids, in the same order
+                (see adelete_by_doc_id). Documents that were found share the outcome
+                of the batch.
         """
+        if not doc_ids:
+            return []
+        unique_doc_ids = list(dict.fromkeys(doc_ids))
+        if len(unique_doc_ids) == 1:
+            target = f"document {unique_doc_ids[0]}"
+            target_name = f"document: {unique_doc_ids[0]}"
+        else:
+            target = target_name = f"{len(unique_doc_ids)} documents"
+
         # Get pipeline status shared data and lock for validation
         pipeline_status = await get_namespace_data(
             "pipeline_status", workspace=self.workspace
@@ -3002,128 +3224,153 @@ class LightRAG:
                 pipeline_status.update(
                     {
                         "busy": True,
-                        "job_name": "Single document deletion",
+                        "job_name": "Single document deletion"
+                        if len(unique_doc_ids) == 1
+                        else "Batch document deletion",
                         "job_start": datetime.now(timezone.utc).isoformat(),
-                        "docs": 1,
+                        "docs": len(unique_doc_ids),
                         "batchs": 1,
                         "cur_batch": 0,
                         "request_pending": False,
                         "cancellation_requested": False,
-                        "latest_message": f"Starting deletion for document: {doc_id}",
+                        "latest_message": f"Starting deletion for {target_name}",
                     }
                 )
                 # Initialize history messages
                 pipeline_status["history_messages"][:] = [
-                    f"Starting deletion for document: {doc_id}"
+                    f"Starting deletion for {target_name}"
                 ]
             else:
                 # Pipeline already busy - verify it's a deletion job
                 job_name = pipeline_status.get("job_name", "").lower()
                 if not job_name.startswith("deleting") or "document" not in job_name:
-                    return DeletionResult(
-                        status="not_allowed",
-                        doc_id=doc_id,
-                        message=f"Deletion not allowed: current job '{pipeline_status.get('job_name')}' is not a document deletion job",
-                        status_code=403,
-                        file_path=None,
-                    )
+                    return [
+                        DeletionResult(
+                            status="not_allowed",
+                            doc_id=doc_id,
+                            message=f"Deletion not allowed: current job '{pipeline_status.get('job_name')}' is not a document deletion job",
+                            status_code=403,
+                            file_path=None,
+                        )
+                        for doc_id in doc_ids
+                    ]
                 # Pipeline is busy with deletion - proceed without acquiring
 
+        results: dict[str, DeletionResult] = {}
+        found_doc_ids: list[str] = []
+        file_paths: dict[str, str | None] = {}
         deletion_operations_started = False
         original_exception = None
         doc_llm_cache_ids: list[str] = []
 
+        def outcome(
+            status: str, message: str, status_code: int
+        ) -> list[DeletionResult]:
+            """Give every found document the same outcome and return all results"""
+            for doc_id in found_doc_ids:
+                results[doc_id] = DeletionResult(
+                    status=status,
+                    doc_id=doc_id,
+                    message=message,
+                    status_code=status_code,
+                    file_path=file_paths.get(doc_id),
+                )
+            return [results[doc_id] for doc_id in doc_ids]
+
         async with pipeline_status_lock:
-            log_message = f"Starting deletion process for document {doc_id}"
+            log_message = f"Starting deletion process for {target}"
             logger.info(log_message)
             pipeline_status["latest_message"] = log_message
             pipeline_status["history_messages"].append(log_message)
 
         try:
             # 1. Get the document status and related data
-            doc_status_data = await self.doc_status.get_by_id(doc_id)
-            file_path = doc_status_data.get("file_path") if doc_status_data else None
-            if not doc_status_data:
-                logger.warning(f"Document {doc_id} not found")
-                return DeletionResult(
-                    status="not_found",
-                    doc_id=doc_id,
-                    message=f"Document {doc_id} not found.",
-                    status_code=404,
-                    file_path="",
-                )
-
-            # Check document status and log warning for non-completed documents
-            raw_status = doc_status_data.get("status")
-            try:
-                doc_status = DocStatus(raw_status)
-            except ValueError:
-                doc_status = raw_status
-
-            if doc_status != DocStatus.PROCESSED:
-                if doc_status == DocStatus.PENDING:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PENDING)"
-                    )
-                elif doc_status == DocStatus.PROCESSING:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PROCESSING)"
-                    )
-                elif doc_status == DocStatus.PREPROCESSED:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PREPROCESSED)"
-                    )
-                elif doc_status == DocStatus.FAILED:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: FAILED)"
-                    )
-                else:
-                    status_text = (
-                        doc_status.value
-                        if isinstance(doc_status, DocStatus)
-                        else str(doc_status)
-                    )
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: {status_text})"
+            doc_status_list = await self.doc_status.get_by_ids(unique_doc_ids)
+            chunk_ids: set[str] = set()
+            for doc_id, doc_status_data in zip(unique_doc_ids, doc_status_list):
+                if not doc_status_data:
+                    logger.warning(f"Document {doc_id} not found")
+                    results[doc_id] = DeletionResult(
+                        status="not_found",
+                        doc_id=doc_id,
+                        message=f"Document {doc_id} not found.",
+                        status_code=404,
+                        file_path="",
                     )
-                logger.info(warning_msg)
-                # Update pipeline status for monitoring
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = warning_msg
-                    pipeline_status["history_messages"].append(warning_msg)
+                    continue
+                file_path = doc_status_data.get("file_path")
+                file_paths[doc_id] = file_path
+                found_doc_ids.append(doc_id)
+
+                # Check document status and log warning for non-completed documents
+                raw_status = doc_status_data.get("status")
+                try:
+                    doc_status = DocStatus(raw_status)
+                except ValueError:
+                    doc_status = raw_status
+
+                if doc_status != DocStatus.PROCESSED:
+                    if doc_status == DocStatus.PENDING:
+                        warning_msg = (
+                            f"Deleting {doc_id} {file_path}(previous status: PENDING)"
+                        )
+                    elif doc_status == DocStatus.PROCESSING:
+                        warning_msg = f"Deleting {doc_id} {file_path}(previous status: PROCESSING)"
+                    elif doc_status == DocStatus.PREPROCESSED:
+                        warning_msg = f"Deleting {doc_id} {file_path}(previous status: PREPROCESSED)"
+                    elif doc_status == DocStatus.FAILED:
+                        warning_msg = (
+                            f"Deleting {doc_id} {file_path}(previous status: FAILED)"
+                        )
+                    else:
+                        status_text = (
+                            doc_status.value
+                            if isinstance(doc_status, DocStatus)
+                            else str(doc_status)
+                        )
+                        warning_msg = f"Deleting {doc_id} {file_path}(previous status: {status_text})"
+                    logger.info(warning_msg)
+                    # Update pipeline status for monitoring
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = warning_msg
+                        pipeline_status["history_messages"].append(warning_msg)
+
+                # 2. Get chunk IDs from document status
+                chunk_ids.update(doc_status_data.get("chunks_list", []))
+
+            if not found_doc_ids:
+                return [results[doc_id] for doc_id in doc_ids]
 
-            # 2. Get chunk IDs from document status
-            chunk_ids = set(doc_status_data.get("chunks_list", []))
+            async with pipeline_status_lock:
+                if pipeline_status.get("cancellation_requested", False):
+                    log_message = f"Deletion of {target} cancelled by user"
+                    logger.info(log_message)
+                    pipeline_status["latest_message"] = log_message
+                    pipeline_status["history_messages"].append(log_message)
+                    return outcome("fail", log_message, 500)
 
             if not chunk_ids:
-                logger.warning(f"No chunks found for document {doc_id}")
+                logger.warning(f"No chunks found for {target}")
                 # Mark that deletion operations have started
                 deletion_operations_started = True
                 try:
                     # Still need to delete the doc status and full doc
-                    await self.full_docs.delete([doc_id])
-                    await self.doc_status.delete([doc_id])
+                    await self.full_docs.delete(found_doc_ids)
+                    await self.doc_status.delete(found_doc_ids)
                 except Exception as e:
-                    logger.error(
-                        f"Failed to delete document {doc_id} with no chunks: {e}"
-                    )
+                    logger.error(f"Failed to delete {target} with no chunks: {e}")
                     raise Exception(f"Failed to delete document entry: {e}") from e
 
                 async with pipeline_status_lock:
-                    log_message = (
-                        f"Document deleted without associated chunks: {doc_id}"
-                    )
+                    if len(found_doc_ids) == 1:
+                        log_message = f"Document deleted without associated chunks: {found_doc_ids[0]}"
+                    else:
+                        log_message = f"{len(found_doc_ids)} documents deleted without associated chunks"
                     logger.info(log_message)
                     pipeline_status["latest_message"] = log_message
                     pipeline_status["history_messages"].append(log_message)
 
-                return DeletionResult(
-                    status="success",
-                    doc_id=doc_id,
-                    message=log_message,
-                    status_code=200,
-                    file_path=file_path,
-                )
+                return outcome("success", log_message, 200)
 
             # Mark that deletion operations have started
             deletion_operations_started = True
@@ -3131,13 +3378,13 @@ class LightRAG:
             if delete_llm_cache and chunk_ids:
                 if not self.llm_response_cache:
                     logger.info(
-                        "Skipping LLM cache collection for document %s because cache storage is unavailable",
-                        doc_id,
+                        "Skipping LLM cache collection for %s because cache storage is unavailable",
+                        target,
                     )
                 elif not self.text_chunks:
                     logger.info(
-                        "Skipping LLM cache collection for document %s because text chunk storage is unavailable",
-                        doc_id,
+                        "Skipping LLM cache collection for %s because text chunk storage is unavailable",
+                        target,
                     )
                 else:
                     try:
@@ -3161,22 +3408,20 @@ class LightRAG:
                                     seen_cache_ids.add(cache_id)
                         if doc_llm_cache_ids:
                             logger.info(
-                                "Collected %d LLM cache entries for document %s",
+                                "Collected %d LLM cache entries for %s",
                                 len(doc_llm_cache_ids),
-                                doc_id,
+                                target,
                             )
                         else:
-                            logger.info(
-                                "No LLM cache entries found for document %s", doc_id
-                            )
+                            logger.info("No LLM cache entries found for %s", target)
                     except Exception as cache_collect_error:
                         logger.error(
-                            "Failed to collect LLM cache ids for document %s: %s",
-                            doc_id,
+                            "Failed to collect LLM cache ids for %s: %s",
+                            target,
                             cache_collect_error,
                         )
                         raise Exception(
-                            f"Failed to collect LLM cache ids for document {doc_id}: {cache_collect_error}"
+                            f"Failed to collect LLM cache ids for {target}: {cache_collect_error}"
                         ) from cache_collect_error
 
             # 4. Analyze entities and relationships that will be affected
@@ -3189,15 +3434,31 @@ class LightRAG:
 
             try:
                 # Get affected entities and relations from full_entities and full_relations storage
-                doc_entities_data = await self.full_entities.get_by_id(doc_id)
-                doc_relations_data = await self.full_relations.get_by_id(doc_id)
+                doc_entities_list = await self.full_entities.get_by_ids(found_doc_ids)
+                doc_relations_list = await self.full_relations.get_by_ids(found_doc_ids)
+                # Documents sharing entities or relations list them only once
+                entity_names = list(
+                    dict.fromkeys(
+                        entity_name
+                        for doc_entities_data in doc_entities_list
+                        if doc_entities_data
+                        for entity_name in doc_entities_data.get("entity_names", [])
+                    )
+                )
+                relation_pairs = list(
+                    dict.fromkeys(
+                        (pair[0], pair[1])
+                        for doc_relations_data in doc_relations_list
+                        if doc_relations_data
+                        for pair in doc_relations_data.get("relation_pairs", [])
+                    )
+                )
 
                 affected_nodes = []
                 affected_edges = []
 
                 # Get entity data from graph storage using entity names from full_entities
-                if doc_entities_data and "entity_names" in doc_entities_data:
-                    entity_names = doc_entities_data["entity_names"]
+                if entity_names:
                     # get_nodes_batch returns dict[str, dict], need to convert to list[dict]
                     nodes_dict = await self.chunk_entity_relation_graph.get_nodes_batch(
                         entity_names
@@ -3211,18 +3472,16 @@ class LightRAG:
                             affected_nodes.append(node_data)
 
                 # Get relation data from graph storage using relation pairs from full_relations
-                if doc_relations_data and "relation_pairs" in doc_relations_data:
-                    relation_pairs = doc_relations_data["relation_pairs"]
+                if relation_pairs:
                     edge_pairs_dicts = [
-                        {"src": pair[0], "tgt": pair[1]} for pair in relation_pairs
+                        {"src": src, "tgt": tgt} for src, tgt in relation_pairs
                     ]
                     # get_edges_batch returns dict[tuple[str, str], dict], need to convert to list[dict]
                     edges_dict = await self.chunk_entity_relation_graph.get_edges_batch(
                         edge_pairs_dicts
                     )
 
-                    for pair in relation_pairs:
-                        src, tgt = pair[0], pair[1]
+                    for src, tgt in relation_pairs:
                         edge_key = (src, tgt)
                         edge_data = edges_dict.get(edge_key)
                         if edge_data:
@@ -3239,20 +3498,33 @@ class LightRAG:
 
             try:
                 # Process entities
+                node_labels = [
+                    node_data.get("entity_id")
+                    for node_data in affected_nodes
+                    if node_data.get("entity_id")
+                ]
+                stored_entity_chunks: dict[str, Any] = {}
+                if self.entity_chunks and node_labels:
+                    stored_entity_chunks = dict(
+                        zip(
+                            node_labels,
+                            await self.entity_chunks.get_by_ids(node_labels),
+                        )
+                    )
+
                 for node_data in affected_nodes:
                     node_label = node_data.get("entity_id")
                     if not node_label:
                         continue
 
                     existing_sources: list[str] = []
-                    if self.entity_chunks:
-                        stored_chunks = await self.entity_chunks.get_by_id(node_label)
-                        if stored_chunks and isinstance(stored_chunks, dict):
-                            existing_sources = [
-                                chunk_id
-                                for chunk_id in stored_chunks.get("chunk_ids", [])
-                                if chunk_id
-                            ]
+                    stored_chunks = stored_entity_chunks.get(node_label)
+                    if stored_chunks and isinstance(stored_chunks, dict):
+                        existing_sources = [
+                            chunk_id
+                            for chunk_id in stored_chunks.get("chunk_ids", [])
+                            if chunk_id
+                        ]
 
                     if not existing_sources and node_data.get("source_id"):
                         existing_sources = [
@@ -3287,33 +3559,38 @@ class LightRAG:
                     pipeline_status["history_messages"].append(log_message)
 
                 # Process relationships
+                # source target is not in normalize order in graph db property
+                edges_by_tuple: dict[tuple[str, str], dict] = {}
                 for edge_data in affected_edges:
-                    # source target is not in normalize order in graph db property
                     src = edge_data.get("source")
                     tgt = edge_data.get("target")
-
                     if not src or not tgt or "source_id" not in edge_data:
                         continue
+                    edges_by_tuple.setdefault(tuple(sorted((src, tgt))), edge_data)
+
+                stored_relation_chunks: dict[tuple[str, str], Any] = {}
+                if self.relation_chunks and edges_by_tuple:
+                    stored_relation_chunks = dict(
+                        zip(
+                            edges_by_tuple,
+                            await self.relation_chunks.get_by_ids(
+                                [
+                                    make_relation_chunk_key(*edge_tuple)
+                                    for edge_tuple in edges_by_tuple
+                                ]
+                            ),
+                        )
+                    )
 
-                    edge_tuple = tuple(sorted((src, tgt)))
-                    if (
-                        edge_tuple in relationships_to_delete
-                        or edge_tuple in relationships_to_rebuild
-                    ):
-                        continue
-
+                for edge_tuple, edge_data in edges_by_tuple.items():
                     existing_sources: list[str] = []
-                    if self.relation_chunks:
-                        storage_key = make_relation_chunk_key(src, tgt)
-                        stored_chunks = await self.relation_chunks.get_by_id(
-                            storage_key
-                        )
-                        if stored_chunks and isinstance(stored_chunks, dict):
-                            existing_sources = [
-                                chunk_id
-                                for chunk_id in stored_chunks.get("chunk_ids", [])
-                                if chunk_id
-                            ]
+                    stored_chunks = stored_relation_chunks.get(edge_tuple)
+                    if stored_chunks and isinstance(stored_chunks, dict):
+                        existing_sources = [
+                            chunk_id
+                            for chunk_id in stored_chunks.get("chunk_ids", [])
+                            if chunk_id
+                        ]
 
                     if not existing_sources:
                         existing_sources = [
@@ -3565,8 +3842,8 @@ class LightRAG:
 
             # 9. Delete from full_entities and full_relations storage
             try:
-                await self.full_entities.delete([doc_id])
-                await self.full_relations.delete([doc_id])
+                await self.full_entities.delete(found_doc_ids)
+                await self.full_relations.delete(found_doc_ids)
             except Exception as e:
                 logger.error(f"Failed to delete from full_entities/full_relations: {e}")
                 raise Exception(
@@ -3575,8 +3852,8 @@ class LightRAG:
 
             # 10. Delete original document and status
             try:
-                await self.full_docs.delete([doc_id])
-                await self.doc_status.delete([doc_id])
+                await self.full_docs.delete(found_doc_ids)
+                await self.doc_status.delete(found_doc_ids)
             except Exception as e:
                 logger.error(f"Failed to delete document and status: {e}")
                 raise Exception(f"Failed to delete document and status: {e}") from e
@@ -3584,40 +3861,30 @@ class LightRAG:
             if delete_llm_cache and doc_llm_cache_ids and self.llm_response_cache:
                 try:
                     await self.llm_response_cache.delete(doc_llm_cache_ids)
-                    cache_log_message = f"Successfully deleted {len(doc_llm_cache_ids)} LLM cache entries for document {doc_id}"
+                    cache_log_message = f"Successfully deleted {len(doc_llm_cache_ids)} LLM cache entries for {target}"
                     logger.info(cache_log_message)
                     async with pipeline_status_lock:
                         pipeline_status["latest_message"] = cache_log_message
                         pipeline_status["history_messages"].append(cache_log_message)
                     log_message = cache_log_message
                 except Exception as cache_delete_error:
-                    log_message = f"Failed to delete LLM cache for document {doc_id}: {cache_delete_error}"
+                    log_message = (
+                        f"Failed to delete LLM cache for {target}: {cache_delete_error}"
+                    )
                     logger.error(log_message)
                     logger.error(traceback.format_exc())
                     async with pipeline_status_lock:
                         pipeline_status["latest_message"] = log_message
                         pipeline_status["history_messages"].append(log_message)
 
-            return DeletionResult(
-                status="success",
-                doc_id=doc_id,
-                message=log_message,
-                status_code=200,
-                file_path=file_path,
-            )
+            return outcome("success", log_message, 200)
 
         except Exception as e:
             original_exception = e
-            error_message = f"Error while deleting document {doc_id}: {e}"
+            error_message = f"Error while deleting {target}: {e}"
             logger.error(error_message)
             logger.error(traceback.format_exc())
-            return DeletionResult(
-                status="fail",
-                doc_id=doc_id,
-                message=error_message,
-                status_code=500,
-                file_path=file_path,
-            )
+            return outcome("fail", error_message, 500)
 
         finally:
             # ALWAYS ensure persistence if any deletion operations were started
@@ -3625,24 +3892,22 @@ class LightRAG:
                 try:
                     await self._insert_done()
                 except Exception as persistence_error:
-                    persistence_error_msg = f"Failed to persist data after deletion attempt for {doc_id}: {persistence_error}"
+                    persistence_error_msg = f"Failed to persist data after deletion attempt for {target}: {persistence_error}"
                     logger.error(persistence_error_msg)
                     logger.error(traceback.format_exc())
 
                     # If there was no original exception, this persistence error becomes the main error
                     if original_exception is None:
-                        return DeletionResult(
-                            status="fail",
-                            doc_id=doc_id,
-                            message=f"Deletion completed but failed to persist changes: {persistence_error}",
-                            status_code=500,
-                            file_path=file_path,
+                        return outcome(
+                            "fail",
+                            f"Deletion completed but failed to persist changes: {persistence_error}",
+                            500,
                         )
                     # If there was an original exception, log the persistence error but don't override the original error
                     # The original error result was already returned in the except block
             else:
                 logger.debug(
-                    f"No deletion operations were started for document {doc_id}, skipping persistence"
+                    f"No deletion operations were started for {target}, skipping persistence"
                 )
 
             # Release pipeline only if WE acquired it
@@ -3650,9 +3915,7 @@ class LightRAG:
                 async with pipeline_status_lock:
                     pipeline_status["busy"] = False
                     pipeline_status["cancellation_requested"] = False
-                    completion_msg = (
-                        f"Deletion process completed for document: {doc_id}"
-                    )
+                    completion_msg = f"Deletion process completed for {target_name}"
                     pipeline_status["latest_message"] = completion_msg
                     pipeline_status["history_messages"].append(completion_msg)
                     logger.info(completion_msg)
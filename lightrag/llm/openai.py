@@ -1,4 +1,7 @@
 from ..utils import verbose_debug, VERBOSE_DEBUG
+import asyncio
+import importlib.util
+import json
 import os
 import logging
 
@@ -10,10 +13,12 @@ import pipmaster as pm
 if not pm.is_installed("openai"):
     pm.install("openai")
 
+import httpx
 from openai import (
     APIConnectionError,
     RateLimitError,
     APITimeoutError,
+    DefaultAsyncHttpxClient,
 )
 from tenacity import (
     retry,
@@ -25,6 +30,15 @@ from lightrag.utils import (
     wrap_embedding_func_with_attrs,
     safe_unicode_decode,
     logger,
+    compute_args_hash,
+    get_env_value,
+    register_client_pool,
+    report_rate_limit_before_retry,
+)
+from lightrag.constants import (
+    DEFAULT_OPENAI_MAX_CONNECTIONS,
+    DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_OPENAI_KEEPALIVE_EXPIRY,
 )
 
 from lightrag.types import GPTKeywordExtractionFormat
@@ -159,6 +173,114 @@ def create_openai_async_client(
         return AsyncOpenAI(**merged_configs)
 
 
+def create_pooled_http_client() -> httpx.AsyncClient:
+    """Create the httpx client backing a shared OpenAI client.
+
+    Pool limits come from OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE_CONNECTIONS
+    and OPENAI_KEEPALIVE_EXPIRY; HTTP/2 is enabled when the `h2` package is
+    installed and OPENAI_HTTP2 is not false.
+    """
+    http2 = get_env_value("OPENAI_HTTP2", True, bool) and (
+        importlib.util.find_spec("h2") is not None
+    )
+    limits = httpx.Limits(
+        max_connections=get_env_value(
+            "OPENAI_MAX_CONNECTIONS", DEFAULT_OPENAI_MAX_CONNECTIONS, int
+        ),
+        max_keepalive_connections=get_env_value(
+            "OPENAI_MAX_KEEPALIVE_CONNECTIONS",
+            DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            int,
+        ),
+        keepalive_expiry=get_env_value(
+            "OPENAI_KEEPALIVE_EXPIRY", DEFAULT_OPENAI_KEEPALIVE_EXPIRY, float
+        ),
+    )
+    return DefaultAsyncHttpxClient(http2=http2, limits=limits)
+
+
+class OpenAIClientRegistry:
+    """Long-lived AsyncOpenAI/AsyncAzureOpenAI clients shared across calls.
+
+    Clients are keyed by their configuration (endpoint, API key, Azure
+    settings, timeout and client_configs) and by event loop, so completion and
+    embedding calls to the same endpoint reuse one httpx connection pool
+    instead of opening new TLS connections for every request. Clients without
+    an http_client of their own in client_configs get one from
+    create_pooled_http_client().
+
+    Clients live for the process lifetime. LightRAG instances acquire() the
+    registry in initialize_storages and release() it in finalize_storages;
+    when the last one releases it the clients are closed, and the next call
+    creates new ones.
+    """
+
+    def __init__(self):
+        self._clients: dict[str, tuple[AsyncOpenAI, asyncio.AbstractEventLoop]] = {}
+        self._users = 0
+
+    def get(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        use_azure: bool = False,
+        azure_deployment: str | None = None,
+        api_version: str | None = None,
+        timeout: int | None = None,
+        client_configs: dict[str, Any] | None = None,
+    ) -> AsyncOpenAI:
+        """Return the shared client for this configuration, creating it if needed"""
+        client_args = dict(
+            api_key=api_key,
+            base_url=base_url,
+            use_azure=use_azure,
+            azure_deployment=azure_deployment,
+            api_version=api_version,
+            timeout=timeout,
+        )
+        key = compute_args_hash(
+            json.dumps(
+                {**client_args, "client_configs": client_configs or {}},
+                sort_keys=True,
+                default=repr,
+            )
+        )
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(key)
+        if entry is not None:
+            client, client_loop = entry
+            is_closed = getattr(client, "is_closed", None)
+            if client_loop is loop and not (is_closed and is_closed()):
+                return client
+
+        client_configs = dict(client_configs or {})
+        client_configs.setdefault("http_client", create_pooled_http_client())
+        client = create_openai_async_client(
+            client_configs=client_configs, **client_args
+        )
+        self._clients[key] = (client, loop)
+        return client
+
+    def acquire(self) -> None:
+        self._users += 1
+
+    async def release(self) -> None:
+        self._users = max(0, self._users - 1)
+        if self._users == 0:
+            await self.close()
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        loop = asyncio.get_running_loop()
+        for client, client_loop in clients.values():
+            # Clients of an event loop that is gone cannot be closed from here
+            if client_loop is loop:
+                await client.close()
+
+
+openai_client_registry = register_client_pool(OpenAIClientRegistry())
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -168,6 +290,7 @@ def create_openai_async_client(
         | retry_if_exception_type(APITimeoutError)
         | retry_if_exception_type(InvalidResponseError)
     ),
+    before_sleep=report_rate_limit_before_retry,
 )
 async def openai_complete_if_cache(
     model: str,
@@ -260,8 +383,8 @@ async def openai_complete_if_cache(
     if keyword_extraction:
         kwargs["response_format"] = GPTKeywordExtractionFormat
 
-    # Create the OpenAI client (supports both OpenAI and Azure)
-    openai_async_client = create_openai_async_client(
+    # Get the shared OpenAI client (supports both OpenAI and Azure)
+    openai_async_client = openai_client_registry.get(
         api_key=api_key,
         base_url=base_url,
         use_azure=use_azure,
@@ -311,21 +434,17 @@ async def openai_complete_if_cache(
             )
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
         raise
 
     if hasattr(response, "__aiter__"):
@@ -459,8 +578,6 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
                 raise
             finally:
                 # Final safety check for unclosed COT tags
@@ -492,104 +609,83 @@ async def openai_complete_if_cache(
                                 f"Unexpected error during stream response cleanup: {close_error}"
                             )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
-
         return inner()
 
     else:
-        try:
-            if (
-                not response
-                or not response.choices
-                or not hasattr(response.choices[0], "message")
-            ):
-                logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Invalid response from OpenAI API")
-
-            message = response.choices[0].message
-
-            # Handle parsed responses (structured output via response_format)
-            # When using beta.chat.completions.parse(), the response is in message.parsed
-            if hasattr(message, "parsed") and message.parsed is not None:
-                # Serialize the parsed structured response to JSON
-                final_content = message.parsed.model_dump_json()
-                logger.debug("Using parsed structured response from API")
-            else:
-                # Handle regular content responses
-                content = getattr(message, "content", None)
-                reasoning_content = getattr(message, "reasoning_content", "")
-
-                # Handle COT logic for non-streaming responses (only if enabled)
-                final_content = ""
-
-                if enable_cot:
-                    # Check if we should include reasoning content
-                    should_include_reasoning = False
-                    if reasoning_content and reasoning_content.strip():
-                        if not content or content.strip() == "":
-                            # Case 1: Only reasoning content, should include COT
-                            should_include_reasoning = True
-                            final_content = (
-                                content or ""
-                            )  # Use empty string if content is None
-                        else:
-                            # Case 3: Both content and reasoning_content present, ignore reasoning
-                            should_include_reasoning = False
-                            final_content = content
-                    else:
-                        # No reasoning content, use regular content
-                        final_content = content or ""
-
-                    # Apply COT wrapping if needed
-                    if should_include_reasoning:
-                        if r"\u" in reasoning_content:
-                            reasoning_content = safe_unicode_decode(
-                                reasoning_content.encode("utf-8")
-                            )
+        if (
+            not response
+            or not response.choices
+            or not hasattr(response.choices[0], "message")
+        ):
+            logger.error("Invalid response from OpenAI API")
+            raise InvalidResponseError("Invalid response from OpenAI API")
+
+        message = response.choices[0].message
+
+        # Handle parsed responses (structured output via response_format)
+        # When using beta.chat.completions.parse(), the response is in message.parsed
+        if hasattr(message, "parsed") and message.parsed is not None:
+            # Serialize the parsed structured response to JSON
+            final_content = message.parsed.model_dump_json()
+            logger.debug("Using parsed structured response from API")
+        else:
+            # Handle regular content responses
+            content = getattr(message, "content", None)
+            reasoning_content = getattr(message, "reasoning_content", "")
+
+            # Handle COT logic for non-streaming responses (only if enabled)
+            final_content = ""
+
+            if enable_cot:
+                # Check if we should include reasoning content
+                should_include_reasoning = False
+                if reasoning_content and reasoning_content.strip():
+                    if not content or content.strip() == "":
+                        # Case 1: Only reasoning content, should include COT
+                        should_include_reasoning = True
                         final_content = (
-                            f"<think>{reasoning_content}</think>{final_content}"
-                        )
+                            content or ""
+                        )  # Use empty string if content is None
+                    else:
+                        # Case 3: Both content and reasoning_content present, ignore reasoning
+                        should_include_reasoning = False
+                        final_content = content
                 else:
-                    # COT disabled, only use regular content
+                    # No reasoning content, use regular content
                     final_content = content or ""
 
-                # Validate final content
-                if not final_content or final_content.strip() == "":
-                    logger.error("Received empty content from OpenAI API")
-                    await openai_async_client.close()  # Ensure client is closed
-                    raise InvalidResponseError("Received empty content from OpenAI API")
+                # Apply COT wrapping if needed
+                if should_include_reasoning:
+                    if r"\u" in reasoning_content:
+                        reasoning_content = safe_unicode_decode(
+                            reasoning_content.encode("utf-8")
+                        )
+                    final_content = f"<think>{reasoning_content}</think>{final_content}"
+            else:
+                # COT disabled, only use regular content
+                final_content = content or ""
 
-            # Apply Unicode decoding to final content if needed
-            if r"\u" in final_content:
-                final_content = safe_unicode_decode(final_content.encode("utf-8"))
+            # Validate final content
+            if not final_content or final_content.strip() == "":
+                logger.error("Received empty content from OpenAI API")
+                raise InvalidResponseError("Received empty content from OpenAI API")
 
-            if token_tracker and hasattr(response, "usage"):
-                token_counts = {
-                    "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(
-                        response.usage, "completion_tokens", 0
-                    ),
-                    "total_tokens": getattr(response.usage, "total_tokens", 0),
-                }
-                token_tracker.add_usage(token_counts)
+        # Apply Unicode decoding to final content if needed
+        if r"\u" in final_content:
+            final_content = safe_unicode_decode(final_content.encode("utf-8"))
 
-            logger.debug(f"Response content len: {len(final_content)}")
-            verbose_debug(f"Response: {response}")
+        if token_tracker and hasattr(response, "usage"):
+            token_counts = {
+                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(response.usage, "completion_tokens", 0),
+                "total_tokens": getattr(response.usage, "total_tokens", 0),
+            }
+            token_tracker.add_usage(token_counts)
+
+        logger.debug(f"Response content len: {len(final_content)}")
+        verbose_debug(f"Response: {response}")
 
-            return final_content
-        finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+        return final_content
 
 
 async def openai_complete(
@@ -686,6 +782,7 @@ async def nvidia_openai_complete(
         | retry_if_exception_type(APIConnectionError)
         | retry_if_exception_type(APITimeoutError)
     ),
+    before_sleep=report_rate_limit_before_retry,
 )
 async def openai_embed(
     texts: list[str],
@@ -738,8 +835,8 @@ async def openai_embed(
         RateLimitError: If the OpenAI API rate limit is exceeded.
         APITimeoutError: If the OpenAI API request times out.
     """
-    # Create the OpenAI client (supports both OpenAI and Azure)
-    openai_async_client = create_openai_async_client(
+    # Get the shared OpenAI client (supports both OpenAI and Azure)
+    openai_async_client = openai_client_registry.get(
         api_key=api_key,
         base_url=base_url,
         use_azure=use_azure,
@@ -748,40 +845,39 @@ async def openai_embed(
         client_configs=client_configs,
     )
 
-    async with openai_async_client:
-        # Determine the correct model identifier to use
-        # For Azure OpenAI, we must use the deployment name instead of the model name
-        api_model = azure_deployment if use_azure and azure_deployment else model
-
-        # Prepare API call parameters
-        api_params = {
-            "model": api_model,
-            "input": texts,
-            "encoding_format": "base64",
-        }
+    # Determine the correct model identifier to use
+    # For Azure OpenAI, we must use the deployment name instead of the model name
+    api_model = azure_deployment if use_azure and azure_deployment else model
 
-        # Add dimensions parameter only if embedding_dim is provided
-        if embedding_dim is not None:
-            api_params["dimensions"] = embedding_dim
+    # Prepare API call parameters
+    api_params = {
+        "model": api_model,
+        "input": texts,
+        "encoding_format": "base64",
+    }
 
-        # Make API call
-        response = await openai_async_client.embeddings.create(**api_params)
+    # Add dimensions parameter only if embedding_dim is provided
+    if embedding_dim is not None:
+        api_params["dimensions"] = embedding_dim
 
-        if token_tracker and hasattr(response, "usage"):
-            token_counts = {
-                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                "total_tokens": getattr(response.usage, "total_tokens", 0),
-            }
-            token_tracker.add_usage(token_counts)
+    # Make API call
+    response = await openai_async_client.embeddings.create(**api_params)
 
-        return np.array(
-            [
-                np.array(dp.embedding, dtype=np.float32)
-                if isinstance(dp.embedding, list)
-                else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
-                for dp in response.data
-            ]
-        )
+    if token_tracker and hasattr(response, "usage"):
+        token_counts = {
+            "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+            "total_tokens": getattr(response.usage, "total_tokens", 0),
+        }
+        token_tracker.add_usage(token_counts)
+
+    return np.array(
+        [
+            np.array(dp.embedding, dtype=np.float32)
+            if isinstance(dp.embedding, list)
+            else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
+            for dp in response.data
+        ]
+    )
 
 
 # Azure OpenAI wrapper functions for backward compatibility
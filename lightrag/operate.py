@@ -3,10 +3,12 @@ from functools import partial
 from pathlib import Path
 
 import asyncio
+import copy
 import json
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal
-from collections import Counter, defaultdict
+from typing import Any, AsyncIterator, Iterator, overload, Literal
+from collections import Counter, OrderedDict, defaultdict, deque
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from lightrag.exceptions import (
     PipelineCancelledException,
@@ -26,7 +28,11 @@ from lightrag.utils import (
     save_to_cache,
     CacheData,
     use_llm_func_with_cache,
-    update_chunk_cache_list,
+    compute_llm_cache_key,
+    LLMCacheBatch,
+    update_chunks_cache_list,
+    StageTimer,
+    extraction_stage_timer,
     remove_think_tags,
     pick_by_weighted_polling,
     pick_by_vector_similarity,
@@ -39,6 +45,7 @@ from lightrag.utils import (
     apply_source_ids_limit,
     merge_source_ids,
     make_relation_chunk_key,
+    VectorUpsertBuffer,
 )
 from lightrag.base import (
     BaseGraphStorage,
@@ -59,13 +66,14 @@ from lightrag.constants import (
     DEFAULT_KG_CHUNK_PICK_METHOD,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_SUMMARY_LANGUAGE,
+    DEFAULT_MAX_ASYNC,
     SOURCE_IDS_LIMIT_METHOD_KEEP,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_ENTITY_NAME_MAX_LENGTH,
 )
-from lightrag.kg.shared_storage import get_storage_keyed_lock
+from lightrag.kg.shared_storage import get_storage_keyed_lock, get_storage_generation
 import time
 from dotenv import load_dotenv
 
@@ -96,23 +104,67 @@ def _truncate_entity_identifier(
     return display_value
 
 
-def chunking_by_token_size(
+def _iter_token_windows(
+    tokenizer: Tokenizer,
+    text: str,
+    tokens: list[int],
+    chunk_overlap_token_size: int,
+    chunk_token_size: int,
+    exact_decode: bool,
+) -> Iterator[tuple[int, str]]:
+    """Yield (token_count, text) windows of an already tokenized text.
+
+    Windows are sliced from `text` through token character offsets when the
+    tokenizer provides them, otherwise (or with `exact_decode`) every window is
+    decoded from its tokens.
+    """
+    offsets = None if exact_decode else tokenizer.token_char_offsets(text, tokens)
+    total = len(tokens)
+    for start in range(0, total, chunk_token_size - chunk_overlap_token_size):
+        end = start + chunk_token_size
+        if offsets is None:
+            window = tokenizer.decode(tokens[start:end])
+        else:
+            window = text[offsets[start] : offsets[end] if end < total else len(text)]
+        yield min(chunk_token_size, total - start), window
+
+
+def iter_chunks_by_token_size(
     tokenizer: Tokenizer,
     content: str,
     split_by_character: str | None = None,
     split_by_character_only: bool = False,
     chunk_overlap_token_size: int = 100,
     chunk_token_size: int = 1200,
-) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
+    exact_decode: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Streaming variant of `chunking_by_token_size`.
+
+    Every piece of text is tokenized exactly once and chunks are yielded as soon
+    as they are cut, so callers can start consuming them before the whole
+    document has been processed. Token windows are sliced from the source string
+    instead of being decoded whenever the tokenizer can map tokens back to
+    character offsets.
+
+    Args:
+        exact_decode: Compatibility mode. Decode every token window like
+            `chunking_by_token_size` does, producing byte-identical chunks (and
+            therefore identical chunk ids). Slicing only differs from decoding
+            when a window boundary falls inside a multi-token character.
+
+    Raises:
+        ChunkTokenLimitExceededError: When `split_by_character_only` is set and a
+            segment exceeds `chunk_token_size`. Chunks preceding the oversized
+            segment have already been yielded at that point.
+    """
     if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
+
+        def _raw_chunks() -> Iterator[tuple[int, str]]:
+            for chunk in content.split(split_by_character):
                 _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > chunk_token_size:
+                if len(_tokens) <= chunk_token_size:
+                    yield len(_tokens), chunk
+                elif split_by_character_only:
                     logger.warning(
                         "Chunk split_by_character exceeds token limit: len=%d limit=%d",
                         len(_tokens),
@@ -123,43 +175,59 @@ def chunking_by_token_size(
                         chunk_token_limit=chunk_token_size,
                         chunk_preview=chunk[:120],
                     )
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > chunk_token_size:
-                    for start in range(
-                        0, len(_tokens), chunk_token_size - chunk_overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + chunk_token_size]
-                        )
-                        new_chunks.append(
-                            (min(chunk_token_size, len(_tokens) - start), chunk_content)
-                        )
                 else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
-                    "tokens": _len,
-                    "content": chunk.strip(),
-                    "chunk_order_index": index,
-                }
-            )
+                    yield from _iter_token_windows(
+                        tokenizer,
+                        chunk,
+                        _tokens,
+                        chunk_overlap_token_size,
+                        chunk_token_size,
+                        exact_decode,
+                    )
+
+        raw_chunks = _raw_chunks()
     else:
-        for index, start in enumerate(
-            range(0, len(tokens), chunk_token_size - chunk_overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + chunk_token_size])
-            results.append(
-                {
-                    "tokens": min(chunk_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    return results
+        raw_chunks = _iter_token_windows(
+            tokenizer,
+            content,
+            tokenizer.encode(content),
+            chunk_overlap_token_size,
+            chunk_token_size,
+            exact_decode,
+        )
+
+    for index, (_len, chunk) in enumerate(raw_chunks):
+        yield {
+            "tokens": _len,
+            "content": chunk.strip(),
+            "chunk_order_index": index,
+        }
+
+
+def chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    chunk_overlap_token_size: int = 100,
+    chunk_token_size: int = 1200,
+) -> list[dict[str, Any]]:
+    """Split content into chunks of at most `chunk_token_size` tokens.
+
+    Runs `iter_chunks_by_token_size` in compatibility mode so chunk contents,
+    and the chunk ids derived from them, stay stable across releases.
+    """
+    return list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            chunk_overlap_token_size,
+            chunk_token_size,
+            exact_decode=True,
+        )
+    )
 
 
 async def _handle_entity_relation_summary(
@@ -202,13 +270,34 @@ async def _handle_entity_relation_summary(
     summary_max_tokens = global_config["summary_max_tokens"]
     force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
 
+    # Count tokens once (estimated in the tokenizer's "estimate" count mode); each
+    # summary produced below is counted when it is added
     current_list = description_list[:]  # Copy the list to avoid modifying original
+    current_tokens_list = tokenizer.estimate_tokens_batch(current_list)
     llm_was_used = False  # Track whether LLM was used during the entire process
 
+    # Group summaries of a map phase run concurrently, but a single hub entity
+    # with thousands of descriptions may only take part of the LLM slots so the
+    # other entities of the merge keep moving
+    map_max_async = global_config.get("summary_map_max_async") or max(
+        1, global_config.get("llm_model_max_async", DEFAULT_MAX_ASYNC) // 2
+    )
+    map_semaphore = asyncio.Semaphore(map_max_async)
+
+    async def _summarize_group(group: list[str]) -> str:
+        async with map_semaphore:
+            return await _summarize_descriptions(
+                description_type,
+                entity_or_relation_name,
+                group,
+                global_config,
+                llm_response_cache,
+            )
+
     # Iterative map-reduce process
     while True:
         # Calculate total tokens in current list
-        total_tokens = sum(len(tokenizer.encode(desc)) for desc in current_list)
+        total_tokens = sum(current_tokens_list)
 
         # If total length is within limits, perform final summarization
         if total_tokens <= summary_context_size or len(current_list) <= 2:
@@ -237,13 +326,12 @@ async def _handle_entity_relation_summary(
         # Need to split into chunks - Map phase
         # Ensure each chunk has minimum 2 descriptions to guarantee progress
         chunks = []
+        chunk_tokens = []
         current_chunk = []
         current_tokens = 0
 
         # Currently least 3 descriptions in current_list
-        for i, desc in enumerate(current_list):
-            desc_tokens = len(tokenizer.encode(desc))
-
+        for desc, desc_tokens in zip(current_list, current_tokens_list):
             # If adding current description would exceed limit, finalize current chunk
             if current_tokens + desc_tokens > summary_context_size and current_chunk:
                 # Ensure we have at least 2 descriptions in the chunk (when possible)
@@ -251,6 +339,7 @@ async def _handle_entity_relation_summary(
                     # Force add one more description to ensure minimum 2 per chunk
                     current_chunk.append(desc)
                     chunks.append(current_chunk)
+                    chunk_tokens.append(current_tokens + desc_tokens)
                     logger.warning(
                         f"Summarizing {entity_or_relation_name}: Oversize descpriton found"
                     )
@@ -258,6 +347,7 @@ async def _handle_entity_relation_summary(
                     current_tokens = 0
                 else:  # curren_chunk is ready for summary in reduce phase
                     chunks.append(current_chunk)
+                    chunk_tokens.append(current_tokens)
                     current_chunk = [desc]  # leave it for next group
                     current_tokens = desc_tokens
             else:
@@ -267,31 +357,32 @@ async def _handle_entity_relation_summary(
         # Add the last chunk if it exists
         if current_chunk:
             chunks.append(current_chunk)
+            chunk_tokens.append(current_tokens)
 
         logger.info(
             f"   Summarizing {entity_or_relation_name}: Map {len(current_list)} descriptions into {len(chunks)} groups"
         )
 
         # Reduce phase: summarize each group from chunks
-        new_summaries = []
-        for chunk in chunks:
-            if len(chunk) == 1:
-                # Optimization: single description chunks don't need LLM summarization
-                new_summaries.append(chunk[0])
-            else:
-                # Multiple descriptions need LLM summarization
-                summary = await _summarize_descriptions(
-                    description_type,
-                    entity_or_relation_name,
-                    chunk,
-                    global_config,
-                    llm_response_cache,
-                )
-                new_summaries.append(summary)
-                llm_was_used = True  # Mark that LLM was used in reduce phase
+        # Optimization: single description chunks don't need LLM summarization
+        summaries = await asyncio.gather(
+            *(_summarize_group(chunk) for chunk in chunks if len(chunk) > 1)
+        )
+        if summaries:
+            llm_was_used = True  # Mark that LLM was used in reduce phase
+        summary_tokens = iter(tokenizer.estimate_tokens_batch(summaries))
+        summaries = iter(summaries)
 
         # Update current list with new summaries for next iteration
-        current_list = new_summaries
+        current_list = []
+        current_tokens_list = []
+        for chunk, tokens in zip(chunks, chunk_tokens):
+            if len(chunk) == 1:
+                current_list.append(chunk[0])
+                current_tokens_list.append(tokens)
+            else:
+                current_list.append(next(summaries))
+                current_tokens_list.append(next(summary_tokens))
 
 
 async def _summarize_descriptions(
@@ -364,7 +455,7 @@ async def _summarize_descriptions(
     embedding_token_limit = global_config.get("embedding_token_limit")
     if embedding_token_limit is not None and summary:
         tokenizer = global_config["tokenizer"]
-        summary_token_count = len(tokenizer.encode(summary))
+        summary_token_count = tokenizer.count_tokens(summary)
         threshold = int(embedding_token_limit * 0.9)
 
         if summary_token_count > threshold:
@@ -376,7 +467,7 @@ async def _summarize_descriptions(
     return summary
 
 
-async def _handle_single_entity_extraction(
+def _handle_single_entity_extraction(
     record_attributes: list[str],
     chunk_key: str,
     timestamp: int,
@@ -448,7 +539,7 @@ async def _handle_single_entity_extraction(
         return None
 
 
-async def _handle_single_relationship_extraction(
+def _handle_single_relationship_extraction(
     record_attributes: list[str],
     chunk_key: str,
     timestamp: int,
@@ -914,6 +1005,31 @@ async def _process_extraction_result(
     file_path: str = "unknown_source",
     tuple_delimiter: str = "<|#|>",
     completion_delimiter: str = "<|COMPLETE|>",
+) -> tuple[dict, dict]:
+    """Parse an extraction result in a worker thread, off the event loop
+
+    Delimiter repair and text normalization are pure Python work on the whole
+    LLM response; running them in a thread lets the LLM calls of other chunks
+    keep being issued and received meanwhile.
+    """
+    return await asyncio.to_thread(
+        _parse_extraction_result,
+        result,
+        chunk_key,
+        timestamp,
+        file_path,
+        tuple_delimiter,
+        completion_delimiter,
+    )
+
+
+def _parse_extraction_result(
+    result: str,
+    chunk_key: str,
+    timestamp: int,
+    file_path: str = "unknown_source",
+    tuple_delimiter: str = "<|#|>",
+    completion_delimiter: str = "<|COMPLETE|>",
 ) -> tuple[dict, dict]:
     """Process a single extraction result (either initial or gleaning)
     Args:
@@ -969,7 +1085,7 @@ async def _process_extraction_result(
                     entity_relation_record = (
                         f"relation{tuple_delimiter}{entity_relation_record}"
                     )
-                fixed_records = fixed_records + [entity_relation_record]
+                fixed_records.append(entity_relation_record)
 
     if len(fixed_records) != len(records):
         logger.warning(
@@ -994,7 +1110,7 @@ async def _process_extraction_result(
         record_attributes = split_string_by_multi_markers(record, [tuple_delimiter])
 
         # Try to parse as entity
-        entity_data = await _handle_single_entity_extraction(
+        entity_data = _handle_single_entity_extraction(
             record_attributes, chunk_key, timestamp, file_path
         )
         if entity_data is not None:
@@ -1009,7 +1125,7 @@ async def _process_extraction_result(
             continue
 
         # Try to parse as relationship
-        relationship_data = await _handle_single_relationship_extraction(
+        relationship_data = _handle_single_relationship_extraction(
             record_attributes, chunk_key, timestamp, file_path
         )
         if relationship_data is not None:
@@ -1594,7 +1710,7 @@ async def _merge_nodes_then_upsert(
     entity_name: str,
     nodes_data: list[dict],
     knowledge_graph_inst: BaseGraphStorage,
-    entity_vdb: BaseVectorStorage | None,
+    entity_vdb: BaseVectorStorage | VectorUpsertBuffer | None,
     global_config: dict,
     pipeline_status: dict = None,
     pipeline_status_lock=None,
@@ -1873,8 +1989,8 @@ async def _merge_edges_then_upsert(
     tgt_id: str,
     edges_data: list[dict],
     knowledge_graph_inst: BaseGraphStorage,
-    relationships_vdb: BaseVectorStorage | None,
-    entity_vdb: BaseVectorStorage | None,
+    relationships_vdb: BaseVectorStorage | VectorUpsertBuffer | None,
+    entity_vdb: BaseVectorStorage | VectorUpsertBuffer | None,
     global_config: dict,
     pipeline_status: dict = None,
     pipeline_status_lock=None,
@@ -2395,6 +2511,166 @@ async def _merge_edges_then_upsert(
     return edge_data
 
 
+class _GraphMergeView:
+    """Read-through, write-back view of a graph storage for bulk merges.
+
+    Serves the node and edge reads of the merge helpers from records fetched
+    with get_nodes_batch/get_edges_batch, and holds their writes until flush()
+    sends them with upsert_nodes_batch/upsert_edges_batch. Reads see pending
+    writes. Only the properties actually written are sent back.
+    """
+
+    def __init__(self, graph: BaseGraphStorage):
+        self.graph = graph
+        self._nodes: dict[str, dict | None] = {}
+        self._edges: dict[tuple[str, str], dict | None] = {}
+        self._node_writes: dict[str, dict] = {}
+        self._edge_writes: dict[tuple[str, str], tuple[str, str, dict]] = {}
+
+    @staticmethod
+    def _edge_key(src_id: str, tgt_id: str) -> tuple[str, str]:
+        return (src_id, tgt_id) if src_id <= tgt_id else (tgt_id, src_id)
+
+    async def prefetch(self, node_ids, edge_pairs) -> None:
+        node_ids = [n for n in dict.fromkeys(node_ids) if n not in self._nodes]
+        if node_ids:
+            nodes = await self.graph.get_nodes_batch(node_ids)
+            for node_id in node_ids:
+                self._nodes[node_id] = nodes.get(node_id)
+        pairs = [
+            pair
+            for pair in dict.fromkeys(self._edge_key(*p) for p in edge_pairs)
+            if pair not in self._edges
+        ]
+        if pairs:
+            edges = await self.graph.get_edges_batch(
+                [{"src": src, "tgt": tgt} for src, tgt in pairs]
+            )
+            for src, tgt in pairs:
+                edge = edges.get((src, tgt))
+                self._edges[(src, tgt)] = (
+                    edge if edge is not None else edges.get((tgt, src))
+                )
+
+    async def get_node(self, node_id: str) -> dict | None:
+        if node_id not in self._nodes:
+            self._nodes[node_id] = await self.graph.get_node(node_id)
+        node = self._nodes[node_id]
+        return dict(node) if node is not None else None
+
+    async def has_node(self, node_id: str) -> bool:
+        return await self.get_node(node_id) is not None
+
+    async def get_edge(self, src_id: str, tgt_id: str) -> dict | None:
+        key = self._edge_key(src_id, tgt_id)
+        if key not in self._edges:
+            self._edges[key] = await self.graph.get_edge(src_id, tgt_id)
+        edge = self._edges[key]
+        return dict(edge) if edge is not None else None
+
+    async def has_edge(self, src_id: str, tgt_id: str) -> bool:
+        return await self.get_edge(src_id, tgt_id) is not None
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        self._nodes[node_id] = {**(self._nodes.get(node_id) or {}), **node_data}
+        self._node_writes[node_id] = {
+            **self._node_writes.get(node_id, {}),
+            **node_data,
+        }
+
+    async def upsert_edge(
+        self, src_id: str, tgt_id: str, edge_data: dict[str, str]
+    ) -> None:
+        key = self._edge_key(src_id, tgt_id)
+        self._edges[key] = {**(self._edges.get(key) or {}), **edge_data}
+        written = self._edge_writes.get(key, (src_id, tgt_id, {}))[2]
+        self._edge_writes[key] = (src_id, tgt_id, {**written, **edge_data})
+
+    async def flush(self) -> None:
+        # Nodes first: backends only connect edges between existing nodes
+        if self._node_writes:
+            nodes = list(self._node_writes.items())
+            self._node_writes = {}
+            await self.graph.upsert_nodes_batch(nodes)
+        if self._edge_writes:
+            edges = list(self._edge_writes.values())
+            self._edge_writes = {}
+            await self.graph.upsert_edges_batch(edges)
+
+
+class _KVMergeView:
+    """Read-through, write-back view of a chunk-tracking KV storage for bulk merges."""
+
+    def __init__(self, storage: BaseKVStorage):
+        self.storage = storage
+        self._records: dict[str, dict | None] = {}
+        self._writes: dict[str, dict] = {}
+
+    async def prefetch(self, ids) -> None:
+        ids = [i for i in dict.fromkeys(ids) if i not in self._records]
+        if ids:
+            for record_id, record in zip(ids, await self.storage.get_by_ids(ids)):
+                self._records[record_id] = record
+
+    async def get_by_id(self, id: str) -> dict | None:
+        if id not in self._records:
+            self._records[id] = await self.storage.get_by_id(id)
+        return self._records[id]
+
+    async def upsert(self, data: dict[str, dict]) -> None:
+        self._records.update(data)
+        self._writes.update(data)
+
+    async def flush(self) -> None:
+        if self._writes:
+            writes, self._writes = self._writes, {}
+            await self.storage.upsert(writes)
+
+
+@asynccontextmanager
+async def _local_keyed_lock(locks: dict[str, asyncio.Lock], keys: list[str]):
+    """Acquire in-process locks for keys in sorted order"""
+    async with AsyncExitStack() as stack:
+        for key in sorted(set(keys)):
+            await stack.enter_async_context(locks.setdefault(key, asyncio.Lock()))
+        yield
+
+
+@asynccontextmanager
+async def _bulk_merge_phase(
+    enabled: bool,
+    lock_keys: list[str],
+    lock_namespace: str,
+    graph_view: _GraphMergeView | None,
+    chunk_views: list[_KVMergeView | None],
+    node_ids: list[str],
+    edge_pairs: list[tuple[str, str]],
+    chunk_ids: list[list[str]],
+):
+    """Hold the entity locks of a bulk merge phase around prefetch and write-back.
+
+    Completed merges are written back even when the phase fails, matching the
+    per-entity path where every finished merge has already been persisted.
+    """
+    if not enabled:
+        yield
+        return
+    async with get_storage_keyed_lock(
+        lock_keys, namespace=lock_namespace, enable_logging=False
+    ):
+        await graph_view.prefetch(node_ids, edge_pairs)
+        for view, ids in zip(chunk_views, chunk_ids):
+            if view is not None:
+                await view.prefetch(ids)
+        try:
+            yield
+        finally:
+            await graph_view.flush()
+            for view in chunk_views:
+                if view is not None:
+                    await view.flush()
+
+
 async def merge_nodes_and_edges(
     chunk_results: list,
     knowledge_graph_inst: BaseGraphStorage,
@@ -2472,6 +2748,50 @@ async def merge_nodes_and_edges(
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
 
+    # Optionally coalesce the single-record vector upserts of concurrent merge
+    # tasks so they are embedded in embedding_batch_num sized requests; a batch
+    # is sent early once every merge slot is waiting on it
+    entity_vdb_buffer, relationships_vdb_buffer = entity_vdb, relationships_vdb
+    if global_config.get("vector_upsert_batching", False):
+        embedding_batch_num = global_config.get("embedding_batch_num", 10)
+        if entity_vdb is not None:
+            entity_vdb_buffer = VectorUpsertBuffer(
+                entity_vdb, embedding_batch_num, max_waiters=graph_max_async
+            )
+        if relationships_vdb is not None:
+            relationships_vdb_buffer = VectorUpsertBuffer(
+                relationships_vdb, embedding_batch_num, max_waiters=graph_max_async
+            )
+
+    workspace = global_config.get("workspace", "")
+    graph_lock_namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+    # Bulk mode: each phase takes the locks of all its entities at once,
+    # prefetches every node, edge and chunk-tracking record it touches in a few
+    # batched calls, merges against in-memory views and writes back in batches
+    bulk_merge = bool(global_config.get("graph_bulk_merge", False))
+    local_locks: dict[str, asyncio.Lock] = {}
+
+    def _merge_targets():
+        if not bulk_merge:
+            return knowledge_graph_inst, entity_chunks_storage, relation_chunks_storage
+        return (
+            _GraphMergeView(knowledge_graph_inst),
+            _KVMergeView(entity_chunks_storage)
+            if entity_chunks_storage is not None
+            else None,
+            _KVMergeView(relation_chunks_storage)
+            if relation_chunks_storage is not None
+            else None,
+        )
+
+    def _item_lock(keys: list[str]):
+        if bulk_merge:
+            # The phase already holds the shared locks; only serialize in-process
+            return _local_keyed_lock(local_locks, keys)
+        return get_storage_keyed_lock(
+            keys, namespace=graph_lock_namespace, enable_logging=False
+        )
+
     # ===== Phase 1: Process all entities concurrently =====
     log_message = f"Phase 1: Processing {total_entities_count} entities from {doc_id} (async: {graph_max_async})"
     logger.info(log_message)
@@ -2489,23 +2809,19 @@ async def merge_nodes_and_edges(
                             "User cancelled during entity merge"
                         )
 
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            async with get_storage_keyed_lock(
-                [entity_name], namespace=namespace, enable_logging=False
-            ):
+            async with _item_lock([entity_name]):
                 try:
                     logger.debug(f"Processing entity {entity_name}")
                     entity_data = await _merge_nodes_then_upsert(
                         entity_name,
                         entities,
-                        knowledge_graph_inst,
-                        entity_vdb,
+                        merge_graph,
+                        entity_vdb_buffer,
                         global_config,
                         pipeline_status,
                         pipeline_status_lock,
                         llm_response_cache,
-                        entity_chunks_storage,
+                        merge_entity_chunks,
                     )
 
                     return entity_data
@@ -2534,44 +2850,58 @@ async def merge_nodes_and_edges(
                     )
                     raise prefixed_exception from e
 
-    # Create entity processing tasks
-    entity_tasks = []
-    for entity_name, entities in all_nodes.items():
-        task = asyncio.create_task(_locked_process_entity_name(entity_name, entities))
-        entity_tasks.append(task)
-
-    # Execute entity tasks with error handling
-    processed_entities = []
-    if entity_tasks:
-        done, pending = await asyncio.wait(
-            entity_tasks, return_when=asyncio.FIRST_EXCEPTION
-        )
+    entity_names = list(all_nodes)
+    merge_graph, merge_entity_chunks, merge_relation_chunks = _merge_targets()
+    async with _bulk_merge_phase(
+        bulk_merge,
+        entity_names,
+        graph_lock_namespace,
+        merge_graph,
+        [merge_entity_chunks],
+        node_ids=entity_names,
+        edge_pairs=[],
+        chunk_ids=[entity_names],
+    ):
+        # Create entity processing tasks
+        entity_tasks = []
+        for entity_name, entities in all_nodes.items():
+            task = asyncio.create_task(
+                _locked_process_entity_name(entity_name, entities)
+            )
+            entity_tasks.append(task)
 
-        first_exception = None
+        # Execute entity tasks with error handling
         processed_entities = []
+        if entity_tasks:
+            done, pending = await asyncio.wait(
+                entity_tasks, return_when=asyncio.FIRST_EXCEPTION
+            )
 
-        for task in done:
-            try:
-                result = task.result()
-            except BaseException as e:
-                if first_exception is None:
-                    first_exception = e
-            else:
-                processed_entities.append(result)
+            first_exception = None
+            processed_entities = []
 
-        if pending:
-            for task in pending:
-                task.cancel()
-            pending_results = await asyncio.gather(*pending, return_exceptions=True)
-            for result in pending_results:
-                if isinstance(result, BaseException):
+            for task in done:
+                try:
+                    result = task.result()
+                except BaseException as e:
                     if first_exception is None:
-                        first_exception = result
+                        first_exception = e
                 else:
                     processed_entities.append(result)
 
-        if first_exception is not None:
-            raise first_exception
+            if pending:
+                for task in pending:
+                    task.cancel()
+                pending_results = await asyncio.gather(*pending, return_exceptions=True)
+                for result in pending_results:
+                    if isinstance(result, BaseException):
+                        if first_exception is None:
+                            first_exception = result
+                    else:
+                        processed_entities.append(result)
+
+            if first_exception is not None:
+                raise first_exception
 
     # ===== Phase 2: Process all relationships concurrently =====
     log_message = f"Phase 2: Processing {total_relations_count} relations from {doc_id} (async: {graph_max_async})"
@@ -2590,15 +2920,9 @@ async def merge_nodes_and_edges(
                             "User cancelled during relation merge"
                         )
 
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
             sorted_edge_key = sorted([edge_key[0], edge_key[1]])
 
-            async with get_storage_keyed_lock(
-                sorted_edge_key,
-                namespace=namespace,
-                enable_logging=False,
-            ):
+            async with _item_lock(sorted_edge_key):
                 try:
                     added_entities = []  # Track entities added during edge processing
 
@@ -2607,16 +2931,16 @@ async def merge_nodes_and_edges(
                         edge_key[0],
                         edge_key[1],
                         edges,
-                        knowledge_graph_inst,
-                        relationships_vdb,
-                        entity_vdb,
+                        merge_graph,
+                        relationships_vdb_buffer,
+                        entity_vdb_buffer,
                         global_config,
                         pipeline_status,
                         pipeline_status_lock,
                         llm_response_cache,
                         added_entities,  # Pass list to collect added entities
-                        relation_chunks_storage,
-                        entity_chunks_storage,  # Add entity_chunks_storage parameter
+                        merge_relation_chunks,
+                        merge_entity_chunks,  # Add entity_chunks_storage parameter
                     )
 
                     if edge_data is None:
@@ -2648,50 +2972,65 @@ async def merge_nodes_and_edges(
                     )
                     raise prefixed_exception from e
 
-    # Create relationship processing tasks
-    edge_tasks = []
-    for edge_key, edges in all_edges.items():
-        task = asyncio.create_task(_locked_process_edges(edge_key, edges))
-        edge_tasks.append(task)
-
-    # Execute relationship tasks with error handling
-    processed_edges = []
-    all_added_entities = []
-
-    if edge_tasks:
-        done, pending = await asyncio.wait(
-            edge_tasks, return_when=asyncio.FIRST_EXCEPTION
-        )
-
-        first_exception = None
+    edge_node_ids = list(dict.fromkeys(n for edge_key in all_edges for n in edge_key))
+    merge_graph, merge_entity_chunks, merge_relation_chunks = _merge_targets()
+    async with _bulk_merge_phase(
+        bulk_merge,
+        edge_node_ids,
+        graph_lock_namespace,
+        merge_graph,
+        [merge_entity_chunks, merge_relation_chunks],
+        node_ids=edge_node_ids,
+        edge_pairs=list(all_edges),
+        chunk_ids=[
+            edge_node_ids,
+            [make_relation_chunk_key(src, tgt) for src, tgt in all_edges],
+        ],
+    ):
+        # Create relationship processing tasks
+        edge_tasks = []
+        for edge_key, edges in all_edges.items():
+            task = asyncio.create_task(_locked_process_edges(edge_key, edges))
+            edge_tasks.append(task)
+
+        # Execute relationship tasks with error handling
+        processed_edges = []
+        all_added_entities = []
+
+        if edge_tasks:
+            done, pending = await asyncio.wait(
+                edge_tasks, return_when=asyncio.FIRST_EXCEPTION
+            )
 
-        for task in done:
-            try:
-                edge_data, added_entities = task.result()
-            except BaseException as e:
-                if first_exception is None:
-                    first_exception = e
-            else:
-                if edge_data is not None:
-                    processed_edges.append(edge_data)
-                all_added_entities.extend(added_entities)
+            first_exception = None
 
-        if pending:
-            for task in pending:
-                task.cancel()
-            pending_results = await asyncio.gather(*pending, return_exceptions=True)
-            for result in pending_results:
-                if isinstance(result, BaseException):
+            for task in done:
+                try:
+                    edge_data, added_entities = task.result()
+                except BaseException as e:
                     if first_exception is None:
-                        first_exception = result
+                        first_exception = e
                 else:
-                    edge_data, added_entities = result
                     if edge_data is not None:
                         processed_edges.append(edge_data)
                     all_added_entities.extend(added_entities)
 
-        if first_exception is not None:
-            raise first_exception
+            if pending:
+                for task in pending:
+                    task.cancel()
+                pending_results = await asyncio.gather(*pending, return_exceptions=True)
+                for result in pending_results:
+                    if isinstance(result, BaseException):
+                        if first_exception is None:
+                            first_exception = result
+                    else:
+                        edge_data, added_entities = result
+                        if edge_data is not None:
+                            processed_edges.append(edge_data)
+                        all_added_entities.extend(added_entities)
+
+            if first_exception is not None:
+                raise first_exception
 
     # ===== Phase 3: Update full_entities and full_relations storage =====
     if full_entities_storage and full_relations_storage and doc_id:
@@ -2765,6 +3104,122 @@ async def merge_nodes_and_edges(
         pipeline_status["history_messages"].append(log_message)
 
 
+class ExtractionScheduler:
+    """Shares the chunk extraction slots of a pipeline run between documents.
+
+    Without it every in-flight document extracts its chunks under its own
+    semaphore of llm_model_max_async, so a large document can hold the LLM
+    while the slots of finished small documents stay empty. Here all
+    documents draw from one pool of ``max_async`` slots:
+
+    - slot() grants free slots round-robin across the documents that have
+      chunks waiting, so a large document cannot starve the others.
+    - document() admits documents in arrival order, but only while fewer than
+      ``max_async`` chunks are queued (a document still being chunked counts
+      as one) and fewer than ``max_documents`` documents are in flight. This
+      keeps just enough work queued to fill every slot.
+
+    Each document still merges on its own as soon as its last chunk is done.
+    """
+
+    def __init__(self, max_async: int, max_documents: int):
+        self.max_async = max_async
+        self.max_documents = max_documents
+        self._active = 0
+        self._queued = 0
+        # doc_id -> waiters for a slot; iteration order is the round-robin order
+        self._slot_waiters: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self._admission_waiters: deque[tuple[str, asyncio.Future]] = deque()
+        # doc_id -> True once the document has queued or started a chunk
+        self._documents: dict[str, bool] = {}
+
+    @property
+    def queued(self) -> int:
+        """Number of chunks waiting for an extraction slot"""
+        return self._queued
+
+    def _has_capacity(self) -> bool:
+        starting = sum(not started for started in self._documents.values())
+        return (
+            len(self._documents) < self.max_documents
+            and self._queued + starting < self.max_async
+        )
+
+    def _wake(self) -> None:
+        while self._active < self.max_async and self._slot_waiters:
+            doc_id, waiters = next(iter(self._slot_waiters.items()))
+            waiter = waiters.popleft()
+            self._queued -= 1
+            if waiters:
+                self._slot_waiters.move_to_end(doc_id)
+            else:
+                del self._slot_waiters[doc_id]
+            if not waiter.done():
+                waiter.set_result(None)
+                self._active += 1
+        while self._admission_waiters and self._has_capacity():
+            doc_id, waiter = self._admission_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                # Reserve the capacity before the next waiter is considered
+                self._documents[doc_id] = False
+
+    @asynccontextmanager
+    async def document(self, doc_id: str):
+        """Hold an admission for doc_id for the rest of its processing"""
+        if not self._admission_waiters and self._has_capacity():
+            self._documents[doc_id] = False
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._admission_waiters.append((doc_id, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._documents.pop(doc_id, None)
+                    self._wake()
+                raise
+        try:
+            yield
+        finally:
+            self._documents.pop(doc_id, None)
+            self._wake()
+
+    @asynccontextmanager
+    async def slot(self, doc_id: str):
+        """Hold one extraction slot for a chunk of doc_id"""
+        if self._documents.get(doc_id) is False:
+            # The chunk replaces the placeholder the document held in the queue
+            self._documents[doc_id] = True
+        if self._active < self.max_async and not self._slot_waiters:
+            self._active += 1
+            self._wake()
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._slot_waiters.setdefault(doc_id, deque()).append(waiter)
+            self._queued += 1
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was granted just before the cancellation
+                    self._active -= 1
+                else:
+                    waiters = self._slot_waiters.get(doc_id)
+                    if waiters is not None and waiter in waiters:
+                        waiters.remove(waiter)
+                        self._queued -= 1
+                        if not waiters:
+                            del self._slot_waiters[doc_id]
+                self._wake()
+                raise
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._wake()
+
+
 async def extract_entities(
     chunks: dict[str, TextChunkSchema],
     global_config: dict[str, str],
@@ -2772,7 +3227,17 @@ async def extract_entities(
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
     text_chunks_storage: BaseKVStorage | None = None,
+    extraction_scheduler: ExtractionScheduler | None = None,
+    doc_id: str | None = None,
 ) -> list:
+    """Extract entities and relationships from every chunk concurrently
+
+    Chunks run under a semaphore of llm_model_max_async, or, when an
+    extraction_scheduler is given, under slots shared fairly with the other
+    documents of the pipeline run (doc_id identifies this document). With the
+    extraction LLM cache enabled, cache hits are prefetched with bulk reads and
+    new cache entries are written in batches (LLMCacheBatch).
+    """
     # Check for cancellation at the start of entity extraction
     if pipeline_status is not None and pipeline_status_lock is not None:
         async with pipeline_status_lock:
@@ -2812,9 +3277,84 @@ async def extract_entities(
 
     processed_chunks = 0
     total_chunks = len(ordered_chunks)
+    stage_timer = StageTimer()
+    chunk_cache_keys: dict[str, list[str]] = {}
+
+    # Get max async tasks limit from global_config
+    chunk_max_async = global_config.get("llm_model_max_async", 4)
+    semaphore = asyncio.Semaphore(chunk_max_async)
+
+    def _chunk_slot():
+        if extraction_scheduler is not None:
+            return extraction_scheduler.slot(doc_id)
+        return semaphore
+
+    def _build_prompts(content: str) -> tuple[str, str, str]:
+        """Return the system, extraction and gleaning prompts of a chunk"""
+        context = {**context_base, "input_text": content}
+        return (
+            PROMPTS["entity_extraction_system_prompt"].format(**context),
+            PROMPTS["entity_extraction_user_prompt"].format(**context),
+            PROMPTS["entity_continue_extraction_user_prompt"].format(**context),
+        )
+
+    # Cache lookups of all chunks are resolved up front with bulk reads, and new
+    # cache entries are written in batches when the document finishes
+    cache_batch = None
+    if llm_response_cache is not None and global_config.get(
+        "enable_llm_cache_for_entity_extract"
+    ):
+        cache_batch = LLMCacheBatch(llm_response_cache)
+
+    async def _prefetch_cache():
+        def _extraction_keys() -> dict[str, tuple[str, str]]:
+            keys = {}
+            for chunk_key, chunk_dp in ordered_chunks:
+                system_prompt, user_prompt, _ = _build_prompts(chunk_dp["content"])
+                keys[chunk_key] = (
+                    compute_llm_cache_key(user_prompt, system_prompt),
+                    user_prompt,
+                )
+            return keys
+
+        extraction_keys = await asyncio.to_thread(_extraction_keys)
+        hits = await cache_batch.prefetch([key for key, _ in extraction_keys.values()])
+        if hits == 0 or entity_extract_max_gleaning <= 0:
+            return
+
+        # Gleaning prompts carry the extraction response in their history, so
+        # their keys are only known for chunks whose extraction was cached
+        cached_responses = {}
+        for chunk_key, (cache_key, _) in extraction_keys.items():
+            entry = await cache_batch.get(cache_key)
+            if entry:
+                cached_responses[chunk_key] = entry["return"]
+
+        def _gleaning_keys() -> list[str]:
+            keys = []
+            for chunk_key, chunk_dp in ordered_chunks:
+                if chunk_key not in cached_responses:
+                    continue
+                system_prompt, user_prompt, continue_prompt = _build_prompts(
+                    chunk_dp["content"]
+                )
+                history = pack_user_ass_to_openai_messages(
+                    user_prompt, cached_responses[chunk_key]
+                )
+                keys.append(
+                    compute_llm_cache_key(continue_prompt, system_prompt, history)
+                )
+            return keys
+
+        await cache_batch.prefetch(await asyncio.to_thread(_gleaning_keys))
 
     async def _process_single_content(chunk_key_dp: tuple[str, TextChunkSchema]):
         """Process a single chunk
+
+        The LLM slot is held for the extraction and gleaning calls only. The
+        initial response is parsed while the gleaning call is in flight, and
+        the gleaning response after the slot has been handed to the next chunk.
+
         Args:
             chunk_key_dp (tuple[str, TextChunkSchema]):
                 ("chunk-xxxxxx", {"tokens": int, "content": str, "full_doc_id": str, "chunk_order_index": int})
@@ -2832,62 +3372,78 @@ async def extract_entities(
         cache_keys_collector = []
 
         # Get initial extraction
-        entity_extraction_system_prompt = PROMPTS[
-            "entity_extraction_system_prompt"
-        ].format(**{**context_base, "input_text": content})
-        entity_extraction_user_prompt = PROMPTS["entity_extraction_user_prompt"].format(
-            **{**context_base, "input_text": content}
-        )
-        entity_continue_extraction_user_prompt = PROMPTS[
-            "entity_continue_extraction_user_prompt"
-        ].format(**{**context_base, "input_text": content})
-
-        final_result, timestamp = await use_llm_func_with_cache(
+        (
+            entity_extraction_system_prompt,
             entity_extraction_user_prompt,
-            use_llm_func,
-            system_prompt=entity_extraction_system_prompt,
-            llm_response_cache=llm_response_cache,
-            cache_type="extract",
-            chunk_id=chunk_key,
-            cache_keys_collector=cache_keys_collector,
-        )
+            entity_continue_extraction_user_prompt,
+        ) = _build_prompts(content)
+
+        async def _timed_parse(result: str, timestamp: int) -> tuple[dict, dict]:
+            with stage_timer.measure("parse"):
+                return await _process_extraction_result(
+                    result,
+                    chunk_key,
+                    timestamp,
+                    file_path,
+                    tuple_delimiter=context_base["tuple_delimiter"],
+                    completion_delimiter=context_base["completion_delimiter"],
+                )
 
-        history = pack_user_ass_to_openai_messages(
-            entity_extraction_user_prompt, final_result
-        )
+        wait_start = time.perf_counter()
+        async with _chunk_slot():
+            stage_timer.add("slot_wait", time.perf_counter() - wait_start)
+            # Check for cancellation before processing chunk
+            if pipeline_status is not None and pipeline_status_lock is not None:
+                async with pipeline_status_lock:
+                    if pipeline_status.get("cancellation_requested", False):
+                        raise PipelineCancelledException(
+                            "User cancelled during chunk processing"
+                        )
 
-        # Process initial extraction with file path
-        maybe_nodes, maybe_edges = await _process_extraction_result(
-            final_result,
-            chunk_key,
-            timestamp,
-            file_path,
-            tuple_delimiter=context_base["tuple_delimiter"],
-            completion_delimiter=context_base["completion_delimiter"],
-        )
+            with stage_timer.measure("llm_extract"):
+                final_result, timestamp = await use_llm_func_with_cache(
+                    entity_extraction_user_prompt,
+                    use_llm_func,
+                    system_prompt=entity_extraction_system_prompt,
+                    llm_response_cache=llm_response_cache,
+                    cache_type="extract",
+                    chunk_id=chunk_key,
+                    cache_keys_collector=cache_keys_collector,
+                    cache_batch=cache_batch,
+                )
 
-        # Process additional gleaning results only 1 time when entity_extract_max_gleaning is greater than zero.
-        if entity_extract_max_gleaning > 0:
-            glean_result, timestamp = await use_llm_func_with_cache(
-                entity_continue_extraction_user_prompt,
-                use_llm_func,
-                system_prompt=entity_extraction_system_prompt,
-                llm_response_cache=llm_response_cache,
-                history_messages=history,
-                cache_type="extract",
-                chunk_id=chunk_key,
-                cache_keys_collector=cache_keys_collector,
+            history = pack_user_ass_to_openai_messages(
+                entity_extraction_user_prompt, final_result
             )
 
+            # Process initial extraction with file path; the gleaning request only
+            # needs the raw response, so it is sent while this parse runs
+            parse_task = asyncio.create_task(_timed_parse(final_result, timestamp))
+
+            # Process additional gleaning results only 1 time when entity_extract_max_gleaning is greater than zero.
+            if entity_extract_max_gleaning > 0:
+                try:
+                    with stage_timer.measure("llm_glean"):
+                        glean_result, glean_timestamp = await use_llm_func_with_cache(
+                            entity_continue_extraction_user_prompt,
+                            use_llm_func,
+                            system_prompt=entity_extraction_system_prompt,
+                            llm_response_cache=llm_response_cache,
+                            history_messages=history,
+                            cache_type="extract",
+                            chunk_id=chunk_key,
+                            cache_keys_collector=cache_keys_collector,
+                            cache_batch=cache_batch,
+                        )
+                except BaseException:
+                    parse_task.cancel()
+                    raise
+
+        maybe_nodes, maybe_edges = await parse_task
+
+        if entity_extract_max_gleaning > 0:
             # Process gleaning result separately with file path
-            glean_nodes, glean_edges = await _process_extraction_result(
-                glean_result,
-                chunk_key,
-                timestamp,
-                file_path,
-                tuple_delimiter=context_base["tuple_delimiter"],
-                completion_delimiter=context_base["completion_delimiter"],
-            )
+            glean_nodes, glean_edges = await _timed_parse(glean_result, glean_timestamp)
 
             # Merge results - compare description lengths to choose better version
             for entity_name, glean_entities in glean_nodes.items():
@@ -2920,14 +3476,9 @@ async def extract_entities(
                     # New edge from gleaning stage
                     maybe_edges[edge_key] = list(glean_edges)
 
-        # Batch update chunk's llm_cache_list with all collected cache keys
+        # Cache keys are written to the chunks' llm_cache_list once per document
         if cache_keys_collector and text_chunks_storage:
-            await update_chunk_cache_list(
-                chunk_key,
-                text_chunks_storage,
-                cache_keys_collector,
-                "entity_extraction",
-            )
+            chunk_cache_keys[chunk_key] = cache_keys_collector
 
         processed_chunks += 1
         entities_count = len(maybe_nodes)
@@ -2942,26 +3493,17 @@ async def extract_entities(
         # Return the extracted nodes and edges for centralized processing
         return maybe_nodes, maybe_edges
 
-    # Get max async tasks limit from global_config
-    chunk_max_async = global_config.get("llm_model_max_async", 4)
-    semaphore = asyncio.Semaphore(chunk_max_async)
-
     async def _process_with_semaphore(chunk):
-        async with semaphore:
-            # Check for cancellation before processing chunk
-            if pipeline_status is not None and pipeline_status_lock is not None:
-                async with pipeline_status_lock:
-                    if pipeline_status.get("cancellation_requested", False):
-                        raise PipelineCancelledException(
-                            "User cancelled during chunk processing"
-                        )
+        try:
+            return await _process_single_content(chunk)
+        except Exception as e:
+            chunk_id = chunk[0]  # Extract chunk_id from chunk[0]
+            prefixed_exception = create_prefixed_exception(e, chunk_id)
+            raise prefixed_exception from e
 
-            try:
-                return await _process_single_content(chunk)
-            except Exception as e:
-                chunk_id = chunk[0]  # Extract chunk_id from chunk[0]
-                prefixed_exception = create_prefixed_exception(e, chunk_id)
-                raise prefixed_exception from e
+    if cache_batch is not None:
+        with stage_timer.measure("cache_prefetch"):
+            await _prefetch_cache()
 
     tasks = []
     for c in ordered_chunks:
@@ -2972,6 +3514,23 @@ async def extract_entities(
     # This allows us to cancel remaining tasks if any task fails
     done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
 
+    async def _finish_document():
+        # Write the cache entries and record the cache keys of every chunk that
+        # finished, even when another chunk failed, so its cache entries can
+        # still be reused and found for removal
+        if cache_batch is not None:
+            with stage_timer.measure("cache_flush"):
+                await cache_batch.flush()
+        if chunk_cache_keys:
+            with stage_timer.measure("cache_list_update"):
+                await update_chunks_cache_list(
+                    text_chunks_storage, chunk_cache_keys, "entity_extraction"
+                )
+        extraction_stage_timer.merge(stage_timer)
+        logger.info(
+            f"Extraction stage timings ({total_chunks} chunks): {stage_timer.summary()}"
+        )
+
     # Check if any task raised an exception and ensure all exceptions are retrieved
     first_exception = None
     chunk_results = []
@@ -2997,6 +3556,7 @@ async def extract_entities(
         # Wait for cancellation to complete
         if pending:
             await asyncio.wait(pending)
+        await _finish_document()
 
         # Add progress prefix to the exception message
         progress_prefix = f"C[{processed_chunks + 1}/{total_chunks}]"
@@ -3005,6 +3565,8 @@ async def extract_entities(
         prefixed_exception = create_prefixed_exception(first_exception, progress_prefix)
         raise prefixed_exception from first_exception
 
+    await _finish_document()
+
     # If all tasks completed successfully, chunk_results already contains the results
     # Return the chunk_results for later processing in merge_nodes_and_edges
     return chunk_results
@@ -3021,6 +3583,8 @@ async def kg_query(
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
     chunks_vdb: BaseVectorStorage = None,
+    query_context_cache: OrderedDict[str, tuple[float, QueryContextResult]]
+    | None = None,
 ) -> QueryResult | None:
     """
     Execute knowledge graph query and return unified QueryResult object.
@@ -3036,6 +3600,7 @@ async def kg_query(
         hashing_kv: Cache storage
         system_prompt: System prompt
         chunks_vdb: Document chunks vector database
+        query_context_cache: Retrieval cache of the calling LightRAG instance (None disables it)
 
     Returns:
         QueryResult | None: Unified query result object containing:
@@ -3084,8 +3649,8 @@ async def kg_query(
     ll_keywords_str = ", ".join(ll_keywords) if ll_keywords else ""
     hl_keywords_str = ", ".join(hl_keywords) if hl_keywords else ""
 
-    # Build query context (unified interface)
-    context_result = await _build_query_context(
+    # Build query context (unified interface), reusing a cached one when possible
+    context_result = await _build_query_context_with_cache(
         query,
         ll_keywords_str,
         hl_keywords_str,
@@ -3094,7 +3659,9 @@ async def kg_query(
         relationships_vdb,
         text_chunks_db,
         query_param,
+        global_config,
         chunks_vdb,
+        query_context_cache,
     )
 
     if context_result is None:
@@ -3130,9 +3697,9 @@ async def kg_query(
 
     # Call LLM
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
+    len_of_prompts = tokenizer.count_tokens(query + sys_prompt)
     logger.debug(
-        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
+        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {tokenizer.count_tokens(query)}, System: {tokenizer.count_tokens(sys_prompt)})"
     )
 
     # Handle cache
@@ -3297,7 +3864,7 @@ async def extract_keywords_only(
     )
 
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(kw_prompt))
+    len_of_prompts = tokenizer.count_tokens(kw_prompt)
     logger.debug(
         f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
     )
@@ -3361,6 +3928,17 @@ async def extract_keywords_only(
     return hl_keywords, ll_keywords
 
 
+def _vector_search_kwargs(query_param: QueryParam) -> dict[str, Any]:
+    """Optional keyword arguments for BaseVectorStorage.query derived from query_param.
+
+    search_effort is only passed when set, so custom vector storages that predate
+    the argument keep working with default query parameters.
+    """
+    if query_param.vector_search_effort is None:
+        return {}
+    return {"search_effort": query_param.vector_search_effort}
+
+
 async def _get_vector_context(
     query: str,
     chunks_vdb: BaseVectorStorage,
@@ -3388,7 +3966,10 @@ async def _get_vector_context(
         cosine_threshold = chunks_vdb.cosine_better_than_threshold
 
         results = await chunks_vdb.query(
-            query, top_k=search_top_k, query_embedding=query_embedding
+            query,
+            top_k=search_top_k,
+            query_embedding=query_embedding,
+            **_vector_search_kwargs(query_param),
         )
         if not results:
             logger.info(
@@ -3924,7 +4505,7 @@ async def _build_context_str(
         text_chunks_str="",
         reference_list_str="",
     )
-    kg_context_tokens = len(tokenizer.encode(pre_kg_context))
+    kg_context_tokens = tokenizer.count_tokens(pre_kg_context)
 
     # Calculate preliminary system prompt tokens
     pre_sys_prompt = sys_prompt_template.format(
@@ -3932,10 +4513,10 @@ async def _build_context_str(
         response_type=response_type,
         user_prompt=user_prompt,
     )
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
+    sys_prompt_tokens = tokenizer.count_tokens(pre_sys_prompt)
 
     # Calculate available tokens for text chunks
-    query_tokens = len(tokenizer.encode(query))
+    query_tokens = tokenizer.count_tokens(query)
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + kg_context_tokens + query_tokens + buffer_tokens
@@ -4163,6 +4744,109 @@ async def _build_query_context(
     return QueryContextResult(context=context, raw_data=raw_data)
 
 
+def _normalize_keywords(keywords: str) -> str:
+    """Normalize a comma separated keyword string for use in cache keys"""
+    normalized = {" ".join(k.split()).casefold() for k in keywords.split(",")}
+    return ", ".join(sorted(k for k in normalized if k))
+
+
+async def _build_query_context_with_cache(
+    query: str,
+    ll_keywords: str,
+    hl_keywords: str,
+    knowledge_graph_inst: BaseGraphStorage,
+    entities_vdb: BaseVectorStorage,
+    relationships_vdb: BaseVectorStorage,
+    text_chunks_db: BaseKVStorage,
+    query_param: QueryParam,
+    global_config: dict[str, Any],
+    chunks_vdb: BaseVectorStorage = None,
+    query_context_cache: OrderedDict[str, tuple[float, QueryContextResult]]
+    | None = None,
+) -> QueryContextResult | None:
+    """Build the query context through the caller's retrieval cache.
+
+    Caches the QueryContextResult produced by search, truncation, chunk merging
+    and rerank in `query_context_cache` (owned by one LightRAG instance, which
+    maps cache key -> (expires_at, result)). Entries are keyed on the normalized
+    query and keywords, the retrieval settings and the workspace storage
+    generation, so any persisted index update (which bumps the generation) makes
+    older entries unreachable. Entries are further bounded by
+    `retrieval_cache_max_size` (LRU) and `retrieval_cache_ttl`. Callers always
+    receive a private copy.
+    """
+    max_size = global_config.get("retrieval_cache_max_size", 0)
+    if query_context_cache is None or not max_size or max_size <= 0:
+        return await _build_query_context(
+            query,
+            ll_keywords,
+            hl_keywords,
+            knowledge_graph_inst,
+            entities_vdb,
+            relationships_vdb,
+            text_chunks_db,
+            query_param,
+            chunks_vdb,
+        )
+
+    workspace = global_config.get("workspace")
+    generation = await get_storage_generation(workspace)
+    cache_key = compute_args_hash(
+        workspace or "",
+        generation,
+        query_param.mode,
+        " ".join(query.split()),
+        _normalize_keywords(ll_keywords),
+        _normalize_keywords(hl_keywords),
+        query_param.top_k,
+        query_param.chunk_top_k,
+        query_param.max_entity_tokens,
+        query_param.max_relation_tokens,
+        query_param.max_total_tokens,
+        query_param.enable_rerank,
+        query_param.response_type,
+        query_param.user_prompt or "",
+        query_param.vector_search_effort,
+        global_config.get("kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD),
+        global_config.get("related_chunk_number", DEFAULT_RELATED_CHUNK_NUMBER),
+        getattr(entities_vdb, "cosine_better_than_threshold", None),
+        getattr(chunks_vdb, "cosine_better_than_threshold", None),
+        repr(global_config.get("rerank_model_func")),
+        global_config.get("min_rerank_score"),
+    )
+
+    now = time.time()
+    cached = query_context_cache.get(cache_key)
+    if cached is not None:
+        expires_at, cached_result = cached
+        if expires_at > now:
+            query_context_cache.move_to_end(cache_key)
+            logger.info(" == Retrieval cache == Query context cache hit")
+            return copy.deepcopy(cached_result)
+        del query_context_cache[cache_key]
+
+    context_result = await _build_query_context(
+        query,
+        ll_keywords,
+        hl_keywords,
+        knowledge_graph_inst,
+        entities_vdb,
+        relationships_vdb,
+        text_chunks_db,
+        query_param,
+        chunks_vdb,
+    )
+
+    if context_result is not None:
+        ttl = global_config.get("retrieval_cache_ttl", 0)
+        expires_at = now + ttl if ttl and ttl > 0 else float("inf")
+        query_context_cache[cache_key] = (expires_at, copy.deepcopy(context_result))
+        while len(query_context_cache) > max_size:
+            query_context_cache.popitem(last=False)
+
+    return context_result
+
+
 async def _get_node_data(
     query: str,
     knowledge_graph_inst: BaseGraphStorage,
@@ -4174,7 +4858,9 @@ async def _get_node_data(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    results = await entities_vdb.query(
+        query, top_k=query_param.top_k, **_vector_search_kwargs(query_param)
+    )
 
     if not len(results):
         return [], []
@@ -4446,7 +5132,9 @@ async def _get_edge_data(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    results = await relationships_vdb.query(
+        keywords, top_k=query_param.top_k, **_vector_search_kwargs(query_param)
+    )
 
     if not len(results):
         return [], []
@@ -4832,8 +5520,8 @@ async def naive_query(
     )
 
     # Calculate available tokens for chunks
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
-    query_tokens = len(tokenizer.encode(query))
+    sys_prompt_tokens = tokenizer.count_tokens(pre_sys_prompt)
+    query_tokens = tokenizer.count_tokens(query)
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + query_tokens + buffer_tokens
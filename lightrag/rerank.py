@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
 import aiohttp
-from typing import Any, List, Dict, Optional
+from typing import Any, Awaitable, Callable, List, Dict, Optional
+from urllib.parse import urlsplit
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
     retry_if_exception_type,
 )
-from .utils import logger
+from .constants import DEFAULT_RERANK_KEEPALIVE_TIMEOUT, DEFAULT_RERANK_MAX_CONNECTIONS
+from .utils import compute_args_hash, get_env_value, logger, register_client_pool
 
 from dotenv import load_dotenv
 
@@ -19,6 +23,95 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
+class RerankSessionPool:
+    """Keep-alive aiohttp sessions shared by rerank calls, one per endpoint origin.
+
+    LightRAG instances acquire() the pool in initialize_storages and release()
+    it in finalize_storages; the sessions are closed when the last user
+    releases it. While nobody holds the pool, session() returns None and rerank
+    calls fall back to a short-lived session of their own.
+
+    Identical rerank requests that are in flight at the same time (same
+    endpoint, payload and key, e.g. concurrent users asking the same question)
+    share one HTTP call. The supported providers take a single query per
+    request, so coalescing is the only cross-query batching available.
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        keepalive_timeout: float | None = None,
+    ):
+        self.max_connections = max_connections or get_env_value(
+            "RERANK_MAX_CONNECTIONS", DEFAULT_RERANK_MAX_CONNECTIONS, int
+        )
+        self.keepalive_timeout = keepalive_timeout or get_env_value(
+            "RERANK_KEEPALIVE_TIMEOUT", DEFAULT_RERANK_KEEPALIVE_TIMEOUT, float
+        )
+        self._users = 0
+        self._sessions: dict[
+            str, tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]
+        ] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @property
+    def active(self) -> bool:
+        return self._users > 0
+
+    def acquire(self) -> None:
+        self._users += 1
+
+    async def release(self) -> None:
+        self._users = max(0, self._users - 1)
+        if self._users == 0:
+            await self.close()
+
+    def session(self, base_url: str) -> aiohttp.ClientSession | None:
+        """Return the shared session for base_url's origin, or None when the pool is not held"""
+        if not self.active:
+            return None
+        parts = urlsplit(base_url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(origin)
+        if entry is not None and not entry[0].closed and entry[1] is loop:
+            return entry[0]
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        self._sessions[origin] = (session, loop)
+        logger.debug(f"Rerank session pool: opened session for {origin}")
+        return session
+
+    async def coalesce(
+        self, key: str, request: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Run request(), sharing the result with identical requests already in flight"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(request())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A cancelled caller must not cancel the request for the others
+        results = await asyncio.shield(future)
+        return [dict(result) for result in results]
+
+    async def close(self) -> None:
+        sessions, self._sessions = self._sessions, {}
+        loop = asyncio.get_running_loop()
+        for session, session_loop in sessions.values():
+            # Sessions of an event loop that is gone cannot be closed from here
+            if session_loop is loop and not session.closed:
+                await session.close()
+
+
+rerank_session_pool = register_client_pool(RerankSessionPool())
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=60),
@@ -109,64 +202,88 @@ async def generic_rerank_api(
         f"Rerank request: {len(documents)} documents, model: {model}, format: {response_format}"
     )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(base_url, headers=headers, json=payload) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                content_type = response.headers.get("content-type", "").lower()
-                is_html_error = (
-                    error_text.strip().startswith("<!DOCTYPE html>")
-                    or "text/html" in content_type
-                )
-                if is_html_error:
-                    if response.status == 502:
-                        clean_error = "Bad Gateway (502) - Rerank service temporarily unavailable. Please try again in a few minutes."
-                    elif response.status == 503:
-                        clean_error = "Service Unavailable (503) - Rerank service is temporarily overloaded. Please try again later."
-                    elif response.status == 504:
-                        clean_error = "Gateway Timeout (504) - Rerank service request timed out. Please try again."
-                    else:
-                        clean_error = f"HTTP {response.status} - Rerank service error. Please try again later."
-                else:
-                    clean_error = error_text
-                logger.error(f"Rerank API error {response.status}: {clean_error}")
-                raise aiohttp.ClientResponseError(
-                    request_info=response.request_info,
-                    history=response.history,
-                    status=response.status,
-                    message=f"Rerank API error: {clean_error}",
-                )
+    async def _request():
+        session = rerank_session_pool.session(base_url)
+        if session is not None:
+            return await _post_rerank_request(
+                session, base_url, headers, payload, response_format
+            )
+        async with aiohttp.ClientSession() as session:
+            return await _post_rerank_request(
+                session, base_url, headers, payload, response_format
+            )
+
+    request_key = compute_args_hash(
+        base_url, api_key or "", json.dumps(payload, sort_keys=True)
+    )
+    return await rerank_session_pool.coalesce(request_key, _request)
+
 
-            response_json = await response.json()
-
-            if response_format == "aliyun":
-                # Aliyun format: {"output": {"results": [...]}}
-                results = response_json.get("output", {}).get("results", [])
-                if not isinstance(results, list):
-                    logger.warning(
-                        f"Expected 'output.results' to be list, got {type(results)}: {results}"
-                    )
-                    results = []
-
-            elif response_format == "standard":
-                # Standard format: {"results": [...]}
-                results = response_json.get("results", [])
-                if not isinstance(results, list):
-                    logger.warning(
-                        f"Expected 'results' to be list, got {type(results)}: {results}"
-                    )
-                    results = []
+async def _post_rerank_request(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    response_format: str,
+) -> List[Dict[str, Any]]:
+    """POST a rerank payload and return the standardized results"""
+    async with session.post(base_url, headers=headers, json=payload) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            content_type = response.headers.get("content-type", "").lower()
+            is_html_error = (
+                error_text.strip().startswith("<!DOCTYPE html>")
+                or "text/html" in content_type
+            )
+            if is_html_error:
+                if response.status == 502:
+                    clean_error = "Bad Gateway (502) - Rerank service temporarily unavailable. Please try again in a few minutes."
+                elif response.status == 503:
+                    clean_error = "Service Unavailable (503) - Rerank service is temporarily overloaded. Please try again later."
+                elif response.status == 504:
+                    clean_error = "Gateway Timeout (504) - Rerank service request timed out. Please try again."
+                else:
+                    clean_error = f"HTTP {response.status} - Rerank service error. Please try again later."
             else:
-                raise ValueError(f"Unsupported response format: {response_format}")
-            if not results:
-                logger.warning("Rerank API returned empty results")
-                return []
-
-            # Standardize return format
-            return [
-                {"index": result["index"], "relevance_score": result["relevance_score"]}
-                for result in results
-            ]
+                clean_error = error_text
+            logger.error(f"Rerank API error {response.status}: {clean_error}")
+            raise aiohttp.ClientResponseError(
+                request_info=response.request_info,
+                history=response.history,
+                status=response.status,
+                message=f"Rerank API error: {clean_error}",
+            )
+
+        response_json = await response.json()
+
+        if response_format == "aliyun":
+            # Aliyun format: {"output": {"results": [...]}}
+            results = response_json.get("output", {}).get("results", [])
+            if not isinstance(results, list):
+                logger.warning(
+                    f"Expected 'output.results' to be list, got {type(results)}: {results}"
+                )
+                results = []
+
+        elif response_format == "standard":
+            # Standard format: {"results": [...]}
+            results = response_json.get("results", [])
+            if not isinstance(results, list):
+                logger.warning(
+                    f"Expected 'results' to be list, got {type(results)}: {results}"
+                )
+                results = []
+        else:
+            raise ValueError(f"Unsupported response format: {response_format}")
+        if not results:
+            logger.warning("Rerank API returned empty results")
+            return []
+
+        # Standardize return format
+        return [
+            {"index": result["index"], "relevance_score": result["relevance_score"]}
+            for result in results
+        ]
 
 
 async def cohere_rerank(
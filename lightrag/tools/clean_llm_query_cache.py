@@ -31,7 +31,6 @@ sys.path.insert(
 )
 
 from lightrag.kg import STORAGE_ENV_REQUIREMENTS
-from lightrag.kg.shared_storage import set_all_update_flags
 from lightrag.namespace import NameSpace
 from lightrag.utils import setup_logger
 
@@ -457,15 +456,9 @@ class CleanupTool:
             batch_keys = keys_to_delete[start_idx:end_idx]
 
             try:
-                async with storage._storage_lock:
-                    for key in batch_keys:
-                        del storage._data[key]
-
-                # CRITICAL: Set update flag so changes persist to disk
-                # Without this, deletions remain in-memory only and are lost on exit
-                await set_all_update_flags(
-                    storage.namespace, workspace=storage.workspace
-                )
+                # delete() records the keys for the storage log and sets the
+                # update flag so changes persist to disk
+                await storage.delete(batch_keys)
 
                 # Success
                 stats.successful_batches += 1
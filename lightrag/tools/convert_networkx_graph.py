@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Convert NetworkXStorage graph files between GraphML and the binary format.
+
+NetworkXStorage converts an existing .graphml file automatically the first
+time it starts with NETWORKX_GRAPH_FORMAT=binary. This tool does the same
+offline, and can also export a binary snapshot (including any pending delta
+file) back to GraphML for tools that only read GraphML, such as the graph
+visualizer.
+
+Usage:
+    python -m lightrag.tools.convert_networkx_graph ./rag_storage/graph_chunk_entity_relation.graphml
+    python -m lightrag.tools.convert_networkx_graph ./rag_storage/graph_chunk_entity_relation.nxgraph
+    python -m lightrag.tools.convert_networkx_graph in.graphml -o out.nxgraph
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import networkx as nx  # noqa: E402
+
+from lightrag.kg.networkx_impl import (  # noqa: E402
+    apply_graph_delta,
+    convert_graphml_to_binary,
+    read_graph_delta,
+    read_graph_snapshot,
+)
+
+
+def convert(source: str, target: str | None = None) -> str:
+    """Convert source to the other format and return the written file name"""
+    stem, ext = os.path.splitext(source)
+    start = time.perf_counter()
+    if ext == ".graphml":
+        target = target or f"{stem}.nxgraph"
+        graph = convert_graphml_to_binary(source, target)
+    else:
+        loaded = read_graph_snapshot(source)
+        if loaded is None:
+            raise ValueError(f"{source} is not a binary NetworkX graph file")
+        graph, generation = loaded
+        ops, _ = read_graph_delta(f"{source}.delta", generation)
+        apply_graph_delta(graph, ops)
+        target = target or f"{stem}.graphml"
+        nx.write_graphml(graph, target)
+    print(
+        f"Wrote {target}: {graph.number_of_nodes()} nodes, "
+        f"{graph.number_of_edges()} edges in {time.perf_counter() - start:.1f}s"
+    )
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert NetworkXStorage graphs between GraphML and binary"
+    )
+    parser.add_argument("source", help="A .graphml file or a .nxgraph snapshot")
+    parser.add_argument("-o", "--output", help="Output file (default: next to source)")
+    args = parser.parse_args()
+    convert(args.source, args.output)
+
+
+if __name__ == "__main__":
+    main()
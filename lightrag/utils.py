@@ -4,15 +4,20 @@ import weakref
 import sys
 
 import asyncio
+import codecs
 import html
 import csv
 import json
 import logging
 import logging.handlers
+import math
 import os
 import re
 import time
 import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime
 from functools import wraps
@@ -27,6 +32,8 @@ from typing import (
     Iterable,
     Sequence,
     Collection,
+    Iterator,
+    MutableMapping,
 )
 import numpy as np
 from dotenv import load_dotenv
@@ -37,6 +44,14 @@ from lightrag.constants import (
     DEFAULT_LOG_FILENAME,
     GRAPH_FIELD_SEP,
     DEFAULT_MAX_TOTAL_TOKENS,
+    DEFAULT_TOKEN_COUNT_CACHE_SIZE,
+    DEFAULT_TOKEN_COUNT_MODE,
+    DEFAULT_TOKEN_ESTIMATOR_CALIBRATION_CHARS,
+    DEFAULT_TOKEN_ESTIMATE_MARGIN,
+    DEFAULT_JSON_LOAD_BATCH_SIZE,
+    JSON_LOAD_PROGRESS_MIN_BYTES,
+    DEFAULT_VECTOR_UPSERT_FLUSH_INTERVAL,
+    DEFAULT_LLM_CACHE_FLUSH_SIZE,
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     VALID_SOURCE_IDS_LIMIT_METHODS,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
@@ -272,6 +287,73 @@ def set_verbose_debug(enabled: bool):
 statistic_data = {"llm_call": 0, "llm_cache": 0, "embed_call": 0}
 
 
+class StageTimer:
+    """Accumulates elapsed time and call counts per named processing stage.
+
+    Stages measured by concurrent tasks add up their own elapsed times, so the
+    total of a stage can exceed the wall time of the work that contains it.
+    """
+
+    def __init__(self):
+        self.seconds: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float, count: int = 1) -> None:
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+        self.counts[stage] = self.counts.get(stage, 0) + count
+
+    def merge(self, other: "StageTimer") -> None:
+        for stage, seconds in other.seconds.items():
+            self.add(stage, seconds, other.counts[stage])
+
+    def reset(self) -> None:
+        self.seconds.clear()
+        self.counts.clear()
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{stage} {seconds:.2f}s/{self.counts[stage]}"
+            for stage, seconds in self.seconds.items()
+        )
+
+
+# Chunk-level extraction stage timings accumulated over all documents of the process
+extraction_stage_timer = StageTimer()
+
+# Shared HTTP client pools (rerank sessions, OpenAI clients) that LightRAG
+# instances hold between initialize_storages and finalize_storages. Each pool
+# implements acquire() and async release(), and closes its clients once the
+# last holder has released it.
+_client_pools: list[Any] = []
+
+
+def register_client_pool(pool):
+    """Register a shared client pool for the LightRAG storage lifecycle"""
+    _client_pools.append(pool)
+    return pool
+
+
+def acquire_client_pools() -> None:
+    for pool in _client_pools:
+        pool.acquire()
+
+
+async def release_client_pools() -> None:
+    for pool in _client_pools:
+        try:
+            await pool.release()
+        except Exception as e:
+            logger.warning(f"Failed to release client pool {type(pool).__name__}: {e}")
+
+
 class LightragPathFilter(logging.Filter):
     """Filter for lightrag logger to filter out frequent path access logs"""
 
@@ -559,6 +641,264 @@ class HealthCheckTimeoutError(Exception):
         )
 
 
+_current_concurrency_limiter: ContextVar[AdaptiveConcurrencyLimiter | None] = (
+    ContextVar("current_concurrency_limiter", default=None)
+)
+
+
+def is_rate_limit_error(exception: BaseException | None) -> bool:
+    """Whether an exception reports that the provider throttled the request (HTTP 429)"""
+    if exception is None:
+        return False
+    status = getattr(exception, "status_code", None) or getattr(
+        exception, "status", None
+    )
+    return status == 429 or "ratelimit" in type(exception).__name__.lower()
+
+
+def retry_after_seconds(exception: BaseException | None) -> float | None:
+    """Read the Retry-After (or retry-after-ms) header of a provider error, if any"""
+    response = getattr(exception, "response", None)
+    headers = getattr(response, "headers", None) or getattr(exception, "headers", None)
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            return float(retry_after_ms) / 1000
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            return float(retry_after)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def report_rate_limit(exception: BaseException) -> None:
+    """Tell the adaptive limiter running the current call that the provider throttled it.
+
+    Provider functions retry rate-limited requests internally, so without this
+    hook the limiter would only see the final outcome of the call.
+    """
+    limiter = _current_concurrency_limiter.get()
+    if limiter is not None and is_rate_limit_error(exception):
+        limiter.on_rate_limited(retry_after_seconds(exception))
+
+
+def report_rate_limit_before_retry(retry_state) -> None:
+    """tenacity `before_sleep` hook forwarding rate-limit errors to report_rate_limit"""
+    outcome = retry_state.outcome
+    if outcome is not None and outcome.failed:
+        report_rate_limit(outcome.exception())
+
+
+def estimate_call_tokens(args: tuple, kwargs: dict) -> int:
+    """Estimate the prompt tokens of an LLM call from its text arguments"""
+    texts = [arg for arg in args if isinstance(arg, str)]
+    system_prompt = kwargs.get("system_prompt")
+    if isinstance(system_prompt, str):
+        texts.append(system_prompt)
+    for message in kwargs.get("history_messages") or []:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            texts.append(content)
+    return _call_token_estimator.estimate("\n".join(texts))
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit and token-per-minute budget for provider calls.
+
+    Starting from initial_limit, the limit doubles-up one slot per successful
+    call (slow start) and, after the first back-off, grows by one slot per
+    window of `limit` successful calls. It only grows while the limit is
+    actually in use, the latency EWMA stays within latency_tolerance times its
+    (slowly rising) baseline and the error-rate EWMA stays below
+    error_rate_threshold. Rate-limit errors, and a too high error rate,
+    multiply the limit by backoff, at most once per latency period so one
+    burst of 429s counts as one signal; a Retry-After header additionally
+    pauses new calls until it has passed.
+
+    With adaptive=False the limit stays at initial_limit and only the token
+    budget and Retry-After pauses apply. The token budget is a bucket of
+    tokens_per_minute tokens refilled continuously; a call larger than the
+    whole bucket waits for a full bucket.
+
+    Callers take a slot with `acquire`, wait for `admit` right before calling
+    the provider and hand the slot back with `release`.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: int | None = None,
+        adaptive: bool = True,
+        tokens_per_minute: int | None = None,
+        latency_tolerance: float = 2.0,
+        error_rate_threshold: float = 0.2,
+        backoff: float = 0.5,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        initial = initial_limit if initial_limit is not None else self.max_limit
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.adaptive = adaptive
+        self.tokens_per_minute = tokens_per_minute or 0
+        self.latency_tolerance = latency_tolerance
+        self.error_rate_threshold = error_rate_threshold
+        self.backoff = backoff
+
+        self.in_flight = 0
+        self.rate_limited = 0
+        self._slow_start_threshold = float(self.max_limit)
+        self._latency: float | None = None
+        self._baseline_latency: float | None = None
+        self._error_rate = 0.0
+        self._wait: float | None = None
+        self._last_decrease = float("-inf")
+        self._paused_until = 0.0
+        self._tokens = float(self.tokens_per_minute)
+        self._tokens_updated = time.monotonic()
+        self._waiters: list[asyncio.Future] = []
+
+    def _refill(self, now: float) -> None:
+        if self.tokens_per_minute:
+            elapsed = now - self._tokens_updated
+            self._tokens = min(
+                float(self.tokens_per_minute),
+                self._tokens + elapsed * self.tokens_per_minute / 60,
+            )
+        self._tokens_updated = now
+
+    async def _wait_until(self, ready) -> None:
+        """Wait until ready(now) returns 0, sleeping for the delay it returns (None: until woken)"""
+        while True:
+            delay = ready(time.monotonic())
+            if delay == 0:
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait({waiter}, timeout=delay)
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def _wake(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def acquire(self) -> None:
+        """Wait for a concurrency slot"""
+        await self._wait_until(
+            lambda now: 0 if self.in_flight < int(self.limit) else None
+        )
+        self.in_flight += 1
+
+    async def admit(self, tokens: int = 0) -> None:
+        """Wait out a Retry-After pause and until the token budget allows the call"""
+        needed = min(tokens, self.tokens_per_minute)
+
+        def ready(now: float) -> float:
+            if now < self._paused_until:
+                return self._paused_until - now
+            if not self.tokens_per_minute:
+                return 0
+            self._refill(now)
+            if self._tokens >= needed:
+                return 0
+            return (needed - self._tokens) * 60 / self.tokens_per_minute
+
+        await self._wait_until(ready)
+        self._tokens -= needed
+
+    def record_wait(self, seconds: float) -> None:
+        self._wait = seconds if self._wait is None else 0.8 * self._wait + 0.2 * seconds
+
+    def release(
+        self,
+        latency: float | None = None,
+        error: BaseException | None = None,
+        saturated: bool | None = None,
+    ) -> None:
+        """Free a slot and feed the outcome of the call (no latency or error: no call made)
+
+        saturated tells whether more calls were waiting than the limit admitted;
+        by default that is assumed when every slot was taken.
+        """
+        if saturated is None:
+            saturated = self.in_flight >= int(self.limit) or bool(self._waiters)
+        self.in_flight = max(0, self.in_flight - 1)
+        if is_rate_limit_error(error):
+            self.on_rate_limited(retry_after_seconds(error))
+        elif self.adaptive and (latency is not None or error is not None):
+            self._on_completion(latency, error is not None, saturated)
+        self._wake()
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        self.rate_limited += 1
+        now = time.monotonic()
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+        if self.adaptive:
+            self._decrease(now, "rate limited")
+        self._wake()
+
+    def _on_completion(self, latency: float | None, failed: bool, saturated: bool):
+        self._error_rate = 0.9 * self._error_rate + 0.1 * failed
+        if failed:
+            if self._error_rate > self.error_rate_threshold:
+                self._decrease(time.monotonic(), "error rate")
+            return
+
+        self._latency = (
+            latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        )
+        if self._baseline_latency is None or self._latency < self._baseline_latency:
+            self._baseline_latency = self._latency
+        else:
+            # Let the baseline follow lasting workload changes slowly
+            self._baseline_latency *= 1.01
+        if (
+            not saturated
+            or self._error_rate > self.error_rate_threshold
+            or self._latency > self._baseline_latency * self.latency_tolerance
+        ):
+            return
+        if self.limit < self._slow_start_threshold:
+            self.limit += 1
+        else:
+            self.limit += 1 / self.limit
+        self.limit = min(self.limit, float(self.max_limit))
+
+    def _decrease(self, now: float, reason: str) -> None:
+        # Calls already in flight were admitted under the old limit
+        if now - self._last_decrease < max(self._latency or 0.0, 1.0):
+            return
+        self._last_decrease = now
+        previous = int(self.limit)
+        self.limit = max(float(self.min_limit), float(int(self.limit * self.backoff)))
+        self._slow_start_threshold = self.limit
+        logger.info(
+            f"Adaptive concurrency: {reason}, limit {previous} -> {int(self.limit)}"
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Current limit, in-flight calls, average queue wait and latency, and budget"""
+        self._refill(time.monotonic())
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "avg_wait": self._wait or 0.0,
+            "avg_latency": self._latency or 0.0,
+            "error_rate": self._error_rate,
+            "rate_limited": self.rate_limited,
+            "tokens_available": int(self._tokens) if self.tokens_per_minute else None,
+        }
+
+
 def priority_limit_async_func_call(
     max_size: int,
     llm_timeout: float = None,
@@ -567,6 +907,10 @@ def priority_limit_async_func_call(
     max_queue_size: int = 1000,
     cleanup_timeout: float = 2.0,
     queue_name: str = "limit_async",
+    adaptive: bool = False,
+    min_size: int = 1,
+    initial_size: int | None = None,
+    tokens_per_minute: int | None = None,
 ):
     """
     Enhanced priority-limited asynchronous function call decorator with robust timeout handling
@@ -576,18 +920,25 @@ def priority_limit_async_func_call(
     - Task state tracking to prevent race conditions
     - Enhanced health check system with stuck task detection
     - Proper resource cleanup and error recovery
+    - Optional adaptive concurrency and token budget (see AdaptiveConcurrencyLimiter)
 
     Args:
-        max_size: Maximum number of concurrent calls
+        max_size: Maximum number of concurrent calls (upper bound of the adaptive limit)
         max_queue_size: Maximum queue capacity to prevent memory overflow
         llm_timeout: LLM provider timeout (from global config), used to calculate other timeouts
         max_execution_timeout: Maximum time for worker to execute function (defaults to llm_timeout + 30s)
         max_task_duration: Maximum time before health check intervenes (defaults to llm_timeout + 60s)
         cleanup_timeout: Maximum time to wait for cleanup operations (defaults to 2.0s)
         queue_name: Optional queue name for logging identification (defaults to "limit_async")
+        adaptive: Adapt the concurrency limit between min_size and max_size to latency,
+            error rate and rate-limit errors instead of always running max_size calls
+        min_size: Lower bound of the adaptive limit
+        initial_size: Starting limit in adaptive mode (defaults to max_size)
+        tokens_per_minute: Estimated prompt tokens the calls may send per minute (None or 0: unlimited)
 
     Returns:
-        Decorator function
+        Decorator function; its `stats()` reports the current limit, calls in flight,
+        queue depth and, with a limiter, average queue wait, latency and error rate
     """
 
     def final_decro(func):
@@ -620,12 +971,33 @@ def priority_limit_async_func_call(
         task_states_lock = asyncio.Lock()
         active_futures = weakref.WeakSet()
         reinit_count = 0
+        executing = 0
+        limiter = (
+            AdaptiveConcurrencyLimiter(
+                max_limit=max_size,
+                min_limit=min_size,
+                initial_limit=initial_size if adaptive else max_size,
+                adaptive=adaptive,
+                tokens_per_minute=tokens_per_minute,
+            )
+            if adaptive or tokens_per_minute
+            else None
+        )
 
         async def worker():
             """Enhanced worker that processes tasks with proper timeout and state management"""
+            nonlocal executing
+            # Lets provider retry hooks report rate limits (see report_rate_limit)
+            _current_concurrency_limiter.set(limiter)
             try:
                 while not shutdown_event.is_set():
+                    has_slot = False
                     try:
+                        # Take a slot before dequeuing so waiting tasks keep their priority order
+                        if limiter is not None:
+                            await limiter.acquire()
+                            has_slot = True
+
                         # Get task from queue with timeout for shutdown checking
                         try:
                             (
@@ -660,6 +1032,18 @@ def priority_limit_async_func_call(
                             queue.task_done()
                             continue
 
+                        if limiter is not None:
+                            await limiter.admit(estimate_call_tokens(args, kwargs))
+                            task_state.execution_start_time = (
+                                asyncio.get_event_loop().time()
+                            )
+                            limiter.record_wait(
+                                task_state.execution_start_time - task_state.start_time
+                            )
+                        saturated = not queue.empty()
+                        call_latency = outcome_error = None
+                        executing += 1
+
                         try:
                             # Execute function with timeout protection
                             if max_execution_timeout is not None:
@@ -668,6 +1052,10 @@ def priority_limit_async_func_call(
                                 )
                             else:
                                 result = await func(*args, **kwargs)
+                            call_latency = (
+                                asyncio.get_event_loop().time()
+                                - task_state.execution_start_time
+                            )
 
                             # Set result if future is still valid
                             if not task_state.future.done():
@@ -678,12 +1066,11 @@ def priority_limit_async_func_call(
                             logger.warning(
                                 f"{queue_name}: Worker timeout for task {task_id} after {max_execution_timeout}s"
                             )
+                            outcome_error = WorkerTimeoutError(
+                                max_execution_timeout, "execution"
+                            )
                             if not task_state.future.done():
-                                task_state.future.set_exception(
-                                    WorkerTimeoutError(
-                                        max_execution_timeout, "execution"
-                                    )
-                                )
+                                task_state.future.set_exception(outcome_error)
                         except asyncio.CancelledError:
                             # Task was cancelled during execution
                             if not task_state.future.done():
@@ -696,9 +1083,18 @@ def priority_limit_async_func_call(
                             logger.error(
                                 f"{queue_name}: Error in decorated function for task {task_id}: {str(e)}"
                             )
+                            outcome_error = e
                             if not task_state.future.done():
                                 task_state.future.set_exception(e)
                         finally:
+                            executing -= 1
+                            if limiter is not None:
+                                limiter.release(
+                                    latency=call_latency,
+                                    error=outcome_error,
+                                    saturated=saturated or not queue.empty(),
+                                )
+                                has_slot = False
                             # Clean up task state
                             async with task_states_lock:
                                 task_states.pop(task_id, None)
@@ -710,6 +1106,10 @@ def priority_limit_async_func_call(
                             f"{queue_name}: Critical error in worker: {str(e)}"
                         )
                         await asyncio.sleep(0.1)
+                    finally:
+                        # Slots held without running a call carry no outcome
+                        if has_slot:
+                            limiter.release()
             finally:
                 logger.debug(f"{queue_name}: Worker exiting")
 
@@ -996,6 +1396,18 @@ def priority_limit_async_func_call(
                 async with task_states_lock:
                     task_states.pop(task_id, None)
 
+        def stats() -> dict[str, Any]:
+            """Current concurrency limit, calls in flight and queue depth"""
+            current = {"limit": max_size}
+            if limiter is not None:
+                current.update(limiter.stats())
+            current["in_flight"] = executing
+            current["queue_depth"] = queue.qsize()
+            return current
+
+        wait_func.stats = stats
+        wait_func.limiter = limiter
+
         # Add shutdown method to decorated function
         wait_func.shutdown = shutdown
 
@@ -1004,6 +1416,93 @@ def priority_limit_async_func_call(
     return final_decro
 
 
+class VectorUpsertBuffer:
+    """Coalesce small vector upserts from concurrent tasks into batched calls.
+
+    Records passed to upsert() are buffered and written to the wrapped vector
+    storage once batch_size records are pending, once max_waiters callers are
+    waiting (when the caller concurrency is bounded, nobody else can add to the
+    batch), or flush_interval seconds after the first record arrived, whichever
+    comes first. Each caller waits until the
+    batch holding its records has been written and receives that batch's
+    exception if the write fails, so retry logic around upsert() keeps working.
+    Batches are written concurrently; callers that update the same id must wait
+    for their previous upsert before submitting the next one, which the keyed
+    graph locks in the merge phase already guarantee. delete() is passed
+    straight through to the storage.
+    """
+
+    def __init__(
+        self,
+        storage,
+        batch_size: int,
+        flush_interval: float = DEFAULT_VECTOR_UPSERT_FLUSH_INTERVAL,
+        max_waiters: int | None = None,
+    ):
+        self.storage = storage
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_waiters = max_waiters
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._waiters: list[asyncio.Future] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        if not data:
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.update(data)
+        self._waiters.append(future)
+        if len(self._pending) >= self.batch_size or (
+            self.max_waiters is not None and len(self._waiters) >= self.max_waiters
+        ):
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._start_flush)
+        await future
+
+    async def delete(self, ids: list[str]) -> None:
+        await self.storage.delete(ids)
+
+    async def flush(self) -> None:
+        """Write any buffered records and wait for all in-flight batches"""
+        self._start_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, waiters = self._pending, self._waiters
+        self._pending, self._waiters = {}, []
+        task = asyncio.create_task(self._write(batch, waiters))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _write(
+        self, batch: dict[str, dict[str, Any]], waiters: list[asyncio.Future]
+    ) -> None:
+        try:
+            await self.storage.upsert(batch)
+        except asyncio.CancelledError:
+            for waiter in waiters:
+                waiter.cancel()
+            raise
+        except Exception as e:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+
 def wrap_embedding_func_with_attrs(**kwargs):
     """Decorator to add embedding dimension and token limit attributes to embedding functions.
 
@@ -1090,6 +1589,144 @@ def load_json(file_name):
         return json.load(f)
 
 
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def iter_json_object_items(
+    file_name: str,
+    chunk_size: int = 1 << 20,
+    progress_callback: Callable[[int, int], None] | None = None,
+) -> Iterator[tuple[str, Any]]:
+    """Stream the top-level key/value pairs of a file holding one JSON object.
+
+    Only the current read buffer and the record being decoded are held in memory,
+    instead of the whole file text plus the fully built object as with json.load.
+
+    Args:
+        file_name: Path of a file written by write_json (a JSON object)
+        chunk_size: Bytes read from disk per call
+        progress_callback: Optional callable(bytes_read, total_bytes) invoked after each read
+
+    Yields:
+        (key, value) pairs in file order
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    total_bytes = os.path.getsize(file_name)
+
+    with open(file_name, "rb") as f:
+        buf = ""
+        pos = 0
+        bytes_read = 0
+        eof = False
+
+        def fill(min_chars: int = 0) -> None:
+            nonlocal buf, pos, bytes_read, eof
+            raw = f.read(max(chunk_size, min_chars))
+            bytes_read += len(raw)
+            buf = buf[pos:] + text_decoder.decode(raw, final=not raw)
+            pos = 0
+            eof = not raw
+            if progress_callback is not None:
+                progress_callback(bytes_read, total_bytes)
+
+        def skip_whitespace() -> None:
+            nonlocal pos
+            while True:
+                pos = _JSON_WHITESPACE.match(buf, pos).end()
+                if pos < len(buf) or eof:
+                    return
+                fill()
+
+        def decode_value() -> Any:
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    # Values inside an object are followed by whitespace, ":", "," or "}";
+                    # anything else means a number was cut at the buffer end
+                    if eof or (end < len(buf) and buf[end] in " \t\n\r:,}"):
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                # Grow geometrically so a large record is not re-parsed too often
+                fill(len(buf) - pos)
+
+        def expect(chars: str) -> str:
+            nonlocal pos
+            skip_whitespace()
+            char = buf[pos : pos + 1]
+            if not char or char not in chars:
+                raise json.JSONDecodeError(f"Expecting one of {chars!r}", buf, pos)
+            pos += 1
+            return char
+
+        fill()
+        skip_whitespace()
+        if eof and pos >= len(buf):
+            return
+        expect("{")
+        skip_whitespace()
+        if buf[pos : pos + 1] == "}":
+            return
+        while True:
+            skip_whitespace()
+            key = decode_value()
+            expect(":")
+            skip_whitespace()
+            yield key, decode_value()
+            if expect(",}") == "}":
+                return
+
+
+def load_json_streaming(
+    file_name: str,
+    target: MutableMapping[str, Any] | None = None,
+    batch_size: int = DEFAULT_JSON_LOAD_BATCH_SIZE,
+    label: str | None = None,
+) -> dict[str, Any] | int | None:
+    """Load a JSON object file record by record (see iter_json_object_items).
+
+    Without target it returns the loaded dict like load_json. With target (e.g. a
+    shared namespace dict) records are written into it in batches of batch_size and
+    the number of records is returned. Progress is logged for large files.
+    Returns None if the file does not exist.
+    """
+    if not os.path.exists(file_name):
+        return None
+
+    label = label or os.path.basename(file_name)
+    next_report = [10]
+
+    def report(bytes_read: int, total_bytes: int) -> None:
+        percent = bytes_read * 100 // max(total_bytes, 1)
+        if percent >= next_report[0] and percent < 100:
+            logger.info(f"Loading {label}: {percent}% of {total_bytes:,} bytes")
+            next_report[0] = percent // 10 * 10 + 10
+
+    large = os.path.getsize(file_name) >= JSON_LOAD_PROGRESS_MIN_BYTES
+    items = iter_json_object_items(
+        file_name, progress_callback=report if large else None
+    )
+    if target is None:
+        return dict(items)
+
+    count = 0
+    batch: dict[str, Any] = {}
+    for key, value in items:
+        batch[key] = value
+        if len(batch) >= batch_size:
+            target.update(batch)
+            count += len(batch)
+            batch = {}
+    if batch:
+        target.update(batch)
+        count += len(batch)
+    return count
+
+
 def _sanitize_string_for_json(text: str) -> str:
     """Remove characters that cannot be encoded in UTF-8 for JSON serialization.
 
@@ -1223,21 +1860,101 @@ class TokenizerInterface(Protocol):
         ...
 
 
+class TokenEstimator:
+    """
+    Approximates token counts from the number of ASCII and non-ASCII characters.
+
+    The per-character ratios start from conservative defaults and are fitted by
+    least squares to exact counts passed to `calibrate`. Estimates are rounded up
+    and increased by `margin`, so budget checks tend to over- rather than undercount.
+    """
+
+    def __init__(
+        self,
+        ascii_ratio: float = 0.25,
+        other_ratio: float = 1.0,
+        margin: float = DEFAULT_TOKEN_ESTIMATE_MARGIN,
+    ):
+        self.ascii_ratio = ascii_ratio
+        self.other_ratio = other_ratio
+        self.margin = margin
+
+    @staticmethod
+    def _char_classes(content: str) -> tuple[int, int]:
+        if content.isascii():
+            return len(content), 0
+        ascii_chars = len(content.encode("ascii", "ignore"))
+        return ascii_chars, len(content) - ascii_chars
+
+    def estimate(self, content: str) -> int:
+        ascii_chars, other_chars = self._char_classes(content)
+        tokens = ascii_chars * self.ascii_ratio + other_chars * self.other_ratio
+        # Rounding first keeps floating point noise from adding a token
+        return math.ceil(round(tokens * (1 + self.margin), 6))
+
+    def estimate_batch(self, contents: Sequence[str]) -> List[int]:
+        return [self.estimate(content) for content in contents]
+
+    def calibrate(self, contents: Sequence[str], counts: Sequence[int]) -> None:
+        """Fit the character ratios to exact token counts of sample texts"""
+        classes = np.array([self._char_classes(c) for c in contents], dtype=float)
+        counts = np.asarray(counts, dtype=float)
+        if classes.size == 0:
+            return
+        # Only fit the ratios of character classes present in the samples
+        present = classes.sum(axis=0) > 0
+        ratios, *_ = np.linalg.lstsq(classes[:, present], counts, rcond=None)
+        fitted = iter(ratios)
+        if present[0]:
+            self.ascii_ratio = max(float(next(fitted)), 0.0)
+        if present[1]:
+            self.other_ratio = max(float(next(fitted)), 0.0)
+
+
+# Sizes LLM calls against LLM_TOKENS_PER_MINUTE without a model tokenizer
+_call_token_estimator = TokenEstimator()
+
+
 class Tokenizer:
     """
     A wrapper around a tokenizer to provide a consistent interface for encoding and decoding.
+
+    Also provides a token-count service (`count_tokens` / `count_tokens_batch`)
+    that batch-counts cache misses and memoizes counts by content hash in a
+    bounded LRU, so budget checks on unchanged text never re-tokenize it.
+    Budget checks that can live with approximate counts call
+    `estimate_tokens_batch`, which returns calibrated estimates when
+    `count_mode` is "estimate" and exact counts otherwise.
     """
 
-    def __init__(self, model_name: str, tokenizer: TokenizerInterface):
+    def __init__(
+        self,
+        model_name: str,
+        tokenizer: TokenizerInterface,
+        count_cache_size: int = DEFAULT_TOKEN_COUNT_CACHE_SIZE,
+        count_mode: str = DEFAULT_TOKEN_COUNT_MODE,
+    ):
         """
         Initializes the Tokenizer with a tokenizer model name and a tokenizer instance.
 
         Args:
             model_name: The associated model name for the tokenizer.
             tokenizer: An instance of a class implementing the TokenizerInterface.
+            count_cache_size: Max number of memoized token counts (0 disables the cache).
+            count_mode: "exact" or "estimate"; see `estimate_tokens_batch`.
         """
+        if count_mode not in ("exact", "estimate"):
+            raise ValueError(f"Invalid count_mode: {count_mode}")
         self.model_name: str = model_name
         self.tokenizer: TokenizerInterface = tokenizer
+        self.count_cache_size: int = count_cache_size
+        self.count_mode: str = count_mode
+        self.estimator = TokenEstimator()
+        self._count_cache: OrderedDict[str, int] = OrderedDict()
+        self._calibration_texts: List[str] = []
+        self._calibration_counts: List[int] = []
+        self._calibration_chars: int = 0
+        self._calibrated: bool = False
 
     def encode(self, content: str) -> List[int]:
         """
@@ -1263,18 +1980,150 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def count_tokens(self, content: str) -> int:
+        """
+        Returns the number of tokens in a string, using the count cache.
+
+        Args:
+            content: The string to count.
+
+        Returns:
+            The number of tokens `encode(content)` would produce.
+        """
+        return self.count_tokens_batch([content])[0]
+
+    def count_tokens_batch(self, contents: Sequence[str]) -> List[int]:
+        """
+        Returns token counts for a list of strings.
+
+        Cached counts are looked up by content hash; the misses are counted in a
+        single call, then added to the bounded LRU cache. Tokenizers exposing
+        `count_batch` (such as the HuggingFace backend) count without building
+        token lists; otherwise `encode_batch` is used when available (tiktoken
+        has it) and `encode` as the last resort.
+
+        Args:
+            contents: The strings to count.
+
+        Returns:
+            A list of token counts, aligned with `contents`.
+        """
+        cache = self._count_cache
+        counts: List[int | None] = [None] * len(contents)
+        missing: dict[str, list[int]] = {}
+        for i, content in enumerate(contents):
+            key = md5(content.encode("utf-8", "surrogatepass")).hexdigest()
+            cached = cache.get(key)
+            if cached is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                cache.move_to_end(key)
+                counts[i] = cached
+
+        if missing:
+            keys = list(missing)
+            texts = [contents[missing[key][0]] for key in keys]
+            count_batch = getattr(self.tokenizer, "count_batch", None)
+            encode_batch = getattr(self.tokenizer, "encode_batch", None)
+            if count_batch is not None:
+                new_counts = list(count_batch(texts))
+            elif encode_batch is not None and len(texts) > 1:
+                new_counts = [len(tokens) for tokens in encode_batch(texts)]
+            else:
+                new_counts = [len(self.encode(text)) for text in texts]
+
+            for key, count in zip(keys, new_counts):
+                for i in missing[key]:
+                    counts[i] = count
+                if self.count_cache_size > 0:
+                    cache[key] = count
+            while len(cache) > self.count_cache_size:
+                cache.popitem(last=False)
+
+        return counts
+
+    def estimate_tokens_batch(self, contents: Sequence[str]) -> List[int]:
+        """
+        Returns token counts for budget checks that do not need exact values.
+
+        In "exact" mode this is `count_tokens_batch`. In "estimate" mode the
+        first DEFAULT_TOKEN_ESTIMATOR_CALIBRATION_CHARS characters of text are
+        still counted exactly and used to calibrate the estimator; afterwards
+        counts come from the estimator without tokenizing or hashing the text.
+
+        Args:
+            contents: The strings to count.
+
+        Returns:
+            A list of (possibly estimated) token counts, aligned with `contents`.
+        """
+        if self.count_mode != "estimate":
+            return self.count_tokens_batch(contents)
+        if self._calibrated:
+            return self.estimator.estimate_batch(contents)
+
+        counts = self.count_tokens_batch(contents)
+        self._calibration_texts.extend(contents)
+        self._calibration_counts.extend(counts)
+        self._calibration_chars += sum(len(content) for content in contents)
+        if self._calibration_chars >= DEFAULT_TOKEN_ESTIMATOR_CALIBRATION_CHARS:
+            self.calibrate(self._calibration_texts, self._calibration_counts)
+        return counts
+
+    def calibrate(
+        self, contents: Sequence[str], counts: Sequence[int] | None = None
+    ) -> None:
+        """
+        Fits the estimator to sample texts and switches "estimate" mode to estimates.
+
+        Args:
+            contents: Sample texts representative of the corpus.
+            counts: Their exact token counts; computed with `count_tokens_batch` if omitted.
+        """
+        if counts is None:
+            counts = self.count_tokens_batch(contents)
+        self.estimator.calibrate(contents, counts)
+        self._calibrated = True
+        self._calibration_texts, self._calibration_counts = [], []
+        self._calibration_chars = 0
+
+    def token_char_offsets(self, content: str, tokens: List[int]) -> List[int] | None:
+        """
+        Maps every token back to the character offset where it starts in `content`.
+
+        Offsets let callers slice text windows directly from the source string
+        instead of decoding each token window again. Only tokenizers exposing
+        `decode_with_offsets` (such as tiktoken encodings) are supported.
+
+        Args:
+            content: The string that was encoded.
+            tokens: The tokens produced by `encode(content)`.
+
+        Returns:
+            A list with one start offset per token, or None if the underlying
+            tokenizer cannot provide offsets or does not round-trip `content`.
+        """
+        decode_with_offsets = getattr(self.tokenizer, "decode_with_offsets", None)
+        if decode_with_offsets is None:
+            return None
+        text, offsets = decode_with_offsets(tokens)
+        if text != content or len(offsets) != len(tokens):
+            return None
+        return offsets
+
 
 class TiktokenTokenizer(Tokenizer):
     """
     A Tokenizer implementation using the tiktoken library.
     """
 
-    def __init__(self, model_name: str = "gpt-4o-mini"):
+    def __init__(self, model_name: str = "gpt-4o-mini", **kwargs):
         """
         Initializes the TiktokenTokenizer with a specified model name.
 
         Args:
             model_name: The model name for the tiktoken tokenizer to use.  Defaults to "gpt-4o-mini".
+            **kwargs: Passed to `Tokenizer` (count_cache_size, count_mode).
 
         Raises:
             ImportError: If tiktoken is not installed.
@@ -1289,11 +2138,72 @@ class TiktokenTokenizer(Tokenizer):
 
         try:
             tokenizer = tiktoken.encoding_for_model(model_name)
-            super().__init__(model_name=model_name, tokenizer=tokenizer)
+            super().__init__(model_name=model_name, tokenizer=tokenizer, **kwargs)
         except KeyError:
             raise ValueError(f"Invalid model_name: {model_name}.")
 
 
+class _HuggingFaceBackend:
+    """TokenizerInterface adapter for a `tokenizers.Tokenizer`.
+
+    Batch calls run in the library's Rust thread pool, and `count_batch` only
+    takes the length of each encoding instead of converting its ids to Python ints.
+    """
+
+    def __init__(self, tokenizer):
+        self._tokenizer = tokenizer
+
+    def encode(self, content: str) -> List[int]:
+        return self._tokenizer.encode(content, add_special_tokens=False).ids
+
+    def decode(self, tokens: List[int]) -> str:
+        return self._tokenizer.decode(tokens)
+
+    def encode_batch(self, contents: List[str]) -> List[List[int]]:
+        encodings = self._tokenizer.encode_batch(contents, add_special_tokens=False)
+        return [encoding.ids for encoding in encodings]
+
+    def count_batch(self, contents: List[str]) -> List[int]:
+        encodings = self._tokenizer.encode_batch(contents, add_special_tokens=False)
+        return [len(encoding) for encoding in encodings]
+
+
+class HuggingFaceTokenizer(Tokenizer):
+    """
+    A Tokenizer implementation using the HuggingFace `tokenizers` library.
+    """
+
+    def __init__(self, model_name: str, **kwargs):
+        """
+        Initializes the HuggingFaceTokenizer from a local tokenizer.json file or a Hub model id.
+
+        Args:
+            model_name: Path to a tokenizer.json file, or a model id on the HuggingFace Hub.
+            **kwargs: Passed to `Tokenizer` (count_cache_size, count_mode).
+
+        Raises:
+            ImportError: If tokenizers is not installed.
+            ValueError: If the tokenizer cannot be loaded.
+        """
+        try:
+            from tokenizers import Tokenizer as HFTokenizer
+        except ImportError:
+            raise ImportError(
+                "tokenizers is not installed. Please install it with `pip install tokenizers` or define custom `tokenizer_func`."
+            )
+
+        try:
+            if os.path.isfile(model_name):
+                tokenizer = HFTokenizer.from_file(model_name)
+            else:
+                tokenizer = HFTokenizer.from_pretrained(model_name)
+        except Exception as e:
+            raise ValueError(f"Invalid model_name: {model_name}. {e}") from e
+        super().__init__(
+            model_name=model_name, tokenizer=_HuggingFaceBackend(tokenizer), **kwargs
+        )
+
+
 def pack_user_ass_to_openai_messages(*args: str):
     roles = ["user", "assistant"]
     return [
@@ -1320,12 +2230,18 @@ def truncate_list_by_token_size(
     max_token_size: int,
     tokenizer: Tokenizer,
 ) -> list[int]:
-    """Truncate a list of data by token size"""
+    """Truncate a list of data by token size
+
+    Token counts of all items are resolved in one batch through the tokenizer's
+    count cache, so items seen by previous queries are not re-tokenized (or
+    estimated without tokenizing when the tokenizer's count_mode is "estimate").
+    """
     if max_token_size <= 0:
         return []
+    counts = tokenizer.estimate_tokens_batch([key(data) for data in list_data])
     tokens = 0
-    for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
+    for i, count in enumerate(counts):
+        tokens += count
         if tokens > max_token_size:
             return list_data[:i]
     return list_data
@@ -1339,6 +2255,48 @@ def cosine_similarity(v1, v2):
     return dot_product / (norm1 * norm2)
 
 
+def rank_by_cosine_similarity(
+    query_embedding,
+    candidate_embeddings,
+    top_k: int | None = None,
+    normalized: bool = False,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Rank candidate vectors by cosine similarity to a query vector in one pass
+
+    Candidates are stacked into one float32 matrix and scored with a single
+    matrix-vector product; top_k selection uses argpartition so only the
+    selected rows are sorted.
+
+    Args:
+        query_embedding: Query vector
+        candidate_embeddings: 2D array (or sequence of vectors) to score
+        top_k: Number of best candidates to return, None returns all of them
+        normalized: Set when query and candidates are already L2-normalized
+
+    Returns:
+        (indices, similarities) of the selected candidates, highest similarity first.
+        Zero-length vectors get similarity 0.
+    """
+    matrix = np.asarray(candidate_embeddings, dtype=np.float32)
+    if matrix.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+
+    scores = matrix @ query
+    if not normalized:
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        scores = np.divide(scores, norms, out=np.zeros_like(scores), where=norms > 0)
+
+    if top_k is None or top_k >= len(scores):
+        order = np.argsort(-scores, kind="stable")
+    elif top_k <= 0:
+        order = np.empty(0, dtype=np.int64)
+    else:
+        selected = np.argpartition(-scores, top_k - 1)[:top_k]
+        order = selected[np.argsort(-scores[selected], kind="stable")]
+    return order, scores[order]
+
+
 async def handle_cache(
     hashing_kv,
     args_hash,
@@ -1385,6 +2343,17 @@ class CacheData:
     queryparam: dict | None = None
 
 
+def _cache_entry(cache_data: CacheData) -> dict[str, Any]:
+    """Build the flattened cache entry stored for cache_data"""
+    return {
+        "return": cache_data.content,
+        "cache_type": cache_data.cache_type,
+        "chunk_id": cache_data.chunk_id,
+        "original_prompt": cache_data.prompt,
+        "queryparam": cache_data.queryparam,
+    }
+
+
 async def save_to_cache(hashing_kv, cache_data: CacheData):
     """Save data to cache using flattened key structure.
 
@@ -1416,21 +2385,70 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
             )
             return
 
-    # Create cache entry with flattened structure
-    cache_entry = {
-        "return": cache_data.content,
-        "cache_type": cache_data.cache_type,
-        "chunk_id": cache_data.chunk_id if cache_data.chunk_id is not None else None,
-        "original_prompt": cache_data.prompt,
-        "queryparam": cache_data.queryparam
-        if cache_data.queryparam is not None
-        else None,
-    }
-
     logger.info(f" == LLM cache == saving: {flattened_key}")
 
     # Save using flattened key
-    await hashing_kv.upsert({flattened_key: cache_entry})
+    await hashing_kv.upsert({flattened_key: _cache_entry(cache_data)})
+
+
+class LLMCacheBatch:
+    """Batch LLM cache reads and writes of one document's extraction calls.
+
+    prefetch() resolves many flattened cache keys with a single get_by_ids;
+    get() answers prefetched keys from memory and falls back to get_by_id for
+    the others. save() buffers new entries (stamped with their create_time, so
+    later hits within the document see it before the write), which flush()
+    writes with a single upsert. Pending entries are also flushed once
+    flush_size of them have accumulated, which bounds memory use on very large
+    documents.
+    """
+
+    def __init__(self, hashing_kv, flush_size: int = DEFAULT_LLM_CACHE_FLUSH_SIZE):
+        self.hashing_kv = hashing_kv
+        self.flush_size = max(1, flush_size)
+        self._entries: dict[str, dict[str, Any] | None] = {}
+        self._pending: dict[str, dict[str, Any]] = {}
+
+    async def prefetch(self, keys: list[str]) -> int:
+        """Load the given keys with one get_by_ids, returning the number of hits"""
+        missing = [key for key in dict.fromkeys(keys) if key not in self._entries]
+        if not missing:
+            return 0
+        results = await self.hashing_kv.get_by_ids(missing)
+        hits = 0
+        for key, entry in zip(missing, results):
+            self._entries[key] = entry or None
+            hits += bool(entry)
+        return hits
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        if key not in self._entries:
+            self._entries[key] = await self.hashing_kv.get_by_id(key) or None
+        return self._entries[key]
+
+    async def save(self, cache_data: CacheData) -> None:
+        if not cache_data.content:
+            return
+        key = generate_cache_key(
+            cache_data.mode, cache_data.cache_type, cache_data.args_hash
+        )
+        existing = await self.get(key)
+        if existing and existing.get("return") == cache_data.content:
+            logger.warning(f"Cache duplication detected for {key}, skipping update")
+            return
+        cache_entry = _cache_entry(cache_data)
+        cache_entry["create_time"] = int(time.time())
+        self._entries[key] = cache_entry
+        self._pending[key] = cache_entry
+        if len(self._pending) >= self.flush_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        logger.info(f" == LLM cache == saving {len(batch)} entries")
+        await self.hashing_kv.upsert(batch)
 
 
 def safe_unicode_decode(content):
@@ -1892,6 +2910,50 @@ async def update_chunk_cache_list(
         )
 
 
+async def update_chunks_cache_list(
+    text_chunks_storage: "BaseKVStorage",
+    chunk_cache_keys: dict[str, list[str]],
+    cache_scenario: str = "batch_update",
+) -> None:
+    """Update the llm_cache_list of several chunks with one read and one write
+
+    Args:
+        text_chunks_storage: Text chunks storage instance
+        chunk_cache_keys: Cache keys to add, by chunk id
+        cache_scenario: Description of the cache scenario for logging
+    """
+    chunk_ids = [chunk_id for chunk_id, keys in chunk_cache_keys.items() if keys]
+    if not chunk_ids:
+        return
+
+    try:
+        updates = {}
+        chunks = await text_chunks_storage.get_by_ids(chunk_ids)
+        for chunk_id, chunk_data in zip(chunk_ids, chunks):
+            if not chunk_data:
+                continue
+            cache_list = chunk_data.get("llm_cache_list") or []
+            existing_keys = set(cache_list)
+            new_keys = [
+                key for key in chunk_cache_keys[chunk_id] if key not in existing_keys
+            ]
+            if new_keys:
+                updates[chunk_id] = {
+                    **chunk_data,
+                    "llm_cache_list": cache_list + new_keys,
+                }
+
+        if updates:
+            await text_chunks_storage.upsert(updates)
+            logger.debug(
+                f"Updated {len(updates)} chunks with cache keys ({cache_scenario})"
+            )
+    except Exception as e:
+        logger.warning(
+            f"Failed to update {len(chunk_ids)} chunks with cache references on {cache_scenario}: {e}"
+        )
+
+
 def remove_think_tags(text: str) -> str:
     """Remove <think>...</think> tags from the text
     Remove  orphon ...</think> tags from the text also"""
@@ -1900,6 +2962,60 @@ def remove_think_tags(text: str) -> str:
     ).strip()
 
 
+def _sanitize_llm_inputs(
+    user_prompt: str,
+    system_prompt: str | None,
+    history_messages: list[dict[str, str]] | None,
+) -> tuple[str, str | None, list[dict[str, str]] | None, str]:
+    """Sanitize LLM inputs and build the prompt text that is hashed for caching
+
+    Returns:
+        tuple: (safe_user_prompt, safe_system_prompt, safe_history_messages, cache_prompt)
+    """
+    # Sanitize input text to prevent UTF-8 encoding errors for all LLM providers
+    safe_user_prompt = sanitize_text_for_encoding(user_prompt)
+    safe_system_prompt = (
+        sanitize_text_for_encoding(system_prompt) if system_prompt else None
+    )
+
+    # Sanitize history messages if provided
+    safe_history_messages = None
+    history = None
+    if history_messages:
+        safe_history_messages = []
+        for msg in history_messages:
+            safe_msg = msg.copy()
+            if "content" in safe_msg:
+                safe_msg["content"] = sanitize_text_for_encoding(safe_msg["content"])
+            safe_history_messages.append(safe_msg)
+        history = json.dumps(safe_history_messages, ensure_ascii=False)
+
+    prompt_parts = []
+    if safe_user_prompt:
+        prompt_parts.append(safe_user_prompt)
+    if safe_system_prompt:
+        prompt_parts.append(safe_system_prompt)
+    if history:
+        prompt_parts.append(history)
+    return (
+        safe_user_prompt,
+        safe_system_prompt,
+        safe_history_messages,
+        "\n".join(prompt_parts),
+    )
+
+
+def compute_llm_cache_key(
+    user_prompt: str,
+    system_prompt: str | None = None,
+    history_messages: list[dict[str, str]] | None = None,
+    cache_type: str = "extract",
+) -> str:
+    """Flattened cache key under which use_llm_func_with_cache stores this call"""
+    _, _, _, prompt = _sanitize_llm_inputs(user_prompt, system_prompt, history_messages)
+    return generate_cache_key("default", cache_type, compute_args_hash(prompt))
+
+
 async def use_llm_func_with_cache(
     user_prompt: str,
     use_llm_func: callable,
@@ -1910,6 +3026,7 @@ async def use_llm_func_with_cache(
     cache_type: str = "extract",
     chunk_id: str | None = None,
     cache_keys_collector: list = None,
+    cache_batch: LLMCacheBatch | None = None,
 ) -> tuple[str, int]:
     """Call LLM function with cache support and text sanitization
 
@@ -1928,52 +3045,38 @@ async def use_llm_func_with_cache(
         chunk_id: Chunk identifier to store in cache
         text_chunks_storage: Text chunks storage to update llm_cache_list
         cache_keys_collector: Optional list to collect cache keys for batch processing
+        cache_batch: Optional LLMCacheBatch serving lookups from prefetched entries
+            and buffering cache writes until it is flushed
 
     Returns:
         tuple[str, int]: (LLM response text, timestamp)
             - For cache hits: (content, cache_create_time)
             - For cache misses: (content, current_timestamp)
     """
-    # Sanitize input text to prevent UTF-8 encoding errors for all LLM providers
-    safe_user_prompt = sanitize_text_for_encoding(user_prompt)
-    safe_system_prompt = (
-        sanitize_text_for_encoding(system_prompt) if system_prompt else None
+    safe_user_prompt, safe_system_prompt, safe_history_messages, _prompt = (
+        _sanitize_llm_inputs(user_prompt, system_prompt, history_messages)
     )
 
-    # Sanitize history messages if provided
-    safe_history_messages = None
-    if history_messages:
-        safe_history_messages = []
-        for i, msg in enumerate(history_messages):
-            safe_msg = msg.copy()
-            if "content" in safe_msg:
-                safe_msg["content"] = sanitize_text_for_encoding(safe_msg["content"])
-            safe_history_messages.append(safe_msg)
-        history = json.dumps(safe_history_messages, ensure_ascii=False)
-    else:
-        history = None
-
     if llm_response_cache:
-        prompt_parts = []
-        if safe_user_prompt:
-            prompt_parts.append(safe_user_prompt)
-        if safe_system_prompt:
-            prompt_parts.append(safe_system_prompt)
-        if history:
-            prompt_parts.append(history)
-        _prompt = "\n".join(prompt_parts)
-
         arg_hash = compute_args_hash(_prompt)
         # Generate cache key for this LLM call
         cache_key = generate_cache_key("default", cache_type, arg_hash)
 
-        cached_result = await handle_cache(
-            llm_response_cache,
-            arg_hash,
-            _prompt,
-            "default",
-            cache_type=cache_type,
-        )
+        if cache_batch is not None:
+            cache_entry = await cache_batch.get(cache_key)
+            cached_result = (
+                (cache_entry["return"], cache_entry.get("create_time", 0))
+                if cache_entry
+                else None
+            )
+        else:
+            cached_result = await handle_cache(
+                llm_response_cache,
+                arg_hash,
+                _prompt,
+                "default",
+                cache_type=cache_type,
+            )
         if cached_result:
             content, timestamp = cached_result
             logger.debug(f"Found cache for {arg_hash}")
@@ -2003,16 +3106,17 @@ async def use_llm_func_with_cache(
         current_timestamp = int(time.time())
 
         if llm_response_cache.global_config.get("enable_llm_cache_for_entity_extract"):
-            await save_to_cache(
-                llm_response_cache,
-                CacheData(
-                    args_hash=arg_hash,
-                    content=res,
-                    prompt=_prompt,
-                    cache_type=cache_type,
-                    chunk_id=chunk_id,
-                ),
+            cache_data = CacheData(
+                args_hash=arg_hash,
+                content=res,
+                prompt=_prompt,
+                cache_type=cache_type,
+                chunk_id=chunk_id,
             )
+            if cache_batch is not None:
+                await cache_batch.save(cache_data)
+            else:
+                await save_to_cache(llm_response_cache, cache_data)
 
             # Add cache key to collector if provided
             if cache_keys_collector is not None:
@@ -2078,6 +3182,26 @@ def sanitize_and_normalize_extracted_text(
     return ""
 
 
+_HTML_PARAGRAPH_TAGS = re.compile(r"</p\s*>|<p\s*>|<p/>", re.IGNORECASE)
+_HTML_BREAK_TAGS = re.compile(r"</br\s*>|<br\s*>|<br/>", re.IGNORECASE)
+_FULL_WIDTH_TO_HALF_WIDTH = str.maketrans(
+    "ＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚ"
+    "０１２３４５６７８９－＋／＊（）—　",
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-+/*()- ",
+)
+_CHINESE_CHAR = re.compile(r"[\u4e00-\u9fa5]")
+_SPACE_BETWEEN_CHINESE = re.compile(r"(?<=[\u4e00-\u9fa5])\s+(?=[\u4e00-\u9fa5])")
+_SPACE_BEFORE_CHINESE = re.compile(
+    r"(?<=[\u4e00-\u9fa5])\s+(?=[a-zA-Z0-9\(\)\[\]@#$%!&\*\-=+_])"
+)
+_SPACE_AFTER_CHINESE = re.compile(
+    r"(?<=[a-zA-Z0-9\(\)\[\]@#$%!&\*\-=+_])\s+(?=[\u4e00-\u9fa5])"
+)
+_QUOTES_BEFORE_CHINESE = re.compile(r"['\"]+(?=[\u4e00-\u9fa5])")
+_QUOTES_AFTER_CHINESE = re.compile(r"(?<=[\u4e00-\u9fa5])['\"]+")
+_NARROW_NBSP_AFTER_NON_DIGIT = re.compile(r"(?<=[^\d])\u202F")
+
+
 def normalize_extracted_info(name: str, remove_inner_quotes=False) -> str:
     """Normalize entity/relation names and description with the following rules:
     - Clean HTML tags (paragraph and line break tags)
@@ -2105,49 +3229,26 @@ def normalize_extracted_info(name: str, remove_inner_quotes=False) -> str:
         Normalized entity name
     """
     # Clean HTML tags - remove paragraph and line break tags
-    name = re.sub(r"</p\s*>|<p\s*>|<p/>", "", name, flags=re.IGNORECASE)
-    name = re.sub(r"</br\s*>|<br\s*>|<br/>", "", name, flags=re.IGNORECASE)
-
-    # Chinese full-width letters to half-width (A-Z, a-z)
-    name = name.translate(
-        str.maketrans(
-            "ＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚ",
-            "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
-        )
-    )
-
-    # Chinese full-width numbers to half-width
-    name = name.translate(str.maketrans("０１２３４５６７８９", "0123456789"))
-
-    # Chinese full-width symbols to half-width
-    name = name.replace("－", "-")  # Chinese minus
-    name = name.replace("＋", "+")  # Chinese plus
-    name = name.replace("／", "/")  # Chinese slash
-    name = name.replace("＊", "*")  # Chinese asterisk
-
-    # Replace Chinese parentheses with English parentheses
-    name = name.replace("（", "(").replace("）", ")")
-
-    # Replace Chinese dash with English dash (additional patterns)
-    name = name.replace("—", "-").replace("－", "-")
-
-    # Chinese full-width space to regular space (after other replacements)
-    name = name.replace("　", " ")
-
-    # Use regex to remove spaces between Chinese characters
-    # Regex explanation:
-    # (?<=[\u4e00-\u9fa5]): Positive lookbehind for Chinese character
-    # \s+: One or more whitespace characters
-    # (?=[\u4e00-\u9fa5]): Positive lookahead for Chinese character
-    name = re.sub(r"(?<=[\u4e00-\u9fa5])\s+(?=[\u4e00-\u9fa5])", "", name)
-
-    # Remove spaces between Chinese and English/numbers/symbols
-    name = re.sub(
-        r"(?<=[\u4e00-\u9fa5])\s+(?=[a-zA-Z0-9\(\)\[\]@#$%!&\*\-=+_])", "", name
-    )
-    name = re.sub(
-        r"(?<=[a-zA-Z0-9\(\)\[\]@#$%!&\*\-=+_])\s+(?=[\u4e00-\u9fa5])", "", name
-    )
+    if "<" in name:
+        name = _HTML_PARAGRAPH_TAGS.sub("", name)
+        name = _HTML_BREAK_TAGS.sub("", name)
+
+    # Chinese full-width letters, numbers and symbols (minus, plus, slash,
+    # asterisk, parentheses, dash, space) to their half-width forms
+    name = name.translate(_FULL_WIDTH_TO_HALF_WIDTH)
+
+    has_chinese = _CHINESE_CHAR.search(name) is not None
+    if has_chinese:
+        # Use regex to remove spaces between Chinese characters
+        # Regex explanation:
+        # (?<=[\u4e00-\u9fa5]): Positive lookbehind for Chinese character
+        # \s+: One or more whitespace characters
+        # (?=[\u4e00-\u9fa5]): Positive lookahead for Chinese character
+        name = _SPACE_BETWEEN_CHINESE.sub("", name)
+
+        # Remove spaces between Chinese and English/numbers/symbols
+        name = _SPACE_BEFORE_CHINESE.sub("", name)
+        name = _SPACE_AFTER_CHINESE.sub("", name)
 
     # Remove outer quotes
     if len(name) >= 2:
@@ -2183,12 +3284,14 @@ def normalize_extracted_info(name: str, remove_inner_quotes=False) -> str:
         # Remove Chinese quotes
         name = name.replace("“", "").replace("”", "").replace("‘", "").replace("’", "")
         # Remove English queotes in and around chinese
-        name = re.sub(r"['\"]+(?=[\u4e00-\u9fa5])", "", name)
-        name = re.sub(r"(?<=[\u4e00-\u9fa5])['\"]+", "", name)
+        if has_chinese:
+            name = _QUOTES_BEFORE_CHINESE.sub("", name)
+            name = _QUOTES_AFTER_CHINESE.sub("", name)
         # Convert non-breaking space to regular space
         name = name.replace("\u00a0", " ")
         # Convert narrow non-breaking space to regular space when after non-digits
-        name = re.sub(r"(?<=[^\d])\u202F", " ", name)
+        if "\u202f" in name:
+            name = _NARROW_NBSP_AFTER_NON_DIGIT.sub(" ", name)
 
     # Remove spaces from the beginning and end of the text
     name = name.strip()
@@ -2213,6 +3316,10 @@ def normalize_extracted_info(name: str, remove_inner_quotes=False) -> str:
     return name
 
 
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]")
+_CONTROL_AND_C1_CHARS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]")
+
+
 def sanitize_text_for_encoding(text: str, replacement_char: str = "") -> str:
     """Sanitize text to ensure safe UTF-8 encoding by removing or replacing problematic characters.
 
@@ -2248,38 +3355,23 @@ def sanitize_text_for_encoding(text: str, replacement_char: str = "") -> str:
         # Try to encode/decode to catch any encoding issues early
         text.encode("utf-8")
 
-        # Remove or replace surrogate characters (U+D800 to U+DFFF)
-        # These are the main cause of the encoding error
-        sanitized = ""
-        for char in text:
-            code_point = ord(char)
-            # Check for surrogate characters
-            if 0xD800 <= code_point <= 0xDFFF:
-                # Replace surrogate with replacement character
-                sanitized += replacement_char
-                continue
-            # Check for other problematic characters
-            elif code_point == 0xFFFE or code_point == 0xFFFF:
-                # These are non-characters in Unicode
-                sanitized += replacement_char
-                continue
-            else:
-                sanitized += char
+        # Remove or replace surrogate characters (U+D800 to U+DFFF) and the
+        # U+FFFE/U+FFFF non-characters; surrogates are the main cause of the encoding error
+        sanitized = _SURROGATE_PATTERN.sub(replacement_char, text)
 
         # Additional cleanup: remove null bytes and other control characters that might cause issues
         # (but preserve common whitespace like \t, \n, \r)
-        sanitized = re.sub(
-            r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", replacement_char, sanitized
-        )
+        sanitized = _CONTROL_CHARS.sub(replacement_char, sanitized)
 
         # Test final encoding to ensure it's safe
         sanitized.encode("utf-8")
 
         # Unescape HTML escapes
-        sanitized = html.unescape(sanitized)
+        if "&" in sanitized:
+            sanitized = html.unescape(sanitized)
 
         # Remove control characters but preserve common whitespace (\t, \n, \r)
-        sanitized = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]", "", sanitized)
+        sanitized = _CONTROL_AND_C1_CHARS.sub("", sanitized)
 
         return sanitized.strip()
 
@@ -2485,29 +3577,13 @@ async def pick_by_vector_similarity(
                 )
             return []
 
-        # Calculate cosine similarities
-        similarities = []
-        valid_vectors = 0
-        for chunk_id in all_chunk_ids:
-            if chunk_id in chunk_vectors:
-                chunk_embedding = chunk_vectors[chunk_id]
-                try:
-                    # Calculate cosine similarity
-                    similarity = cosine_similarity(query_embedding, chunk_embedding)
-                    similarities.append((chunk_id, similarity))
-                    valid_vectors += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Vector similarity chunk selection: failed to calculate similarity for chunk {chunk_id}: {e}"
-                    )
-            else:
-                logger.warning(
-                    f"Vector similarity chunk selection:  no vector found for chunk {chunk_id}"
-                )
-
-        # Sort by similarity (highest first) and select top num_of_chunks
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        selected_chunks = [chunk_id for chunk_id, _ in similarities[:num_of_chunks]]
+        # Rank all candidates against the query in one batched pass
+        order, _ = rank_by_cosine_similarity(
+            query_embedding,
+            [chunk_vectors[chunk_id] for chunk_id in all_chunk_ids],
+            top_k=num_of_chunks,
+        )
+        selected_chunks = [all_chunk_ids[i] for i in order]
 
         logger.debug(
             f"Vector similarity chunk selection: {len(selected_chunks)} chunks from {len(all_chunk_ids)} candidates"
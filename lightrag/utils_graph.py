@@ -5,7 +5,7 @@ import asyncio
 from typing import Any, cast
 
 from .base import DeletionResult
-from .kg.shared_storage import get_storage_keyed_lock
+from .kg.shared_storage import get_storage_keyed_lock, bump_storage_generation
 from .constants import GRAPH_FIELD_SEP
 from .utils import compute_mdhash_id, logger
 from .base import StorageNameSpace
@@ -52,6 +52,8 @@ async def _persist_graph_updates(
                 for storage_inst in storages  # type: ignore
             ]
         )
+        # Invalidate query-time caches derived from the updated data
+        await bump_storage_generation(storages[0].global_config.get("workspace"))
 
 
 async def adelete_by_entity(
@@ -0,0 +1,179 @@
+"""
+Benchmark for the streaming chunker in lightrag.operate.
+
+Compares the pre-streaming implementation of ``chunking_by_token_size`` (kept
+below as ``legacy_chunking_by_token_size``) with ``iter_chunks_by_token_size``
+in compatibility mode (``exact_decode=True``) and in slicing mode.
+
+Reports tokens/sec and peak traced memory for each variant and verifies that
+compatibility mode output is byte-identical to the legacy function.
+
+Usage:
+    python tests/benchmark_chunking.py --size-mb 50
+    python tests/benchmark_chunking.py --size-mb 5 --split-by-character "\\n\\n"
+
+The tiktoken ``gpt-4o-mini`` encoding is used when it can be loaded; otherwise
+(e.g. offline) a regex word tokenizer with offset support is used instead.
+"""
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from lightrag.operate import chunking_by_token_size, iter_chunks_by_token_size
+from lightrag.utils import Tokenizer
+
+from helpers import RegexWordTokenizer
+
+SAMPLE_DIR = (
+    Path(__file__).resolve().parent.parent
+    / "lightrag"
+    / "evaluation"
+    / "sample_documents"
+)
+
+
+def legacy_chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    chunk_overlap_token_size: int = 100,
+    chunk_token_size: int = 1200,
+) -> list[dict[str, Any]]:
+    """Reference copy of chunking_by_token_size before the streaming rewrite.
+
+    The split_by_character_only error path is omitted; the benchmark never uses it.
+    """
+    tokens = tokenizer.encode(content)
+    results: list[dict[str, Any]] = []
+    if split_by_character:
+        raw_chunks = content.split(split_by_character)
+        new_chunks = []
+        for chunk in raw_chunks:
+            _tokens = tokenizer.encode(chunk)
+            if len(_tokens) > chunk_token_size and not split_by_character_only:
+                for start in range(
+                    0, len(_tokens), chunk_token_size - chunk_overlap_token_size
+                ):
+                    chunk_content = tokenizer.decode(
+                        _tokens[start : start + chunk_token_size]
+                    )
+                    new_chunks.append(
+                        (min(chunk_token_size, len(_tokens) - start), chunk_content)
+                    )
+            else:
+                new_chunks.append((len(_tokens), chunk))
+        for index, (_len, chunk) in enumerate(new_chunks):
+            results.append(
+                {"tokens": _len, "content": chunk.strip(), "chunk_order_index": index}
+            )
+    else:
+        for index, start in enumerate(
+            range(0, len(tokens), chunk_token_size - chunk_overlap_token_size)
+        ):
+            chunk_content = tokenizer.decode(tokens[start : start + chunk_token_size])
+            results.append(
+                {
+                    "tokens": min(chunk_token_size, len(tokens) - start),
+                    "content": chunk_content.strip(),
+                    "chunk_order_index": index,
+                }
+            )
+    return results
+
+
+def make_tokenizer() -> Tokenizer:
+    try:
+        import tiktoken
+
+        return Tokenizer("gpt-4o-mini", tiktoken.encoding_for_model("gpt-4o-mini"))
+    except Exception as e:
+        print(f"tiktoken unavailable ({type(e).__name__}), using regex tokenizer")
+        return Tokenizer("regex-words", RegexWordTokenizer())
+
+
+def make_document(size_mb: float) -> str:
+    samples = [p.read_text(encoding="utf-8") for p in sorted(SAMPLE_DIR.glob("*.md"))]
+    corpus = "\n\n".join(samples) or "LightRAG chunking benchmark text. " * 100
+    repeat = max(1, int(size_mb * 1024 * 1024 / len(corpus.encode("utf-8"))))
+    return "\n\n".join([corpus] * repeat)
+
+
+def measure(label: str, func, total_tokens: int) -> list[dict[str, Any]]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<28} {elapsed:8.2f}s {total_tokens / elapsed:14,.0f} tok/s "
+        f"{peak / 1024 / 1024:10.1f} MiB peak {len(result):8d} chunks"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LightRAG chunking")
+    parser.add_argument("--size-mb", type=float, default=10.0)
+    parser.add_argument("--split-by-character", default=None)
+    parser.add_argument("--chunk-token-size", type=int, default=1200)
+    parser.add_argument("--chunk-overlap-token-size", type=int, default=100)
+    args = parser.parse_args()
+
+    split = (
+        args.split_by_character.encode().decode("unicode_escape")
+        if args.split_by_character
+        else None
+    )
+    tokenizer = make_tokenizer()
+    content = make_document(args.size_mb)
+    total_tokens = len(tokenizer.encode(content))
+    print(
+        f"document: {len(content):,} chars, {total_tokens:,} tokens, "
+        f"split_by_character={split!r}"
+    )
+
+    kwargs = dict(
+        split_by_character=split,
+        split_by_character_only=False,
+        chunk_overlap_token_size=args.chunk_overlap_token_size,
+        chunk_token_size=args.chunk_token_size,
+    )
+
+    legacy = measure(
+        "legacy",
+        lambda: legacy_chunking_by_token_size(tokenizer, content, **kwargs),
+        total_tokens,
+    )
+    compat = measure(
+        "chunking_by_token_size",
+        lambda: chunking_by_token_size(tokenizer, content, **kwargs),
+        total_tokens,
+    )
+    measure(
+        "iter_chunks (slicing)",
+        lambda: list(iter_chunks_by_token_size(tokenizer, content, **kwargs)),
+        total_tokens,
+    )
+
+    # Streaming consumers never hold the full chunk list in memory
+    measure(
+        "iter_chunks (consumed)",
+        lambda: [
+            sum(1 for _ in iter_chunks_by_token_size(tokenizer, content, **kwargs))
+        ],
+        total_tokens,
+    )
+
+    identical = compat == legacy
+    print(f"compatibility mode byte-identical to legacy: {identical}")
+    if not identical:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
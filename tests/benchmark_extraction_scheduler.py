@@ -0,0 +1,171 @@
+"""
+Throughput benchmark for the cross-document extraction scheduler.
+
+Runs the document pipeline end to end on a mixed-size batch (one large
+document and many small ones) with a mock LLM of fixed latency, once with
+per-document extraction semaphores and once with EXTRACTION_SCHEDULER
+enabled, and reports wall time, LLM calls per second and the average number
+of LLM calls in flight against the llm_model_max_async limit.
+
+Usage:
+    python tests/benchmark_extraction_scheduler.py
+    python tests/benchmark_extraction_scheduler.py --max-async 16 --large-chunks 120
+    python tests/benchmark_extraction_scheduler.py --latency 0.1 --small-docs 40
+
+Storages are the file-based defaults in a temporary directory; the mock
+embedding function returns random vectors without delay.
+"""
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from lightrag import LightRAG
+from lightrag.kg.shared_storage import finalize_share_data, initialize_pipeline_status
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+
+class WordTokenizer:
+    """Offline stand-in tokenizer: one token per space-separated word."""
+
+    def __init__(self):
+        self._vocab: dict[str, int] = {}
+        self._inverse: list[str] = []
+
+    def encode(self, content: str) -> list[int]:
+        tokens = []
+        for word in content.split(" "):
+            token = self._vocab.get(word)
+            if token is None:
+                token = self._vocab[word] = len(self._inverse)
+                self._inverse.append(word)
+            tokens.append(token)
+        return tokens
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join(self._inverse[t] for t in tokens)
+
+
+class MockLLM:
+    """Fixed-latency LLM that answers extraction prompts with one relation."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self._busy_time = 0.0
+        self._last_change = None
+
+    def _track(self, delta: int):
+        now = time.perf_counter()
+        if self._last_change is not None:
+            self._busy_time += self.in_flight * (now - self._last_change)
+        self._last_change = now
+        self.in_flight += delta
+
+    def average_in_flight(self, elapsed: float) -> float:
+        return self._busy_time / elapsed
+
+    async def __call__(self, prompt, system_prompt=None, history_messages=[], **kwargs):
+        self.calls += 1
+        self._track(1)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self._track(-1)
+        if "---Task---" in prompt or "entity" in (system_prompt or ""):
+            n = self.calls
+            return (
+                f"entity<|#|>Entity{n}<|#|>concept<|#|>Entity {n} from the text.\n"
+                f"entity<|#|>Entity{n + 1}<|#|>concept<|#|>Entity {n + 1}.\n"
+                f"relation<|#|>Entity{n}<|#|>Entity{n + 1}<|#|>related<|#|>"
+                f"Entity {n} relates to Entity {n + 1}.\n<|COMPLETE|>"
+            )
+        return "A merged description."
+
+
+async def mock_embedding(texts: list[str]) -> np.ndarray:
+    return np.random.rand(len(texts), 32).astype(np.float32)
+
+
+def make_documents(large_chunks: int, small_docs: int, chunk_tokens: int):
+    def text(doc: int, chunks: int) -> str:
+        words = chunks * (chunk_tokens - 20)
+        return " ".join(f"d{doc}w{i}" for i in range(words))
+
+    documents = [text(0, large_chunks)]
+    documents += [text(i + 1, 1 + i % 2) for i in range(small_docs)]
+    return documents
+
+
+async def run(args, scheduler: bool) -> dict:
+    working_dir = tempfile.mkdtemp(prefix="lightrag_sched_bench_")
+    llm = MockLLM(args.latency)
+    try:
+        rag = LightRAG(
+            working_dir=working_dir,
+            llm_model_func=llm,
+            embedding_func=EmbeddingFunc(embedding_dim=32, func=mock_embedding),
+            tokenizer=Tokenizer("words", WordTokenizer()),
+            chunk_token_size=args.chunk_tokens,
+            chunk_overlap_token_size=0,
+            llm_model_max_async=args.max_async,
+            max_parallel_insert=args.max_parallel_insert,
+            entity_extract_max_gleaning=0,
+            enable_llm_cache=False,
+            enable_llm_cache_for_entity_extract=False,
+            extraction_scheduler=scheduler,
+        )
+        await rag.initialize_storages()
+        await initialize_pipeline_status()
+        documents = make_documents(
+            args.large_chunks, args.small_docs, args.chunk_tokens
+        )
+
+        start = time.perf_counter()
+        await rag.ainsert(documents)
+        elapsed = time.perf_counter() - start
+        await rag.finalize_storages()
+        return {
+            "elapsed": elapsed,
+            "calls": llm.calls,
+            "in_flight": llm.average_in_flight(elapsed),
+        }
+    finally:
+        finalize_share_data()
+        shutil.rmtree(working_dir, ignore_errors=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--max-async", type=int, default=8)
+    parser.add_argument("--max-parallel-insert", type=int, default=2)
+    parser.add_argument("--large-chunks", type=int, default=60)
+    parser.add_argument("--small-docs", type=int, default=30)
+    parser.add_argument("--chunk-tokens", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(
+        f"1 document x {args.large_chunks} chunks + {args.small_docs} documents x 1-2 "
+        f"chunks, LLM latency {args.latency}s, max_async={args.max_async}, "
+        f"max_parallel_insert={args.max_parallel_insert}"
+    )
+    print(
+        f"{'mode':<22}{'wall (s)':>10}{'LLM calls':>11}{'calls/s':>10}{'in flight':>11}"
+    )
+    for label, scheduler in (("per-document", False), ("extraction scheduler", True)):
+        result = await run(args, scheduler)
+        print(
+            f"{label:<22}{result['elapsed']:>10.2f}{result['calls']:>11}"
+            f"{result['calls'] / result['elapsed']:>10.1f}"
+            f"{result['in_flight']:>8.1f}/{args.max_async}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""
+Recall-vs-latency benchmark for the FaissVectorDBStorage index types.
+
+Builds each index type with the same factory description and search knobs
+used by lightrag.kg.faiss_impl on synthetic normalized data, then sweeps the
+search effort (nprobe for IVF/IVFPQ, efSearch for HNSW) and reports recall@k
+against exact inner-product search together with per-query latency.
+
+Usage:
+    python tests/benchmark_faiss_ann.py                     # 1M x 1024, slow
+    python tests/benchmark_faiss_ann.py --n 100000 --dim 256
+    python tests/benchmark_faiss_ann.py --types IVF HNSW --efforts 8 32 128
+
+Synthetic data is drawn around random cluster centres so that IVF partitions
+behave like they do on real embeddings; pure Gaussian noise makes every ANN
+index look worse than it is in practice.
+"""
+
+import argparse
+import time
+
+import faiss  # type: ignore
+import numpy as np
+
+from lightrag.kg.faiss_impl import (
+    FAISS_INDEX_TYPES,
+    default_faiss_train_size,
+    faiss_index_description,
+    set_faiss_search_effort,
+)
+
+
+def make_data(
+    n: int, dim: int, n_queries: int, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((max(16, n // 1000), dim), dtype=np.float32)
+
+    def sample(count: int) -> np.ndarray:
+        rows = np.empty((count, dim), dtype=np.float32)
+        for start in range(0, count, 100_000):
+            stop = min(start + 100_000, count)
+            picks = rng.integers(0, len(centres), stop - start)
+            rows[start:stop] = centres[picks] + 0.5 * rng.standard_normal(
+                (stop - start, dim), dtype=np.float32
+            )
+        faiss.normalize_L2(rows)
+        return rows
+
+    return sample(n), sample(n_queries)
+
+
+def ground_truth(data: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    index = faiss.IndexFlatIP(data.shape[1])
+    index.add(data)
+    _, indices = index.search(queries, k)
+    return indices
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Faiss ANN index types")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--pq-m", type=int, default=64)
+    parser.add_argument("--train-size", type=int, default=None)
+    parser.add_argument("--types", nargs="+", default=list(FAISS_INDEX_TYPES))
+    parser.add_argument("--efforts", nargs="+", type=int, default=[1, 4, 16, 64, 256])
+    args = parser.parse_args()
+
+    data, queries = make_data(args.n, args.dim, args.queries)
+    truth = ground_truth(data, queries, args.k)
+    ids = np.arange(args.n, dtype=np.int64)
+    print(f"data: {args.n:,} x {args.dim}, {args.queries} queries, recall@{args.k}")
+    print(f"{'index':<28} {'effort':>7} {'recall':>8} {'ms/query':>10} {'build s':>9}")
+
+    for index_type in args.types:
+        description = faiss_index_description(
+            index_type, args.nlist, args.hnsw_m, args.pq_m
+        )
+        index = faiss.index_factory(args.dim, description, faiss.METRIC_INNER_PRODUCT)
+        start = time.perf_counter()
+        if not index.is_trained:
+            train_size = args.train_size or default_faiss_train_size(
+                index_type, args.nlist
+            )
+            index.train(data[:train_size])
+        index.add_with_ids(data, ids)
+        build_seconds = time.perf_counter() - start
+
+        efforts = [None] if index_type == "Flat" else args.efforts
+        for effort in efforts:
+            set_faiss_search_effort(index, effort)
+            start = time.perf_counter()
+            _, found = index.search(queries, args.k)
+            latency_ms = (time.perf_counter() - start) * 1000 / args.queries
+            print(
+                f"{description:<28} {effort or '-':>7} "
+                f"{recall_at_k(found, truth):8.3f} {latency_ms:10.3f} "
+                f"{build_seconds:9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
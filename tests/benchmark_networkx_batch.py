@@ -0,0 +1,119 @@
+"""
+Benchmark for the graph reads of a local-mode query on NetworkXStorage.
+
+Builds a synthetic graph and replays the graph reads of local queries
+(get_nodes_batch + node_degrees_batch for the top_k entities, then
+get_nodes_edges_batch and get_edges_batch + edge_degrees_batch for their
+relations), once through the single-item loops of BaseGraphStorage and once
+through the NetworkXStorage batch overrides, and reports the per-query time.
+
+Usage:
+    python tests/benchmark_networkx_batch.py
+    python tests/benchmark_networkx_batch.py --nodes 100000 --edges 500000 --top-k 60
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+import networkx as nx
+
+from lightrag.base import BaseGraphStorage
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+
+def make_graph(nodes: int, edges: int, seed: int) -> nx.Graph:
+    rng = random.Random(seed)
+    graph = nx.Graph()
+    graph.add_nodes_from(
+        (f"entity-{i}", {"entity_type": "concept", "description": f"node {i}"})
+        for i in range(nodes)
+    )
+    added = 0
+    while added < edges:
+        # Skew endpoints towards low ids so some entities become hubs
+        src = int(nodes * rng.random() ** 2)
+        tgt = rng.randrange(nodes)
+        if src != tgt and not graph.has_edge(f"entity-{src}", f"entity-{tgt}"):
+            added += 1
+            graph.add_edge(
+                f"entity-{src}",
+                f"entity-{tgt}",
+                weight=1.0,
+                keywords="related",
+                description=f"edge {src}-{tgt}",
+            )
+    return graph
+
+
+async def local_query_reads(storage, node_ids: list[str], batch_impl) -> int:
+    """Graph reads of one local query; batch_impl provides the batch methods"""
+    await asyncio.gather(
+        batch_impl.get_nodes_batch(storage, node_ids),
+        batch_impl.node_degrees_batch(storage, node_ids),
+    )
+    node_edges = await batch_impl.get_nodes_edges_batch(storage, node_ids)
+    pairs = list({tuple(sorted(e)) for edges in node_edges.values() for e in edges})
+    await asyncio.gather(
+        batch_impl.get_edges_batch(storage, [{"src": s, "tgt": t} for s, t in pairs]),
+        batch_impl.edge_degrees_batch(storage, pairs),
+    )
+    return len(pairs)
+
+
+async def run(args):
+    graph = make_graph(args.nodes, args.edges, args.seed)
+    print(f"{graph.number_of_nodes():,} nodes, {graph.number_of_edges():,} edges")
+
+    with tempfile.TemporaryDirectory() as working_dir:
+        storage = NetworkXStorage(
+            namespace="chunk_entity_relation",
+            workspace="",
+            global_config={"working_dir": working_dir},
+            embedding_func=None,
+        )
+        await storage.initialize()
+        storage._graph = graph
+
+        rng = random.Random(args.seed + 1)
+        queries = [
+            [f"entity-{rng.randrange(args.nodes)}" for _ in range(args.top_k)]
+            for _ in range(args.queries)
+        ]
+        print(f"{'implementation':<16}{'ms/query':>10}{'relations/query':>17}")
+        for name, batch_impl in (
+            ("single-item", BaseGraphStorage),
+            ("batch", NetworkXStorage),
+        ):
+            relations = 0
+            start = time.perf_counter()
+            for node_ids in queries:
+                relations += await local_query_reads(storage, node_ids, batch_impl)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:<16}{elapsed / len(queries) * 1000:>10.2f}"
+                f"{relations / len(queries):>17.0f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=500_000)
+    parser.add_argument("--top-k", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    initialize_share_data()
+    try:
+        asyncio.run(run(args))
+    finally:
+        finalize_share_data()
+
+
+if __name__ == "__main__":
+    main()
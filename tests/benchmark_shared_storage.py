@@ -0,0 +1,113 @@
+"""
+Benchmark for JsonKVStorage throughput across worker processes.
+
+Sets up the shared storage the way a multi-worker (gunicorn) server does,
+loads a KV namespace and forks 1, 4 and 8 workers that call get_by_ids
+(reads) or upsert (writes) on it for a fixed time, once with
+multiprocessing.Manager dicts and once with the memory-mapped
+SharedMemoryStore. Reports total operations per second over all workers.
+
+Usage:
+    python tests/benchmark_shared_storage.py
+    python tests/benchmark_shared_storage.py --records 50000 --seconds 5 --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import time
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+BACKENDS = {"manager": "false", "shared-memory": "true"}
+
+
+def make_record(i: int) -> dict:
+    return {"content": f"chunk {i} " + "lorem ipsum " * 60, "tokens": 120}
+
+
+async def open_storage(working_dir: str) -> JsonKVStorage:
+    storage = JsonKVStorage(
+        namespace="text_chunks",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+async def worker_loop(args, working_dir: str, mode: str, seed: int) -> int:
+    storage = await open_storage(working_dir)
+    rng = random.Random(seed)
+    ops = 0
+    deadline = time.perf_counter() + args.seconds
+    while time.perf_counter() < deadline:
+        if mode == "read":
+            ids = [f"chunk-{rng.randrange(args.records)}" for _ in range(args.batch)]
+            await storage.get_by_ids(ids)
+            ops += len(ids)
+        else:
+            key = f"chunk-{rng.randrange(args.records)}"
+            await storage.upsert({key: make_record(ops)})
+            ops += 1
+    return ops
+
+
+def worker(args, working_dir: str, mode: str, seed: int, results) -> None:
+    results.put(asyncio.run(worker_loop(args, working_dir, mode, seed)))
+
+
+def run(args, backend: str, workers: int, mode: str) -> float:
+    os.environ["SHARED_MEMORY_STORE"] = BACKENDS[backend]
+    initialize_share_data(workers=max(2, max(args.workers)))
+    try:
+        with tempfile.TemporaryDirectory() as working_dir:
+
+            async def load():
+                storage = await open_storage(working_dir)
+                records = {f"chunk-{i}": make_record(i) for i in range(args.records)}
+                await storage.upsert(records)
+
+            asyncio.run(load())
+            context = mp.get_context("fork")
+            results = context.Queue()
+            processes = [
+                context.Process(
+                    target=worker, args=(args, working_dir, mode, seed, results)
+                )
+                for seed in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            ops = sum(results.get() for _ in processes)
+            for process in processes:
+                process.join()
+    finally:
+        finalize_share_data()
+    return ops / args.seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{args.records:,} records, get_by_ids batches of {args.batch}")
+    print(f"{'backend':<15}{'workers':>8}{'reads/s':>12}{'writes/s':>12}")
+    for backend in BACKENDS:
+        for workers in args.workers:
+            reads = run(args, backend, workers, "read")
+            writes = run(args, backend, workers, "write")
+            print(f"{backend:<15}{workers:>8}{reads:>12,.0f}{writes:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
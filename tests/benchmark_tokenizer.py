@@ -0,0 +1,108 @@
+"""
+Benchmark for the tokenizer backends and the token count estimator.
+
+Splits the sample documents into paragraphs and, for every available backend,
+reports counts/sec for per-text ``encode``, for ``count_tokens_batch`` (count
+cache disabled, so every call tokenizes) and for calibrated estimates, plus
+the estimator's error against the exact counts of that backend.
+
+Usage:
+    python tests/benchmark_tokenizer.py
+    python tests/benchmark_tokenizer.py --repeat 20 --calibration-share 0.1
+    python tests/benchmark_tokenizer.py --hf-tokenizer /path/to/tokenizer.json
+
+tiktoken (``gpt-4o-mini``) is used when its encoding can be loaded and the
+HuggingFace ``tokenizers`` backend when ``--hf-tokenizer`` is given; a regex
+word tokenizer is always included so the benchmark also runs offline.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from lightrag.utils import HuggingFaceTokenizer, TiktokenTokenizer, Tokenizer
+
+from helpers import RegexWordTokenizer
+
+SAMPLE_DIR = (
+    Path(__file__).resolve().parent.parent
+    / "lightrag"
+    / "evaluation"
+    / "sample_documents"
+)
+
+
+def load_texts(repeat: int) -> list[str]:
+    paragraphs = []
+    for path in sorted(SAMPLE_DIR.glob("*.md")):
+        text = path.read_text(encoding="utf-8")
+        paragraphs += [p for p in text.split("\n\n") if p.strip()]
+    # Suffix repeats so they are distinct texts of the same shape
+    return [f"{p} ({i})" for i in range(repeat) for p in paragraphs]
+
+
+def backends(args) -> list[tuple[str, Tokenizer]]:
+    found = [("regex", Tokenizer("regex", RegexWordTokenizer(), count_cache_size=0))]
+    try:
+        found.append(("tiktoken", TiktokenTokenizer(count_cache_size=0)))
+    except Exception as e:
+        print(f"tiktoken unavailable ({type(e).__name__})")
+    if args.hf_tokenizer:
+        try:
+            found.append(
+                (
+                    "huggingface",
+                    HuggingFaceTokenizer(args.hf_tokenizer, count_cache_size=0),
+                )
+            )
+        except Exception as e:
+            print(f"huggingface unavailable ({type(e).__name__}: {e})")
+    return found
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--calibration-share", type=float, default=0.2)
+    parser.add_argument("--hf-tokenizer", default="")
+    args = parser.parse_args()
+
+    texts = load_texts(args.repeat)
+    chars = sum(len(t) for t in texts)
+    print(f"{len(texts)} texts, {chars:,} characters")
+    print(
+        f"{'backend':<13}{'encode/s':>12}{'batch/s':>12}{'estimate/s':>13}"
+        f"{'mean err':>10}{'p95 err':>9}{'under':>8}"
+    )
+    calibration = texts[: max(1, int(len(texts) * args.calibration_share))]
+    for name, tokenizer in backends(args):
+        exact, encode_time = timed(lambda: [len(tokenizer.encode(t)) for t in texts])
+        batch, batch_time = timed(lambda: tokenizer.count_tokens_batch(texts))
+        assert batch == exact, f"{name}: batch counts differ from encode"
+
+        tokenizer.count_mode = "estimate"
+        tokenizer.calibrate(calibration)
+        estimates, estimate_time = timed(lambda: tokenizer.estimate_tokens_batch(texts))
+
+        exact_arr = np.maximum(np.array(exact, dtype=float), 1)
+        error = (np.array(estimates) - exact_arr) / exact_arr
+        print(
+            f"{name:<13}{len(texts) / encode_time:>12,.0f}"
+            f"{len(texts) / batch_time:>12,.0f}"
+            f"{len(texts) / estimate_time:>13,.0f}"
+            f"{np.mean(np.abs(error)):>10.1%}"
+            f"{np.percentile(np.abs(error), 95):>9.1%}"
+            f"{np.mean(error < 0):>8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
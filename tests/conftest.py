@@ -6,6 +6,8 @@ This file provides command-line options and fixtures for test configuration.
 
 import pytest
 
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
 
 def pytest_configure(config):
     """Register custom markers for LightRAG tests."""
@@ -74,6 +76,17 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(skip_integration)
 
 
+@pytest.fixture
+def shared_data():
+    """Initialize single-process shared storage data for one test.
+
+    Storage tests opt in with ``pytestmark = pytest.mark.usefixtures("shared_data")``.
+    """
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
 @pytest.fixture(scope="session")
 def keep_test_artifacts(request):
     """
@@ -0,0 +1,61 @@
+"""
+Helpers shared by several offline test modules.
+"""
+
+import hashlib
+import re
+
+import numpy as np
+
+
+async def hashed_embedding(texts, embedding_dim: int = 16, **kwargs):
+    """Deterministic pseudo-random embedding per text."""
+    return np.stack(
+        [
+            np.random.default_rng(
+                int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+            ).standard_normal(embedding_dim)
+            for text in texts
+        ]
+    ).astype(np.float32)
+
+
+class CharTokenizer:
+    """Tokenizer with one token per character."""
+
+    def encode(self, content: str) -> list[int]:
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+class RegexWordTokenizer:
+    """Offline stand-in tokenizer: one token per word, space run or symbol."""
+
+    _pattern = re.compile(r"\w+|\s+|[^\w\s]")
+
+    def __init__(self):
+        self._vocab: dict[str, int] = {}
+        self._inverse: list[str] = []
+
+    def encode(self, content: str) -> list[int]:
+        tokens = []
+        for piece in self._pattern.findall(content):
+            token = self._vocab.get(piece)
+            if token is None:
+                token = self._vocab[piece] = len(self._inverse)
+                self._inverse.append(piece)
+            tokens.append(token)
+        return tokens
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(self._inverse[t] for t in tokens)
+
+    def decode_with_offsets(self, tokens: list[int]) -> tuple[str, list[int]]:
+        offsets = []
+        position = 0
+        for t in tokens:
+            offsets.append(position)
+            position += len(self._inverse[t])
+        return self.decode(tokens), offsets
@@ -0,0 +1,123 @@
+"""
+Tests for the adaptive concurrency limiter of priority_limit_async_func_call.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from lightrag.utils import (
+    AdaptiveConcurrencyLimiter,
+    priority_limit_async_func_call,
+    report_rate_limit,
+)
+
+
+class RateLimited(Exception):
+    """Provider error shaped like openai.RateLimitError."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: str | None = None):
+        super().__init__("rate limited")
+        headers = {"retry-after": retry_after} if retry_after else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+@pytest.mark.offline
+async def test_limit_grows_while_healthy():
+    in_flight = 0
+    peak = 0
+
+    async def call(i):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return i
+
+    limited = priority_limit_async_func_call(
+        16, adaptive=True, initial_size=2, queue_name="test"
+    )(call)
+    try:
+        results = await asyncio.gather(*(limited(i) for i in range(200)))
+        assert results == list(range(200))
+        stats = limited.stats()
+        assert 2 < stats["limit"] <= 16
+        assert 2 < peak <= 16
+        assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+        assert stats["error_rate"] == 0 and stats["avg_latency"] > 0
+    finally:
+        await limited.shutdown()
+
+
+@pytest.mark.offline
+async def test_rate_limits_back_off_and_honor_retry_after():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=16, initial_limit=8)
+    await limiter.acquire()
+    limiter.release(error=RateLimited(retry_after="0.2"))
+    assert limiter.stats()["limit"] == 4 and limiter.stats()["rate_limited"] == 1
+
+    # A burst of 429s from calls admitted under the old limit backs off only once
+    limiter.on_rate_limited()
+    assert limiter.stats()["limit"] == 4
+
+    start = time.monotonic()
+    await limiter.acquire()
+    await limiter.admit()
+    assert time.monotonic() - start >= 0.19
+    limiter.release(latency=0.01)
+
+
+@pytest.mark.offline
+async def test_provider_retries_report_rate_limits():
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            # What the tenacity before_sleep hook does before retrying
+            report_rate_limit(RateLimited())
+        return "ok"
+
+    limited = priority_limit_async_func_call(
+        8, adaptive=True, initial_size=8, queue_name="test"
+    )(call)
+    try:
+        assert await limited() == "ok"
+        assert limited.stats()["rate_limited"] == 1
+        assert limited.stats()["limit"] == 4
+    finally:
+        await limited.shutdown()
+
+
+@pytest.mark.offline
+async def test_token_budget_gates_calls():
+    limiter = AdaptiveConcurrencyLimiter(
+        max_limit=4, adaptive=False, tokens_per_minute=600
+    )
+    await limiter.admit(600)
+    assert limiter.stats()["tokens_available"] == 0
+
+    # 10 tokens per second are refilled
+    start = time.monotonic()
+    await limiter.admit(2)
+    assert 0.15 <= time.monotonic() - start < 1.0
+
+
+@pytest.mark.offline
+async def test_fixed_limit_stats():
+    async def call():
+        await asyncio.sleep(0.01)
+
+    limited = priority_limit_async_func_call(3, queue_name="test")(call)
+    try:
+        await asyncio.gather(*(limited() for _ in range(5)))
+        assert limited.limiter is None
+        assert limited.stats() == {"limit": 3, "in_flight": 0, "queue_depth": 0}
+    finally:
+        await limited.shutdown()
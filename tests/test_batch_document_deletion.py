@@ -0,0 +1,218 @@
+"""
+Tests for deleting several documents in one pass with LightRAG.adelete_by_doc_ids,
+and for background deletion jobs that delete documents in bounded batches.
+"""
+
+import asyncio
+import re
+import sys
+
+import numpy as np
+import pytest
+
+import lightrag.lightrag as lightrag_module
+from lightrag import LightRAG
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+from helpers import CharTokenizer
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+async def mock_llm(prompt, system_prompt=None, history_messages=None, **kwargs):
+    await asyncio.sleep(0)
+    topic = re.findall(r"TOPIC-(\w+)", f"{system_prompt}\n{prompt}")[-1]
+    return (
+        "entity<|#|>Hub<|#|>concept<|#|>Shared by every document.\n"
+        f"entity<|#|>Topic {topic}<|#|>concept<|#|>Only in document {topic}.\n"
+        f"relation<|#|>Hub<|#|>Topic {topic}<|#|>covers<|#|>Hub covers {topic}.\n"
+        "<|COMPLETE|>"
+    )
+
+
+async def mock_embedding(texts: list[str]) -> np.ndarray:
+    await asyncio.sleep(0)
+    return np.random.rand(len(texts), 32)
+
+
+async def make_rag(tmp_path, topics, **kwargs) -> LightRAG:
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=mock_llm,
+        embedding_func=EmbeddingFunc(embedding_dim=32, func=mock_embedding),
+        tokenizer=Tokenizer("mock-tokenizer", CharTokenizer()),
+        **kwargs,
+    )
+    await rag.initialize_storages()
+    await rag.ainsert(
+        [f"TOPIC-{t} text about topic {t}." for t in topics],
+        ids=[f"doc-{t}" for t in topics],
+    )
+    return rag
+
+
+@pytest.mark.offline
+async def test_shared_entities_are_rebuilt_once(tmp_path, monkeypatch):
+    rag = await make_rag(tmp_path, ["a", "b", "c", "d"])
+    try:
+        rebuilds = []
+        rebuild = lightrag_module.rebuild_knowledge_from_chunks
+
+        async def counting_rebuild(**kwargs):
+            rebuilds.append(
+                (
+                    set(kwargs["entities_to_rebuild"]),
+                    set(kwargs["relationships_to_rebuild"]),
+                )
+            )
+            return await rebuild(**kwargs)
+
+        monkeypatch.setattr(
+            lightrag_module, "rebuild_knowledge_from_chunks", counting_rebuild
+        )
+
+        results = await rag.adelete_by_doc_ids(["doc-a", "doc-b", "doc-c", "missing"])
+        assert [r.status for r in results] == [
+            "success",
+            "success",
+            "success",
+            "not_found",
+        ]
+
+        # One rebuild pass for all documents; only the hub keeps other chunks
+        assert rebuilds == [({"Hub"}, set())]
+
+        graph = rag.chunk_entity_relation_graph
+        hub = await graph.get_node("Hub")
+        remaining = await rag.doc_status.get_by_id("doc-d")
+        assert set(hub["source_id"].split("<SEP>")) == set(remaining["chunks_list"])
+        for topic in ("a", "b", "c"):
+            assert not await graph.has_node(f"Topic {topic}")
+            assert await rag.doc_status.get_by_id(f"doc-{topic}") is None
+            assert await rag.full_docs.get_by_id(f"doc-{topic}") is None
+        assert await graph.has_edge("Hub", "Topic d")
+
+        pipeline_status = await lightrag_module.get_namespace_data("pipeline_status")
+        assert not pipeline_status["busy"]
+        assert (
+            pipeline_status["latest_message"]
+            == "Deletion process completed for 4 documents"
+        )
+    finally:
+        await rag.finalize_storages()
+
+
+async def run_deletion_job(rag: LightRAG, tmp_path, monkeypatch, doc_ids) -> dict:
+    """Run the API server's background deletion job and return pipeline_status"""
+    pytest.importorskip("fastapi")
+    # The API configuration is parsed from the command line on first use
+    monkeypatch.setattr(sys, "argv", ["lightrag-server"])
+    from lightrag.api.routers.document_routes import (
+        DocumentManager,
+        background_delete_documents,
+    )
+
+    doc_manager = DocumentManager(str(tmp_path / "inputs"))
+    await background_delete_documents(rag, doc_manager, doc_ids)
+    return await lightrag_module.get_namespace_data("pipeline_status")
+
+
+@pytest.mark.offline
+async def test_deletion_job_deletes_in_batches(tmp_path, monkeypatch):
+    topics = ["a", "b", "c", "d", "e"]
+    rag = await make_rag(tmp_path, topics, max_delete_batch_size=2)
+    try:
+        batches = []
+        delete = rag.adelete_by_doc_ids
+
+        async def recording_delete(doc_ids, **kwargs):
+            batches.append(list(doc_ids))
+            return await delete(doc_ids, **kwargs)
+
+        monkeypatch.setattr(rag, "adelete_by_doc_ids", recording_delete)
+
+        pipeline_status = await run_deletion_job(
+            rag, tmp_path, monkeypatch, [f"doc-{t}" for t in topics]
+        )
+        assert batches == [["doc-a", "doc-b"], ["doc-c", "doc-d"], ["doc-e"]]
+        assert pipeline_status["batchs"] == pipeline_status["cur_batch"] == 3
+        assert "Deleting documents 3-4/5" in pipeline_status["history_messages"]
+        assert (
+            pipeline_status["latest_message"]
+            == "Deletion completed: 5 successful, 0 failed"
+        )
+        for topic in topics:
+            assert await rag.doc_status.get_by_id(f"doc-{topic}") is None
+    finally:
+        await rag.finalize_storages()
+
+
+@pytest.mark.offline
+async def test_deletion_job_stops_between_batches_when_cancelled(tmp_path, monkeypatch):
+    topics = ["a", "b", "c", "d"]
+    rag = await make_rag(tmp_path, topics, max_delete_batch_size=2)
+    try:
+        delete = rag.adelete_by_doc_ids
+
+        async def delete_then_cancel(doc_ids, **kwargs):
+            results = await delete(doc_ids, **kwargs)
+            pipeline_status = await lightrag_module.get_namespace_data(
+                "pipeline_status"
+            )
+            pipeline_status["cancellation_requested"] = True
+            return results
+
+        monkeypatch.setattr(rag, "adelete_by_doc_ids", delete_then_cancel)
+
+        pipeline_status = await run_deletion_job(
+            rag, tmp_path, monkeypatch, [f"doc-{t}" for t in topics]
+        )
+        # The first batch is deleted, the remaining documents are left untouched
+        assert await rag.doc_status.get_by_id("doc-b") is None
+        assert await rag.doc_status.get_by_id("doc-c") is not None
+        assert await rag.chunk_entity_relation_graph.has_node("Topic d")
+        assert (
+            "Deletion cancelled by user at document 3/4. 2 deleted, 2 remaining."
+            in pipeline_status["history_messages"]
+        )
+        assert (
+            pipeline_status["latest_message"]
+            == "Deletion completed: 2 successful, 2 failed"
+        )
+        assert not pipeline_status["busy"]
+        assert not pipeline_status["cancellation_requested"]
+    finally:
+        await rag.finalize_storages()
+
+
+@pytest.mark.offline
+async def test_deletion_job_continues_after_failed_batch(tmp_path, monkeypatch):
+    topics = ["a", "b", "c", "d", "e"]
+    rag = await make_rag(tmp_path, topics, max_delete_batch_size=2)
+    try:
+        delete = rag.adelete_by_doc_ids
+
+        async def failing_delete(doc_ids, **kwargs):
+            if "doc-c" in doc_ids:
+                raise RuntimeError("storage unavailable")
+            return await delete(doc_ids, **kwargs)
+
+        monkeypatch.setattr(rag, "adelete_by_doc_ids", failing_delete)
+
+        pipeline_status = await run_deletion_job(
+            rag, tmp_path, monkeypatch, [f"doc-{t}" for t in topics]
+        )
+        for topic in ("a", "b", "e"):
+            assert await rag.doc_status.get_by_id(f"doc-{topic}") is None
+        for topic in ("c", "d"):
+            assert await rag.doc_status.get_by_id(f"doc-{topic}") is not None
+        assert (
+            "Error deleting documents 3-4/5: storage unavailable"
+            in pipeline_status["history_messages"]
+        )
+        assert (
+            pipeline_status["latest_message"]
+            == "Deletion completed: 3 successful, 2 failed"
+        )
+    finally:
+        await rag.finalize_storages()
@@ -0,0 +1,152 @@
+"""
+Tests for the change feed that lets worker processes apply each other's saves
+to their in-memory NetworkX (graphml), NanoVectorDB and Faiss replicas.
+"""
+
+import pytest
+
+from lightrag.kg.change_feed import ChangeFeed
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.utils import EmbeddingFunc
+
+from helpers import hashed_embedding
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+DIM = 16
+
+
+@pytest.fixture(autouse=True)
+def graph_format(monkeypatch):
+    """Store NetworkX graphs as graphml, which relies on the change feed"""
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "graphml")
+
+
+def vector_config(tmp_path) -> dict:
+    return {
+        "working_dir": str(tmp_path),
+        "embedding_batch_num": 32,
+        "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": -1.0},
+    }
+
+
+async def make_storage(cls, tmp_path, namespace="chunks"):
+    storage = cls(
+        namespace=namespace,
+        workspace="",
+        global_config=vector_config(tmp_path),
+        embedding_func=EmbeddingFunc(
+            embedding_dim=DIM, func=hashed_embedding, send_dimensions=True
+        ),
+        meta_fields={"content"},
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+def test_readers_follow_appends_and_compaction(tmp_path):
+    path = str(tmp_path / "data.changes")
+    writer, caught_up, behind = (ChangeFeed(path) for _ in range(3))
+    for feed in (writer, caught_up, behind):
+        assert feed.loaded() == []
+
+    writer.append([("set", "a", 1)], data_size=1000)
+    writer.mark_snapshot()
+    assert caught_up.read() == behind.read() == [("set", "a", 1)]
+    writer.append([("set", "b", 2)], data_size=1000)
+    writer.mark_snapshot()
+    assert caught_up.read() == [("set", "b", 2)]
+    assert caught_up.sequence == writer.sequence == 2
+
+    # The feed outgrows the data file and is restarted at the writer's sequence:
+    # a caught-up reader carries on, one that missed frames has to reload
+    writer.append([("set", "c", 3)], data_size=10)
+    writer.mark_snapshot()
+    assert caught_up.read() == [("set", "c", 3)]
+    assert behind.read() is None
+    assert behind.loaded() == [] and behind.sequence == 3
+
+    # A torn final frame is left for the next read
+    with open(path, "ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")
+    assert caught_up.read() == []
+
+    # After a drop every replica reloads
+    writer.reset()
+    assert caught_up.read() is None
+
+
+@pytest.mark.offline
+async def test_graphml_replica_applies_changes_in_place(tmp_path):
+    def make_graph_storage():
+        return NetworkXStorage(
+            namespace="chunk_entity_relation",
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=None,
+        )
+
+    writer = make_graph_storage()
+    await writer.initialize()
+    for i in range(20):
+        await writer.upsert_node(f"n{i}", {"description": "d" * 50})
+    await writer.index_done_callback()
+    reader = make_graph_storage()
+    await reader.initialize()
+    graph_before = reader._graph
+
+    await writer.upsert_edge("n0", "n1", {"weight": 2.0})
+    await writer.delete_node("n19")
+    await writer.index_done_callback()
+    assert await reader.has_edge("n1", "n0")
+    assert not await reader.has_node("n19")
+    assert reader._graph is graph_before
+
+    await writer.drop()
+    assert not await reader.has_node("n0")
+
+
+@pytest.mark.offline
+async def test_nano_replica_applies_changes_in_place(tmp_path):
+    writer = await make_storage(NanoVectorDBStorage, tmp_path)
+    await writer.upsert({f"id{i}": {"content": f"text {i}"} for i in range(10)})
+    await writer.index_done_callback()
+    reader = await make_storage(NanoVectorDBStorage, tmp_path)
+    client_before = reader._client
+
+    await writer.upsert({"id3": {"content": "changed"}, "id10": {"content": "new"}})
+    await writer.delete(["id0"])
+    await writer.index_done_callback()
+
+    assert (await reader.query("changed", top_k=1))[0]["id"] == "id3"
+    assert (await reader.get_by_id("id10"))["content"] == "new"
+    assert await reader.get_by_id("id0") is None
+    assert reader._client is client_before
+
+    # A restarted process loads the saved file plus nothing left in the feed
+    restarted = await make_storage(NanoVectorDBStorage, tmp_path)
+    assert len(restarted._client) == len(reader._client) == 10
+
+
+@pytest.mark.offline
+async def test_faiss_replica_applies_changes_in_place(tmp_path):
+    pytest.importorskip("faiss")
+    from lightrag.kg.faiss_impl import FaissVectorDBStorage
+
+    writer = await make_storage(FaissVectorDBStorage, tmp_path)
+    await writer.upsert({f"id{i}": {"content": f"text {i}"} for i in range(10)})
+    await writer.index_done_callback()
+    reader = await make_storage(FaissVectorDBStorage, tmp_path)
+    index_before = reader._index
+
+    await writer.upsert({"id3": {"content": "changed"}, "id10": {"content": "new"}})
+    await writer.delete(["id0"])
+    await writer.index_done_callback()
+
+    assert (await reader.query("changed", top_k=1))[0]["id"] == "id3"
+    assert (await reader.get_by_id("id10"))["content"] == "new"
+    assert await reader.get_by_id("id0") is None
+    assert await reader._get_index() is index_before
+    assert reader._index.ntotal == writer._index.ntotal == 10
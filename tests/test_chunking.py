@@ -1,7 +1,7 @@
 import pytest
 
 from lightrag.exceptions import ChunkTokenLimitExceededError
-from lightrag.operate import chunking_by_token_size
+from lightrag.operate import chunking_by_token_size, iter_chunks_by_token_size
 from lightrag.utils import Tokenizer, TokenizerInterface
 
 
@@ -63,6 +63,23 @@ class MultiTokenCharacterTokenizer(TokenizerInterface):
         return "".join(result)
 
 
+class OffsetAwareTokenizer(MultiTokenCharacterTokenizer):
+    """Multi-token tokenizer that can map tokens back to character offsets."""
+
+    def decode_with_offsets(self, tokens):
+        text = self.decode(tokens)
+        offsets = []
+        char_index = 0
+        i = 0
+        while i < len(tokens):
+            ch = text[char_index]
+            width = 3 if ch in ["!", "?", "."] else 2 if ch.isupper() else 1
+            offsets.extend([char_index] * width)
+            char_index += 1
+            i += width
+        return text, offsets
+
+
 def make_tokenizer() -> Tokenizer:
     return Tokenizer(model_name="dummy", tokenizer=DummyTokenizer())
 
@@ -1064,3 +1081,89 @@ def test_decode_preserves_content():
         tokens = tokenizer.encode(original)
         decoded = tokenizer.decode(tokens)
         assert decoded == original, f"Failed to decode: {original}"
+
+
+# ============================================================================
+# Tests for the streaming chunker (iter_chunks_by_token_size)
+# ============================================================================
+
+
+STREAMING_CASES = [
+    dict(split_by_character=None, split_by_character_only=False),
+    dict(split_by_character="\n\n", split_by_character_only=False),
+    dict(split_by_character="\n\n", split_by_character_only=True),
+]
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("case", STREAMING_CASES)
+def test_streaming_compat_mode_matches_chunking_by_token_size(case):
+    """Compatibility mode must reproduce chunking_by_token_size exactly."""
+    tokenizer = make_multi_token_tokenizer()
+    content = "Alpha beta. GAMMA!\n\nshort\n\n" + "Delta epsilon? " * 3
+
+    kwargs = dict(case, chunk_token_size=60, chunk_overlap_token_size=7)
+    if case["split_by_character_only"]:
+        kwargs["chunk_token_size"] = 200
+
+    expected = chunking_by_token_size(tokenizer, content, **kwargs)
+    streamed = list(
+        iter_chunks_by_token_size(tokenizer, content, exact_decode=True, **kwargs)
+    )
+
+    assert streamed == expected
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("split_by_character", [None, "\n\n"])
+def test_streaming_slices_source_text_with_offsets(split_by_character):
+    """Offset-aware tokenizers slice chunks from the source instead of decoding."""
+    tokenizer = Tokenizer(model_name="offsets", tokenizer=OffsetAwareTokenizer())
+    content = "abcABCdef!\n\nxyzXYZ?" * 4
+
+    expected = chunking_by_token_size(
+        tokenizer,
+        content,
+        split_by_character=split_by_character,
+        chunk_token_size=12,
+        chunk_overlap_token_size=3,
+    )
+
+    calls = []
+    original_decode = tokenizer.decode
+    tokenizer.decode = lambda tokens: calls.append(tokens) or original_decode(tokens)
+
+    streamed = list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character=split_by_character,
+            chunk_token_size=12,
+            chunk_overlap_token_size=3,
+        )
+    )
+
+    assert [c["tokens"] for c in streamed] == [c["tokens"] for c in expected]
+    assert [c["chunk_order_index"] for c in streamed] == list(range(len(expected)))
+    # Sliced chunks are always verbatim source text, even where a decoded
+    # window would garble a multi-token character cut at its boundary
+    assert all(c["content"] in content for c in streamed)
+    assert calls == []
+
+
+@pytest.mark.offline
+def test_streaming_yields_chunks_lazily():
+    """Chunks before an oversized segment are produced before the error."""
+    tokenizer = make_tokenizer()
+    chunks = iter_chunks_by_token_size(
+        tokenizer,
+        "alpha\n\nbeta\n\n" + "x" * 20,
+        split_by_character="\n\n",
+        split_by_character_only=True,
+        chunk_token_size=10,
+    )
+
+    assert next(chunks)["content"] == "alpha"
+    assert next(chunks)["content"] == "beta"
+    with pytest.raises(ChunkTokenLimitExceededError):
+        next(chunks)
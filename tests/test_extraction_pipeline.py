@@ -0,0 +1,201 @@
+"""
+Tests for the chunk extraction pipeline of extract_entities.
+"""
+
+import asyncio
+
+import pytest
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.operate import extract_entities
+from lightrag.utils import (
+    LLMCacheBatch,
+    extraction_stage_timer,
+    use_llm_func_with_cache,
+)
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+class CountingKV(JsonKVStorage):
+    """JsonKVStorage that counts upsert and read calls."""
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.upserts = 0
+        self.single_reads = 0
+        self.batch_reads = 0
+
+    async def upsert(self, data):
+        self.upserts += 1
+        return await super().upsert(data)
+
+    async def get_by_id(self, id):
+        self.single_reads += 1
+        return await super().get_by_id(id)
+
+    async def get_by_ids(self, ids):
+        self.batch_reads += 1
+        return await super().get_by_ids(ids)
+
+
+async def make_kv(namespace, global_config):
+    storage = CountingKV(
+        namespace=namespace,
+        workspace="",
+        global_config=global_config,
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def make_llm(events):
+    async def llm(prompt, system_prompt=None, history_messages=None, **kwargs):
+        gleaning = bool(history_messages)
+        chunk = f"{system_prompt}\n{prompt}".split("CHUNK-")[1].split()[0]
+        events.append(("glean" if gleaning else "extract", chunk))
+        await asyncio.sleep(0.01)
+        if gleaning:
+            return (
+                f"entity<|#|>Glean {chunk}<|#|>concept<|#|>Found when gleaning.\n"
+                "<|COMPLETE|>"
+            )
+        return (
+            f"entity<|#|>Alpha {chunk}<|#|>concept<|#|>First entity.\n"
+            f"entity<|#|>Beta {chunk}<|#|>concept<|#|>Second entity.\n"
+            f"relation<|#|>Alpha {chunk}<|#|>Beta {chunk}<|#|>pair<|#|>They pair.\n"
+            "<|COMPLETE|>"
+        )
+
+    return llm
+
+
+def make_chunks(count):
+    return {
+        f"chunk-{i}": {
+            "content": f"CHUNK-{i} text",
+            "tokens": 3,
+            "full_doc_id": "doc-1",
+            "chunk_order_index": i,
+            "file_path": "doc.txt",
+        }
+        for i in range(count)
+    }
+
+
+@pytest.mark.offline
+async def test_gleaning_and_cache_lists(tmp_path):
+    events = []
+    global_config = {
+        "working_dir": str(tmp_path),
+        "llm_model_func": make_llm(events),
+        "llm_model_max_async": 2,
+        "entity_extract_max_gleaning": 1,
+        "addon_params": {},
+        "enable_llm_cache_for_entity_extract": True,
+    }
+    text_chunks = await make_kv("text_chunks", global_config)
+    llm_cache = await make_kv("llm_response_cache", global_config)
+    chunks = make_chunks(4)
+    await text_chunks.upsert(chunks)
+    text_chunks.upserts = 0
+    extraction_stage_timer.reset()
+
+    results = await extract_entities(
+        chunks,
+        global_config,
+        llm_response_cache=llm_cache,
+        text_chunks_storage=text_chunks,
+    )
+
+    assert len(results) == 4
+    for nodes, edges in results:
+        assert len(nodes) == 3 and len(edges) == 1
+    assert len(events) == 8
+
+    # Cache keys of all chunks were recorded with a single write
+    assert text_chunks.upserts == 1
+    for chunk_id in chunks:
+        stored = await text_chunks.get_by_id(chunk_id)
+        assert len(stored["llm_cache_list"]) == 2
+
+    counts = extraction_stage_timer.counts
+    assert counts["llm_extract"] == 4 and counts["llm_glean"] == 4
+    assert counts["parse"] == 8 and counts["slot_wait"] == 4
+    assert counts["cache_list_update"] == 1
+
+
+@pytest.mark.offline
+async def test_cached_extraction_uses_bulk_reads(tmp_path):
+    events = []
+    global_config = {
+        "working_dir": str(tmp_path),
+        "llm_model_func": make_llm(events),
+        "llm_model_max_async": 4,
+        "entity_extract_max_gleaning": 1,
+        "addon_params": {},
+        "enable_llm_cache_for_entity_extract": True,
+    }
+    text_chunks = await make_kv("text_chunks", global_config)
+    llm_cache = await make_kv("llm_response_cache", global_config)
+    chunks = make_chunks(6)
+    await text_chunks.upsert(chunks)
+
+    first = await extract_entities(
+        chunks,
+        global_config,
+        llm_response_cache=llm_cache,
+        text_chunks_storage=text_chunks,
+    )
+    # A cold cache costs one bulk read for the extraction prompts; gleaning keys
+    # depend on the fresh responses and are looked up one by one
+    assert len(events) == 12
+    assert llm_cache.batch_reads == 1 and llm_cache.single_reads == 6
+    # The 12 new entries are written at once
+    assert llm_cache.upserts == 1 and len(llm_cache._data) == 12
+
+    llm_cache.batch_reads = llm_cache.single_reads = llm_cache.upserts = 0
+    second = await extract_entities(
+        chunks,
+        global_config,
+        llm_response_cache=llm_cache,
+        text_chunks_storage=text_chunks,
+    )
+    # Extraction and gleaning responses are each resolved with one bulk read
+    assert len(events) == 12
+    assert llm_cache.batch_reads == 2 and llm_cache.single_reads == 0
+    assert llm_cache.upserts == 0
+
+    def by_chunk(results):
+        return sorted((sorted(nodes), sorted(edges)) for nodes, edges in results)
+
+    assert by_chunk(second) == by_chunk(first)
+
+
+@pytest.mark.offline
+async def test_buffered_cache_hit_has_create_time(tmp_path):
+    global_config = {
+        "working_dir": str(tmp_path),
+        "enable_llm_cache_for_entity_extract": True,
+    }
+    llm_cache = await make_kv("llm_response_cache", global_config)
+    cache_batch = LLMCacheBatch(llm_cache)
+    llm = make_llm([])
+
+    _, first_time = await use_llm_func_with_cache(
+        "CHUNK-0 text", llm, llm_response_cache=llm_cache, cache_batch=cache_batch
+    )
+    # Served from the not yet written batch entry
+    content, cached_time = await use_llm_func_with_cache(
+        "CHUNK-0 text", llm, llm_response_cache=llm_cache, cache_batch=cache_batch
+    )
+    assert llm_cache.upserts == 0
+    assert "Alpha 0" in content
+    assert cached_time > 0 and abs(cached_time - first_time) <= 1
+
+    await cache_batch.flush()
+    [entry] = llm_cache._data.values()
+    assert entry["cache_type"] == "extract"
+    assert entry["original_prompt"] == "CHUNK-0 text"
+    assert entry["queryparam"] is None
@@ -0,0 +1,72 @@
+"""
+Tests for ExtractionScheduler, which shares chunk extraction slots across documents.
+"""
+
+import asyncio
+
+import pytest
+
+from lightrag.operate import ExtractionScheduler
+
+
+async def run_chunks(scheduler, doc_id, count, order, release):
+    async def chunk(i):
+        async with scheduler.slot(doc_id):
+            order.append(doc_id)
+            await release.wait()
+
+    await asyncio.gather(*(chunk(i) for i in range(count)))
+
+
+@pytest.mark.offline
+async def test_slots_are_shared_round_robin():
+    scheduler = ExtractionScheduler(max_async=2, max_documents=10)
+    order = []
+    release = asyncio.Event()
+
+    big = asyncio.create_task(run_chunks(scheduler, "big", 20, order, release))
+    await asyncio.sleep(0.01)
+    small = asyncio.create_task(run_chunks(scheduler, "small", 3, order, release))
+    await asyncio.sleep(0.01)
+    # The large document took both slots and queued the rest
+    assert order == ["big", "big"] and scheduler.queued == 21
+    release.set()
+    await asyncio.gather(big, small)
+
+    # The small document's chunks were interleaved with the queued large ones
+    assert order[2:8] == ["big", "small", "big", "small", "big", "small"]
+    assert scheduler.queued == 0 and scheduler._active == 0
+
+
+@pytest.mark.offline
+async def test_documents_are_admitted_while_the_queue_is_short():
+    scheduler = ExtractionScheduler(max_async=2, max_documents=3)
+    admitted = []
+    release = asyncio.Event()
+
+    async def document(doc_id, chunks):
+        async with scheduler.document(doc_id):
+            admitted.append(doc_id)
+            await run_chunks(scheduler, doc_id, chunks, [], release)
+
+    tasks = [asyncio.create_task(document("a", 5))]
+    await asyncio.sleep(0.01)
+    tasks += [asyncio.create_task(document(d, 1)) for d in ("b", "c", "d")]
+    await asyncio.sleep(0.01)
+    # "a" holds both slots and has three chunks queued, so nobody else gets in
+    assert admitted == ["a"]
+
+    release.set()
+    await asyncio.gather(*tasks)
+    # Admitted in arrival order once the queue drained
+    assert admitted == ["a", "b", "c", "d"]
+
+    # Cancelled waiters give their slot and queue position back
+    release.clear()
+    blocker = asyncio.create_task(run_chunks(scheduler, "x", 3, [], release))
+    await asyncio.sleep(0.01)
+    assert scheduler.queued == 1
+    blocker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocker
+    assert scheduler.queued == 0 and scheduler._active == 0
@@ -0,0 +1,96 @@
+"""
+Tests for the approximate index modes of FaissVectorDBStorage.
+"""
+
+import pytest
+
+pytest.importorskip("faiss")
+
+from lightrag.kg.faiss_impl import FaissVectorDBStorage  # noqa: E402
+from lightrag.utils import EmbeddingFunc  # noqa: E402
+
+from helpers import hashed_embedding  # noqa: E402
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+DIM = 16
+
+
+async def make_storage(tmp_path, **kwargs):
+    storage = FaissVectorDBStorage(
+        namespace="chunks",
+        workspace="",
+        global_config={
+            "working_dir": str(tmp_path),
+            "embedding_batch_num": 32,
+            "vector_db_storage_cls_kwargs": {
+                "cosine_better_than_threshold": -1.0,
+                **kwargs,
+            },
+        },
+        embedding_func=EmbeddingFunc(
+            embedding_dim=DIM, func=hashed_embedding, send_dimensions=True
+        ),
+        meta_fields={"content"},
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+async def test_ivf_trains_after_first_vectors_and_removes_in_place(tmp_path):
+    storage = await make_storage(
+        tmp_path, faiss_index_type="IVF", faiss_nlist=4, faiss_train_size=40
+    )
+    await storage.upsert({f"id{i}": {"content": f"text {i}"} for i in range(20)})
+    # Not enough vectors to train yet: searched exactly from the pending set
+    assert not storage._index.is_trained
+    results = await storage.query("text 3", top_k=1)
+    assert results[0]["id"] == "id3"
+
+    await storage.upsert({f"id{i}": {"content": f"text {i}"} for i in range(20, 60)})
+    assert storage._index.is_trained
+    assert storage._index.ntotal == 60 and not storage._pending
+
+    await storage.delete(["id3"])
+    assert storage._index.ntotal == 59
+    results = await storage.query("text 3", top_k=5, search_effort=4)
+    assert "id3" not in [r["id"] for r in results]
+
+    await storage.index_done_callback()
+    reloaded = await make_storage(
+        tmp_path, faiss_index_type="IVF", faiss_nlist=4, faiss_train_size=40
+    )
+    assert reloaded._index.ntotal == 59
+    results = await reloaded.query("text 7", top_k=1, search_effort=4)
+    assert results[0]["id"] == "id7"
+
+
+@pytest.mark.offline
+async def test_hnsw_hides_removed_vectors_until_rebuild(tmp_path):
+    storage = await make_storage(tmp_path, faiss_index_type="HNSW", faiss_hnsw_m=8)
+    await storage.upsert({f"id{i}": {"content": f"text {i}"} for i in range(10)})
+    await storage.upsert({"id1": {"content": "text 1"}})  # replaces id1
+    await storage.delete(["id2"])
+    assert storage._index.ntotal == 11
+    assert len(storage._stale_fids) == 2
+
+    results = await storage.query("text 1", top_k=10, search_effort=32)
+    ids = [r["id"] for r in results]
+    assert ids[0] == "id1" and "id2" not in ids and len(ids) == 9
+
+    await storage.index_done_callback()
+    reloaded = await make_storage(tmp_path, faiss_index_type="HNSW", faiss_hnsw_m=8)
+    assert reloaded._stale_fids == storage._stale_fids
+    assert reloaded._next_fid == storage._next_fid
+
+
+@pytest.mark.offline
+async def test_legacy_flat_index_is_rebuilt_for_configured_type(tmp_path):
+    flat = await make_storage(tmp_path)
+    await flat.upsert({f"id{i}": {"content": f"text {i}"} for i in range(8)})
+    await flat.index_done_callback()
+
+    hnsw = await make_storage(tmp_path, faiss_index_type="HNSW", faiss_hnsw_m=8)
+    assert hnsw._index.ntotal == 8
+    assert (await hnsw.query("text 5", top_k=1))[0]["id"] == "id5"
@@ -0,0 +1,233 @@
+"""
+Tests for the native upsert_nodes_batch / upsert_edges_batch methods of the
+database graph backends, run against mocked drivers: each batch must reach the
+database as one transaction, bulk write or multi-statement execute with the
+expected queries and parameters.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+NODES = [
+    ("Alice", {"entity_id": "Alice", "entity_type": "person", "source_id": "c1"}),
+    ("Bob", {"entity_id": "Bob", "entity_type": "person", "source_id": "c1<SEP>c2"}),
+    ("Paris", {"entity_id": "Paris", "entity_type": "location", "source_id": "c2"}),
+]
+EDGES = [
+    ("Alice", "Bob", {"weight": "1.0", "source_id": "c1"}),
+    ("Bob", "Paris", {"weight": "2.0", "source_id": "c2"}),
+]
+
+
+class FakeResult:
+    async def consume(self):
+        pass
+
+
+class FakeTransaction:
+    def __init__(self):
+        self.runs: list[tuple[str, dict]] = []
+
+    async def run(self, query, **params):
+        self.runs.append((" ".join(query.split()), params))
+        return FakeResult()
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_write(self, func):
+        tx = FakeTransaction()
+        self.driver.transactions.append(tx)
+        await func(tx)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.transactions: list[FakeTransaction] = []
+
+    def session(self, **kwargs):
+        return FakeSession(self)
+
+
+def neo4j_style_storage(storage_cls):
+    storage = storage_cls(
+        namespace="chunk_entity_relation",
+        global_config={},
+        embedding_func=None,
+        workspace="ws",
+    )
+    # Set by initialize()
+    storage._DATABASE = None
+    storage._driver = FakeDriver()
+    return storage
+
+
+@pytest.fixture(params=["neo4j", "memgraph"])
+def cypher_storage(request):
+    pytest.importorskip("neo4j")
+    if request.param == "neo4j":
+        from lightrag.kg.neo4j_impl import Neo4JStorage as storage_cls
+    else:
+        from lightrag.kg.memgraph_impl import MemgraphStorage as storage_cls
+    return neo4j_style_storage(storage_cls)
+
+
+@pytest.mark.offline
+async def test_cypher_node_batch_unwinds_per_entity_type(cypher_storage):
+    await cypher_storage.upsert_nodes_batch(NODES)
+
+    [tx] = cypher_storage._driver.transactions
+    assert tx.runs == [
+        (
+            "UNWIND $rows AS row MERGE (n:`ws` {entity_id: row.entity_id}) "
+            "SET n += row.properties SET n:`person`",
+            {
+                "rows": [
+                    {"entity_id": "Alice", "properties": NODES[0][1]},
+                    {"entity_id": "Bob", "properties": NODES[1][1]},
+                ]
+            },
+        ),
+        (
+            "UNWIND $rows AS row MERGE (n:`ws` {entity_id: row.entity_id}) "
+            "SET n += row.properties SET n:`location`",
+            {"rows": [{"entity_id": "Paris", "properties": NODES[2][1]}]},
+        ),
+    ]
+
+
+@pytest.mark.offline
+async def test_cypher_edge_batch_is_one_unwind(cypher_storage):
+    await cypher_storage.upsert_edges_batch(EDGES)
+
+    [tx] = cypher_storage._driver.transactions
+    assert tx.runs == [
+        (
+            "UNWIND $rows AS row "
+            "MATCH (source:`ws` {entity_id: row.source}) "
+            "MATCH (target:`ws` {entity_id: row.target}) "
+            "MERGE (source)-[r:DIRECTED]-(target) SET r += row.properties",
+            {
+                "rows": [
+                    {"source": s, "target": t, "properties": p} for s, t, p in EDGES
+                ]
+            },
+        )
+    ]
+
+    # Larger batches are split into batch_size rows per query
+    await cypher_storage.upsert_edges_batch(EDGES * 3, batch_size=4)
+    assert [len(p["rows"]) for _, p in cypher_storage._driver.transactions[1].runs] == [
+        4,
+        2,
+    ]
+
+
+@pytest.mark.offline
+async def test_mongo_batches_use_one_bulk_write():
+    pytest.importorskip("pymongo")
+    from pymongo import UpdateOne
+
+    from lightrag.kg.mongo_impl import MongoGraphStorage
+
+    storage = MongoGraphStorage(
+        namespace="chunk_entity_relation", global_config={}, embedding_func=None
+    )
+    storage.collection = AsyncMock()
+    storage.edge_collection = AsyncMock()
+
+    await storage.upsert_nodes_batch(NODES[:2])
+    storage.collection.bulk_write.assert_awaited_once_with(
+        [
+            UpdateOne(
+                {"_id": "Alice"},
+                {"$set": {**NODES[0][1], "source_ids": ["c1"]}},
+                upsert=True,
+            ),
+            UpdateOne(
+                {"_id": "Bob"},
+                {"$set": {**NODES[1][1], "source_ids": ["c1", "c2"]}},
+                upsert=True,
+            ),
+        ],
+        ordered=False,
+    )
+
+    storage.collection.reset_mock()
+    await storage.upsert_edges_batch(EDGES)
+    # One write ensures the source nodes exist, one upserts the edges
+    storage.collection.bulk_write.assert_awaited_once_with(
+        [
+            UpdateOne({"_id": "Alice"}, {"$set": {}}, upsert=True),
+            UpdateOne({"_id": "Bob"}, {"$set": {}}, upsert=True),
+        ],
+        ordered=False,
+    )
+    storage.edge_collection.bulk_write.assert_awaited_once()
+    [operations] = storage.edge_collection.bulk_write.await_args.args
+    assert operations[1] == UpdateOne(
+        {
+            "$or": [
+                {"source_node_id": "Bob", "target_node_id": "Paris"},
+                {"source_node_id": "Paris", "target_node_id": "Bob"},
+            ]
+        },
+        {
+            "$set": {
+                **EDGES[1][2],
+                "source_node_id": "Bob",
+                "target_node_id": "Paris",
+                "source_ids": ["c2"],
+            }
+        },
+        upsert=True,
+    )
+
+
+@pytest.mark.offline
+async def test_postgres_batches_join_statements_into_one_execute():
+    pytest.importorskip("asyncpg")
+    from lightrag.kg.postgres_impl import PGGraphStorage
+
+    storage = PGGraphStorage(
+        namespace="chunk_entity_relation",
+        global_config={},
+        embedding_func=None,
+        workspace="ws",
+    )
+    storage.graph_name = "ws_chunk_entity_relation"
+    storage.db = AsyncMock()
+    storage.db.execute.return_value = None
+
+    # The statements each single upsert sends
+    for node_id, node_data in NODES:
+        await storage.upsert_node(node_id, node_data)
+    for source, target, edge_data in EDGES:
+        await storage.upsert_edge(source, target, edge_data)
+    single = [call.args[0] for call in storage.db.execute.await_args_list]
+    storage.db.execute.reset_mock()
+
+    await storage.upsert_nodes_batch(NODES)
+    await storage.upsert_edges_batch(EDGES)
+    assert [call.args[0] for call in storage.db.execute.await_args_list] == [
+        ";\n".join(single[:3]),
+        ";\n".join(single[3:]),
+    ]
+    assert storage.db.execute.await_args.kwargs == {
+        "upsert": True,
+        "with_age": True,
+        "graph_name": "ws_chunk_entity_relation",
+    }
+
+    storage.db.execute.reset_mock()
+    await storage.upsert_nodes_batch(NODES, batch_size=2)
+    assert storage.db.execute.await_count == 2
@@ -0,0 +1,175 @@
+"""
+Tests for the bulk graph merge mode (GRAPH_BULK_MERGE) of merge_nodes_and_edges.
+"""
+
+import asyncio
+
+import networkx as nx
+import pytest
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.operate import merge_nodes_and_edges
+from lightrag.utils import Tokenizer
+
+from helpers import CharTokenizer
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+class CountingGraph(NetworkXStorage):
+    """NetworkXStorage that counts single-record and batched calls."""
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.calls: dict[str, int] = {}
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    async def get_node(self, node_id):
+        self._count("get_node")
+        return await super().get_node(node_id)
+
+    async def get_nodes_batch(self, node_ids):
+        self._count("get_nodes_batch")
+        return await super().get_nodes_batch(node_ids)
+
+    async def upsert_node(self, node_id, node_data):
+        self._count("upsert_node")
+        return await super().upsert_node(node_id, node_data)
+
+    async def upsert_edge(self, source_node_id, target_node_id, edge_data):
+        self._count("upsert_edge")
+        return await super().upsert_edge(source_node_id, target_node_id, edge_data)
+
+    async def upsert_nodes_batch(self, nodes):
+        self._count("upsert_nodes_batch")
+        return await super().upsert_nodes_batch(nodes)
+
+    async def upsert_edges_batch(self, edges):
+        self._count("upsert_edges_batch")
+        return await super().upsert_edges_batch(edges)
+
+
+def make_chunk_results(chunk_id: str, offset: int = 0):
+    nodes = {}
+    edges = {}
+    for i in range(offset, offset + 30):
+        name = f"E{i}"
+        nodes[name] = [
+            {
+                "entity_name": name,
+                "entity_type": "concept",
+                "description": f"{name} from {chunk_id}",
+                "source_id": chunk_id,
+                "file_path": f"{chunk_id}.txt",
+            }
+        ]
+    for i in range(offset, offset + 30):
+        # The last edge points at an entity this document did not extract
+        src, tgt = f"E{i}", f"E{i + 1}"
+        edges[(src, tgt)] = [
+            {
+                "src_id": src,
+                "tgt_id": tgt,
+                "weight": 1.0,
+                "description": f"{src} relates to {tgt} in {chunk_id}",
+                "keywords": "related",
+                "source_id": chunk_id,
+                "file_path": f"{chunk_id}.txt",
+            }
+        ]
+    return [(nodes, edges)]
+
+
+async def run_merges(tmp_path, bulk: bool):
+    global_config = {
+        "working_dir": str(tmp_path),
+        "workspace": "",
+        "graph_bulk_merge": bulk,
+        "llm_model_max_async": 4,
+        "source_ids_limit_method": "FIFO",
+        "max_source_ids_per_entity": 300,
+        "max_source_ids_per_relation": 300,
+        "max_file_paths": 100,
+        "summary_context_size": 12000,
+        "summary_max_tokens": 500,
+        "force_llm_summary_on_merge": 8,
+        "tokenizer": Tokenizer("chars", CharTokenizer()),
+    }
+    graph = CountingGraph(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config=global_config,
+        embedding_func=None,
+    )
+    await graph.initialize()
+    chunk_stores = []
+    for namespace in ("entity_chunks", "relation_chunks"):
+        store = JsonKVStorage(
+            namespace=namespace,
+            workspace="",
+            global_config=global_config,
+            embedding_func=None,
+        )
+        await store.initialize()
+        chunk_stores.append(store)
+
+    pipeline_status = {"history_messages": []}
+    lock = asyncio.Lock()
+    # Two documents merged concurrently share entities E20..E39
+    await asyncio.gather(
+        *(
+            merge_nodes_and_edges(
+                make_chunk_results(chunk_id, offset),
+                graph,
+                None,
+                None,
+                global_config,
+                doc_id=chunk_id,
+                pipeline_status=pipeline_status,
+                pipeline_status_lock=lock,
+                entity_chunks_storage=chunk_stores[0],
+                relation_chunks_storage=chunk_stores[1],
+            )
+            for chunk_id, offset in (("chunk-a", 0), ("chunk-b", 20))
+        )
+    )
+    return graph, chunk_stores
+
+
+def comparable_graph(graph: nx.Graph):
+    def clean(data):
+        data = {k: v for k, v in data.items() if k not in ("created_at", "truncate")}
+        # Concurrent documents may merge in either order
+        for key in ("source_id", "file_path", "description"):
+            if key in data:
+                data[key] = sorted(data[key].split("<SEP>"))
+        return data
+
+    return (
+        {n: clean(d) for n, d in graph.nodes(data=True)},
+        {frozenset((u, v)): clean(d) for u, v, d in graph.edges(data=True)},
+    )
+
+
+@pytest.mark.offline
+async def test_bulk_merge_matches_per_entity_merge(tmp_path):
+    single_graph, single_chunks = await run_merges(tmp_path / "single", bulk=False)
+    bulk_graph, bulk_chunks = await run_merges(tmp_path / "bulk", bulk=True)
+
+    assert comparable_graph(bulk_graph._graph) == comparable_graph(single_graph._graph)
+    assert bulk_graph._graph.nodes["E25"]["source_id"].count("chunk-") == 2
+    for single_store, bulk_store in zip(single_chunks, bulk_chunks):
+        single_data = {k: sorted(v["chunk_ids"]) for k, v in single_store._data.items()}
+        bulk_data = {k: sorted(v["chunk_ids"]) for k, v in bulk_store._data.items()}
+        assert bulk_data == single_data
+
+    # Per-record graph round trips are replaced by one batch per phase and document
+    assert single_graph.calls["upsert_node"] >= 60
+    assert "upsert_node" not in bulk_graph.calls
+    assert "upsert_edge" not in bulk_graph.calls
+    assert bulk_graph.calls["get_nodes_batch"] == 4
+    assert bulk_graph.calls["upsert_nodes_batch"] <= 4
+    assert bulk_graph.calls["upsert_edges_batch"] == 2
@@ -0,0 +1,129 @@
+"""
+Tests for the secondary indexes behind JsonDocStatusStorage queries.
+"""
+
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.kg.json_doc_status_impl import JsonDocStatusStorage
+from lightrag.utils import get_pinyin_sort_key
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+STATUSES = [DocStatus.PENDING, DocStatus.PROCESSING, DocStatus.PROCESSED]
+
+
+async def make_storage(tmp_path):
+    storage = JsonDocStatusStorage(
+        namespace="doc_status",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def make_doc(i: int, status: DocStatus = None) -> dict:
+    return {
+        "status": (status or STATUSES[i % 3]).value,
+        "content_summary": f"doc {i}",
+        "content_length": i,
+        "created_at": f"2025-01-01T00:00:{(i * 7) % 60:02d}",
+        "updated_at": f"2025-01-02T00:00:{(i * 13) % 60:02d}",
+        "file_path": f"文档{i}.txt" if i % 2 else f"file_{i}.txt",
+        "track_id": f"track-{i % 4}",
+    }
+
+
+def brute_force_page(data, status, sort_field, descending, page, page_size):
+    def key(item):
+        doc_id, doc = item
+        if sort_field == "id":
+            return doc_id
+        if sort_field == "file_path":
+            return get_pinyin_sort_key(doc["file_path"])
+        return doc[sort_field]
+
+    docs = [
+        (doc_id, doc)
+        for doc_id, doc in data.items()
+        if status is None or doc["status"] == status.value
+    ]
+    docs.sort(key=lambda item: (key(item), item[0]), reverse=descending)
+    start = (page - 1) * page_size
+    return [doc_id for doc_id, _ in docs[start : start + page_size]], len(docs)
+
+
+@pytest.mark.offline
+async def test_pages_match_full_sort_across_updates(tmp_path):
+    storage = await make_storage(tmp_path)
+    data = {f"doc-{i:03d}": make_doc(i) for i in range(60)}
+    await storage.upsert({k: dict(v) for k, v in data.items()})
+
+    async def check():
+        for status in [None, *STATUSES]:
+            for sort_field in ["created_at", "updated_at", "id", "file_path"]:
+                for direction in ["asc", "desc"]:
+                    for page in (1, 2, 4):
+                        docs, total = await storage.get_docs_paginated(
+                            status, page, 10, sort_field, direction
+                        )
+                        expected = brute_force_page(
+                            data, status, sort_field, direction == "desc", page, 10
+                        )
+                        assert ([d for d, _ in docs], total) == expected
+
+    await check()
+
+    # Indexes follow status changes, re-upserts and deletes
+    for i in range(0, 60, 5):
+        data[f"doc-{i:03d}"] = make_doc(i + 1, DocStatus.FAILED)
+    await storage.upsert({k: dict(data[k]) for k in list(data)[::5]})
+    deleted = [f"doc-{i:03d}" for i in range(1, 60, 7)]
+    await storage.delete(deleted)
+    for doc_id in deleted:
+        del data[doc_id]
+    await check()
+
+    docs, total = await storage.get_docs_paginated(DocStatus.FAILED, 1, 10)
+    assert total == 10 and len(docs) == 10
+    assert all(doc.status == DocStatus.FAILED for _, doc in docs)
+
+
+@pytest.mark.offline
+async def test_status_track_id_and_file_path_lookups(tmp_path):
+    storage = await make_storage(tmp_path)
+    await storage.upsert({f"doc-{i}": make_doc(i) for i in range(12)})
+
+    counts = await storage.get_all_status_counts()
+    assert counts[DocStatus.PENDING.value] == 4 and counts["all"] == 12
+    assert set(await storage.get_docs_by_status(DocStatus.PROCESSED)) == {
+        "doc-2",
+        "doc-5",
+        "doc-8",
+        "doc-11",
+    }
+    assert set(await storage.get_docs_by_track_id("track-1")) == {
+        "doc-1",
+        "doc-5",
+        "doc-9",
+    }
+    assert (await storage.get_doc_by_file_path("文档3.txt"))["content_length"] == 3
+
+    await storage.upsert({"doc-3": make_doc(3, DocStatus.PROCESSED)})
+    await storage.delete(["doc-5"])
+    counts = await storage.get_status_counts()
+    assert counts[DocStatus.PENDING.value] == 3
+    assert counts[DocStatus.PROCESSED.value] == 4
+    assert set(await storage.get_docs_by_track_id("track-1")) == {"doc-1", "doc-9"}
+    assert await storage.get_doc_by_file_path("文档5.txt") is None
+
+    # A second storage instance picks up the changes made through the first
+    other = await make_storage(tmp_path)
+    await storage.upsert({"doc-20": make_doc(20)})
+    assert "doc-20" in await other.get_docs_by_track_id("track-0")
+
+    assert (await storage.drop())["status"] == "success"
+    assert (await other.get_all_status_counts())["all"] == 0
+    assert await other.get_docs_paginated() == ([], 0)
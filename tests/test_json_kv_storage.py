@@ -0,0 +1,171 @@
+"""
+Tests for the append-only log persistence of JsonKVStorage.
+"""
+
+import json
+
+import pytest
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import iter_json_object_items, load_json_streaming, write_json
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+async def make_storage(
+    tmp_path, fresh_process: bool = False, namespace: str = "full_docs"
+):
+    if fresh_process:
+        # Simulate a restart so the namespace is loaded from disk again
+        finalize_share_data()
+        initialize_share_data()
+    storage = JsonKVStorage(
+        namespace=namespace,
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+async def test_changes_are_appended_and_replayed(tmp_path):
+    storage = await make_storage(tmp_path)
+    await storage.upsert({f"doc{i}": {"content": "x" * 200} for i in range(10)})
+    await storage.index_done_callback()
+
+    snapshot = tmp_path / "kv_store_full_docs.json"
+    log = tmp_path / "kv_store_full_docs.log.jsonl"
+    # The first persist writes the snapshot
+    assert len(json.loads(snapshot.read_text())) == 10
+    assert not log.exists()
+
+    snapshot_bytes = snapshot.read_bytes()
+    await storage.upsert({"doc1": {"content": "updated"}})
+    await storage.delete(["doc2"])
+    await storage.index_done_callback()
+
+    # Only the changed keys are written, the snapshot is untouched
+    assert snapshot.read_bytes() == snapshot_bytes
+    entries = [json.loads(line) for line in log.read_text().splitlines()]
+    assert sorted((e["op"], e["key"]) for e in entries) == [
+        ("delete", "doc2"),
+        ("upsert", "doc1"),
+    ]
+
+    # A torn final write is ignored on replay
+    with open(log, "a", encoding="utf-8") as f:
+        f.write('{"op": "upsert", "key": "doc3", "val')
+
+    reloaded = await make_storage(tmp_path, fresh_process=True)
+    assert (await reloaded.get_by_id("doc1"))["content"] == "updated"
+    assert await reloaded.get_by_id("doc2") is None
+    assert (await reloaded.get_by_id("doc3"))["content"] == "x" * 200
+
+
+@pytest.mark.offline
+async def test_log_is_compacted_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("KV_LOG_COMPACTION_RATIO", "0.5")
+    storage = await make_storage(tmp_path)
+    await storage.upsert({"a": {"content": "a"}, "b": {"content": "b"}})
+    await storage.index_done_callback()
+
+    log = tmp_path / "kv_store_full_docs.log.jsonl"
+    await storage.upsert({"c": {"content": "c" * 1000}})
+    await storage.index_done_callback()
+    # The log outgrew half the snapshot and was folded into it
+    assert not log.exists()
+    snapshot = json.loads((tmp_path / "kv_store_full_docs.json").read_text())
+    assert set(snapshot) == {"a", "b", "c"}
+
+    await storage.delete(["a"])
+    await storage.index_done_callback()
+    assert log.exists()
+    await storage.finalize()
+    assert not log.exists()
+    snapshot = json.loads((tmp_path / "kv_store_full_docs.json").read_text())
+    assert set(snapshot) == {"b", "c"}
+
+
+@pytest.mark.offline
+async def test_drop_removes_log(tmp_path):
+    storage = await make_storage(tmp_path)
+    await storage.upsert({"a": {"content": "a" * 1000}})
+    await storage.index_done_callback()
+    await storage.upsert({"b": {"content": "b"}})
+    await storage.index_done_callback()
+    assert (tmp_path / "kv_store_full_docs.log.jsonl").exists()
+
+    assert (await storage.drop())["status"] == "success"
+    assert not (tmp_path / "kv_store_full_docs.log.jsonl").exists()
+    reloaded = await make_storage(tmp_path, fresh_process=True)
+    assert await reloaded.is_empty()
+
+
+@pytest.mark.offline
+def test_streaming_loader_matches_json_load(tmp_path):
+    data = {
+        "default:extract:1": {"return": "实体 entity", "score": -3.5e10, "n": 12345},
+        "default:extract:2": {"nested": [1, {"deep": None}, True]},
+        "empty": {},
+    }
+    path = tmp_path / "store.json"
+    write_json(data, str(path))
+
+    # Tiny reads force records and numbers to be split across buffers
+    for chunk_size in (1, 3, 7, 64):
+        items = list(iter_json_object_items(str(path), chunk_size=chunk_size))
+        assert dict(items) == data and [k for k, _ in items] == list(data)
+
+    target = {}
+    assert load_json_streaming(str(path), target=target, batch_size=2) == 3
+    assert target == data
+    assert load_json_streaming(str(tmp_path / "missing.json")) is None
+
+
+@pytest.mark.offline
+async def test_background_load_keeps_newer_writes(tmp_path, monkeypatch):
+    cache = {f"default:extract:{i}": {"return": f"old {i}"} for i in range(50)}
+    write_json(cache, str(tmp_path / "kv_store_llm_response_cache.json"))
+    monkeypatch.setenv("JSON_KV_BACKGROUND_LOAD", "true")
+
+    storage = await make_storage(tmp_path, namespace="llm_response_cache")
+    assert storage._load_task is not None
+    # Served (and written) before the load has finished
+    await storage.upsert({"default:extract:3": {"return": "new"}})
+    await storage.index_done_callback()
+    await storage._load_task
+
+    assert (await storage.get_by_id("default:extract:3"))["return"] == "new"
+    assert (await storage.get_by_id("default:extract:4"))["return"] == "old 4"
+    await storage.index_done_callback()
+    reloaded = await make_storage(
+        tmp_path, fresh_process=True, namespace="llm_response_cache"
+    )
+    await reloaded._load_task
+    assert (await reloaded.get_by_id("default:extract:3"))["return"] == "new"
+    assert len(reloaded._data) == 50
+
+
+@pytest.mark.offline
+async def test_background_load_keeps_deletes_of_unloaded_keys(tmp_path, monkeypatch):
+    cache = {f"default:extract:{i}": {"return": f"old {i}"} for i in range(50)}
+    write_json(cache, str(tmp_path / "kv_store_llm_response_cache.json"))
+    monkeypatch.setenv("JSON_KV_BACKGROUND_LOAD", "true")
+
+    storage = await make_storage(tmp_path, namespace="llm_response_cache")
+    # Deleted before the load has reached the key
+    assert await storage.get_by_id("default:extract:49") is None
+    await storage.delete(["default:extract:49"])
+    await storage._load_task
+
+    assert await storage.get_by_id("default:extract:49") is None
+    await storage.index_done_callback()
+    reloaded = await make_storage(
+        tmp_path, fresh_process=True, namespace="llm_response_cache"
+    )
+    await reloaded._load_task
+    assert await reloaded.get_by_id("default:extract:49") is None
+    assert len(reloaded._data) == 49
@@ -0,0 +1,147 @@
+"""
+Tests for MmapVectorDBStorage (memory-mapped binary vector storage).
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.kg.mmap_vector_db_impl import MmapVectorDBStorage
+from lightrag.utils import EmbeddingFunc
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+DIM = 8
+
+
+async def keyword_embedding(texts, **kwargs):
+    """Deterministic embedding: one-hot on the first character."""
+    vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+    for i, text in enumerate(texts):
+        vectors[i, ord(text[0]) % DIM] = 1.0
+        vectors[i, (ord(text[0]) + 1) % DIM] = 0.1
+    return vectors
+
+
+async def make_storage(tmp_path, **kwargs):
+    storage = MmapVectorDBStorage(
+        namespace="chunks",
+        workspace="",
+        global_config={
+            "working_dir": str(tmp_path),
+            "embedding_batch_num": 2,
+            "vector_db_storage_cls_kwargs": {
+                "cosine_better_than_threshold": 0.2,
+                **kwargs,
+            },
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=DIM, func=keyword_embedding),
+        meta_fields={"content", "src_id", "tgt_id"},
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+async def test_upsert_query_persist_and_reload(tmp_path):
+    storage = await make_storage(tmp_path)
+    await storage.upsert(
+        {
+            "a": {"content": "apple"},
+            "b": {"content": "banana"},
+            "c": {"content": "cherry"},
+        }
+    )
+
+    results = await storage.query("another", top_k=2)
+    assert results[0]["id"] == "a"
+    assert results[0]["content"] == "apple"
+    assert all(r["distance"] >= 0.2 for r in results)
+
+    await storage.index_done_callback()
+    # Appends after the first snapshot go to the log
+    await storage.upsert({"d": {"content": "date"}})
+    await storage.delete(["b"])
+    await storage.index_done_callback()
+
+    reloaded = await make_storage(tmp_path)
+    assert await reloaded.get_by_id("b") is None
+    assert (await reloaded.get_by_id("d"))["content"] == "date"
+    assert [r["id"] for r in await reloaded.query("apricot", top_k=1)] == ["a"]
+    vectors = await reloaded.get_vectors_by_ids(["a", "missing"])
+    assert list(vectors) == ["a"]
+    assert np.isclose(np.linalg.norm(vectors["a"]), 1.0)
+
+
+@pytest.mark.offline
+async def test_reader_applies_log_tail_from_other_process(tmp_path):
+    writer = await make_storage(tmp_path)
+    await writer.upsert({"a": {"content": "apple"}})
+    await writer.index_done_callback()
+
+    reader = await make_storage(tmp_path)
+    await writer.upsert({"c": {"content": "cherry"}})
+    await writer.index_done_callback()
+
+    # The writer flags the reader, which only applies the new log entries
+    reader.storage_updated.value = True
+    snapshot_sig = reader._snapshot_sig
+    assert (await reader.get_by_id("c"))["content"] == "cherry"
+    assert reader._snapshot_sig == snapshot_sig
+
+
+@pytest.mark.offline
+async def test_compaction_drops_dead_rows(tmp_path):
+    storage = await make_storage(
+        tmp_path, mmap_vector_dtype="float16", mmap_compaction_ratio=0.3
+    )
+    await storage.upsert({f"id{i}": {"content": f"{chr(97 + i)}"} for i in range(6)})
+    await storage.index_done_callback()
+    epoch = storage._epoch
+
+    await storage.upsert({"id0": {"content": "zebra"}})  # replaces a row
+    await storage.delete(["id1", "id2"])
+    await storage.index_done_callback()
+
+    assert storage._epoch == epoch + 1
+    assert storage._dead_rows == 0
+    assert len(storage._records) == 4
+    assert not (tmp_path / f"mvdb_chunks.{epoch}.vec").exists()
+
+    reloaded = await make_storage(tmp_path)
+    assert (await reloaded.get_by_id("id0"))["content"] == "zebra"
+    assert await reloaded.get_by_ids(["id1", "id3"]) == [
+        None,
+        await reloaded.get_by_id("id3"),
+    ]
+    assert (await reloaded.drop())["status"] == "success"
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.offline
+async def test_rows_without_log_entry_are_discarded(tmp_path, monkeypatch):
+    storage = await make_storage(tmp_path)
+    await storage.upsert({"a": {"content": "apple"}})
+    await storage.index_done_callback()
+
+    # The writer stops after appending the vector but before the log record
+    def crash(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    await storage.upsert({"b": {"content": "banana"}})
+    with monkeypatch.context() as m:
+        m.setattr("lightrag.kg.mmap_vector_db_impl.json.dumps", crash)
+        with pytest.raises(KeyboardInterrupt):
+            await storage.index_done_callback()
+
+    vector_file = tmp_path / f"mvdb_chunks.{storage._epoch}.vec"
+    row_size = DIM * np.dtype(np.float32).itemsize
+    # Loading leaves the file alone and ignores the unreferenced row
+    restarted = await make_storage(tmp_path)
+    assert await restarted.get_by_id("b") is None
+    assert vector_file.stat().st_size == 2 * row_size
+
+    await restarted.upsert({"c": {"content": "cherry"}})
+    await restarted.index_done_callback()
+    reloaded = await make_storage(tmp_path)
+    assert [r["id"] for r in await reloaded.query("coconut", top_k=1)] == ["c"]
+    assert vector_file.stat().st_size == 2 * row_size
@@ -0,0 +1,210 @@
+"""
+Tests for the binary snapshot + delta persistence of NetworkXStorage.
+"""
+
+import random
+
+import networkx as nx
+import pytest
+
+from lightrag.base import BaseGraphStorage
+from lightrag.kg.networkx_impl import NetworkXStorage
+
+pytestmark = pytest.mark.usefixtures("shared_data")
+
+
+@pytest.fixture(autouse=True)
+def graph_format(monkeypatch):
+    """Store NetworkX graphs in the binary format"""
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "binary")
+
+
+async def make_storage(tmp_path):
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def graph_state(graph: nx.Graph):
+    return (
+        dict(graph.nodes(data=True)),
+        {frozenset((u, v)): d for u, v, d in graph.edges(data=True)},
+    )
+
+
+@pytest.mark.offline
+async def test_changes_are_appended_as_deltas(tmp_path):
+    storage = await make_storage(tmp_path)
+    for i in range(20):
+        await storage.upsert_node(f"n{i}", {"entity_type": "x", "weight": i})
+    for i in range(19):
+        await storage.upsert_edge(f"n{i}", f"n{i + 1}", {"weight": 1.0})
+    await storage.index_done_callback()
+
+    snapshot = tmp_path / "graph_chunk_entity_relation.nxgraph"
+    delta = tmp_path / "graph_chunk_entity_relation.nxgraph.delta"
+    snapshot_bytes = snapshot.read_bytes()
+    assert not delta.exists()
+
+    await storage.upsert_node("n3", {"description": "updated"})
+    await storage.remove_edges([("n0", "n1")])
+    await storage.delete_node("n19")
+    await storage.index_done_callback()
+    # The snapshot is untouched, only the changes were written
+    assert snapshot.read_bytes() == snapshot_bytes and delta.exists()
+
+    # A torn final frame is ignored on load
+    with open(delta, "ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")
+
+    reloaded = await make_storage(tmp_path)
+    assert graph_state(reloaded._graph) == graph_state(storage._graph)
+    assert (await reloaded.get_node("n3"))["description"] == "updated"
+    assert (await reloaded.get_node("n3"))["weight"] == 3
+    assert not await reloaded.has_edge("n0", "n1")
+    assert not await reloaded.has_node("n19")
+
+
+@pytest.mark.offline
+async def test_other_process_applies_only_new_deltas(tmp_path):
+    writer = await make_storage(tmp_path)
+    await writer.upsert_node("a", {"entity_type": "x"})
+    for i in range(20):
+        await writer.upsert_node(f"n{i}", {"description": "d" * 50})
+    await writer.index_done_callback()
+    reader = await make_storage(tmp_path)
+    graph_before = reader._graph
+
+    await writer.upsert_node("b", {"entity_type": "y"})
+    await writer.upsert_edge("a", "b", {"weight": 2.0})
+    await writer.index_done_callback()
+
+    assert await reader.has_edge("b", "a")
+    # Applied in place rather than reloading the whole snapshot
+    assert reader._graph is graph_before
+
+    # Once the delta outgrows the snapshot it is folded into a new one
+    for i in range(50):
+        await writer.upsert_node(f"c{i}", {"description": "d" * 50})
+    await writer.index_done_callback()
+    assert not (tmp_path / "graph_chunk_entity_relation.nxgraph.delta").exists()
+    assert await reader.has_node("c49")
+    assert graph_state(reader._graph) == graph_state(writer._graph)
+
+
+@pytest.mark.offline
+async def test_existing_graphml_is_converted(tmp_path):
+    graph = nx.Graph()
+    graph.add_node("alice", entity_type="person", description="多语言")
+    graph.add_node("bob", entity_type="person")
+    graph.add_edge("alice", "bob", weight=1.5, keywords="knows")
+    nx.write_graphml(graph, tmp_path / "graph_chunk_entity_relation.graphml")
+
+    storage = await make_storage(tmp_path)
+    assert (tmp_path / "graph_chunk_entity_relation.nxgraph").exists()
+    assert graph_state(storage._graph) == graph_state(graph)
+
+    assert (await storage.drop())["status"] == "success"
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.offline
+async def test_batch_reads_match_single_item_reads(tmp_path):
+    storage = await make_storage(tmp_path)
+    await storage.upsert_nodes_batch(
+        [(f"n{i}", {"entity_type": "x", "weight": i}) for i in range(10)]
+    )
+    await storage.upsert_edges_batch(
+        [(f"n{i}", f"n{(i * 3) % 10}", {"weight": float(i)}) for i in range(10)]
+    )
+    await storage.upsert_edge("n4", "n4", {"weight": 9.0})
+
+    node_ids = ["n1", "missing", "n4", "n7", "n1"]
+    edge_pairs = [("n1", "n3"), ("n3", "n1"), ("n4", "n4"), ("n2", "missing")]
+    edge_dicts = [{"src": src, "tgt": tgt} for src, tgt in edge_pairs]
+
+    calls = 0
+    get_graph = storage._get_graph
+
+    async def counting_get_graph():
+        nonlocal calls
+        calls += 1
+        return await get_graph()
+
+    storage._get_graph = counting_get_graph
+    native = [
+        await storage.get_nodes_batch(node_ids),
+        await storage.node_degrees_batch(node_ids),
+        await storage.edge_degrees_batch(edge_pairs),
+        await storage.get_edges_batch(edge_dicts),
+        await storage.get_nodes_edges_batch(node_ids),
+    ]
+    # Each batch reads the graph once
+    assert calls == 5
+
+    node_ids = [node_id for node_id in node_ids if node_id != "missing"]
+    expected = [
+        await BaseGraphStorage.get_nodes_batch(storage, node_ids),
+        await BaseGraphStorage.node_degrees_batch(storage, node_ids),
+        await BaseGraphStorage.edge_degrees_batch(storage, edge_pairs),
+        await BaseGraphStorage.get_edges_batch(storage, edge_dicts),
+        await BaseGraphStorage.get_nodes_edges_batch(storage, node_ids),
+    ]
+    assert native[1].pop("missing") == 0
+    assert native[4].pop("missing") == []
+    assert native == expected
+
+
+async def assert_degree_index_matches(storage):
+    graph = await storage._get_graph()
+    degrees = sorted((degree for _, degree in graph.degree()), reverse=True)
+    popular = await storage.get_popular_labels(limit=15)
+    assert [graph.degree(node) for node in popular] == degrees[:15]
+    assert await storage.get_all_labels() == sorted(graph.nodes())
+    kg = await storage.get_knowledge_graph("*", max_nodes=15)
+    assert sorted(node.id for node in kg.nodes) == sorted(popular)
+    assert kg.is_truncated == (graph.number_of_nodes() > 15)
+
+
+@pytest.mark.offline
+async def test_degree_index_follows_changes(tmp_path, monkeypatch):
+    # Keep appending deltas so the reader always applies them in place
+    monkeypatch.setenv("GRAPH_DELTA_COMPACTION_RATIO", "1000")
+    rng = random.Random(7)
+    writer = await make_storage(tmp_path)
+    await writer.upsert_nodes_batch(
+        [(f"n{i}", {"entity_type": "x"}) for i in range(40)]
+    )
+    await writer.index_done_callback()
+    reader = await make_storage(tmp_path)
+    await assert_degree_index_matches(writer)
+    await assert_degree_index_matches(reader)
+    reader_index = reader._degree_index
+
+    for round_ in range(5):
+        for _ in range(30):
+            src, tgt = (f"n{rng.randrange(50)}" for _ in range(2))
+            await writer.upsert_edge(src, tgt, {"weight": 1.0})
+        await writer.upsert_edges_batch(
+            [(f"n{rng.randrange(50)}", f"m{round_}", {}) for _ in range(5)]
+        )
+        await writer.upsert_node(f"solo{round_}", {"entity_type": "x"})
+        await writer.delete_node(f"n{rng.randrange(50)}")
+        await writer.remove_nodes([f"n{rng.randrange(50)}", "missing"])
+        await writer.remove_edges(list(writer._graph.edges())[:3])
+        await assert_degree_index_matches(writer)
+
+        await writer.index_done_callback()
+        # The reader applies the deltas to its graph and index in place
+        await assert_degree_index_matches(reader)
+        assert reader._degree_index is reader_index
+
+    assert graph_state(reader._graph) == graph_state(writer._graph)
+    await writer.drop()
+    assert await writer.get_popular_labels() == []
+    assert await writer.get_all_labels() == []
@@ -0,0 +1,115 @@
+"""
+Tests for the shared OpenAI client registry in lightrag.llm.openai.
+"""
+
+import base64
+
+import numpy as np
+import pytest
+from aiohttp import web
+
+pytest.importorskip("openai")
+
+from lightrag.llm.openai import (  # noqa: E402
+    OpenAIClientRegistry,
+    openai_client_registry,
+    openai_complete_if_cache,
+    openai_embed,
+)
+
+
+@pytest.fixture
+async def openai_server():
+    """Local OpenAI-compatible endpoint that records the client port of every request."""
+    peers = []
+
+    def record(request):
+        peers.append(request.transport.get_extra_info("peername")[1])
+
+    async def chat(request):
+        record(request)
+        body = await request.json()
+        return web.json_response(
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "pong"},
+                        "finish_reason": "stop",
+                    }
+                ],
+            }
+        )
+
+    async def embeddings(request):
+        record(request)
+        body = await request.json()
+        vector = base64.b64encode(np.ones(4, dtype=np.float32).tobytes()).decode()
+        return web.json_response(
+            {
+                "object": "list",
+                "model": body["model"],
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": vector}
+                    for i in range(len(body["input"]))
+                ],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        )
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat)
+    app.router.add_post("/v1/embeddings", embeddings)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/v1", peers
+    await runner.cleanup()
+
+
+@pytest.mark.offline
+async def test_calls_share_one_client_and_connection(openai_server):
+    base_url, peers = openai_server
+    openai_client_registry.acquire()
+    try:
+        for _ in range(3):
+            result = await openai_complete_if_cache(
+                "gpt-test", "ping", base_url=base_url, api_key="key"
+            )
+            assert result == "pong"
+            vectors = await openai_embed.func(
+                ["a", "b"], model="embed-test", base_url=base_url, api_key="key"
+            )
+            assert vectors.shape == (2, 4)
+
+        # Completion and embedding calls reuse the same keep-alive connection
+        assert len(peers) == 6 and len(set(peers)) == 1
+        client = openai_client_registry.get(api_key="key", base_url=base_url)
+        assert not client.is_closed()
+        # A different configuration gets its own client
+        assert openai_client_registry.get(api_key="other", base_url=base_url) is not (
+            client
+        )
+    finally:
+        await openai_client_registry.release()
+    assert client.is_closed()
+
+
+@pytest.mark.offline
+async def test_closed_registry_recreates_clients(openai_server):
+    base_url, _ = openai_server
+    registry = OpenAIClientRegistry()
+    registry.acquire()
+    first = registry.get(api_key="key", base_url=base_url)
+    await registry.release()
+    assert first.is_closed()
+
+    second = registry.get(api_key="key", base_url=base_url)
+    assert second is not first and not second.is_closed()
+    await registry.close()
@@ -0,0 +1,75 @@
+"""
+Tests for the shared rerank HTTP session pool in lightrag.rerank.
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from lightrag.rerank import RerankSessionPool, generic_rerank_api, rerank_session_pool
+
+
+@pytest.fixture
+async def rerank_server():
+    """Local rerank endpoint that records the client port of every request."""
+    peers = []
+
+    async def rerank(request):
+        peers.append(request.transport.get_extra_info("peername")[1])
+        body = await request.json()
+        await asyncio.sleep(0.05)
+        scores = [
+            {"index": i, "relevance_score": 1.0 / (i + 1)}
+            for i in range(len(body["documents"]))
+        ]
+        return web.json_response({"results": scores})
+
+    app = web.Application()
+    app.router.add_post("/v1/rerank", rerank)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/v1/rerank", peers
+    await runner.cleanup()
+
+
+async def rerank(url, query="q"):
+    return await generic_rerank_api(
+        query=query, documents=["a", "b"], model="m", base_url=url, api_key="k"
+    )
+
+
+@pytest.mark.offline
+async def test_pool_reuses_connections_and_coalesces(rerank_server):
+    url, peers = rerank_server
+    rerank_session_pool.acquire()
+    try:
+        for query in ("one", "two", "three"):
+            results = await rerank(url, query)
+            assert [r["index"] for r in results] == [0, 1]
+        # Sequential calls share one keep-alive connection
+        assert len(peers) == 3 and len(set(peers)) == 1
+
+        # Identical concurrent requests share one HTTP call
+        results = await asyncio.gather(*(rerank(url, "same") for _ in range(5)))
+        assert len(peers) == 4
+        assert all(r == results[0] for r in results)
+        results[0][0]["index"] = 99
+        assert results[1][0]["index"] == 0
+
+        session = rerank_session_pool.session(url)
+    finally:
+        await rerank_session_pool.release()
+    assert session.closed and not rerank_session_pool.active
+
+
+@pytest.mark.offline
+async def test_without_pool_each_call_opens_a_session(rerank_server):
+    url, peers = rerank_server
+    assert RerankSessionPool().session(url) is None
+    await rerank(url, "one")
+    await rerank(url, "two")
+    assert len(peers) == 2 and len(set(peers)) == 2
@@ -0,0 +1,136 @@
+"""
+Tests for the retrieval (query context) cache used by kg_query.
+"""
+
+from collections import OrderedDict
+
+import pytest
+
+from lightrag import LightRAG, operate
+from lightrag.base import QueryContextResult, QueryParam
+from lightrag.kg.shared_storage import (
+    bump_storage_generation,
+)
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+from helpers import CharTokenizer, hashed_embedding
+
+cache = OrderedDict()
+
+
+@pytest.fixture
+def context_builder(monkeypatch, shared_data):
+    cache.clear()
+    calls = []
+
+    async def fake_build_query_context(query, ll_keywords, hl_keywords, *args):
+        calls.append((query, ll_keywords, hl_keywords))
+        return QueryContextResult(context=f"ctx-{len(calls)}", raw_data={"data": {}})
+
+    monkeypatch.setattr(operate, "_build_query_context", fake_build_query_context)
+    yield calls
+    cache.clear()
+
+
+async def build(query, ll="Apple, pie", config=None, param=None):
+    global_config = {
+        "workspace": "cache_test",
+        "retrieval_cache_max_size": 2,
+        "retrieval_cache_ttl": 300,
+        **(config or {}),
+    }
+    return await operate._build_query_context_with_cache(
+        query,
+        ll,
+        "",
+        None,
+        None,
+        None,
+        None,
+        param or QueryParam(),
+        global_config,
+        None,
+        cache,
+    )
+
+
+@pytest.mark.offline
+async def test_identical_queries_hit_cache(context_builder):
+    first = await build("What is  LightRAG?")
+    # Whitespace in the query and keyword order/case are normalized
+    second = await build("What is LightRAG? ", ll="pie, apple")
+
+    assert len(context_builder) == 1
+    assert second.context == first.context
+    # Cache hands out private copies
+    second.raw_data["data"]["mutated"] = True
+    third = await build("What is LightRAG?")
+    assert "mutated" not in third.raw_data["data"]
+
+
+@pytest.mark.offline
+async def test_generation_bump_and_params_invalidate(context_builder):
+    await build("q")
+    await build("q", param=QueryParam(top_k=7))
+    assert len(context_builder) == 2
+
+    await bump_storage_generation("cache_test")
+    await build("q")
+    assert len(context_builder) == 3
+
+
+@pytest.mark.offline
+async def test_ttl_size_and_disable(context_builder):
+    await build("q", config={"retrieval_cache_ttl": -1})
+    await build("q", config={"retrieval_cache_ttl": -1})
+    assert len(context_builder) == 1  # non-positive TTL never expires by time
+
+    await build("a")
+    await build("b")
+    assert len(cache) == 2  # LRU bound
+
+    await build("b", config={"retrieval_cache_max_size": 0})
+    assert len(context_builder) == 4
+
+
+@pytest.mark.offline
+async def test_instance_settings_are_part_of_the_key(context_builder):
+    async def rerank(query, documents, top_n=None):
+        return documents
+
+    await build("q")
+    await build("q", config={"kg_chunk_pick_method": "WEIGHT"})
+    await build("q", config={"related_chunk_number": 3})
+    await build("q", config={"rerank_model_func": rerank})
+    assert len(context_builder) == 4
+
+
+@pytest.mark.offline
+async def test_instances_sharing_a_workspace_do_not_share_entries(
+    context_builder, tmp_path
+):
+    async def llm(prompt, **kwargs):
+        return ""
+
+    rags = []
+    for name in ("a", "b"):
+        rag = LightRAG(
+            working_dir=str(tmp_path / name),
+            llm_model_func=llm,
+            embedding_func=EmbeddingFunc(embedding_dim=16, func=hashed_embedding),
+            tokenizer=Tokenizer("mock-tokenizer", CharTokenizer()),
+            retrieval_cache_max_size=2,
+        )
+        await rag.initialize_storages()
+        rags.append(rag)
+    try:
+        param = QueryParam(mode="local", ll_keywords=["apple"])
+        for rag in rags + rags:
+            await rag.aquery_data("What is an apple?", param)
+        # One build per instance; each repeat is served by that instance's cache
+        assert len(context_builder) == 2
+        assert len(rags[0]._query_context_cache) == 1
+        assert len(rags[1]._query_context_cache) == 1
+    finally:
+        for rag in rags:
+            await rag.finalize_storages()
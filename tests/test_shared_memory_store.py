@@ -0,0 +1,110 @@
+"""
+Tests for the memory-mapped SharedMemoryStore used by multi-worker servers.
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+
+import pytest
+
+from lightrag.kg import shared_storage
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import (
+    SharedMemoryStore,
+    finalize_share_data,
+    initialize_share_data,
+)
+
+
+@pytest.mark.offline
+def test_processes_see_each_others_writes(tmp_path):
+    path = str(tmp_path / "store")
+    # Separate instances keep separate indexes, like separate processes
+    writer = SharedMemoryStore(path)
+    reader = SharedMemoryStore(path)
+
+    writer.update({f"k{i}": {"value": i} for i in range(100)})
+    writer["k0"] = {"value": "changed"}
+    assert reader["k0"] == {"value": "changed"}
+    assert reader.get("k99") == {"value": 99} and len(reader) == 100
+
+    # Reads return copies
+    reader.get("k1")["value"] = "local"
+    assert reader.get("k1") == {"value": 1}
+
+    assert reader.pop("k1") == {"value": 1}
+    del reader["k2"]
+    assert "k1" not in writer and "k2" not in writer and len(writer) == 98
+    assert reader.pop("k1", None) is None
+    with pytest.raises(KeyError):
+        reader["k1"]
+
+    # Rewriting values outgrows the live data and compacts into a new generation
+    payload = "x" * 10_000
+    for i in range(300):
+        writer.update({f"k{j}": {"value": payload, "round": i} for j in range(3, 6)})
+    assert writer._generation > 0
+    assert len(os.listdir(tmp_path)) == 2  # control file and current generation
+    assert reader.get("k5") == {"value": payload, "round": 299}
+    assert sorted(reader.keys()) == sorted(writer.keys())
+
+    reader.clear()
+    assert len(writer) == 0 and writer.copy() == {}
+    writer["after"] = [1, 2]
+    assert dict(reader.items()) == {"after": [1, 2]}
+
+
+async def _worker_round_trip(working_dir: str) -> None:
+    storage = JsonKVStorage(
+        namespace="full_docs",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    assert (await storage.get_by_id("doc-1"))["content"] == "from parent"
+    await storage.upsert({"doc-2": {"content": "from worker"}})
+
+
+def _worker(working_dir: str) -> None:
+    asyncio.run(_worker_round_trip(working_dir))
+
+
+@pytest.mark.offline
+def test_json_kv_storage_shares_data_across_workers(tmp_path):
+    async def parent():
+        storage = JsonKVStorage(
+            namespace="full_docs",
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=None,
+        )
+        await storage.initialize()
+        assert isinstance(storage._data, SharedMemoryStore)
+        await storage.upsert({"doc-1": {"content": "from parent"}})
+
+        worker = mp.get_context("fork").Process(target=_worker, args=(str(tmp_path),))
+        worker.start()
+        await asyncio.to_thread(worker.join, 30)
+        assert worker.exitcode == 0
+
+        docs = await storage.get_by_ids(["doc-1", "doc-2", "missing"])
+        assert [d and d["content"] for d in docs] == [
+            "from parent",
+            "from worker",
+            None,
+        ]
+        assert await storage.filter_keys({"doc-2", "doc-3"}) == {"doc-3"}
+        await storage.index_done_callback()
+
+    initialize_share_data(workers=2)
+    try:
+        asyncio.run(parent())
+        shm_dir = shared_storage._shared_memory_dir
+    finally:
+        finalize_share_data()
+
+    assert not os.path.exists(shm_dir)
+    with open(tmp_path / "kv_store_full_docs.json", encoding="utf-8") as f:
+        assert "from worker" in f.read()
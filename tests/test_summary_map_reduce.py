@@ -0,0 +1,107 @@
+"""
+Tests for the map-reduce description summary of entities and relations.
+"""
+
+import asyncio
+
+import pytest
+
+from lightrag.operate import _handle_entity_relation_summary
+from lightrag.utils import Tokenizer
+
+
+class CountingTokenizer:
+    """One token per word; records every string it encodes."""
+
+    def __init__(self):
+        self.encoded: list[str] = []
+
+    def encode(self, content: str):
+        self.encoded.append(content)
+        return content.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def make_config(llm_func, tokenizer, **overrides):
+    config = {
+        "llm_model_func": llm_func,
+        "llm_model_max_async": 8,
+        "tokenizer": Tokenizer("words", tokenizer, count_cache_size=0),
+        "summary_context_size": 100,
+        "summary_max_tokens": 60,
+        "summary_length_recommended": 10,
+        "force_llm_summary_on_merge": 8,
+        "addon_params": {},
+    }
+    config.update(overrides)
+    return config
+
+
+@pytest.mark.offline
+async def test_groups_are_summarized_concurrently_with_a_cap():
+    in_flight = 0
+    peak = 0
+    calls = 0
+
+    async def llm(prompt, **kwargs):
+        nonlocal in_flight, peak, calls
+        calls += 1
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"summary {calls} word"
+
+    tokenizer = CountingTokenizer()
+    # 200 descriptions of 10 tokens: 20 groups of 10 in the first map phase
+    descriptions = [f"hub description {i} " + "x " * 7 for i in range(200)]
+    summary, llm_used = await _handle_entity_relation_summary(
+        "Entity",
+        "Hub",
+        descriptions,
+        "<SEP>",
+        make_config(llm, tokenizer, summary_map_max_async=3),
+    )
+
+    assert llm_used and summary.startswith("summary")
+    # 20 map summaries, then 20 short summaries fit into one final call
+    assert calls == 21
+    assert peak == 3
+    # Every input description was tokenized exactly once
+    assert all(tokenizer.encoded.count(d) == 1 for d in descriptions)
+
+
+@pytest.mark.offline
+async def test_default_cap_is_half_of_llm_limit():
+    in_flight = 0
+    peak = 0
+
+    async def llm(prompt, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "short summary"
+
+    descriptions = [f"description {i} " + "y " * 8 for i in range(100)]
+    await _handle_entity_relation_summary(
+        "Relation",
+        "A-B",
+        descriptions,
+        "<SEP>",
+        make_config(llm, CountingTokenizer(), summary_map_max_async=0),
+    )
+    assert peak == 4
+
+    # Few short descriptions are joined without any LLM call
+    joined, llm_used = await _handle_entity_relation_summary(
+        "Entity",
+        "Small",
+        ["a b", "c d"],
+        "<SEP>",
+        make_config(llm, CountingTokenizer()),
+    )
+    assert (joined, llm_used) == ("a b<SEP>c d", False)
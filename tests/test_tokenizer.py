@@ -0,0 +1,171 @@
+"""
+Tests for the token-count service on lightrag.utils.Tokenizer.
+"""
+
+import numpy as np
+import pytest
+
+from lightrag import LightRAG
+from lightrag.utils import (
+    EmbeddingFunc,
+    TokenEstimator,
+    Tokenizer,
+    truncate_list_by_token_size,
+)
+
+
+class CountingTokenizer:
+    """Whitespace tokenizer that records encode/encode_batch calls."""
+
+    def __init__(self):
+        self.encoded: list[str] = []
+        self.batches: list[list[str]] = []
+
+    def encode(self, content: str):
+        self.encoded.append(content)
+        return content.split()
+
+    def encode_batch(self, contents: list[str]):
+        self.batches.append(list(contents))
+        return [content.split() for content in contents]
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.mark.offline
+def test_count_tokens_batch_uses_encode_batch_and_cache():
+    backend = CountingTokenizer()
+    tokenizer = Tokenizer("counting", backend)
+
+    counts = tokenizer.count_tokens_batch(["a b", "c d e", "a b"])
+    assert counts == [2, 3, 2]
+    # Duplicates are encoded once, in a single batch call
+    assert backend.batches == [["a b", "c d e"]]
+
+    assert tokenizer.count_tokens_batch(["c d e", "f"]) == [3, 1]
+    # Only the miss is encoded; a single miss skips the batch API
+    assert backend.batches == [["a b", "c d e"]]
+    assert backend.encoded == ["f"]
+
+
+@pytest.mark.offline
+def test_count_cache_is_bounded_lru():
+    backend = CountingTokenizer()
+    tokenizer = Tokenizer("counting", backend, count_cache_size=2)
+
+    tokenizer.count_tokens("one")
+    tokenizer.count_tokens("two")
+    tokenizer.count_tokens("one")  # refresh "one"
+    tokenizer.count_tokens("three")  # evicts "two"
+    backend.encoded.clear()
+
+    tokenizer.count_tokens("one")
+    tokenizer.count_tokens("two")
+    assert backend.encoded == ["two"]
+    assert len(tokenizer._count_cache) == 2
+
+
+@pytest.mark.offline
+def test_truncate_list_by_token_size_reuses_counts():
+    backend = CountingTokenizer()
+    tokenizer = Tokenizer("counting", backend)
+    items = [{"text": "a b c"}, {"text": "d e"}, {"text": "f g h i"}]
+
+    first = truncate_list_by_token_size(
+        items, key=lambda x: x["text"], max_token_size=5, tokenizer=tokenizer
+    )
+    assert first == items[:2]
+
+    backend.batches.clear()
+    backend.encoded.clear()
+    second = truncate_list_by_token_size(
+        items, key=lambda x: x["text"], max_token_size=9, tokenizer=tokenizer
+    )
+    assert second == items
+    assert backend.batches == [] and backend.encoded == []
+
+
+class CountOnlyTokenizer(CountingTokenizer):
+    """Tokenizer exposing count_batch, like the HuggingFace backend."""
+
+    def __init__(self):
+        super().__init__()
+        self.counted: list[list[str]] = []
+
+    def count_batch(self, contents: list[str]):
+        self.counted.append(list(contents))
+        return [len(content.split()) for content in contents]
+
+
+@pytest.mark.offline
+def test_count_batch_is_preferred_over_encoding():
+    backend = CountOnlyTokenizer()
+    tokenizer = Tokenizer("count-only", backend)
+
+    assert tokenizer.count_tokens_batch(["a b", "c"]) == [2, 1]
+    assert tokenizer.count_tokens("d e f") == 3
+    assert backend.counted == [["a b", "c"], ["d e f"]]
+    assert backend.batches == [] and backend.encoded == []
+
+
+@pytest.mark.offline
+def test_estimator_fits_character_ratios():
+    estimator = TokenEstimator(margin=0.0)
+    samples = ["abcd" * n + "中文" * m for n, m in ((10, 0), (3, 5), (0, 8), (7, 2))]
+    # Four ASCII characters and two CJK characters per token
+    counts = [n + m for n, m in ((10, 0), (3, 5), (0, 8), (7, 2))]
+    estimator.calibrate(samples, counts)
+
+    assert estimator.ascii_ratio == pytest.approx(0.25)
+    assert estimator.other_ratio == pytest.approx(0.5)
+    assert estimator.estimate("abcd" * 100) == 100
+
+    # A margin rounds the estimate up
+    estimator.margin = 0.1
+    assert estimator.estimate("abcd" * 100) == 110
+
+
+@pytest.mark.offline
+def test_estimate_mode_calibrates_then_skips_the_tokenizer(monkeypatch):
+    monkeypatch.setattr("lightrag.utils.DEFAULT_TOKEN_ESTIMATOR_CALIBRATION_CHARS", 100)
+    backend = CountingTokenizer()
+    exact = Tokenizer("counting", backend)
+    assert exact.estimate_tokens_batch(["a b c"]) == [3]
+    assert exact.estimator.ascii_ratio == 0.25
+
+    backend = CountingTokenizer()
+    tokenizer = Tokenizer("counting", backend, count_mode="estimate")
+    texts = [" ".join(["word"] * n) for n in range(1, 12)]
+    # Calibration texts are counted exactly
+    assert tokenizer.estimate_tokens_batch(texts) == list(range(1, 12))
+    assert backend.batches == [texts]
+
+    backend.batches.clear()
+    estimates = tokenizer.estimate_tokens_batch(["word " * 200])
+    assert backend.batches == [] and backend.encoded == []
+    # Five characters per word; the margin keeps the estimate above the exact count
+    assert 200 <= estimates[0] <= 220
+
+    with pytest.raises(ValueError):
+        Tokenizer("counting", backend, count_mode="approximate")
+
+
+@pytest.mark.offline
+def test_token_count_mode_leaves_provided_tokenizer_unchanged(tmp_path):
+    async def embed(texts):
+        return np.zeros((len(texts), 8))
+
+    async def llm(prompt, **kwargs):
+        return ""
+
+    tokenizer = Tokenizer("counting", CountingTokenizer())
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=llm,
+        embedding_func=EmbeddingFunc(embedding_dim=8, func=embed),
+        tokenizer=tokenizer,
+        token_count_mode="estimate",
+    )
+    assert rag.tokenizer is tokenizer
+    assert tokenizer.count_mode == "exact"
@@ -0,0 +1,74 @@
+"""
+Tests for batched cosine ranking in lightrag.utils.
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.utils import (
+    cosine_similarity,
+    pick_by_vector_similarity,
+    rank_by_cosine_similarity,
+)
+
+
+class VectorStore:
+    """Minimal chunks_vdb stand-in exposing get_vectors_by_ids."""
+
+    def __init__(self, vectors: dict[str, list[float]]):
+        self.vectors = vectors
+
+    async def get_vectors_by_ids(self, ids):
+        return {i: self.vectors[i] for i in ids if i in self.vectors}
+
+
+@pytest.mark.offline
+def test_rank_matches_pairwise_cosine_similarity():
+    rng = np.random.default_rng(7)
+    query = rng.standard_normal(12)
+    candidates = rng.standard_normal((50, 12))
+
+    order, scores = rank_by_cosine_similarity(query, candidates, top_k=5)
+    expected = sorted(
+        range(len(candidates)),
+        key=lambda i: cosine_similarity(query, candidates[i]),
+        reverse=True,
+    )[:5]
+    assert order.tolist() == expected
+    assert np.allclose(
+        scores, [cosine_similarity(query, candidates[i]) for i in expected], atol=1e-5
+    )
+
+    full_order, _ = rank_by_cosine_similarity(query, candidates)
+    assert len(full_order) == 50 and full_order[:5].tolist() == expected
+
+
+@pytest.mark.offline
+def test_rank_handles_zero_vectors_and_empty_input():
+    order, scores = rank_by_cosine_similarity([1.0, 0.0], [[0.0, 0.0], [2.0, 0.0]])
+    assert order.tolist() == [1, 0]
+    assert scores.tolist() == [1.0, 0.0]
+
+    order, scores = rank_by_cosine_similarity([1.0, 0.0], [], top_k=3)
+    assert len(order) == 0 and len(scores) == 0
+
+
+@pytest.mark.offline
+async def test_pick_by_vector_similarity_returns_top_chunks():
+    store = VectorStore(
+        {
+            "c1": [1.0, 0.0],
+            "c2": [0.0, 1.0],
+            "c3": [0.9, 0.1],
+        }
+    )
+    selected = await pick_by_vector_similarity(
+        query="q",
+        text_chunks_storage=None,
+        chunks_vdb=store,
+        num_of_chunks=2,
+        entity_info=[{"sorted_chunks": ["c2", "c1"]}, {"sorted_chunks": ["c3"]}],
+        embedding_func=None,
+        query_embedding=[1.0, 0.0],
+    )
+    assert selected == ["c1", "c3"]
@@ -0,0 +1,83 @@
+"""
+Tests for VectorUpsertBuffer, which batches merge-phase vector upserts.
+"""
+
+import asyncio
+
+import pytest
+
+from lightrag.utils import VectorUpsertBuffer
+
+
+class RecordingStorage:
+    """Vector storage stand-in that records every upsert call."""
+
+    def __init__(self, fail_times: int = 0):
+        self.calls: list[dict] = []
+        self.deleted: list[str] = []
+        self.fail_times = fail_times
+
+    async def upsert(self, data):
+        await asyncio.sleep(0.001)
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("embedding service unavailable")
+        self.calls.append(dict(data))
+
+    async def delete(self, ids):
+        self.deleted.extend(ids)
+
+
+@pytest.mark.offline
+async def test_concurrent_upserts_are_batched():
+    storage = RecordingStorage()
+    buffer = VectorUpsertBuffer(storage, batch_size=10, flush_interval=0.01)
+
+    await asyncio.gather(
+        *(buffer.upsert({f"ent-{i}": {"content": str(i)}}) for i in range(25))
+    )
+    # Two full batches flushed on size, the remainder on the deadline
+    assert [len(call) for call in storage.calls] == [10, 10, 5]
+    assert {k for call in storage.calls for k in call} == {
+        f"ent-{i}" for i in range(25)
+    }
+
+    # Later writes of the same id win, and deletes go straight through
+    await asyncio.gather(
+        buffer.upsert({"ent-1": {"content": "old"}}),
+        buffer.upsert({"ent-1": {"content": "new"}}),
+    )
+    assert storage.calls[-1] == {"ent-1": {"content": "new"}}
+    await buffer.delete(["ent-1"])
+    assert storage.deleted == ["ent-1"]
+
+
+@pytest.mark.offline
+async def test_batch_failure_reaches_every_caller():
+    storage = RecordingStorage(fail_times=1)
+    buffer = VectorUpsertBuffer(storage, batch_size=3, flush_interval=0.01)
+
+    results = await asyncio.gather(
+        *(buffer.upsert({f"rel-{i}": {"content": str(i)}}) for i in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    # A retry goes into a fresh batch
+    await buffer.upsert({"rel-0": {"content": "0"}})
+    await buffer.flush()
+    assert storage.calls == [{"rel-0": {"content": "0"}}]
+
+
+@pytest.mark.offline
+async def test_flushes_once_every_caller_is_waiting():
+    storage = RecordingStorage()
+    # A long deadline that the test would notice if it were hit
+    buffer = VectorUpsertBuffer(
+        storage, batch_size=10, flush_interval=60, max_waiters=3
+    )
+    await asyncio.wait_for(
+        asyncio.gather(*(buffer.upsert({f"ent-{i}": {}}) for i in range(3))),
+        timeout=5,
+    )
+    assert [len(call) for call in storage.calls] == [3]